@@ -1,9 +1,9 @@
 from flask import Flask, send_from_directory
 from flask_cors import CORS
-from flasgger import Swagger
-from config.config import config_by_name
-from app.models import db
-from app.swagger import swagger_template, swagger_config
+from config.config import config_by_name, opciones_motor
+from app.models import db, carga_estricta
+from app import instrumentacion, metricas, swagger
+from app.proveedor_json import ProveedorJSON
 import os
 
 def create_app(config_name=None):
@@ -14,17 +14,40 @@ def create_app(config_name=None):
 
     app = Flask(__name__, static_folder='../frontend', static_url_path='')
     app.config.from_object(config_by_name[config_name])
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', opciones_motor(app.config))
+    app.json = ProveedorJSON(app)  # orjson (instrumentacion lo reemplaza por la versión medida)
 
     # Inicializar extensiones
     db.init_app(app)
-    CORS(app)  # Habilitar CORS para todas las rutas
-    Swagger(app, template=swagger_template, config=swagger_config)
+    carga_estricta.init_app(app)
+    instrumentacion.init_app(app)  # Server-Timing, consultas lentas y N+1 por solicitud
+    metricas.init_app(app, db)  # Prometheus en /metrics
+    CORS(app, expose_headers=['X-Siguiente', 'Link', 'X-Cache', 'ETag'])  # Habilitar CORS para todas las rutas (con cursores de paginación y la versión de la cédula)
+    swagger.init_app(app)  # /apispec.json cacheado y Swagger UI si SWAGGER_UI
+
+    # Catálogo en memoria de las tablas de referencia
+    from app.services.notificador import crear_notificador
+    from app.services.catalogo_service import CatalogoService
+    notificador = crear_notificador(app)
+    CatalogoService().init_app(app, notificador)
+
+    # Caché de respuestas pre-serializadas de los listados de referencia
+    from app.services.cache_respuestas import CacheRespuestas
+    CacheRespuestas(app.config['CACHE_RESPUESTAS_MAXIMO']).init_app(app, notificador)
+
+    # Cubo de resultados en memoria (región × categoría × partido)
+    from app.services.cubo_service import CuboService
+    CuboService().init_app(app, notificador)
+
+    # Índice de DNI en memoria (padrón y votos emitidos)
+    from app.services.indice_dni_service import IndiceDniService
+    IndiceDniService().init_app(app, notificador)
 
     # Registrar blueprints del sistema de votación
     from app.controllers import (
         elector_bp, voto_bp, tipo_voto_bp,
         partido_politico_bp, candidato_bp,
-        categoria_bp, voto_categoria_bp,
+        categoria_bp, voto_categoria_bp, resultado_bp, cedula_bp, cache_bp, sistema_bp,
         # Blueprints del módulo de cuestionario
         pregunta_bp, cuestionario_bp
     )
@@ -36,6 +59,10 @@ def create_app(config_name=None):
     app.register_blueprint(candidato_bp)
     app.register_blueprint(categoria_bp)
     app.register_blueprint(voto_categoria_bp)
+    app.register_blueprint(resultado_bp)
+    app.register_blueprint(cedula_bp)
+    app.register_blueprint(cache_bp)
+    app.register_blueprint(sistema_bp)
 
     # Blueprints del módulo de cuestionario (independiente)
     app.register_blueprint(pregunta_bp)
@@ -0,0 +1,182 @@
+"""
+Arranque en producción (wsgi.py y gunicorn.conf.py).
+
+- precalentar(app): en el proceso que carga la aplicación (con gunicorn y
+  preload_app, el maestro): configura los mapeadores del ORM, asegura el
+  catálogo, la cédula, el índice de DNI y el cubo, llena la caché de
+  respuestas de los listados de referencia y abre las conexiones del pool.
+  Así la primera solicitud de cada worker no paga ese costo
+- antes_de_fork(app): cierra las conexiones del maestro (un socket no se
+  comparte entre procesos) y congela el heap con gc.freeze(): el recolector de
+  los workers no recorre los objetos heredados, que siguen compartidos
+  copy-on-write
+- iniciar_worker(app): en cada worker antes de aceptar solicitudes: abre su
+  pool, inicia el hilo LISTEN del notificador (nunca en el maestro) e instala
+  el drenaje de SIGTERM
+
+GET /api/sistema/listo responde 503 hasta que el precalentamiento termina y
+desde que el worker recibe SIGTERM: durante DRENAJE_SEGUNDOS el worker sigue
+atendiendo mientras el balanceador lo retira, y recién entonces se detiene.
+El estado vive en app.extensions['arranque'].
+"""
+import gc
+import logging
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.pool import QueuePool
+
+from app import metricas
+from app.models import db
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EstadoArranque:
+    """Estado de disponibilidad del proceso (app.extensions['arranque'])"""
+    listo: bool = False
+    drenando: bool = False
+    # Proceso que precalentó: si difiere del actual, el worker se creó con fork
+    pid: int = field(default_factory=os.getpid)
+    # Milisegundos de cada paso del precalentamiento
+    tiempos: Dict[str, float] = field(default_factory=dict)
+
+
+def estado_arranque(app) -> Optional[EstadoArranque]:
+    """Estado de `app`, o None si no se precalentó (servidor de desarrollo)"""
+    return app.extensions.get('arranque')
+
+
+def _medir(tiempos: Dict[str, float], paso: str, funcion, *args) -> Any:
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    tiempos[paso] = round((time.perf_counter() - inicio) * 1000, 2)
+    return resultado
+
+
+def _precalentar_servicios(app) -> None:
+    from app.services.catalogo_service import catalogo_service
+    from app.services.cedula_service import cedula_service
+    from app.services.cubo_service import cubo_service
+    from app.services.indice_dni_service import indice_dni_service
+
+    catalogo_service.actual()
+    cedula_service.obtener()
+    # Construyen el índice y el cubo si create_app no pudo (base no disponible)
+    indice_dni_service.consultar('0' * 8)
+    cubo_service.consultar()
+    db.session.remove()
+
+
+def _precalentar_respuestas(app) -> int:
+    """
+    Llena la caché con la respuesta sin parámetros de cada listado @cacheado.
+    La vista se llama directamente: sin hooks de solicitud, el precalentamiento
+    no cuenta en /metrics
+    """
+    llenadas = 0
+    for regla in app.url_map.iter_rules():
+        vista = app.view_functions[regla.endpoint]
+        if regla.arguments or 'GET' not in regla.methods or not hasattr(vista, 'tablas_cacheadas'):
+            continue
+        with app.test_request_context(regla.rule):
+            try:
+                vista()
+                llenadas += 1
+            except Exception:
+                logger.exception('No se pudo precalentar %s', regla.rule)
+    return llenadas
+
+
+def _precalentar_pool() -> int:
+    """Abre las conexiones permanentes del pool (DB_POOL_SIZE) y las devuelve"""
+    abiertas = []
+    try:
+        for engine in db.engines.values():
+            cantidad = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+            for _ in range(cantidad):
+                conexion = engine.connect()
+                conexion.exec_driver_sql('SELECT 1')
+                abiertas.append(conexion)
+    finally:
+        for conexion in abiertas:
+            conexion.close()
+    return len(abiertas)
+
+
+def precalentar(app) -> EstadoArranque:
+    """Deja `app` lista para atender sin costos de primera solicitud y la marca como lista"""
+    estado = app.extensions.setdefault('arranque', EstadoArranque())
+    inicio = time.perf_counter()
+    with app.app_context():
+        _medir(estado.tiempos, 'mapeadores', configure_mappers)
+        _medir(estado.tiempos, 'servicios', _precalentar_servicios, app)
+        respuestas = _medir(estado.tiempos, 'respuestas', _precalentar_respuestas, app)
+        conexiones = _medir(estado.tiempos, 'pool', _precalentar_pool)
+    estado.tiempos['total'] = round((time.perf_counter() - inicio) * 1000, 2)
+    estado.listo = True
+    logger.info('Aplicación precalentada en %.0f ms: %d listados en caché, %d conexiones',
+                estado.tiempos['total'], respuestas, conexiones)
+    return estado
+
+
+def antes_de_fork(app) -> None:
+    """En el maestro, después de precalentar y antes de crear los workers"""
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    # Los objetos de la aplicación pasan a la generación permanente; gc.disable()
+    # en gunicorn.conf.py evitó colecciones (y huecos en el heap) durante la carga
+    gc.freeze()
+    gc.enable()
+    # El maestro no atiende solicitudes: sus gauges (capacidad del pool) no cuentan
+    metricas.proceso_terminado(os.getpid())
+
+
+def instalar_drenaje(app) -> None:
+    """
+    Encadena un manejador de SIGTERM al del servidor: marca el proceso como no
+    listo y difiere la terminación DRENAJE_SEGUNDOS. Llamar desde el hilo
+    principal, después de que el servidor instale sus manejadores.
+    """
+    estado = app.extensions.setdefault('arranque', EstadoArranque(listo=True))
+    anterior = signal.getsignal(signal.SIGTERM)
+    segundos = app.config['DRENAJE_SEGUNDOS']
+    if not callable(anterior):
+        return
+
+    def al_terminar(signum, frame):
+        if estado.drenando:
+            return
+        estado.drenando = True
+        logger.info('SIGTERM en el worker %d: drenando durante %.1f s', os.getpid(), segundos)
+        if segundos > 0:
+            temporizador = threading.Timer(segundos, anterior, (signum, frame))
+            temporizador.daemon = True
+            temporizador.start()
+        else:
+            anterior(signum, frame)
+
+    signal.signal(signal.SIGTERM, al_terminar)
+
+
+def iniciar_worker(app) -> None:
+    """En cada worker, antes de su primera solicitud"""
+    estado = app.extensions.setdefault('arranque', EstadoArranque(listo=True))
+    if estado.pid != os.getpid():
+        # Aplicación heredada del maestro (preload_app): pool propio y precalentado
+        with app.app_context():
+            for engine in db.engines.values():
+                # close=False: no cierra sockets que el maestro pudiera seguir usando
+                engine.dispose(close=False)
+                metricas.proceso_iniciado(engine)
+            _medir(estado.tiempos, 'pool_worker', _precalentar_pool)
+        estado.pid = os.getpid()
+    app.extensions['notificador'].iniciar()
+    instalar_drenaje(app)
@@ -5,6 +5,10 @@ from .partido_politico_controller import partido_politico_bp
 from .candidato_controller import candidato_bp
 from .categoria_controller import categoria_bp
 from .voto_categoria_controller import voto_categoria_bp
+from .resultado_controller import resultado_bp
+from .cedula_controller import cedula_bp
+from .cache_controller import cache_bp
+from .sistema_controller import sistema_bp
 
 # Controladores del módulo de cuestionario
 from .pregunta_controller import pregunta_bp
@@ -0,0 +1,43 @@
+from flask import Blueprint, jsonify
+from app.services.cache_respuestas import cache_respuestas
+
+cache_bp = Blueprint('cache', __name__, url_prefix='/api/cache')
+
+
+@cache_bp.route('/estadisticas', methods=['GET'])
+def get_estadisticas():
+    """
+    Obtiene los contadores de la caché de respuestas de este worker
+    ---
+    tags:
+      - Caché
+    summary: Aciertos, fallos y 304 de los listados cacheados
+    description: |
+      Cubre los listados de categorías, partidos, candidatos, tipos de voto
+      y preguntas. Los contadores son del proceso que atiende la solicitud
+      (cada worker de gunicorn tiene su propia caché).
+    responses:
+      200:
+        description: Estadísticas de la caché
+        schema:
+          type: object
+          properties:
+            aciertos:
+              type: integer
+            fallos:
+              type: integer
+            no_modificados:
+              type: integer
+              description: Respuestas 304 por If-None-Match vigente
+            tasa_aciertos:
+              type: number
+            entradas:
+              type: integer
+            maximo:
+              type: integer
+              description: CACHE_RESPUESTAS_MAXIMO
+            versiones:
+              type: object
+              description: Versión de cada tabla (sube con cada cambio)
+    """
+    return jsonify(cache_respuestas.estadisticas()), 200
@@ -0,0 +1,74 @@
+from functools import wraps
+
+from flask import request, Response, make_response
+from app.negociacion import MIME_MSGPACK, acepta_msgpack, solo_json
+from app.services.serializacion import Serializado
+from app.services.cache_respuestas import cache_respuestas
+
+# Cabeceras de un listado que se guardan junto con su cuerpo
+CABECERAS_CACHEADAS = ('X-Siguiente', 'Link')
+
+
+def respuesta_serializada(serializado: Serializado, cache_control: str) -> Response:
+    """
+    Sirve un cuerpo pre-serializado:
+    - 304 sin cuerpo si If-None-Match coincide con el ETag
+    - MessagePack si el cliente lo prefiere, con su propio ETag (Vary: Accept)
+    - versión gzip (de JSON o MessagePack) si el cliente la acepta (Vary: Accept-Encoding)
+    """
+    msgpack = acepta_msgpack()
+    etag = f'{serializado.etag}-msgpack' if msgpack else serializado.etag
+    if request.if_none_match.contains(etag):
+        respuesta = Response(status=304)
+    else:
+        gzip = 'gzip' in request.accept_encodings
+        if msgpack:
+            cuerpo = serializado.msgpack_comprimido if gzip else serializado.msgpack
+        else:
+            cuerpo = serializado.comprimido if gzip else serializado.cuerpo
+        respuesta = Response(cuerpo, mimetype=MIME_MSGPACK if msgpack else 'application/json')
+        if gzip:
+            respuesta.headers['Content-Encoding'] = 'gzip'
+
+    respuesta.headers.extend(serializado.cabeceras)
+    respuesta.set_etag(etag)
+    respuesta.headers['Cache-Control'] = cache_control
+    respuesta.vary.update(('Accept', 'Accept-Encoding'))
+    return respuesta
+
+
+def cacheado(*tablas: str):
+    """
+    Decorador de vistas GET de listados que dependen de `tablas`: la primera
+    respuesta 200 de cada URL (ruta + query string) se guarda pre-serializada
+    en `cache_respuestas` hasta que alguna de esas tablas cambie. Un acierto
+    no toca la base, y con If-None-Match vigente responde 304 sin cuerpo.
+    Las respuestas de error no se guardan. Se guarda siempre la forma JSON;
+    la variante MessagePack sale del mismo Serializado.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            clave = cache_respuestas.clave((request.endpoint, request.query_string), tablas)
+            serializado = cache_respuestas.obtener(clave)
+            estado = 'HIT'
+            if serializado is None:
+                with solo_json():
+                    respuesta = make_response(vista(*args, **kwargs))
+                if respuesta.status_code != 200 or not respuesta.is_json:
+                    return respuesta
+                serializado = Serializado.desde_bytes(
+                    respuesta.get_data(),
+                    tuple((h, respuesta.headers[h]) for h in CABECERAS_CACHEADAS if h in respuesta.headers)
+                )
+                cache_respuestas.guardar(clave, serializado)
+                estado = 'MISS'
+
+            respuesta = respuesta_serializada(serializado, 'no-cache')
+            if respuesta.status_code == 304:
+                cache_respuestas.registrar_no_modificado()
+            respuesta.headers['X-Cache'] = estado
+            return respuesta
+        envoltura.tablas_cacheadas = tablas  # app.arranque precalienta estas vistas
+        return envoltura
+    return decorador
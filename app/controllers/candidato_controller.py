@@ -1,24 +1,72 @@
 from flask import Blueprint, request, jsonify
 from app.services import CandidatoService
-from app.models import PartidoPolitico, Categoria
+from app.services.catalogo_service import catalogo_service, como_id
 from sqlalchemy.exc import IntegrityError
+from app.controllers.paginacion import respuesta_listado
+from app.controllers.cache_http import cacheado
 
 candidato_bp = Blueprint('candidato', __name__, url_prefix='/api/candidatos')
 candidato_service = CandidatoService()
 
 @candidato_bp.route('/', methods=['GET'])
+@cacheado('candidato')
 def get_all_candidatos():
     """
     Obtiene todos los candidatos
     ---
     tags:
       - Candidatos
+    parameters:
+      - name: after
+        in: query
+        type: integer
+        required: false
+        description: Cursor devuelto en X-Siguiente (clave del último registro de la página anterior)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Tamaño de página (LISTADO_LIMITE por defecto, máximo LISTADO_LIMITE_MAXIMO)
+      - name: campos
+        in: query
+        type: string
+        required: false
+        description: Columnas a incluir separadas por coma (la clave primaria siempre se incluye)
+      - name: forma
+        in: query
+        type: string
+        enum: [objetos, filas]
+        default: objetos
+        required: false
+        description: objetos (lista de objetos) o filas ({"columnas", "filas"}, sin un objeto por fila)
+      - name: id_categoria
+        in: query
+        type: integer
+        required: false
+      - name: id_partido
+        in: query
+        type: integer
+        required: false
     responses:
       200:
         description: Lista de candidatos
+        headers:
+          X-Siguiente:
+            type: string
+            description: Cursor de la página siguiente (ausente en la última página)
+          ETag:
+            type: string
+            description: Versión del contenido
+          X-Cache:
+            type: string
+            description: HIT si la respuesta salió de la caché de respuestas, MISS si no
+      304:
+        description: La versión del cliente (If-None-Match) sigue vigente
     """
-    candidatos = candidato_service.get_all()
-    return jsonify(candidatos), 200
+    try:
+        return respuesta_listado(candidato_service)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @candidato_bp.route('/<int:id_candidato>', methods=['GET'])
 def get_candidato_by_id(id_candidato):
@@ -96,26 +144,30 @@ def create_candidato():
         if not data.get('id_categoria'):
             return jsonify({'error': 'El campo id_categoria es requerido'}), 400
 
-        # Validar que el partido exista
-        partido = PartidoPolitico.query.get(data['id_partido'])
+        # IDs enteros ("1" también): el catálogo se indexa por int
+        for campo in ('id_partido', 'id_categoria'):
+            data[campo] = como_id(data[campo])
+            if data[campo] is None:
+                return jsonify({'error': f'El campo {campo} debe ser un entero'}), 400
+
+        # Validar que el partido exista (catálogo en memoria)
+        partido = catalogo_service.resolver('partidos', data['id_partido'])
         if not partido:
             return jsonify({
                 'error': f'El partido con ID {data["id_partido"]} no existe',
-                'partidos_disponibles': [{'id': p.id_partido, 'nombre': p.nombre_partido}
-                                        for p in PartidoPolitico.query.all()]
+                'partidos_disponibles': catalogo_service.actual().partidos_disponibles()
             }), 404
 
         # Validar que la categoría exista
-        categoria = Categoria.query.get(data['id_categoria'])
+        categoria = catalogo_service.resolver('categorias', data['id_categoria'])
         if not categoria:
             return jsonify({
                 'error': f'La categoría con ID {data["id_categoria"]} no existe',
-                'categorias_disponibles': [{'id': c.id_categoria, 'nombre': c.nombre_categoria}
-                                          for c in Categoria.query.all()]
+                'categorias_disponibles': catalogo_service.actual().categorias_disponibles()
             }), 404
 
         # Validar que Presidente y Vicepresidente no tengan numero_candidato
-        if categoria.nombre_categoria in ['Presidente', 'Vicepresidente']:
+        if categoria['nombre_categoria'] in ['Presidente', 'Vicepresidente']:
             data['numero_candidato'] = None
 
         candidato = candidato_service.create(data)
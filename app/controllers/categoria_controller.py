@@ -1,22 +1,62 @@
 from flask import Blueprint, request, jsonify
 from app.services import CategoriaService
+from app.controllers.paginacion import respuesta_listado
+from app.controllers.cache_http import cacheado
 
 categoria_bp = Blueprint('categoria', __name__, url_prefix='/api/categorias')
 categoria_service = CategoriaService()
 
 @categoria_bp.route('/', methods=['GET'])
+@cacheado('categoria')
 def get_all_categorias():
     """
     Obtiene todas las categorías
     ---
     tags:
       - Categorías
+    parameters:
+      - name: after
+        in: query
+        type: integer
+        required: false
+        description: Cursor devuelto en X-Siguiente (clave del último registro de la página anterior)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Tamaño de página (LISTADO_LIMITE por defecto, máximo LISTADO_LIMITE_MAXIMO)
+      - name: campos
+        in: query
+        type: string
+        required: false
+        description: Columnas a incluir separadas por coma (la clave primaria siempre se incluye)
+      - name: forma
+        in: query
+        type: string
+        enum: [objetos, filas]
+        default: objetos
+        required: false
+        description: objetos (lista de objetos) o filas ({"columnas", "filas"}, sin un objeto por fila)
     responses:
       200:
         description: Lista de categorías
+        headers:
+          X-Siguiente:
+            type: string
+            description: Cursor de la página siguiente (ausente en la última página)
+          ETag:
+            type: string
+            description: Versión del contenido
+          X-Cache:
+            type: string
+            description: HIT si la respuesta salió de la caché de respuestas, MISS si no
+      304:
+        description: La versión del cliente (If-None-Match) sigue vigente
     """
-    categorias = categoria_service.get_all()
-    return jsonify(categorias), 200
+    try:
+        return respuesta_listado(categoria_service)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @categoria_bp.route('/<int:id_categoria>', methods=['GET'])
 def get_categoria_by_id(id_categoria):
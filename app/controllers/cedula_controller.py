@@ -0,0 +1,75 @@
+from flask import Blueprint, request, current_app
+from app.services.cedula_service import cedula_service
+from app.controllers.cache_http import respuesta_serializada
+
+cedula_bp = Blueprint('cedula', __name__, url_prefix='/api/cedula')
+
+
+@cedula_bp.route('/bundle', methods=['GET'])
+def get_bundle():
+    """
+    Obtiene la definición completa de la cédula en una sola respuesta
+    ---
+    tags:
+      - Cédula
+    summary: Categorías, partidos y candidatos agrupados
+    description: |
+      Reemplaza las llamadas sucesivas a categorías, candidatos y partidos
+      al cargar la cédula. El documento se serializa una vez por versión del
+      catálogo y se envía comprimido (gzip) si el cliente lo acepta.
+
+      Caché HTTP: la URL sin versión se revalida siempre (ETag, 304 sin
+      cuerpo). Con `?v=<ETag vigente>` la respuesta es inmutable y se guarda
+      por CEDULA_MAX_AGE segundos. Los candidatos no tienen región, así que
+      la cédula es la misma para todas las regiones.
+    parameters:
+      - name: v
+        in: query
+        type: string
+        required: false
+        description: ETag de la versión (sin comillas) para caché de larga duración
+    responses:
+      200:
+        description: Cédula
+        headers:
+          ETag:
+            type: string
+            description: Versión del contenido
+        schema:
+          type: object
+          properties:
+            categorias:
+              type: array
+              items:
+                type: object
+                properties:
+                  categoria:
+                    type: object
+                  partidos:
+                    type: array
+                    items:
+                      type: object
+                      properties:
+                        partido:
+                          type: object
+                        candidatos:
+                          type: array
+                          items:
+                            type: object
+            partidos:
+              type: array
+              items:
+                type: object
+            tipos_voto:
+              type: array
+              items:
+                type: object
+      304:
+        description: La versión del cliente (If-None-Match) sigue vigente
+    """
+    cedula = cedula_service.obtener()
+    if request.args.get('v') == cedula.etag:
+        cache_control = f'public, max-age={current_app.config["CEDULA_MAX_AGE"]}, immutable'
+    else:
+        cache_control = 'no-cache'
+    return respuesta_serializada(cedula, cache_control)
@@ -1,5 +1,7 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, jsonify
 from app.services.cuestionario_service import cuestionario_service
+from app.controllers.paginacion import respuesta_listado
+from app.negociacion import cuerpo_solicitud
 
 cuestionario_bp = Blueprint('cuestionario', __name__, url_prefix='/api/cuestionarios')
 
@@ -16,9 +18,36 @@ def get_all_cuestionarios():
       Retorna los cuestionarios registrados.
       Solo incluye ID y fecha, sin datos personales ni respuestas.
       Utilidad: estadísticas de participación.
+    parameters:
+      - name: after
+        in: query
+        type: integer
+        required: false
+        description: Cursor devuelto en X-Siguiente (clave del último registro de la página anterior)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Tamaño de página (LISTADO_LIMITE por defecto, máximo LISTADO_LIMITE_MAXIMO)
+      - name: campos
+        in: query
+        type: string
+        required: false
+        description: Columnas a incluir separadas por coma (la clave primaria siempre se incluye)
+      - name: forma
+        in: query
+        type: string
+        enum: [objetos, filas]
+        default: objetos
+        required: false
+        description: objetos (lista de objetos) o filas ({"columnas", "filas"}, sin un objeto por fila)
     responses:
       200:
         description: Lista de cuestionarios
+        headers:
+          X-Siguiente:
+            type: string
+            description: Cursor de la página siguiente (ausente en la última página)
         schema:
           type: array
           items:
@@ -32,8 +61,10 @@ def get_all_cuestionarios():
                 format: date-time
                 description: Fecha de registro
     """
-    cuestionarios = cuestionario_service.get_all()
-    return jsonify(cuestionarios), 200
+    try:
+        return respuesta_listado(cuestionario_service)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 
 @cuestionario_bp.route('/estadisticas', methods=['GET'])
@@ -121,6 +152,14 @@ def create_cuestionario():
       - No se almacena DNI, IP ni datos identificables
       - Completamente independiente del voto emitido
       - No se proporciona feedback sobre respuestas correctas
+
+      Acepta el cuerpo en JSON o en MessagePack (Content-Type: application/msgpack).
+    consumes:
+      - application/json
+      - application/msgpack
+    produces:
+      - application/json
+      - application/msgpack
     parameters:
       - name: body
         in: body
@@ -187,7 +226,7 @@ def create_cuestionario():
               description: Descripción del error
     """
     try:
-        data = request.get_json()
+        data = cuerpo_solicitud()
         if not data:
             return jsonify({'error': 'Datos requeridos'}), 400
 
@@ -1,5 +1,9 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, url_for
 from app.services import ElectorService
+from app.services.indice_dni_service import indice_dni_service
+from app.services.notificador import notificador
+from app.services.padron_service import padron_service
+from app.controllers.paginacion import respuesta_listado
 
 elector_bp = Blueprint('elector', __name__, url_prefix='/api/electores')
 elector_service = ElectorService()
@@ -11,12 +15,50 @@ def get_all_electores():
     ---
     tags:
       - Electores
+    parameters:
+      - name: after
+        in: query
+        type: string
+        required: false
+        description: Cursor devuelto en X-Siguiente (clave del último registro de la página anterior)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Tamaño de página (LISTADO_LIMITE por defecto, máximo LISTADO_LIMITE_MAXIMO)
+      - name: campos
+        in: query
+        type: string
+        required: false
+        description: Columnas a incluir separadas por coma (la clave primaria siempre se incluye)
+      - name: forma
+        in: query
+        type: string
+        enum: [objetos, filas]
+        default: objetos
+        required: false
+        description: objetos (lista de objetos) o filas ({"columnas", "filas"}, sin un objeto por fila)
+      - name: region
+        in: query
+        type: string
+        required: false
+      - name: distrito
+        in: query
+        type: string
+        required: false
+        description: Requiere region (índice region, distrito, dni)
     responses:
       200:
         description: Lista de electores
+        headers:
+          X-Siguiente:
+            type: string
+            description: Cursor de la página siguiente (ausente en la última página)
     """
-    electores = elector_service.get_all()
-    return jsonify(electores), 200
+    try:
+        return respuesta_listado(elector_service)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @elector_bp.route('/<string:dni>', methods=['GET'])
 def get_elector_by_dni(dni):
@@ -41,6 +83,129 @@ def get_elector_by_dni(dni):
         return jsonify({'error': 'Elector no encontrado'}), 404
     return jsonify(elector), 200
 
+@elector_bp.route('/indice', methods=['GET'])
+def get_indice():
+    """
+    Tamaño del índice de DNI en memoria de este worker
+    ---
+    tags:
+      - Electores
+    responses:
+      200:
+        description: Electores indexados, votos marcados y bytes del arreglo y del mapa de bits
+    """
+    return jsonify(indice_dni_service.memoria()), 200
+
+@elector_bp.route('/indice/reconstruir', methods=['POST'])
+def reconstruir_indice():
+    """
+    Reconstruye el índice de DNI de este worker desde ELECTOR y VOTO (uso administrativo)
+    ---
+    description: Los demás workers releen ELECTOR en segundo plano (aviso por el notificador).
+    tags:
+      - Electores
+    responses:
+      200:
+        description: Índice reconstruido
+      409:
+        description: El índice está desactivado (INDICE_DNI=false)
+    """
+    if not current_app.config['INDICE_DNI']:
+        return jsonify({'error': 'El índice de DNI está desactivado (INDICE_DNI=false)'}), 409
+    memoria = indice_dni_service.reconstruir()
+    notificador.publicar('elector')
+    return jsonify(memoria), 200
+
+@elector_bp.route('/importar', methods=['POST'])
+def importar_padron():
+    """
+    Importa el padrón en bloque desde un archivo CSV o de ancho fijo (uso administrativo)
+    ---
+    tags:
+      - Electores
+    summary: Carga masiva del padrón (upsert por DNI)
+    description: |
+      El archivo (campo multipart `archivo` o el cuerpo completo, UTF-8) se
+      lee en flujo. Cada fila se valida (DNI de 8 dígitos, campos obligatorios
+      y largo, DNI repetido en el archivo) y las válidas se fusionan en
+      ELECTOR por bloques de PADRON_BLOQUE filas: inserta los DNIs nuevos y
+      actualiza los existentes.
+
+      CSV: encabezado con las columnas dni, nombres, apellidos, distrito y
+      region (separador `,` o `;`). Ancho fijo: sin encabezado, 8, 40, 40, 40
+      y 30 caracteres por columna en ese orden.
+
+      La solicitud valida formato y encabezado, registra la importación y
+      responde 202; la carga sigue en segundo plano en el worker. El avance
+      se consulta en GET /api/electores/importaciones/<id> (cabecera
+      Location). Si la carga falla o el worker se detiene (la importación
+      queda en_curso sin avance durante PADRON_ABANDONO segundos), se
+      reanuda enviando el mismo archivo con `reanudar=<id>`.
+    consumes:
+      - multipart/form-data
+      - text/csv
+      - text/plain
+    parameters:
+      - name: formato
+        in: query
+        type: string
+        enum: [csv, fijo]
+        default: csv
+      - name: reanudar
+        in: query
+        type: integer
+        required: false
+        description: Id de una importación fallida o abandonada del mismo archivo
+      - name: archivo
+        in: formData
+        type: file
+        required: false
+    responses:
+      202:
+        description: Importación registrada (en_curso); la carga continúa en segundo plano
+        headers:
+          Location:
+            type: string
+            description: URL del avance de la importación
+      400:
+        description: Formato, encabezado o importación a reanudar inválidos
+    """
+    formato = request.args.get('formato', 'csv')
+    reanudar = request.args.get('reanudar', type=int)
+    archivo = request.files.get('archivo')
+    flujo = archivo.stream if archivo else request.stream
+    origen = archivo.filename if archivo and archivo.filename else 'solicitud'
+
+    try:
+        importacion = padron_service.iniciar_en_segundo_plano(flujo, formato, origen, reanudar=reanudar)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    ubicacion = url_for('elector.get_importacion', id_importacion=importacion['id_importacion'])
+    return jsonify(importacion), 202, {'Location': ubicacion}
+
+@elector_bp.route('/importaciones/<int:id_importacion>', methods=['GET'])
+def get_importacion(id_importacion):
+    """
+    Avance de una importación del padrón
+    ---
+    tags:
+      - Electores
+    parameters:
+      - name: id_importacion
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: Estado (en_curso, completada, fallida), filas leídas, válidas, inválidas y duplicadas y último avance (fecha_actualizacion)
+      404:
+        description: Importación no encontrada
+    """
+    importacion = padron_service.obtener(id_importacion)
+    if not importacion:
+        return jsonify({'error': 'Importación no encontrada'}), 404
+    return jsonify(importacion), 200
+
 @elector_bp.route('/verificar/<string:dni>', methods=['GET'])
 def verificar_dni(dni):
     """
@@ -76,6 +241,85 @@ def verificar_dni(dni):
     resultado = elector_service.verificar_estado_voto(dni)
     return jsonify(resultado), 200
 
+@elector_bp.route('/verificar-lote', methods=['POST'])
+def verificar_lote():
+    """
+    Verifica una lista de DNIs en una sola consulta (operadores de mesa)
+    ---
+    tags:
+      - Electores
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required:
+            - dnis
+          properties:
+            dnis:
+              type: array
+              items:
+                type: string
+              example: ["12345678", "87654321"]
+    responses:
+      200:
+        description: Estado por DNI, en el orden recibido
+        schema:
+          type: object
+          properties:
+            total:
+              type: integer
+            resumen:
+              type: object
+              description: Cantidad de DNIs no_registrado, puede_votar y ya_voto
+            resultados:
+              type: array
+              items:
+                type: object
+                properties:
+                  dni:
+                    type: string
+                  exists:
+                    type: boolean
+                  has_voted:
+                    type: boolean
+                  id_voto:
+                    type: integer
+                  fecha:
+                    type: string
+                    description: Fecha del voto (ISO 8601) o null
+      400:
+        description: Lista vacía, con elementos que no son DNI o demasiado grande
+    """
+    data = request.get_json(silent=True)
+    dnis = data.get('dnis') if isinstance(data, dict) else None
+
+    if not isinstance(dnis, list) or not dnis:
+        return jsonify({'error': 'El campo dnis debe ser una lista no vacía'}), 400
+    if not all(isinstance(dni, (str, int)) and not isinstance(dni, bool) for dni in dnis):
+        return jsonify({'error': 'Cada DNI debe ser un texto o un número'}), 400
+
+    maximo = current_app.config['VERIFICAR_LOTE_MAXIMO']
+    if len(dnis) > maximo:
+        return jsonify({'error': f'El lote no puede superar {maximo} DNIs'}), 400
+
+    resultados = elector_service.verificar_lote([str(dni) for dni in dnis])
+    resumen = {'no_registrado': 0, 'puede_votar': 0, 'ya_voto': 0}
+    for resultado in resultados:
+        if not resultado['exists']:
+            resumen['no_registrado'] += 1
+        elif resultado['has_voted']:
+            resumen['ya_voto'] += 1
+        else:
+            resumen['puede_votar'] += 1
+
+    return jsonify({
+        'total': len(resultados),
+        'resumen': resumen,
+        'resultados': resultados
+    }), 200
+
 @elector_bp.route('/', methods=['POST'])
 def create_elector():
     """
@@ -0,0 +1,61 @@
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlencode
+from flask import request, jsonify
+
+# Parámetros reservados de los listados; el resto de la query string son filtros
+PARAMETROS = ('after', 'limit', 'campos', 'forma')
+
+# Formas del cuerpo de un listado (?forma=; ?formato= es el de las exportaciones)
+FORMAS_LISTADO = ('objetos', 'filas')
+
+
+def parametros_listado() -> Dict[str, Any]:
+    """
+    Lee de la URL los parámetros de BaseService.listar_filas:
+    ?after=<clave>&limit=<n>&campos=a,b&<columna>=<valor>
+    """
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError(f'limit debe ser un entero: {limit}')
+    campos = request.args.get('campos')
+    return {
+        'after': request.args.get('after'),
+        'limit': limit,
+        'filtros': {nombre: valor for nombre, valor in request.args.items() if nombre not in PARAMETROS},
+        'campos': [campo.strip() for campo in campos.split(',') if campo.strip()] if campos else None
+    }
+
+
+def respuesta_paginada(registros: Union[List[Dict[str, Any]], Dict[str, Any]], siguiente: Optional[Any]):
+    """
+    Responde la página como lista JSON (formato de siempre). El cursor de la
+    página siguiente va en X-Siguiente y en Link (rel="next"); si falta, es la última.
+    """
+    respuesta = jsonify(registros)
+    if siguiente is not None:
+        argumentos = [(nombre, valor) for nombre, valor in request.args.items(multi=True) if nombre != 'after']
+        argumentos.append(('after', siguiente))
+        respuesta.headers['X-Siguiente'] = str(siguiente)
+        respuesta.headers['Link'] = f'<{request.base_url}?{urlencode(argumentos)}>; rel="next"'
+    return respuesta, 200
+
+
+def respuesta_listado(servicio):
+    """
+    Página de `servicio` (BaseService.listar_filas: tuplas de Core, sin ORM)
+    codificada sin pasar por to_dict. Con ?forma=:
+    - objetos (por defecto): lista de objetos JSON, el formato de siempre
+    - filas: {"columnas": [...], "filas": [[...], ...]}, sin un diccionario
+      por fila (orjson codifica las tuplas directamente; cuerpo más chico)
+    :raises ValueError: Parámetros inválidos
+    """
+    forma = request.args.get('forma', 'objetos')
+    if forma not in FORMAS_LISTADO:
+        raise ValueError(f'forma debe ser una de: {", ".join(FORMAS_LISTADO)}')
+    columnas, filas, siguiente = servicio.listar_filas(**parametros_listado())
+    if forma == 'filas':
+        return respuesta_paginada({'columnas': columnas, 'filas': filas}, siguiente)
+    return respuesta_paginada([dict(zip(columnas, fila)) for fila in filas], siguiente)
@@ -1,22 +1,62 @@
 from flask import Blueprint, request, jsonify
 from app.services import PartidoPoliticoService
+from app.controllers.paginacion import respuesta_listado
+from app.controllers.cache_http import cacheado
 
 partido_politico_bp = Blueprint('partido_politico', __name__, url_prefix='/api/partidos')
 partido_politico_service = PartidoPoliticoService()
 
 @partido_politico_bp.route('/', methods=['GET'])
+@cacheado('partido_politico')
 def get_all_partidos():
     """
     Obtiene todos los partidos políticos
     ---
     tags:
       - Partidos Políticos
+    parameters:
+      - name: after
+        in: query
+        type: integer
+        required: false
+        description: Cursor devuelto en X-Siguiente (clave del último registro de la página anterior)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Tamaño de página (LISTADO_LIMITE por defecto, máximo LISTADO_LIMITE_MAXIMO)
+      - name: campos
+        in: query
+        type: string
+        required: false
+        description: Columnas a incluir separadas por coma (la clave primaria siempre se incluye)
+      - name: forma
+        in: query
+        type: string
+        enum: [objetos, filas]
+        default: objetos
+        required: false
+        description: objetos (lista de objetos) o filas ({"columnas", "filas"}, sin un objeto por fila)
     responses:
       200:
         description: Lista de partidos políticos
+        headers:
+          X-Siguiente:
+            type: string
+            description: Cursor de la página siguiente (ausente en la última página)
+          ETag:
+            type: string
+            description: Versión del contenido
+          X-Cache:
+            type: string
+            description: HIT si la respuesta salió de la caché de respuestas, MISS si no
+      304:
+        description: La versión del cliente (If-None-Match) sigue vigente
     """
-    partidos = partido_politico_service.get_all()
-    return jsonify(partidos), 200
+    try:
+        return respuesta_listado(partido_politico_service)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @partido_politico_bp.route('/<int:id_partido>', methods=['GET'])
 def get_partido_by_id(id_partido):
@@ -1,10 +1,13 @@
 from flask import Blueprint, request, jsonify
 from app.services.pregunta_service import pregunta_service
+from app.controllers.paginacion import parametros_listado, respuesta_paginada
+from app.controllers.cache_http import cacheado
 
 pregunta_bp = Blueprint('pregunta', __name__, url_prefix='/api/preguntas')
 
 
 @pregunta_bp.route('/', methods=['GET'])
+@cacheado('pregunta', 'opcion')
 def get_all_preguntas():
     """
     Obtiene todas las preguntas con sus opciones
@@ -16,9 +19,30 @@ def get_all_preguntas():
       Retorna todas las preguntas disponibles con sus opciones de respuesta.
       IMPORTANTE: No se expone el campo 'es_correcta' por razones éticas.
       El cuestionario es solo para fines estadísticos.
+    parameters:
+      - name: after
+        in: query
+        type: integer
+        required: false
+        description: Cursor devuelto en X-Siguiente (clave del último registro de la página anterior)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Tamaño de página (LISTADO_LIMITE por defecto, máximo LISTADO_LIMITE_MAXIMO)
     responses:
       200:
         description: Lista de preguntas con opciones
+        headers:
+          X-Siguiente:
+            type: string
+            description: Cursor de la página siguiente (ausente en la última página)
+          ETag:
+            type: string
+            description: Versión del contenido
+          X-Cache:
+            type: string
+            description: HIT si la respuesta salió de la caché de respuestas, MISS si no
         schema:
           type: array
           items:
@@ -55,9 +79,14 @@ def get_all_preguntas():
                 - id_opcion: 2
                   id_pregunta: 1
                   texto: "5 años"
+      304:
+        description: La versión del cliente (If-None-Match) sigue vigente
     """
-    preguntas = pregunta_service.get_all_con_opciones()
-    return jsonify(preguntas), 200
+    try:
+        preguntas, siguiente = pregunta_service.listar_con_opciones(**parametros_listado())
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return respuesta_paginada(preguntas, siguiente)
 
 
 @pregunta_bp.route('/<int:pregunta_id>', methods=['GET'])
@@ -0,0 +1,361 @@
+from flask import Blueprint, request, jsonify
+from app.services.resultado_service import resultado_service
+from app.services.preferencial_service import preferencial_service
+from app.services.escanos_service import escanos_service, CalculoEscanosError
+from app.services.catalogo_service import catalogo_service
+from app.services.cubo_service import cubo_service, EJES
+from app.services.notificador import notificador
+
+resultado_bp = Blueprint('resultado', __name__, url_prefix='/api/resultados')
+
+
+@resultado_bp.route('/', methods=['GET'])
+def get_resultados():
+    """
+    Obtiene los resultados en vivo de todas las categorías
+    ---
+    tags:
+      - Resultados
+    summary: Resultados por categoría, partido y tipo de voto
+    description: |
+      Los conteos se mantienen en tablas de conteo actualizadas en la misma
+      transacción que cada voto; la lectura no recorre VOTO_CATEGORIA.
+    responses:
+      200:
+        description: Resultados
+        schema:
+          type: object
+          properties:
+            total_votos:
+              type: integer
+            por_tipo_voto:
+              type: array
+              items:
+                type: object
+                properties:
+                  id_tipo_voto:
+                    type: integer
+                  nombre_tipo:
+                    type: string
+                  votos:
+                    type: integer
+            categorias:
+              type: array
+              items:
+                type: object
+                properties:
+                  id_categoria:
+                    type: integer
+                  nombre_categoria:
+                    type: string
+                  partidos:
+                    type: array
+                    items:
+                      type: object
+                  en_blanco:
+                    type: integer
+                  total:
+                    type: integer
+    """
+    return jsonify(resultado_service.obtener_resultados()), 200
+
+
+@resultado_bp.route('/categoria/<int:id_categoria>', methods=['GET'])
+def get_resultados_categoria(id_categoria):
+    """
+    Obtiene los resultados en vivo de una categoría
+    ---
+    tags:
+      - Resultados
+    parameters:
+      - name: id_categoria
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: Resultados de la categoría
+      404:
+        description: Categoría no encontrada
+    """
+    if not catalogo_service.resolver('categorias', id_categoria):
+        return jsonify({'error': 'Categoría no encontrada'}), 404
+    return jsonify(resultado_service.obtener_resultados(id_categoria)), 200
+
+
+@resultado_bp.route('/preferenciales/<int:id_categoria>', methods=['GET'])
+def get_preferenciales(id_categoria):
+    """
+    Obtiene el conteo de votos preferenciales de una categoría
+    ---
+    tags:
+      - Resultados
+    summary: Ranking preferencial por partido
+    description: |
+      Candidatos ordenados por votos preferenciales dentro de cada partido.
+      Solo aplica a categorías con candidatos numerados (Diputado, Senador,
+      Parlamento Andino).
+    parameters:
+      - name: id_categoria
+        in: path
+        type: integer
+        required: true
+      - name: top
+        in: query
+        type: integer
+        required: false
+        description: Cantidad máxima de candidatos por partido
+    responses:
+      200:
+        description: Ranking preferencial
+      400:
+        description: La categoría no tiene voto preferencial
+      404:
+        description: Categoría no encontrada
+    """
+    if not catalogo_service.resolver('categorias', id_categoria):
+        return jsonify({'error': 'Categoría no encontrada'}), 404
+    if id_categoria not in preferencial_service.categorias_preferenciales():
+        return jsonify({'error': 'La categoría no tiene voto preferencial'}), 400
+
+    top = request.args.get('top', type=int)
+    return jsonify(preferencial_service.obtener_top(id_categoria, top)), 200
+
+
+@resultado_bp.route('/escanos/<int:id_categoria>', methods=['GET'])
+def get_escanos(id_categoria):
+    """
+    Obtiene la asignación de escaños proyectada de una categoría
+    ---
+    tags:
+      - Resultados
+    summary: Cifra repartidora (D'Hondt) por distrito
+    description: |
+      Aplica el umbral electoral nacional, reparte los escaños de cada región
+      con la serie de divisores D'Hondt y ordena a los electos de cada partido
+      por voto preferencial. Mientras se recalcula una versión nueva se
+      responde con la anterior (campo actualizando=true).
+    parameters:
+      - name: id_categoria
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: Asignación de escaños
+      400:
+        description: La categoría no reparte escaños por distrito
+      404:
+        description: Categoría no encontrada
+      503:
+        description: El primer cálculo no terminó en ESCANOS_TIMEOUT o falló; reintentar
+    """
+    if not catalogo_service.resolver('categorias', id_categoria):
+        return jsonify({'error': 'Categoría no encontrada'}), 404
+    if id_categoria not in escanos_service.categorias_con_escanos():
+        return jsonify({'error': 'La categoría no reparte escaños por distrito'}), 400
+
+    try:
+        return jsonify(escanos_service.obtener(id_categoria)), 200
+    except CalculoEscanosError as e:
+        return jsonify({'error': str(e)}), 503
+
+
+@resultado_bp.route('/regiones', methods=['GET'])
+def get_resultados_regiones():
+    """
+    Obtiene los resultados de todas las regiones en una sola respuesta
+    ---
+    tags:
+      - Resultados
+    summary: Resultados por región (tablero nacional)
+    description: |
+      Se leen de la tabla de conteo por región con una sola consulta
+      agrupada, sin recorrer VOTO ni ELECTOR. Pensado para tableros que
+      refrescan todas las regiones a la vez.
+    parameters:
+      - name: region
+        in: query
+        type: array
+        items:
+          type: string
+        collectionFormat: multi
+        required: false
+        description: Regiones a incluir (todas las que tengan votos si se omite)
+    responses:
+      200:
+        description: Lista de resultados por región
+    """
+    regiones = request.args.getlist('region') or None
+    return jsonify(resultado_service.obtener_resultados_regiones(regiones)), 200
+
+
+@resultado_bp.route('/region/<region>', methods=['GET'])
+def get_resultados_region(region):
+    """
+    Obtiene los resultados de una región
+    ---
+    tags:
+      - Resultados
+    parameters:
+      - name: region
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Resultados por categoría y partido de la región
+    """
+    return jsonify(resultado_service.obtener_resultados_region(region)), 200
+
+
+@resultado_bp.route('/region/<region>/distritos', methods=['GET'])
+def get_distritos_region(region):
+    """
+    Lista los distritos con votos de una región
+    ---
+    tags:
+      - Resultados
+    parameters:
+      - name: region
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Distritos y votos por categoría
+    """
+    return jsonify(resultado_service.obtener_distritos(region)), 200
+
+
+@resultado_bp.route('/region/<region>/distrito/<distrito>', methods=['GET'])
+def get_resultados_distrito(region, distrito):
+    """
+    Obtiene los resultados de un distrito
+    ---
+    tags:
+      - Resultados
+    parameters:
+      - name: region
+        in: path
+        type: string
+        required: true
+      - name: distrito
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Resultados por categoría y partido del distrito
+    """
+    return jsonify(resultado_service.obtener_resultados_distrito(region, distrito)), 200
+
+
+@resultado_bp.route('/cubo', methods=['GET'])
+def get_cubo():
+    """
+    Consulta el cubo de resultados en memoria
+    ---
+    tags:
+      - Resultados
+    summary: Cortes del cubo región × categoría × partido
+    description: |
+      Reducciones de NumPy sobre un arreglo en memoria del worker, sin SQL.
+      Ejemplos - total nacional por categoría y partido
+      (`por=categoria,partido`), una región (`region=Lima&por=categoria,partido`),
+      un partido en todas las regiones (`partido=3&por=region`). El partido 0
+      es el voto en blanco de la categoría.
+    parameters:
+      - name: region
+        in: query
+        type: array
+        items:
+          type: string
+        collectionFormat: multi
+        required: false
+      - name: categoria
+        in: query
+        type: array
+        items:
+          type: integer
+        collectionFormat: multi
+        required: false
+      - name: partido
+        in: query
+        type: array
+        items:
+          type: integer
+        collectionFormat: multi
+        required: false
+      - name: por
+        in: query
+        type: string
+        required: false
+        description: Ejes a conservar separados por coma (region, categoria, partido); el resto se suma
+    responses:
+      200:
+        description: Corte del cubo
+        schema:
+          type: object
+          properties:
+            por:
+              type: array
+              items:
+                type: string
+            valores:
+              description: Entero o diccionarios anidados según `por`
+      400:
+        description: Eje inválido
+    """
+    por = [eje for eje in request.args.get('por', '').split(',') if eje]
+    invalidos = [eje for eje in por if eje not in EJES]
+    if invalidos:
+        return jsonify({'error': f'Ejes inválidos: {invalidos}', 'ejes_disponibles': list(EJES)}), 400
+
+    return jsonify(cubo_service.consultar(
+        regiones=request.args.getlist('region') or None,
+        categorias=request.args.getlist('categoria', type=int) or None,
+        partidos=request.args.getlist('partido', type=int) or None,
+        por=por
+    )), 200
+
+
+@resultado_bp.route('/cubo/memoria', methods=['GET'])
+def get_cubo_memoria():
+    """
+    Huella en memoria del cubo de resultados de este worker
+    ---
+    tags:
+      - Resultados
+    responses:
+      200:
+        description: Forma, bytes del arreglo y de los índices, total de votos por categoría
+    """
+    return jsonify(cubo_service.memoria()), 200
+
+
+@resultado_bp.route('/reconstruir', methods=['POST'])
+def reconstruir_resultados():
+    """
+    Recalcula los conteos desde los votos registrados (uso administrativo)
+    ---
+    tags:
+      - Resultados
+    summary: Reconstruir conteos
+    description: |
+      Necesario tras una carga masiva directa en la base o al activar los
+      conteos sobre una base que ya tenía votos. Los demás workers
+      reconstruyen su cubo en la próxima consulta (aviso por el notificador).
+    responses:
+      200:
+        description: Conteos reconstruidos
+      400:
+        description: Error al reconstruir
+    """
+    try:
+        resultado = resultado_service.reconstruir()
+        cubo_service.reconstruir()
+        notificador.publicar('conteo')
+        return jsonify(resultado), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
@@ -0,0 +1,148 @@
+import os
+
+from flask import Blueprint, current_app, jsonify
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db
+from app.arranque import estado_arranque
+from app.metricas import estadisticas_pool
+
+sistema_bp = Blueprint('sistema', __name__, url_prefix='/api/sistema')
+
+
+@sistema_bp.route('/pool', methods=['GET'])
+def get_pool():
+    """
+    Estado del pool de conexiones de este worker (uso administrativo)
+    ---
+    tags:
+      - Sistema
+    summary: Conexiones en uso, desborde, saturación y espera por checkout
+    description: |
+      Los valores son del proceso que atiende la solicitud (cada worker de
+      gunicorn tiene su propio pool); /metrics los suma entre workers. Con
+      DB_PGBOUNCER el pool es NullPool y solo se informa la espera.
+    responses:
+      200:
+        description: Estadísticas del pool
+        schema:
+          type: object
+          properties:
+            clase:
+              type: string
+              example: QueuePool
+            tamano:
+              type: integer
+              description: DB_POOL_SIZE
+            desborde_maximo:
+              type: integer
+              description: DB_MAX_OVERFLOW
+            timeout:
+              type: number
+              description: DB_POOL_TIMEOUT (segundos)
+            en_uso:
+              type: integer
+            disponibles:
+              type: integer
+            desborde:
+              type: integer
+              description: Conexiones abiertas por encima de DB_POOL_SIZE
+            saturacion:
+              type: number
+              description: en_uso / (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+            espera:
+              type: object
+              description: Espera por checkout desde el arranque (null sin METRICAS)
+              properties:
+                checkouts:
+                  type: integer
+                media_ms:
+                  type: number
+                maxima_ms:
+                  type: number
+                agotados:
+                  type: integer
+                  description: Esperas que superaron DB_POOL_TIMEOUT
+            configuracion:
+              type: object
+    """
+    estadisticas = estadisticas_pool(db.engine)
+    estadisticas['configuracion'] = {
+        'dialecto': db.engine.dialect.name,
+        'pgbouncer': current_app.config['DB_PGBOUNCER'],
+        'pre_ping': current_app.config['DB_POOL_PRE_PING'],
+        'reciclado': current_app.config['DB_POOL_RECYCLE']
+    }
+    return jsonify(estadisticas), 200
+
+
+@sistema_bp.route('/vivo', methods=['GET'])
+def get_vivo():
+    """
+    Liveness: el worker responde (no consulta la base)
+    ---
+    tags:
+      - Sistema
+    summary: Sonda de vida del worker
+    description: |
+      Un fallo indica un worker colgado que debe reiniciarse; una base caída
+      no lo hace fallar (eso lo informa /api/sistema/listo).
+    responses:
+      200:
+        description: El worker atiende solicitudes
+        schema:
+          type: object
+          properties:
+            estado:
+              type: string
+              example: vivo
+            pid:
+              type: integer
+    """
+    return jsonify({'estado': 'vivo', 'pid': os.getpid()}), 200
+
+
+@sistema_bp.route('/listo', methods=['GET'])
+def get_listo():
+    """
+    Readiness: el worker puede recibir tráfico
+    ---
+    tags:
+      - Sistema
+    summary: Sonda de disponibilidad del worker
+    description: |
+      503 mientras el worker precalienta (wsgi.py), durante el drenaje tras
+      SIGTERM (DRENAJE_SEGUNDOS) o si la base no responde. Con el servidor de
+      desarrollo no hay precalentamiento y solo se comprueba la base.
+    responses:
+      200:
+        description: Listo
+        schema:
+          type: object
+          properties:
+            estado:
+              type: string
+              example: listo
+            pid:
+              type: integer
+            precalentamiento:
+              type: object
+              description: Milisegundos de cada paso del precalentamiento
+      503:
+        description: No listo (precalentando, drenando o sin_base)
+    """
+    estado = estado_arranque(current_app)
+    if estado is not None and estado.drenando:
+        return jsonify({'estado': 'drenando', 'pid': os.getpid()}), 503
+    if estado is not None and not estado.listo:
+        return jsonify({'estado': 'precalentando', 'pid': os.getpid()}), 503
+    try:
+        db.session.execute(text('SELECT 1'))
+    except SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({'estado': 'sin_base', 'pid': os.getpid()}), 503
+    return jsonify({
+        'estado': 'listo',
+        'pid': os.getpid(),
+        'precalentamiento': estado.tiempos if estado is not None else None
+    }), 200
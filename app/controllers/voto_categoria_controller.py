@@ -1,7 +1,10 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from app.services import VotoCategoriaService
-from app.models import Voto, Categoria, PartidoPolitico
+from app.services.catalogo_service import catalogo_service, como_id
+from app.services.exportacion import FORMATOS
+from app.models import Voto
 from sqlalchemy.exc import IntegrityError
+from app.controllers.paginacion import respuesta_listado
 
 voto_categoria_bp = Blueprint('voto_categoria', __name__, url_prefix='/api/votos-categoria')
 voto_categoria_service = VotoCategoriaService()
@@ -13,12 +16,85 @@ def get_all_votos_categoria():
     ---
     tags:
       - Votos por Categoría
+    parameters:
+      - name: after
+        in: query
+        type: integer
+        required: false
+        description: Cursor devuelto en X-Siguiente (clave del último registro de la página anterior)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Tamaño de página (LISTADO_LIMITE por defecto, máximo LISTADO_LIMITE_MAXIMO)
+      - name: campos
+        in: query
+        type: string
+        required: false
+        description: Columnas a incluir separadas por coma (la clave primaria siempre se incluye)
+      - name: forma
+        in: query
+        type: string
+        enum: [objetos, filas]
+        default: objetos
+        required: false
+        description: objetos (lista de objetos) o filas ({"columnas", "filas"}, sin un objeto por fila)
+      - name: id_voto
+        in: query
+        type: integer
+        required: false
+      - name: id_categoria
+        in: query
+        type: integer
+        required: false
     responses:
       200:
         description: Lista de votos por categoría
+        headers:
+          X-Siguiente:
+            type: string
+            description: Cursor de la página siguiente (ausente en la última página)
+    """
+    try:
+        return respuesta_listado(voto_categoria_service)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@voto_categoria_bp.route('/exportar', methods=['GET'])
+def exportar_votos_categoria():
     """
-    votos_categoria = voto_categoria_service.get_all()
-    return jsonify(votos_categoria), 200
+    Exporta todos los votos por categoría en flujo (NDJSON o CSV)
+    ---
+    tags:
+      - Votos por Categoría
+    summary: Exportación completa sin cargar la tabla en memoria
+    description: |
+      Lee en bloques con un cursor del lado del servidor y envía la respuesta
+      a medida que se genera; la memoria del proceso no crece con la tabla.
+    produces:
+      - application/x-ndjson
+      - text/csv
+    parameters:
+      - name: formato
+        in: query
+        type: string
+        enum: [ndjson, csv]
+        default: ndjson
+        required: false
+    responses:
+      200:
+        description: Un voto por categoría por línea (NDJSON) o por fila (CSV)
+      400:
+        description: Formato no soportado
+    """
+    formato = request.args.get('formato', 'ndjson')
+    if formato not in FORMATOS:
+        return jsonify({'error': f'Formato no soportado: {formato}', 'formatos': list(FORMATOS)}), 400
+    return Response(
+        stream_with_context(voto_categoria_service.exportar(formato)),
+        mimetype=FORMATOS[formato],
+        headers={'Content-Disposition': f'attachment; filename=votos_categoria.{formato}'}
+    )
 
 @voto_categoria_bp.route('/<int:id_voto_categoria>', methods=['GET'])
 def get_voto_categoria_by_id(id_voto_categoria):
@@ -101,6 +177,12 @@ def create_voto_categoria():
         if not data.get('id_partido'):
             return jsonify({'error': 'El campo id_partido es requerido'}), 400
 
+        # IDs enteros ("1" también): el catálogo se indexa por int
+        for campo in ('id_categoria', 'id_partido'):
+            data[campo] = como_id(data[campo])
+            if data[campo] is None:
+                return jsonify({'error': f'El campo {campo} debe ser un entero'}), 400
+
         # Validar que el voto exista
         voto = Voto.query.get(data['id_voto'])
         if not voto:
@@ -109,22 +191,18 @@ def create_voto_categoria():
                 'sugerencia': 'Debe crear el voto primero en /api/votos/'
             }), 404
 
-        # Validar que la categoría exista
-        categoria = Categoria.query.get(data['id_categoria'])
-        if not categoria:
+        # Validar que la categoría exista (catálogo en memoria)
+        if not catalogo_service.resolver('categorias', data['id_categoria']):
             return jsonify({
                 'error': f'La categoría con ID {data["id_categoria"]} no existe',
-                'categorias_disponibles': [{'id': c.id_categoria, 'nombre': c.nombre_categoria}
-                                          for c in Categoria.query.all()]
+                'categorias_disponibles': catalogo_service.actual().categorias_disponibles()
             }), 404
 
         # Validar que el partido exista
-        partido = PartidoPolitico.query.get(data['id_partido'])
-        if not partido:
+        if not catalogo_service.resolver('partidos', data['id_partido']):
             return jsonify({
                 'error': f'El partido con ID {data["id_partido"]} no existe',
-                'partidos_disponibles': [{'id': p.id_partido, 'nombre': p.nombre_partido}
-                                        for p in PartidoPolitico.query.all()]
+                'partidos_disponibles': catalogo_service.actual().partidos_disponibles()
             }), 404
 
         voto_categoria = voto_categoria_service.create(data)
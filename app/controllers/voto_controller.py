@@ -1,7 +1,9 @@
-from flask import Blueprint, request, jsonify
-from app.services import VotoService
-from app.models import Elector, Voto
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+from app.services import VotoService, ElectorNoEncontradoError, VotoDuplicadoError, PapeletaInvalidaError
+from app.services.exportacion import FORMATOS
 from sqlalchemy.exc import IntegrityError
+from app.controllers.paginacion import respuesta_listado
+from app.negociacion import cuerpo_solicitud
 
 voto_bp = Blueprint('voto', __name__, url_prefix='/api/votos')
 voto_service = VotoService()
@@ -13,12 +15,81 @@ def get_all_votos():
     ---
     tags:
       - Votos
+    parameters:
+      - name: after
+        in: query
+        type: integer
+        required: false
+        description: Cursor devuelto en X-Siguiente (clave del último registro de la página anterior)
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Tamaño de página (LISTADO_LIMITE por defecto, máximo LISTADO_LIMITE_MAXIMO)
+      - name: campos
+        in: query
+        type: string
+        required: false
+        description: Columnas a incluir separadas por coma (la clave primaria siempre se incluye)
+      - name: forma
+        in: query
+        type: string
+        enum: [objetos, filas]
+        default: objetos
+        required: false
+        description: objetos (lista de objetos) o filas ({"columnas", "filas"}, sin un objeto por fila)
+      - name: id_tipo_voto
+        in: query
+        type: integer
+        required: false
     responses:
       200:
         description: Lista de votos
+        headers:
+          X-Siguiente:
+            type: string
+            description: Cursor de la página siguiente (ausente en la última página)
+    """
+    try:
+        return respuesta_listado(voto_service)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@voto_bp.route('/exportar', methods=['GET'])
+def exportar_votos():
+    """
+    Exporta todos los votos en flujo (NDJSON o CSV)
+    ---
+    tags:
+      - Votos
+    summary: Exportación completa sin cargar la tabla en memoria
+    description: |
+      Lee en bloques con un cursor del lado del servidor y envía la respuesta
+      a medida que se genera; la memoria del proceso no crece con la tabla.
+    produces:
+      - application/x-ndjson
+      - text/csv
+    parameters:
+      - name: formato
+        in: query
+        type: string
+        enum: [ndjson, csv]
+        default: ndjson
+        required: false
+    responses:
+      200:
+        description: Un voto por línea (NDJSON) o por fila (CSV)
+      400:
+        description: Formato no soportado
     """
-    votos = voto_service.get_all()
-    return jsonify(votos), 200
+    formato = request.args.get('formato', 'ndjson')
+    if formato not in FORMATOS:
+        return jsonify({'error': f'Formato no soportado: {formato}', 'formatos': list(FORMATOS)}), 400
+    return Response(
+        stream_with_context(voto_service.exportar(formato)),
+        mimetype=FORMATOS[formato],
+        headers={'Content-Disposition': f'attachment; filename=votos.{formato}'}
+    )
 
 @voto_bp.route('/<int:id_voto>', methods=['GET'])
 def get_voto_by_id(id_voto):
@@ -73,6 +144,12 @@ def create_voto():
     ---
     tags:
       - Votos
+    consumes:
+      - application/json
+      - application/msgpack
+    produces:
+      - application/json
+      - application/msgpack
     parameters:
       - name: body
         in: body
@@ -94,6 +171,7 @@ def create_voto():
                 properties:
                   id_categoria:
                     type: integer
+                    description: También se acepta un texto numérico ("1")
                     example: 1
                   id_partido:
                     type: integer
@@ -109,51 +187,47 @@ def create_voto():
       201:
         description: Voto creado exitosamente. El tipo se determina automáticamente
       400:
-        description: Error en los datos o DNI ya votó
+        description: Error en los datos (p. ej. un ID que no es un entero)
       404:
         description: DNI no existe
       409:
         description: El DNI ya ha votado
     """
     try:
-        data = request.get_json()
+        data = cuerpo_solicitud()
 
         # Validar que exista el DNI
         if not data.get('dni'):
             return jsonify({'error': 'El campo dni es requerido'}), 400
 
-        dni = data['dni']
-
-        # Validar que el elector exista
-        elector = Elector.query.get(dni)
-        if not elector:
-            return jsonify({
-                'error': f'El elector con DNI {dni} no existe',
-                'sugerencia': 'Debe crear el elector primero en /api/electores/'
-            }), 404
-
-        # Verificar si el DNI ya votó
-        if voto_service.dni_ya_voto(dni):
-            # Obtener información del voto existente
-            voto_existente = Voto.query.filter_by(dni=dni).first()
-            return jsonify({
-                'error': f'El elector con DNI {dni} ya ha registrado su voto',
-                'mensaje': 'No puede votar más de una vez',
-                'voto_existente': {
-                    'id_voto': voto_existente.id_voto,
-                    'fecha': voto_existente.fecha.isoformat(),
-                    'tipo_voto': voto_existente.tipo_voto.nombre_tipo
-                },
-                'sugerencia': 'Ingrese un DNI diferente que no haya votado'
-            }), 409
-
-        # Crear el voto (el tipo se determina automáticamente)
+        # Crear el voto (el tipo se determina automáticamente). La existencia
+        # del elector y el DNI duplicado se validan dentro del mismo INSERT.
         voto = voto_service.create(data)
         return jsonify({
             'mensaje': 'Voto registrado exitosamente',
             'voto': voto
         }), 201
 
+    except PapeletaInvalidaError as e:
+        return jsonify({
+            'error': str(e),
+            'tipo': 'validation_error'
+        }), 400
+
+    except ElectorNoEncontradoError as e:
+        return jsonify({
+            'error': str(e),
+            'sugerencia': 'Debe crear el elector primero en /api/electores/'
+        }), 404
+
+    except VotoDuplicadoError as e:
+        return jsonify({
+            'error': f'El elector con DNI {e.dni} ya ha registrado su voto',
+            'mensaje': 'No puede votar más de una vez',
+            'voto_existente': e.voto_existente,
+            'sugerencia': 'Ingrese un DNI diferente que no haya votado'
+        }), 409
+
     except ValueError as e:
         # Error de validación (DNI duplicado, etc.)
         return jsonify({
@@ -173,3 +247,73 @@ def create_voto():
             'error': str(e),
             'tipo': 'server_error'
         }), 400
+
+@voto_bp.route('/lote', methods=['POST'])
+def create_votos_lote():
+    """
+    Registra un lote de votos (consolidación de mesas) en una sola transacción
+    ---
+    tags:
+      - Votos
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required:
+            - votos
+          properties:
+            votos:
+              type: array
+              description: Papeletas con el mismo formato que POST /api/votos/
+              items:
+                type: object
+                properties:
+                  dni:
+                    type: string
+                    example: "12345678"
+                  votos_categoria:
+                    type: array
+                    items:
+                      type: object
+    responses:
+      200:
+        description: Resultado por papeleta (registrado, duplicado, elector_no_encontrado o invalido)
+      400:
+        description: Error en los datos o lote demasiado grande
+    """
+    try:
+        data = request.get_json()
+        votos = data.get('votos') if isinstance(data, dict) else None
+
+        if not isinstance(votos, list) or not votos:
+            return jsonify({'error': 'El campo votos debe ser una lista no vacía'}), 400
+
+        maximo = current_app.config['VOTOS_LOTE_MAXIMO']
+        if len(votos) > maximo:
+            return jsonify({'error': f'El lote no puede superar {maximo} votos'}), 400
+
+        resultados = voto_service.create_many(votos)
+        resumen = {}
+        for resultado in resultados:
+            resumen[resultado['estado']] = resumen.get(resultado['estado'], 0) + 1
+
+        return jsonify({
+            'total': len(resultados),
+            'resumen': resumen,
+            'resultados': resultados
+        }), 200
+
+    except IntegrityError as e:
+        return jsonify({
+            'error': 'Error de integridad en la base de datos',
+            'detalle': 'Verifique que todas las claves foráneas sean válidas',
+            'tipo': 'integrity_error'
+        }), 409
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'tipo': 'server_error'
+        }), 400
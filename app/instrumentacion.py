@@ -0,0 +1,179 @@
+"""
+Instrumentación SQL por solicitud (INSTRUMENTACION_SQL).
+
+Eventos del motor de SQLAlchemy cuentan las sentencias y acumulan el tiempo
+en la base de la solicitud en curso; el proveedor JSON acumula el tiempo de
+serialización. Al terminar, la respuesta lleva
+
+    Server-Timing: db;dur=3.1;desc="consultas: 4", serialize;dur=0.4, total;dur=5.2
+
+y, con LOG_SOLICITUDES, una línea JSON por solicitud en el logger
+'app.solicitudes'. Además:
+
+- una sentencia que tarda más de SQL_LENTA_MS se registra (logger 'app.sql')
+  con el endpoint que la emitió y la forma de sus parámetros (tipos, nunca
+  valores: los parámetros incluyen DNIs)
+- una misma sentencia ejecutada N_MAS_1_UMBRAL veces o más en una solicitud
+  se registra como posible N+1 (consulta dentro de un bucle)
+"""
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.proveedor_json import ProveedorJSON
+
+logger_sql = logging.getLogger('app.sql')
+logger_solicitudes = logging.getLogger('app.solicitudes')
+
+# Largo máximo de una sentencia en los registros
+LARGO_SENTENCIA = 1000
+
+
+class MedicionSolicitud:
+    """Acumuladores de una solicitud (en flask.g)"""
+
+    __slots__ = ('inicio', 'consultas', 'segundos_db', 'segundos_serializacion', 'sentencias')
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.segundos_db = 0.0
+        self.segundos_serializacion = 0.0
+        self.sentencias = Counter()
+
+
+def medicion_actual() -> Optional[MedicionSolicitud]:
+    """Medición de la solicitud en curso, o None fuera de una solicitud instrumentada"""
+    return g.get('_medicion') if has_request_context() else None
+
+
+@contextmanager
+def medir_serializacion():
+    """Suma el tiempo del bloque a la serialización de la solicitud en curso"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicion = medicion_actual()
+        if medicion is not None:
+            medicion.segundos_serializacion += time.perf_counter() - inicio
+
+
+class ProveedorJSONMedido(ProveedorJSON):
+    """Proveedor JSON de la aplicación que mide el tiempo de cada codificación (jsonify, JSON o MessagePack)"""
+
+    def codificar(self, obj: Any) -> bytes:
+        with medir_serializacion():
+            return super().codificar(obj)
+
+    def empaquetar(self, obj: Any) -> bytes:
+        with medir_serializacion():
+            return super().empaquetar(obj)
+
+
+def forma_parametros(parametros: Any) -> Any:
+    """Tipos de los parámetros ligados, sin sus valores"""
+    if isinstance(parametros, dict):
+        return {nombre: type(valor).__name__ for nombre, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        if parametros and isinstance(parametros[0], (dict, list, tuple)):
+            # executemany: una fila de muestra y la cantidad de filas
+            return {'filas': len(parametros), 'fila': forma_parametros(parametros[0])}
+        tipos = [type(valor).__name__ for valor in parametros]
+        # INSERT multi-fila / IN (...) largos: cantidad por tipo
+        return tipos if len(tipos) <= 10 else dict(Counter(tipos))
+    return type(parametros).__name__
+
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    conn.info['_inicio_sql'] = time.perf_counter()
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    segundos = time.perf_counter() - conn.info.pop('_inicio_sql')
+
+    medicion = medicion_actual()
+    if medicion is not None:
+        medicion.consultas += 1
+        medicion.segundos_db += segundos
+        medicion.sentencias[statement] += 1
+
+    if not has_app_context() or not current_app.config.get('INSTRUMENTACION_SQL'):
+        return
+    umbral = current_app.config['SQL_LENTA_MS']
+    if umbral and segundos * 1000 >= umbral:
+        logger_sql.warning('Consulta lenta (%.1f ms) en %s: %s; parámetros %s',
+                           segundos * 1000, request.endpoint if has_request_context() else None,
+                           statement[:LARGO_SENTENCIA], forma_parametros(parameters))
+
+
+def _iniciar_medicion() -> None:
+    g._medicion = MedicionSolicitud()
+
+
+def _registrar_medicion(respuesta):
+    medicion = g.pop('_medicion', None)
+    if medicion is None:
+        return respuesta
+    total_ms = (time.perf_counter() - medicion.inicio) * 1000
+    db_ms = medicion.segundos_db * 1000
+    serializacion_ms = medicion.segundos_serializacion * 1000
+
+    respuesta.headers['Server-Timing'] = (
+        f'db;dur={db_ms:.2f};desc="consultas: {medicion.consultas}", '
+        f'serialize;dur={serializacion_ms:.2f}, total;dur={total_ms:.2f}'
+    )
+    respuesta.headers['Timing-Allow-Origin'] = '*'
+
+    umbral = current_app.config['N_MAS_1_UMBRAL']
+    repetidas = {
+        sentencia: veces for sentencia, veces in medicion.sentencias.items() if umbral and veces >= umbral
+    }
+    for sentencia, veces in repetidas.items():
+        logger_sql.warning('Posible N+1 en %s %s: %d ejecuciones de %s',
+                           request.method, request.endpoint, veces, sentencia[:LARGO_SENTENCIA])
+
+    if current_app.config['LOG_SOLICITUDES']:
+        logger_solicitudes.info(json.dumps({
+            'metodo': request.method,
+            'ruta': request.url_rule.rule if request.url_rule else request.path,
+            'endpoint': request.endpoint,
+            'estado': respuesta.status_code,
+            'total_ms': round(total_ms, 3),
+            'db_ms': round(db_ms, 3),
+            'serializacion_ms': round(serializacion_ms, 3),
+            'consultas': medicion.consultas,
+            'sentencias_distintas': len(medicion.sentencias),
+            'n_mas_1': len(repetidas)
+        }, ensure_ascii=False))
+    return respuesta
+
+
+def init_app(app) -> None:
+    """Instrumenta las solicitudes de `app` si la configuración lo pide"""
+    if not app.config['INSTRUMENTACION_SQL']:
+        return
+
+    # Los eventos se registran en Engine: cubren los motores que cree Flask-SQLAlchemy
+    if not event.contains(Engine, 'before_cursor_execute', _antes_de_ejecutar):
+        event.listen(Engine, 'before_cursor_execute', _antes_de_ejecutar)
+        event.listen(Engine, 'after_cursor_execute', _despues_de_ejecutar)
+
+    app.json = ProveedorJSONMedido(app)
+    app.before_request(_iniciar_medicion)
+    app.after_request(_registrar_medicion)
+
+    if app.config['LOG_SOLICITUDES'] and not logger_solicitudes.handlers:
+        # Una línea JSON por solicitud, sin prefijos del formato por defecto
+        manejador = logging.StreamHandler()
+        manejador.setFormatter(logging.Formatter('%(message)s'))
+        logger_solicitudes.addHandler(manejador)
+        logger_solicitudes.setLevel(logging.INFO)
+        logger_solicitudes.propagate = False
@@ -0,0 +1,230 @@
+"""
+Métricas Prometheus de la API (METRICAS), expuestas en GET /metrics.
+
+- Solicitudes por blueprint y ruta (plantilla de la regla, no la URL: las
+  etiquetas no crecen con los DNIs), histograma de latencia y solicitudes en curso
+- Pool de conexiones: espera para obtener una conexión, conexiones en uso y
+  capacidad (en uso / capacidad = saturación) y esperas agotadas
+- Dominio: votos por tipo de voto, rechazos por DNI que ya votó y cuestionarios
+
+Con gunicorn cada worker es un proceso: si PROMETHEUS_MULTIPROC_DIR está
+definida (antes de importar la aplicación, ver gunicorn.conf.py), cada
+proceso escribe sus valores en archivos mmap de ese directorio, sin locks
+entre procesos, y /metrics los suma con MultiProcessCollector. Sin esa
+variable, las métricas son las del proceso.
+"""
+import functools
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict
+
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Latencias de la API: de 1 ms (índice de DNI, caché) a 10 s (exportaciones)
+BUCKETS_SOLICITUD = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Espera por una conexión del pool: normalmente microsegundos; hasta pool_timeout si se agota
+BUCKETS_POOL = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+solicitudes = Counter(
+    'votacion_solicitudes_total', 'Solicitudes HTTP atendidas',
+    ['blueprint', 'ruta', 'metodo', 'estado']
+)
+latencia = Histogram(
+    'votacion_solicitud_segundos', 'Duración de las solicitudes HTTP',
+    ['blueprint', 'ruta', 'metodo'], buckets=BUCKETS_SOLICITUD
+)
+en_curso = Gauge(
+    'votacion_solicitudes_en_curso', 'Solicitudes HTTP en curso',
+    ['blueprint'], multiprocess_mode='livesum'
+)
+
+espera_pool = Histogram(
+    'votacion_pool_espera_segundos', 'Espera para obtener una conexión del pool (incluye abrirla)',
+    buckets=BUCKETS_POOL
+)
+pool_agotado = Counter(
+    'votacion_pool_agotado_total', 'Esperas por una conexión que superaron pool_timeout'
+)
+conexiones = Gauge(
+    'votacion_pool_conexiones', 'Conexiones del pool en uso y capacidad (pool_size + max_overflow)',
+    ['estado'], multiprocess_mode='livesum'
+)
+# Proceso que registró la capacidad de cada motor (ver proceso_iniciado)
+_capacidad_registrada: 'weakref.WeakKeyDictionary[Any, int]' = weakref.WeakKeyDictionary()
+
+votos_emitidos = Counter(
+    'votacion_votos_total', 'Votos registrados por tipo de voto',
+    ['tipo_voto']
+)
+dni_duplicado = Counter(
+    'votacion_dni_duplicado_total', 'Votos rechazados porque el DNI ya votó',
+    ['origen']
+)
+cuestionarios_enviados = Counter(
+    'votacion_cuestionarios_total', 'Cuestionarios registrados'
+)
+
+
+def _iniciar_solicitud() -> None:
+    g._metricas = (time.perf_counter(), request.blueprint or '')
+    en_curso.labels(request.blueprint or '').inc()
+
+
+def _registrar_solicitud(respuesta):
+    if '_metricas' not in g:
+        return respuesta  # otro before_request respondió antes de _iniciar_solicitud
+    inicio, blueprint = g._metricas
+    ruta = request.url_rule.rule if request.url_rule else '<sin_ruta>'
+    latencia.labels(blueprint, ruta, request.method).observe(time.perf_counter() - inicio)
+    solicitudes.labels(blueprint, ruta, request.method, str(respuesta.status_code)).inc()
+    return respuesta
+
+
+def _terminar_solicitud(_error) -> None:
+    # teardown: se ejecuta también si la vista lanzó una excepción
+    metricas = g.pop('_metricas', None)
+    if metricas is not None:
+        en_curso.labels(metricas[1]).dec()
+
+
+@functools.lru_cache(maxsize=None)
+def _clase_medida(clase):
+    """Subclase del pool que mide la espera de cada checkout (Prometheus y totales del pool)"""
+
+    class PoolMedido(clase):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._iniciar_esperas()
+
+        def _iniciar_esperas(self):
+            self._lock_esperas = threading.Lock()
+            self.checkouts = 0
+            self.espera_total = 0.0
+            self.espera_maxima = 0.0
+            self.agotados = 0
+
+        def _do_get(self):
+            inicio = time.perf_counter()
+            agotado = False
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                agotado = True
+                pool_agotado.inc()
+                raise
+            finally:
+                espera = time.perf_counter() - inicio
+                espera_pool.observe(espera)
+                with self._lock_esperas:
+                    self.checkouts += 1
+                    self.espera_total += espera
+                    self.espera_maxima = max(self.espera_maxima, espera)
+                    self.agotados += agotado
+
+    PoolMedido.__name__ = PoolMedido.__qualname__ = f'{clase.__name__}Medido'
+    return PoolMedido
+
+
+def medir_pool(engine) -> None:
+    """
+    Instrumenta el pool de `engine`. SQLAlchemy no tiene un evento previo al
+    checkout, así que la espera se mide en una subclase de la clase del pool;
+    se reemplaza la clase (no un método) para que sobreviva a engine.dispose(),
+    que recrea el pool con self.__class__.
+    """
+    pool = engine.pool
+    if type(pool).__name__.endswith('Medido'):
+        return
+    pool.__class__ = _clase_medida(type(pool))
+    pool._iniciar_esperas()
+
+    _registrar_capacidad(engine)
+    event.listen(engine, 'checkout', lambda *_: conexiones.labels('en_uso').inc())
+    event.listen(engine, 'checkin', lambda *_: conexiones.labels('en_uso').dec())
+
+
+def _registrar_capacidad(engine) -> None:
+    pool = engine.pool
+    # Pools sin límite (NullPool, StaticPool) no informan capacidad
+    if hasattr(pool, '_max_overflow'):
+        conexiones.labels('capacidad').inc(pool.size() + max(pool._max_overflow, 0))
+    _capacidad_registrada[engine] = os.getpid()
+
+
+def proceso_iniciado(engine) -> None:
+    """
+    En un worker creado con fork después de medir_pool (preload_app): en modo
+    multiproceso prometheus_client empieza de cero en el hijo, así que la
+    capacidad del pool se registra de nuevo
+    """
+    pid = _capacidad_registrada.get(engine)
+    if pid is not None and pid != os.getpid() and os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        _registrar_capacidad(engine)
+
+
+def estadisticas_pool(engine) -> Dict[str, Any]:
+    """Estado del pool de `engine` en este proceso: conexiones, desborde y espera por checkout"""
+    pool = engine.pool
+    datos: Dict[str, Any] = {'clase': type(pool).__name__.removesuffix('Medido'), 'estado': pool.status()}
+    if isinstance(pool, QueuePool):
+        capacidad = pool.size() + max(pool._max_overflow, 0)
+        datos.update(
+            tamano=pool.size(),
+            desborde_maximo=pool._max_overflow,
+            timeout=pool.timeout(),
+            en_uso=pool.checkedout(),
+            disponibles=pool.checkedin(),
+            # overflow() parte de -pool_size: solo cuentan las conexiones por encima del tamaño
+            desborde=max(pool.overflow(), 0),
+            saturacion=round(pool.checkedout() / capacidad, 4) if capacidad else None
+        )
+    if hasattr(pool, '_lock_esperas'):
+        with pool._lock_esperas:
+            datos['espera'] = {
+                'checkouts': pool.checkouts,
+                'media_ms': round(pool.espera_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+                'maxima_ms': round(pool.espera_maxima * 1000, 3),
+                'agotados': pool.agotados
+            }
+    else:
+        datos['espera'] = None  # METRICAS desactivado: el pool no está instrumentado
+    return datos
+
+
+def exponer() -> Response:
+    """Texto de exposición de Prometheus, sumando todos los workers si hay directorio multiproceso"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+    else:
+        registro = REGISTRY
+    return Response(generate_latest(registro), content_type=CONTENT_TYPE_LATEST)
+
+
+def proceso_terminado(pid: int) -> None:
+    """Descarta los gauges 'livesum' de un worker que terminó (hook child_exit de gunicorn)"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
+
+
+def init_app(app, db) -> None:
+    """Registra /metrics y la medición de solicitudes y del pool si la configuración lo pide"""
+    if not app.config['METRICAS']:
+        return
+
+    app.before_request(_iniciar_solicitud)
+    app.after_request(_registrar_solicitud)
+    app.teardown_request(_terminar_solicitud)
+    app.add_url_rule('/metrics', 'metricas', exponer)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            medir_pool(engine)
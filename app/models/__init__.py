@@ -10,6 +10,11 @@ from .partido_politico import PartidoPolitico
 from .candidato import Candidato
 from .categoria import Categoria
 from .voto_categoria import VotoCategoria
+from .conteo_categoria import ConteoCategoria
+from .conteo_tipo_voto import ConteoTipoVoto
+from .conteo_region import ConteoRegion
+from .conteo_distrito import ConteoDistrito
+from .importacion_padron import ImportacionPadron
 
 # Modelos del módulo de cuestionario (independiente del sistema de votación)
 from .cuestionario import Cuestionario
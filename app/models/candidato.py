@@ -3,6 +3,11 @@ from . import db
 class Candidato(db.Model):
     """Modelo que representa un candidato"""
     __tablename__ = 'candidato'
+    __table_args__ = (
+        # Listados filtrados por categoría o partido, paginados por ID
+        db.Index('ix_candidato_categoria_id', 'id_categoria', 'id_candidato'),
+        db.Index('ix_candidato_partido_id', 'id_partido', 'id_candidato'),
+    )
 
     id_candidato = db.Column(db.Integer, primary_key=True, autoincrement=True)
     nombre_candidato = db.Column(db.String(100), nullable=False)
@@ -0,0 +1,23 @@
+"""
+Modo estricto de carga de relaciones (ORM_CARGA_ESTRICTA).
+
+Agrega raiseload('*') a cada SELECT del ORM, con el mismo efecto que declarar
+todas las relaciones con lazy='raise': acceder a una relación que la consulta
+no cargó de forma explícita (joinedload/selectinload) lanza
+InvalidRequestError en lugar de emitir una consulta perezosa (N+1). Las
+opciones explícitas de la consulta tienen prioridad sobre el comodín.
+"""
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, raiseload
+
+
+def _aplicar_raiseload(estado) -> None:
+    if estado.is_select and has_app_context() and current_app.config.get('ORM_CARGA_ESTRICTA'):
+        estado.statement = estado.statement.options(raiseload('*'))
+
+
+def init_app(app) -> None:
+    """Activa el modo estricto para las sesiones de `app` si la configuración lo pide"""
+    if app.config.get('ORM_CARGA_ESTRICTA') and not event.contains(Session, 'do_orm_execute', _aplicar_raiseload):
+        event.listen(Session, 'do_orm_execute', _aplicar_raiseload)
@@ -0,0 +1,24 @@
+from . import db
+
+
+class ConteoCategoria(db.Model):
+    """
+    Conteo de votos por categoría y partido, mantenido en la misma transacción
+    que registra cada voto.
+    Cada contador se reparte en varios fragmentos (filas) para que los INSERT
+    concurrentes no compitan por una sola fila; el total es la suma de fragmentos.
+    """
+    __tablename__ = 'conteo_categoria'
+
+    id_categoria = db.Column(db.Integer, db.ForeignKey('categoria.id_categoria'), primary_key=True)
+    id_partido = db.Column(db.Integer, primary_key=True)  # 0 para voto en blanco en la categoría
+    fragmento = db.Column(db.Integer, primary_key=True)
+    cantidad = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'id_categoria': self.id_categoria,
+            'id_partido': self.id_partido,
+            'fragmento': self.fragmento,
+            'cantidad': self.cantidad
+        }
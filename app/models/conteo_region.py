@@ -0,0 +1,24 @@
+from . import db
+
+
+class ConteoRegion(db.Model):
+    """
+    Conteo de votos por región (del elector), categoría y partido.
+    Se mantiene en la transacción de cada voto, fragmentado igual que ConteoCategoria.
+    """
+    __tablename__ = 'conteo_region'
+
+    region = db.Column(db.String(100), primary_key=True)
+    id_categoria = db.Column(db.Integer, db.ForeignKey('categoria.id_categoria'), primary_key=True)
+    id_partido = db.Column(db.Integer, primary_key=True)  # 0 para voto en blanco en la categoría
+    fragmento = db.Column(db.Integer, primary_key=True)
+    cantidad = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'region': self.region,
+            'id_categoria': self.id_categoria,
+            'id_partido': self.id_partido,
+            'fragmento': self.fragmento,
+            'cantidad': self.cantidad
+        }
@@ -0,0 +1,20 @@
+from . import db
+
+
+class ConteoTipoVoto(db.Model):
+    """
+    Conteo de votos por tipo (Válido, Nulo, En Blanco), fragmentado igual
+    que ConteoCategoria.
+    """
+    __tablename__ = 'conteo_tipo_voto'
+
+    id_tipo_voto = db.Column(db.Integer, db.ForeignKey('tipo_voto.id_tipo_voto'), primary_key=True)
+    fragmento = db.Column(db.Integer, primary_key=True)
+    cantidad = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'id_tipo_voto': self.id_tipo_voto,
+            'fragmento': self.fragmento,
+            'cantidad': self.cantidad
+        }
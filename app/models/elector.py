@@ -3,6 +3,11 @@ from . import db
 class Elector(db.Model):
     """Modelo que representa a un elector"""
     __tablename__ = 'elector'
+    __table_args__ = (
+        # Listados filtrados por región / distrito, paginados por DNI
+        db.Index('ix_elector_region_dni', 'region', 'dni'),
+        db.Index('ix_elector_region_distrito_dni', 'region', 'distrito', 'dni'),
+    )
 
     dni = db.Column(db.String(20), primary_key=True)
     nombres = db.Column(db.String(100), nullable=False)
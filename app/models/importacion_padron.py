@@ -0,0 +1,43 @@
+from . import db
+from datetime import datetime
+
+
+class ImportacionPadron(db.Model):
+    """
+    Registro de una importación masiva del padrón (PadronService).
+    Se actualiza en la misma transacción que cada bloque fusionado en ELECTOR,
+    así que `filas_leidas` es el punto exacto desde donde reanudar.
+    `fecha_actualizacion` es el latido de la carga: una importación en_curso
+    sin bloques nuevos durante PADRON_ABANDONO segundos quedó abandonada (el
+    proceso terminó) y se puede reanudar como una fallida.
+    """
+    __tablename__ = 'importacion_padron'
+
+    id_importacion = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    origen = db.Column(db.String(255), nullable=False)
+    formato = db.Column(db.String(10), nullable=False)
+    estado = db.Column(db.String(20), nullable=False, default='en_curso')  # en_curso, completada, fallida
+    filas_leidas = db.Column(db.BigInteger, nullable=False, default=0)
+    filas_validas = db.Column(db.BigInteger, nullable=False, default=0)
+    filas_invalidas = db.Column(db.BigInteger, nullable=False, default=0)
+    duplicados = db.Column(db.BigInteger, nullable=False, default=0)
+    fecha_inicio = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    fecha_actualizacion = db.Column(db.DateTime, nullable=True, default=datetime.utcnow)
+    fecha_fin = db.Column(db.DateTime, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    def to_dict(self):
+        return {
+            'id_importacion': self.id_importacion,
+            'origen': self.origen,
+            'formato': self.formato,
+            'estado': self.estado,
+            'filas_leidas': self.filas_leidas,
+            'filas_validas': self.filas_validas,
+            'filas_invalidas': self.filas_invalidas,
+            'duplicados': self.duplicados,
+            'fecha_inicio': self.fecha_inicio.isoformat() if self.fecha_inicio else None,
+            'fecha_actualizacion': self.fecha_actualizacion.isoformat() if self.fecha_actualizacion else None,
+            'fecha_fin': self.fecha_fin.isoformat() if self.fecha_fin else None,
+            'error': self.error
+        }
@@ -4,6 +4,10 @@ from datetime import datetime
 class Voto(db.Model):
     """Modelo que representa un voto"""
     __tablename__ = 'voto'
+    __table_args__ = (
+        # Listados filtrados por tipo de voto, paginados por ID
+        db.Index('ix_voto_tipo_voto_id', 'id_tipo_voto', 'id_voto'),
+    )
 
     id_voto = db.Column(db.Integer, primary_key=True, autoincrement=True)
     fecha = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
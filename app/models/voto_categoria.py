@@ -3,6 +3,12 @@ from . import db
 class VotoCategoria(db.Model):
     """Modelo que representa el voto por categoría con votos preferenciales"""
     __tablename__ = 'voto_categoria'
+    __table_args__ = (
+        # Categorías de un voto (to_dict, conteos por región/distrito de cada voto en
+        # ResultadoService.acumular_geografia) y listados filtrados por categoría, paginados por ID
+        db.Index('ix_voto_categoria_voto_id', 'id_voto', 'id_voto_categoria'),
+        db.Index('ix_voto_categoria_categoria_id', 'id_categoria', 'id_voto_categoria'),
+    )
 
     id_voto_categoria = db.Column(db.Integer, primary_key=True, autoincrement=True)
     id_voto = db.Column(db.Integer, db.ForeignKey('voto.id_voto'), nullable=False)
@@ -0,0 +1,80 @@
+"""
+MessagePack para los kioscos (enlaces lentos): negociación de contenido.
+
+- Respuestas: si el cliente prefiere MessagePack (`Accept: application/msgpack`)
+  jsonify responde MessagePack (ProveedorJSON.response), en todos los
+  blueprints. Los cuerpos pre-serializados (listados en caché, cédula) tienen
+  su variante MessagePack con otro ETag (ver respuesta_serializada)
+- Solicitudes: cuerpo_solicitud() acepta `Content-Type: application/msgpack`
+  además de JSON (POST /api/votos/ y /api/cuestionarios/)
+- Las respuestas negociadas llevan `Vary: Accept`
+
+Se empaqueta lo mismo que se enviaría en JSON (fechas en ISO 8601, arreglos
+de NumPy como listas, claves de mapas siempre str): el cliente recibe los
+mismos datos en otro formato, venga la respuesta de jsonify o de la caché.
+Comparación de tamaños y tiempos: benchmarks/bench_msgpack.py
+"""
+from contextlib import contextmanager
+from typing import Any
+
+import msgpack
+import orjson
+from flask import g, has_request_context, request
+from werkzeug.exceptions import BadRequest
+
+from app import proveedor_json
+
+MIME_MSGPACK = 'application/msgpack'
+# Tipos aceptados en Accept y Content-Type (el segundo es el nombre anterior al registro IANA)
+TIPOS_MSGPACK = (MIME_MSGPACK, 'application/x-msgpack')
+
+
+def empaquetar_json(cuerpo: bytes) -> bytes:
+    """MessagePack de un cuerpo JSON ya codificado"""
+    return msgpack.packb(orjson.loads(cuerpo), use_bin_type=True)
+
+
+def empaquetar(obj: Any) -> bytes:
+    """
+    MessagePack de `obj` pasando por su JSON (orjson, en C): mismas conversiones
+    que jsonify y claves no str (IDs enteros) convertidas a str, como en la caché
+    """
+    return empaquetar_json(proveedor_json.codificar(obj))
+
+
+def desempaquetar(datos: bytes) -> Any:
+    """:raises ValueError: Cuerpo que no es MessagePack válido"""
+    try:
+        return msgpack.unpackb(datos, raw=False)
+    except (msgpack.UnpackException, ValueError) as e:
+        raise ValueError(f'MessagePack inválido: {e}') from e
+
+
+def acepta_msgpack() -> bool:
+    """True si la solicitud en curso prefiere MessagePack a JSON"""
+    if not has_request_context() or g.get('_solo_json'):
+        return False
+    return request.accept_mimetypes.best_match(('application/json',) + TIPOS_MSGPACK) in TIPOS_MSGPACK
+
+
+@contextmanager
+def solo_json():
+    """Dentro del bloque jsonify responde JSON aunque el cliente prefiera MessagePack"""
+    g._solo_json = True
+    try:
+        yield
+    finally:
+        g.pop('_solo_json', None)
+
+
+def cuerpo_solicitud() -> Any:
+    """
+    Cuerpo de la solicitud en MessagePack o JSON, según Content-Type. Un cuerpo
+    inválido lanza BadRequest, igual que request.get_json
+    """
+    if request.mimetype in TIPOS_MSGPACK:
+        try:
+            return desempaquetar(request.get_data())
+        except ValueError as e:
+            raise BadRequest(str(e))
+    return request.get_json()
@@ -0,0 +1,61 @@
+"""
+Proveedor JSON de Flask basado en orjson: jsonify, request.get_json y los
+cuerpos pre-serializados (Serializado) codifican en C, directamente a bytes.
+
+Diferencias con el proveedor por defecto de Flask:
+
+- salida UTF-8 compacta y claves en el orden de inserción (el de to_dict);
+  sort_keys = True las ordena
+- date y datetime en ISO 8601, igual que los to_dict (el proveedor por
+  defecto usaba el formato HTTP para datetime)
+- arreglos y escalares de NumPy (cubo de resultados) sin convertirlos antes
+- claves no str (IDs enteros) se convierten a str, como en json.dumps
+- los argumentos de dumps (indent, separators...) se ignoran
+- jsonify responde MessagePack a los clientes que lo prefieren (app/negociacion.py)
+"""
+from typing import Any, Union
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+from app import negociacion
+
+OPCIONES = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def codificar(obj: Any) -> bytes:
+    """JSON de `obj` en bytes UTF-8 (fuera de un contexto de aplicación)"""
+    return orjson.dumps(obj, default=DefaultJSONProvider.default, option=OPCIONES)
+
+
+class ProveedorJSON(DefaultJSONProvider):
+    """Proveedor JSON de la aplicación (app.json)"""
+
+    sort_keys = False
+
+    def codificar(self, obj: Any) -> bytes:
+        opciones = (OPCIONES | orjson.OPT_SORT_KEYS) if self.sort_keys else OPCIONES
+        return orjson.dumps(obj, default=self.default, option=opciones)
+
+    def empaquetar(self, obj: Any) -> bytes:
+        return negociacion.empaquetar(obj)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.codificar(obj).decode('utf-8')
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        # orjson.JSONDecodeError es un ValueError: request.get_json responde 400 igual que antes
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """
+        Como jsonify, sin pasar por str: los bytes de orjson (o de MessagePack,
+        si el cliente lo prefiere) van directo a la respuesta
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        if negociacion.acepta_msgpack():
+            respuesta = self._app.response_class(self.empaquetar(obj), mimetype=negociacion.MIME_MSGPACK)
+        else:
+            respuesta = self._app.response_class(self.codificar(obj), mimetype=self.mimetype)
+        respuesta.vary.add('Accept')
+        return respuesta
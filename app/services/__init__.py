@@ -1,6 +1,6 @@
 from .base_service import BaseService
 from .elector_service import ElectorService
-from .voto_service import VotoService
+from .voto_service import VotoService, ElectorNoEncontradoError, VotoDuplicadoError, PapeletaInvalidaError
 from .tipo_voto_service import TipoVotoService
 from .partido_politico_service import PartidoPoliticoService
 from .candidato_service import CandidatoService
@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Sequence, Tuple
+from flask import current_app
+from sqlalchemy import select
+from app.models import db
+from . import exportacion
 
 class BaseService(ABC):
     """
@@ -10,6 +14,14 @@ class BaseService(ABC):
     - No se fuerzan métodos que las clases hijas no puedan implementar correctamente
     """
 
+    # Columnas por las que se puede filtrar el listado paginado. Cada una debe
+    # tener un índice (columna, clave primaria) en el modelo para que la página
+    # se lea en orden desde el índice
+    filtros: Tuple[str, ...] = ()
+    # Filtros cuyo índice empieza por otras columnas: solo se aceptan junto
+    # con ellas ({filtro: (columnas previas del índice, ...)})
+    filtros_dependientes: Dict[str, Tuple[str, ...]] = {}
+
     def __init__(self, model):
         """
         Constructor que recibe el modelo de SQLAlchemy
@@ -43,6 +55,101 @@ class BaseService(ABC):
         """
         pass
 
+    def listar_filas(self, after: Optional[str] = None, limit: Optional[int] = None,
+                     filtros: Optional[Dict[str, str]] = None,
+                     campos: Optional[Sequence[str]] = None) -> Tuple[List[str], List[tuple], Optional[Any]]:
+        """
+        Listado paginado por clave (keyset): WHERE pk > :after ORDER BY pk LIMIT :limit.
+        El costo depende del tamaño de página, no del de la tabla. Sin un objeto
+        del ORM ni un diccionario por fila: las filas de Core se entregan como
+        tuplas, listas para codificar con orjson (fechas incluidas).
+        :param after: Cursor; clave primaria del último registro de la página anterior
+        :param limit: Tamaño de página (LISTADO_LIMITE por defecto, máximo LISTADO_LIMITE_MAXIMO)
+        :param filtros: Igualdades sobre columnas de `self.filtros`
+        :param campos: Columnas a incluir (la clave primaria siempre se incluye)
+        :return: (nombres de columna, filas, cursor de la página siguiente o None si es la última)
+        :raises ValueError: Parámetros inválidos
+        """
+        tabla = self.model.__table__
+        clave = self._clave_primaria()
+
+        if campos:
+            desconocidos = [campo for campo in campos if campo not in tabla.c]
+            if desconocidos:
+                raise ValueError(f'Campos desconocidos: {", ".join(desconocidos)}')
+            columnas = [clave] + [tabla.c[campo] for campo in dict.fromkeys(campos) if campo != clave.key]
+        else:
+            columnas = list(tabla.c)
+
+        consulta, limit = self._pagina(select(*columnas), after, limit, filtros)
+        nombres = [columna.key for columna in columnas]
+        filas = list(map(tuple, db.session.execute(consulta)))
+        siguiente = None
+        if len(filas) > limit:
+            # La fila extra solo indica que hay otra página
+            del filas[limit:]
+            siguiente = filas[-1][nombres.index(clave.key)]
+        return nombres, filas, siguiente
+
+    def _clave_primaria(self):
+        columnas = self.model.__table__.primary_key.columns
+        if len(columnas) != 1:
+            raise TypeError(f'{self.model.__name__} no tiene una clave primaria simple')
+        return next(iter(columnas))
+
+    def _pagina(self, consulta, after: Optional[str], limit: Optional[int],
+                filtros: Optional[Dict[str, str]] = None):
+        """
+        Aplica cursor, filtros, orden estable y LIMIT + 1 (la fila extra indica
+        si hay otra página). Retorna (consulta, limit efectivo).
+        """
+        tabla = self.model.__table__
+        clave = self._clave_primaria()
+        limite_maximo = current_app.config['LISTADO_LIMITE_MAXIMO']
+        limit = current_app.config['LISTADO_LIMITE'] if limit is None else limit
+        if not 1 <= limit <= limite_maximo:
+            raise ValueError(f'limit debe estar entre 1 y {limite_maximo}')
+
+        for nombre, valor in (filtros or {}).items():
+            if nombre not in self.filtros:
+                raise ValueError(
+                    f'No se puede filtrar por {nombre}; filtros disponibles: {", ".join(self.filtros) or "ninguno"}'
+                )
+            faltantes = [previa for previa in self.filtros_dependientes.get(nombre, ()) if previa not in filtros]
+            if faltantes:
+                raise ValueError(f'El filtro {nombre} requiere también: {", ".join(faltantes)}')
+            consulta = consulta.where(tabla.c[nombre] == self._convertir(tabla.c[nombre], valor))
+        if after is not None:
+            consulta = consulta.where(clave > self._convertir(clave, after))
+
+        return consulta.order_by(clave).limit(limit + 1), limit
+
+    @staticmethod
+    def _convertir(columna, valor: str) -> Any:
+        """Convierte un valor de la URL al tipo de la columna"""
+        try:
+            return columna.type.python_type(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f'Valor inválido para {columna.key}: {valor}')
+
+    @staticmethod
+    def _cortar(registros: List[Dict[str, Any]], limit: int, clave: str) -> Tuple[List[Dict[str, Any]], Optional[Any]]:
+        """Descarta la fila extra y calcula el cursor de la página siguiente"""
+        if len(registros) > limit:
+            registros = registros[:limit]
+            return registros, registros[-1][clave]
+        return registros, None
+
+    def exportar(self, formato: str) -> Iterator[bytes]:
+        """
+        Exporta la tabla completa en flujo, ordenada por clave primaria
+        :param formato: 'ndjson' o 'csv' (ver exportacion.FORMATOS)
+        :return: Generador de bloques de bytes (memoria constante)
+        """
+        tabla = self.model.__table__
+        consulta = select(*tabla.c).order_by(*tabla.primary_key.columns)
+        return exportacion.exportar(consulta, formato, current_app.config['EXPORTACION_BLOQUE'])
+
     def _to_dict(self, entity) -> Dict[str, Any]:
         """
         Convierte una entidad a diccionario
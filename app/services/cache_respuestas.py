@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+from flask import current_app
+from werkzeug.local import LocalProxy
+from .serializacion import Serializado
+
+
+class CacheRespuestas:
+    """
+    Caché de respuestas GET ya serializadas (cuerpo, gzip y ETag) de los
+    listados de tablas de referencia.
+
+    - Hay una instancia por aplicación (app.extensions['cache_respuestas']);
+      el resto del código la usa a través de `cache_respuestas`
+    - Cada tabla tiene un contador de versión que se incrementa con cada aviso
+      del notificador (los create de los servicios, propios o de otros
+      workers); '*' incrementa todas
+    - La clave de una entrada incluye las versiones de las tablas de las que
+      depende, así que un cambio la deja inalcanzable sin recorrer la caché
+    - Las entradas se descartan por LRU al superar CACHE_RESPUESTAS_MAXIMO
+    """
+
+    def __init__(self, maximo: int):
+        self._maximo = maximo
+        self._versiones: Dict[str, int] = {}
+        self._entradas: 'OrderedDict[Hashable, Serializado]' = OrderedDict()
+        self._contadores = {'aciertos': 0, 'fallos': 0, 'no_modificados': 0}
+        self._lock = threading.Lock()
+
+    def init_app(self, app, notificador) -> None:
+        notificador.suscribir(self._al_notificar)
+        app.extensions['cache_respuestas'] = self
+
+    def _al_notificar(self, tabla: str) -> None:
+        with self._lock:
+            if tabla == '*':
+                self._versiones = {t: v + 1 for t, v in self._versiones.items()}
+                self._entradas.clear()
+            else:
+                self._versiones[tabla] = self._versiones.get(tabla, 0) + 1
+
+    def clave(self, solicitud: Hashable, tablas: Sequence[str]) -> Tuple[Hashable, Tuple[int, ...]]:
+        """Clave de la solicitud con las versiones actuales de `tablas`"""
+        with self._lock:
+            return solicitud, tuple(self._versiones.get(tabla, 0) for tabla in tablas)
+
+    def obtener(self, clave: Hashable) -> Optional[Serializado]:
+        with self._lock:
+            serializado = self._entradas.get(clave)
+            if serializado is None:
+                self._contadores['fallos'] += 1
+            else:
+                self._entradas.move_to_end(clave)
+                self._contadores['aciertos'] += 1
+            return serializado
+
+    def guardar(self, clave: Hashable, serializado: Serializado) -> None:
+        """
+        Guarda bajo la clave calculada ANTES de consultar la base: si la tabla
+        cambió mientras tanto, la entrada ya nace con una versión vieja
+        """
+        with self._lock:
+            self._entradas[clave] = serializado
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self._maximo:
+                self._entradas.popitem(last=False)
+
+    def registrar_no_modificado(self) -> None:
+        with self._lock:
+            self._contadores['no_modificados'] += 1
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            consultas = self._contadores['aciertos'] + self._contadores['fallos']
+            return {
+                **self._contadores,
+                'tasa_aciertos': round(self._contadores['aciertos'] / consultas, 4) if consultas else None,
+                'entradas': len(self._entradas),
+                'maximo': self._maximo,
+                'versiones': dict(self._versiones)
+            }
+
+
+# Caché de respuestas de la aplicación activa
+cache_respuestas: CacheRespuestas = LocalProxy(lambda: current_app.extensions['cache_respuestas'])
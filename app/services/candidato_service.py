@@ -1,10 +1,13 @@
 from typing import List, Optional, Dict, Any
 from app.models import db, Candidato
 from .base_service import BaseService
+from .catalogo_service import catalogo_service
 
 class CandidatoService(BaseService):
     """Servicio para gestionar candidatos"""
 
+    filtros = ('id_categoria', 'id_partido')
+
     def __init__(self):
         super().__init__(Candidato)
 
@@ -23,4 +26,6 @@ class CandidatoService(BaseService):
         candidato = self.model(**data)
         db.session.add(candidato)
         db.session.commit()
-        return self._to_dict(candidato)
+        resultado = self._to_dict(candidato)
+        catalogo_service.invalidar('candidato')
+        return resultado
@@ -0,0 +1,192 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
+
+from app.models import db, TipoVoto, Categoria, PartidoPolitico, Candidato
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.local import LocalProxy
+
+logger = logging.getLogger(__name__)
+
+Fila = Mapping[str, Any]
+
+
+def como_id(valor: Any) -> Optional[int]:
+    """
+    Convierte `valor` en un ID: un entero JSON o un texto de solo dígitos ("1").
+    Retorna None si no puede ser un ID (bool, listas, "abc", ...).
+    """
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, int):
+        return valor
+    if isinstance(valor, str) and valor.isascii() and valor.isdigit():
+        try:
+            return int(valor)
+        except ValueError:
+            # Más dígitos de los que int() acepta convertir
+            return None
+    return None
+
+
+@dataclass(frozen=True)
+class Catalogo:
+    """
+    Instantánea inmutable de las tablas de referencia de la elección.
+    Cada recarga produce una instancia nueva con una versión mayor; los
+    lectores nunca ven una mezcla de dos versiones.
+    """
+    version: int
+    tipos_voto: Mapping[int, Fila]
+    categorias: Mapping[int, Fila]
+    partidos: Mapping[int, Fila]
+    candidatos: Mapping[int, Fila]
+
+    def id_tipo_voto(self, nombre_tipo: str) -> Optional[int]:
+        """Obtiene el ID de un tipo de voto por su nombre"""
+        for id_tipo_voto, tipo in self.tipos_voto.items():
+            if tipo['nombre_tipo'] == nombre_tipo:
+                return id_tipo_voto
+        return None
+
+    def podria_faltar(self, coleccion: str, clave: int) -> bool:
+        """
+        Indica si `clave` puede ser un registro creado después de esta versión:
+        no está y es mayor que los IDs conocidos (los IDs son crecientes)
+        """
+        filas = getattr(self, coleccion)
+        return clave not in filas and clave > max(filas, default=0)
+
+    def lista(self, coleccion: str) -> List[Dict[str, Any]]:
+        """Copia serializable de una colección, ordenada por ID"""
+        filas = getattr(self, coleccion)
+        return [dict(filas[clave]) for clave in sorted(filas)]
+
+    def categorias_disponibles(self) -> List[Dict[str, Any]]:
+        return [{'id': c['id_categoria'], 'nombre': c['nombre_categoria']} for c in self.lista('categorias')]
+
+    def partidos_disponibles(self) -> List[Dict[str, Any]]:
+        return [{'id': p['id_partido'], 'nombre': p['nombre_partido']} for p in self.lista('partidos')]
+
+
+def _indexar(modelo, clave: str) -> Mapping[int, Fila]:
+    return MappingProxyType({
+        getattr(entidad, clave): MappingProxyType(entidad.to_dict())
+        for entidad in modelo.query.all()
+    })
+
+
+class CatalogoService:
+    """
+    Catálogo en memoria de TIPO_VOTO, CATEGORIA, PARTIDO_POLITICO y CANDIDATO.
+
+    - Hay una instancia por aplicación (app.extensions['catalogo']); el resto
+      del código la usa a través de `catalogo_service`
+    - Se carga en create_app y se reemplaza completo (cambio atómico de referencia)
+    - Los servicios de administración llaman a invalidar() tras crear registros
+    - La invalidación llega a los demás workers mediante el notificador de la
+      aplicación (LISTEN/NOTIFY en PostgreSQL, NotificadorLocal en pruebas)
+    """
+
+    # Segundos mínimos entre recargas provocadas por IDs desconocidos
+    RECARGA_MINIMA = 1.0
+
+    COLECCIONES = {
+        'tipo_voto': 'tipos_voto',
+        'categoria': 'categorias',
+        'partido_politico': 'partidos',
+        'candidato': 'candidatos',
+    }
+
+    def __init__(self):
+        self._catalogo: Optional[Catalogo] = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._recarga_por_fallo = float('-inf')
+        self._app = None
+        self._notificador = None
+
+    def init_app(self, app, notificador) -> None:
+        self._app = app
+        self._notificador = notificador
+        notificador.suscribir(self._al_notificar)
+        app.extensions['catalogo'] = self
+
+        with app.app_context():
+            try:
+                self.recargar()
+            except SQLAlchemyError:
+                # Tablas aún no creadas (init_db.py, primer arranque): carga diferida
+                db.session.rollback()
+                logger.warning('Catálogo de referencia no disponible al iniciar; se cargará al primer uso')
+
+    def actual(self) -> Catalogo:
+        """Retorna la versión vigente del catálogo (la carga si aún no existe)"""
+        catalogo = self._catalogo
+        if catalogo is None:
+            catalogo = self.recargar()
+        return catalogo
+
+    def recargar(self) -> Catalogo:
+        """Lee las tablas de referencia y publica una nueva versión del catálogo"""
+        tipos_voto = _indexar(TipoVoto, 'id_tipo_voto')
+        categorias = _indexar(Categoria, 'id_categoria')
+        partidos = _indexar(PartidoPolitico, 'id_partido')
+        candidatos = _indexar(Candidato, 'id_candidato')
+
+        with self._lock:
+            self._version += 1
+            self._catalogo = Catalogo(self._version, tipos_voto, categorias, partidos, candidatos)
+            return self._catalogo
+
+    def recargar_por_fallo(self) -> Catalogo:
+        """
+        Recarga porque se pidió un ID que podría ser más nuevo que el catálogo
+        (creado en otro worker, notificación aún en camino). A lo sumo una vez
+        cada RECARGA_MINIMA segundos: los IDs los elige el cliente
+        """
+        ahora = time.monotonic()
+        with self._lock:
+            if ahora - self._recarga_por_fallo < self.RECARGA_MINIMA:
+                return self._catalogo
+            self._recarga_por_fallo = ahora
+        return self.recargar()
+
+    def resolver(self, coleccion: str, clave: Any) -> Optional[Fila]:
+        """
+        Busca un registro en el catálogo por su ID (entero o texto numérico).
+        Retorna None si no existe o si `clave` no es un ID. Ante un fallo con
+        un ID que podría ser nuevo (Catalogo.podria_faltar) recarga una vez
+        (recargar_por_fallo).
+        """
+        clave = como_id(clave)
+        if clave is None:
+            return None
+        catalogo = self.actual()
+        fila = getattr(catalogo, coleccion).get(clave)
+        if fila is None and catalogo.podria_faltar(coleccion, clave):
+            fila = getattr(self.recargar_por_fallo(), coleccion).get(clave)
+        return fila
+
+    def invalidar(self, tabla: str) -> None:
+        """
+        Avisa del cambio en `tabla` a los suscriptores de este proceso (este
+        catálogo y la caché de respuestas) y a los demás workers
+        """
+        if self._notificador is None:
+            self.recargar()
+        else:
+            self._notificador.emitir(tabla)
+
+    def _al_notificar(self, tabla: str) -> None:
+        if tabla in self.COLECCIONES or tabla == '*':
+            with self._app.app_context():
+                self.recargar()
+
+
+# Catálogo de la aplicación activa
+catalogo_service: CatalogoService = LocalProxy(lambda: current_app.extensions['catalogo'])
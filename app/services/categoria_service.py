@@ -1,6 +1,7 @@
 from typing import List, Optional, Dict, Any
 from app.models import db, Categoria
 from .base_service import BaseService
+from .catalogo_service import catalogo_service
 
 class CategoriaService(BaseService):
     """Servicio para gestionar categorías de votación"""
@@ -23,4 +24,6 @@ class CategoriaService(BaseService):
         categoria = self.model(**data)
         db.session.add(categoria)
         db.session.commit()
-        return self._to_dict(categoria)
+        resultado = self._to_dict(categoria)
+        catalogo_service.invalidar('categoria')
+        return resultado
@@ -0,0 +1,69 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .catalogo_service import catalogo_service, Catalogo
+from .serializacion import Serializado
+
+
+class CedulaService:
+    """
+    Definición completa de la cédula en un solo documento: categorías, partidos
+    (con logo) y candidatos ya agrupados por categoría y partido.
+
+    Se arma desde el catálogo en memoria y se serializa una vez por versión del
+    catálogo; las peticiones siguientes solo envían los bytes ya codificados.
+    """
+
+    def __init__(self):
+        self._cache: Optional[Tuple[Catalogo, Serializado]] = None
+        self._lock = threading.Lock()
+
+    def obtener(self) -> Serializado:
+        """Cédula serializada de la versión vigente del catálogo"""
+        catalogo = catalogo_service.actual()
+        cache = self._cache
+        if cache is not None and cache[0] is catalogo:
+            return cache[1]
+
+        with self._lock:
+            cache = self._cache
+            if cache is None or cache[0] is not catalogo:
+                cache = (catalogo, Serializado.desde(self.armar(catalogo)))
+                self._cache = cache
+            return cache[1]
+
+    @staticmethod
+    def armar(catalogo: Catalogo) -> Dict[str, Any]:
+        """
+        {
+            "categorias": [
+                {"categoria": {...}, "partidos": [{"partido": {...}, "candidatos": [...]}]}
+            ],
+            "partidos": [...],
+            "tipos_voto": [...]
+        }
+        Partidos ordenados por ID; candidatos por ID dentro de cada partido.
+        """
+        agrupados: Dict[int, Dict[int, List[Dict[str, Any]]]] = {}
+        for candidato in catalogo.lista('candidatos'):
+            agrupados.setdefault(candidato['id_categoria'], {}) \
+                .setdefault(candidato['id_partido'], []).append(candidato)
+
+        return {
+            'categorias': [
+                {
+                    'categoria': categoria,
+                    'partidos': [
+                        {'partido': dict(catalogo.partidos[id_partido]), 'candidatos': candidatos}
+                        for id_partido, candidatos in sorted(agrupados.get(categoria['id_categoria'], {}).items())
+                        if id_partido in catalogo.partidos
+                    ]
+                }
+                for categoria in catalogo.lista('categorias')
+            ],
+            'partidos': catalogo.lista('partidos'),
+            'tipos_voto': catalogo.lista('tipos_voto')
+        }
+
+
+cedula_service = CedulaService()
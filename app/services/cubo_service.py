@@ -0,0 +1,274 @@
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from app.models import db, ConteoRegion
+from flask import current_app
+from sqlalchemy import select, func
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.local import LocalProxy
+from .resultado_service import PARTIDO_EN_BLANCO
+
+logger = logging.getLogger(__name__)
+
+# Ejes del cubo, en el orden de sus dimensiones
+EJES = ('region', 'categoria', 'partido')
+
+
+class CuboService:
+    """
+    Cubo de resultados en memoria: ndarray int64 indexado por
+    [región, categoría, partido] (el partido PARTIDO_EN_BLANCO es el voto en
+    blanco de la categoría).
+
+    - Hay una instancia por aplicación (app.extensions['cubo']); el resto del
+      código la usa a través de `cubo_service`
+    - Se construye en create_app leyendo CONTEO_REGION en bloques (yield_per)
+    - VotoService lo incrementa después de cada commit del propio worker
+    - Los votos de otros workers se incorporan reconstruyendo el cubo cuando su
+      total difiere del de la base, comprobado cada CUBO_INTERVALO segundos.
+      CONTEO_REGION es un agregado (regiones × categorías × partidos ×
+      fragmentos): reconstruir no recorre los votos
+    - Una reconstrucción no cuenta dos veces ni pierde los votos del propio
+      worker: VotoService confirma dentro de registro(), que espera mientras
+      la reconstrucción fija la instantánea de su lectura; los incrementos
+      que llegan durante la lectura se vuelven a aplicar sobre el cubo nuevo
+    - POST /api/resultados/reconstruir avisa a los demás workers por el
+      notificador ('conteo'): reconstruyen en su próxima consulta
+    - Las consultas son reducciones de NumPy sobre el arreglo, sin SQL
+    """
+
+    def __init__(self):
+        self._indices: Dict[str, Dict[Any, int]] = {eje: {} for eje in EJES}
+        self._datos = np.zeros((0, 0, 0), dtype=np.int64)
+        self._sincronizado = 0.0
+        # Reconstruir en la próxima consulta aunque el total coincida
+        self._obsoleto = False
+        self._lock = threading.Lock()
+        # Una reconstrucción a la vez
+        self._reconstruyendo = threading.Lock()
+        # Commits de votos en curso y si una reconstrucción está fijando su lectura
+        self._barrera = threading.Condition()
+        self._en_curso = 0
+        self._fijando = False
+        # Incrementos registrados mientras una reconstrucción lee (None si no hay)
+        self._capturados: Optional[List[list]] = None
+
+    def init_app(self, app, notificador) -> None:
+        app.extensions['cubo'] = self
+        notificador.suscribir(self._al_notificar)
+
+        with app.app_context():
+            try:
+                self.reconstruir()
+            except SQLAlchemyError:
+                # Tablas aún no creadas (init_db.py, primer arranque): se construye al primer uso
+                db.session.rollback()
+                logger.warning('Cubo de resultados no disponible al iniciar; se construirá al primer uso')
+
+    def _al_notificar(self, tabla: str) -> None:
+        if tabla in ('conteo', '*'):
+            # Los conteos se reconstruyeron en otro worker: el total puede no cambiar
+            self._obsoleto = True
+
+    @contextmanager
+    def registro(self):
+        """
+        Envuelve el commit de un voto y su registrar(): mientras una
+        reconstrucción fija su lectura, el commit espera. Así cada voto del
+        worker queda antes de la instantánea (lo cuenta la lectura) o después
+        (lo suma registrar), nunca en ambos
+        """
+        with self._barrera:
+            while self._fijando:
+                self._barrera.wait()
+            self._en_curso += 1
+        try:
+            yield
+        finally:
+            with self._barrera:
+                self._en_curso -= 1
+                self._barrera.notify_all()
+
+    def reconstruir(self) -> Dict[str, Any]:
+        """Lee CONTEO_REGION (sumando fragmentos) en bloques y reemplaza el cubo completo"""
+        with self._reconstruyendo:
+            return self._reconstruir()
+
+    def _reconstruir(self) -> Dict[str, Any]:
+        self._obsoleto = False
+        consulta = (
+            select(ConteoRegion.region, ConteoRegion.id_categoria, ConteoRegion.id_partido,
+                   func.sum(ConteoRegion.cantidad))
+            .group_by(ConteoRegion.region, ConteoRegion.id_categoria, ConteoRegion.id_partido)
+            .execution_options(yield_per=current_app.config['CUBO_BLOQUE'])
+        )
+        # Sin commits del worker en curso mientras se fija la instantánea de la lectura
+        with self._barrera:
+            self._fijando = True
+            while self._en_curso:
+                self._barrera.wait()
+        try:
+            with self._lock:
+                self._capturados = []
+            try:
+                resultado = db.session.execute(consulta)
+            finally:
+                with self._barrera:
+                    self._fijando = False
+                    self._barrera.notify_all()
+            indices, datos = self._leer(resultado)
+        except Exception:
+            with self._lock:
+                self._capturados = None
+            raise
+
+        with self._lock:
+            self._indices = indices
+            self._datos = datos
+            # Votos del worker confirmados después de la instantánea
+            capturados, self._capturados = self._capturados, None
+            for conteos in capturados:
+                self._sumar(conteos)
+            self._sincronizado = time.monotonic()
+        return self.memoria()
+
+    @staticmethod
+    def _leer(resultado) -> Tuple[Dict[str, Dict[Any, int]], np.ndarray]:
+        """Arma índices y arreglo desde las filas (región, categoría, partido, cantidad)"""
+        indices: Dict[str, Dict[Any, int]] = {eje: {} for eje in EJES}
+        celdas: List[np.ndarray] = []
+        cantidades: List[np.ndarray] = []
+        for bloque in resultado.partitions():
+            celdas.append(np.array(
+                [
+                    [indices[eje].setdefault(clave, len(indices[eje])) for eje, clave in zip(EJES, fila[:3])]
+                    for fila in bloque
+                ],
+                dtype=np.intp
+            ))
+            cantidades.append(np.fromiter((fila[3] for fila in bloque), dtype=np.int64, count=len(bloque)))
+
+        datos = np.zeros(tuple(len(indices[eje]) for eje in EJES), dtype=np.int64)
+        if celdas:
+            celdas_todas = np.concatenate(celdas)
+            np.add.at(datos, tuple(celdas_todas.T), np.concatenate(cantidades))
+        return indices, datos
+
+    def registrar(self, conteos: Iterable[Tuple[Tuple[str, int, Optional[int]], int]]) -> None:
+        """
+        Suma votos ya confirmados (después del commit, dentro de registro()).
+
+        :param conteos: pares ((region, id_categoria, id_partido o None), cantidad)
+        """
+        conteos = list(conteos)
+        with self._lock:
+            self._sumar(conteos)
+            if self._capturados is not None:
+                self._capturados.append(conteos)
+
+    def _sumar(self, conteos: list) -> None:
+        """Suma `conteos` al arreglo vigente (llamar con el lock)"""
+        for (region, id_categoria, id_partido), cantidad in conteos:
+            celda = (
+                self._indice('region', region),
+                self._indice('categoria', id_categoria),
+                self._indice('partido', PARTIDO_EN_BLANCO if id_partido is None else id_partido)
+            )
+            self._datos[celda] += cantidad
+
+    def _indice(self, eje: str, clave: Any) -> int:
+        """Posición de `clave` en el eje; agranda el arreglo si es nueva (llamar con el lock)"""
+        indices = self._indices[eje]
+        posicion = indices.get(clave)
+        if posicion is None:
+            posicion = indices[clave] = len(indices)
+            forma = list(self._datos.shape)
+            forma[EJES.index(eje)] = 1
+            self._datos = np.concatenate(
+                (self._datos, np.zeros(forma, dtype=np.int64)), axis=EJES.index(eje)
+            )
+        return posicion
+
+    def _vigente(self) -> Tuple[Dict[str, Dict[Any, int]], np.ndarray]:
+        """
+        Retorna copias de (índices, datos) tomadas juntas: un registrar()
+        posterior que agregue claves no cambia la forma de lo retornado.
+        Cada CUBO_INTERVALO segundos compara el total con CONTEO_REGION y
+        reconstruye si otro worker registró votos.
+        """
+        if self._obsoleto:
+            self.reconstruir()
+        elif time.monotonic() - self._sincronizado > current_app.config['CUBO_INTERVALO']:
+            total_base = db.session.execute(
+                select(func.coalesce(func.sum(ConteoRegion.cantidad), 0))
+            ).scalar()
+            if int(total_base) != int(self._datos.sum()):
+                self.reconstruir()
+            else:
+                self._sincronizado = time.monotonic()
+        with self._lock:
+            return {eje: dict(indice) for eje, indice in self._indices.items()}, self._datos.copy()
+
+    def consultar(self, regiones: Optional[Sequence[str]] = None,
+                  categorias: Optional[Sequence[int]] = None,
+                  partidos: Optional[Sequence[int]] = None,
+                  por: Sequence[str] = ()) -> Dict[str, Any]:
+        """
+        Corta el cubo y suma los ejes que no están en `por`.
+
+        Ejemplos: total nacional por categoría (por=['categoria']), una región
+        (regiones=['Lima'], por=['categoria', 'partido']), un partido en todas
+        las regiones (partidos=[3], por=['region']).
+
+        Retorna {'por': [...], 'valores': ...}: un entero si `por` está vacío,
+        o diccionarios anidados en el orden de EJES ({región: {categoría: n}}).
+        Los filtros con claves que el cubo no conoce se ignoran.
+        """
+        por = [eje for eje in EJES if eje in por]
+        indices, datos = self._vigente()
+
+        claves_por_eje = []
+        for eje, filtro in zip(EJES, (regiones, categorias, partidos)):
+            claves = sorted(indices[eje], key=indices[eje].get) if filtro is None else \
+                [clave for clave in filtro if clave in indices[eje]]
+            claves_por_eje.append(claves)
+
+        corte = datos[np.ix_(*(
+            np.array([indices[eje][clave] for clave in claves], dtype=np.intp)
+            for eje, claves in zip(EJES, claves_por_eje)
+        ))]
+        reducido = corte.sum(axis=tuple(i for i, eje in enumerate(EJES) if eje not in por))
+
+        claves_resultado = [claves for eje, claves in zip(EJES, claves_por_eje) if eje in por]
+        return {'por': por, 'valores': self._anidar(reducido, claves_resultado)}
+
+    @classmethod
+    def _anidar(cls, arreglo: np.ndarray, claves: List[List[Any]]):
+        if not claves:
+            return int(arreglo)
+        return {clave: cls._anidar(arreglo[i], claves[1:]) for i, clave in enumerate(claves[0])}
+
+    def memoria(self) -> Dict[str, Any]:
+        """Huella en memoria del cubo: arreglo NumPy más los índices de cada eje"""
+        with self._lock:
+            datos = self._datos
+            bytes_indices = sum(
+                sys.getsizeof(indice) + sum(sys.getsizeof(clave) for clave in indice)
+                for indice in self._indices.values()
+            )
+        return {
+            'forma': dict(zip(EJES, datos.shape)),
+            'dtype': str(datos.dtype),
+            'bytes_datos': int(datos.nbytes),
+            'bytes_indices': int(bytes_indices),
+            'total': int(datos.sum())
+        }
+
+
+# Cubo de la aplicación activa
+cubo_service: CuboService = LocalProxy(lambda: current_app.extensions['cubo'])
@@ -1,6 +1,9 @@
 from typing import List, Dict, Any, Optional
 from app.models import db, Cuestionario, Respuesta, Pregunta, Opcion
 from .base_service import BaseService
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from app.metricas import cuestionarios_enviados
 
 
 class CuestionarioService(BaseService):
@@ -29,7 +32,9 @@ class CuestionarioService(BaseService):
 
     def get_by_id_con_respuestas(self, cuestionario_id: int) -> Optional[Dict[str, Any]]:
         """Obtiene un cuestionario con sus respuestas (sin indicar correctas)"""
-        cuestionario = self.model.query.get(cuestionario_id)
+        cuestionario = db.session.get(
+            self.model, cuestionario_id, options=[joinedload(Cuestionario.respuestas)]
+        )
         if not cuestionario:
             return None
 
@@ -57,26 +62,35 @@ class CuestionarioService(BaseService):
         if not respuestas_data:
             raise ValueError('Debe proporcionar al menos una respuesta')
 
-        # Validar referencias
+        # Validar referencias: una consulta para las preguntas y otra para las
+        # opciones del cuestionario completo, en lugar de dos por respuesta
         for resp in respuestas_data:
-            id_pregunta = resp.get('id_pregunta')
-            id_opcion = resp.get('id_opcion')
-
-            if not id_pregunta or not id_opcion:
+            if not resp.get('id_pregunta') or not resp.get('id_opcion'):
                 raise ValueError('Cada respuesta debe tener id_pregunta e id_opcion')
 
+        preguntas = set(db.session.execute(
+            select(Pregunta.id_pregunta)
+            .where(Pregunta.id_pregunta.in_({resp['id_pregunta'] for resp in respuestas_data}))
+        ).scalars())
+        opciones = dict(db.session.execute(
+            select(Opcion.id_opcion, Opcion.id_pregunta)
+            .where(Opcion.id_opcion.in_({resp['id_opcion'] for resp in respuestas_data}))
+        ).all())
+
+        for resp in respuestas_data:
+            id_pregunta = resp['id_pregunta']
+            id_opcion = resp['id_opcion']
+
             # Verificar que la pregunta existe
-            pregunta = Pregunta.query.get(id_pregunta)
-            if not pregunta:
+            if id_pregunta not in preguntas:
                 raise ValueError(f'La pregunta con ID {id_pregunta} no existe')
 
             # Verificar que la opción existe
-            opcion = Opcion.query.get(id_opcion)
-            if not opcion:
+            if id_opcion not in opciones:
                 raise ValueError(f'La opción con ID {id_opcion} no existe')
 
             # Verificar que la opción pertenece a la pregunta
-            if opcion.id_pregunta != id_pregunta:
+            if opciones[id_opcion] != id_pregunta:
                 raise ValueError(
                     f'La opción {id_opcion} no pertenece a la pregunta {id_pregunta}'
                 )
@@ -96,6 +110,7 @@ class CuestionarioService(BaseService):
             db.session.add(respuesta)
 
         db.session.commit()
+        cuestionarios_enviados.inc()
 
         return {
             'id_cuestionario': cuestionario.id_cuestionario,
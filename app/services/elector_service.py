@@ -1,6 +1,10 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from app.models import db, Elector, Voto
 from .base_service import BaseService
+from .sql_utils import en_lista
+from .indice_dni_service import indice_dni_service
+from .notificador import notificador
+from sqlalchemy import select
 
 class ElectorService(BaseService):
     """
@@ -9,6 +13,10 @@ class ElectorService(BaseService):
     sin romper el contrato establecido.
     """
 
+    filtros = ('region', 'distrito')
+    # El único índice con distrito es ix_elector_region_distrito_dni: sin region se recorrería la tabla
+    filtros_dependientes = {'distrito': ('region',)}
+
     def __init__(self):
         super().__init__(Elector)
 
@@ -27,11 +35,18 @@ class ElectorService(BaseService):
         elector = self.model(**data)
         db.session.add(elector)
         db.session.commit()
-        return self._to_dict(elector)
+        resultado = self._to_dict(elector)
+        indice_dni_service.registrar_elector(elector.dni)
+        notificador.publicar('elector')
+        return resultado
 
     def verificar_estado_voto(self, dni: str) -> Dict[str, Any]:
         """
         Verifica si un DNI existe en la base de datos y si ya ha votado.
+
+        Un DNI que no está en el índice en memoria (IndiceDniService) se
+        responde sin consultar la base; si existe, elector y voto se leen en
+        una sola consulta.
         
         Args:
             dni: DNI del elector a verificar
@@ -43,10 +58,16 @@ class ElectorService(BaseService):
             - elector: dict (datos del elector si existe)
             - message: str (mensaje descriptivo)
         """
-        # Verificar si el elector existe
-        elector = self.model.query.get(dni)
-        
-        if not elector:
+        estado = indice_dni_service.consultar(dni)
+        fila = None
+        if estado is None or estado[0]:
+            fila = db.session.execute(
+                select(Elector, Voto.id_voto, Voto.fecha)
+                .outerjoin(Voto, Voto.dni == Elector.dni)
+                .where(Elector.dni == dni)
+            ).first()
+
+        if not fila:
             return {
                 'exists': False,
                 'has_voted': False,
@@ -54,18 +75,19 @@ class ElectorService(BaseService):
                 'message': 'DNI no registrado en la base de datos'
             }
         
-        # Verificar si ya votó
-        voto = Voto.query.filter_by(dni=dni).first()
-        has_voted = voto is not None
-        
-        if has_voted:
+        elector, id_voto, fecha = fila
+        if estado is None:
+            indice_dni_service.registrar_elector(dni)
+
+        if id_voto is not None:
+            indice_dni_service.registrar_votos([dni])
             return {
                 'exists': True,
                 'has_voted': True,
                 'elector': self._to_dict(elector),
                 'voto': {
-                    'fecha': voto.fecha.isoformat(),
-                    'id_voto': voto.id_voto
+                    'fecha': fecha.isoformat(),
+                    'id_voto': id_voto
                 },
                 'message': 'Este DNI ya ha registrado su voto'
             }
@@ -76,3 +98,35 @@ class ElectorService(BaseService):
             'elector': self._to_dict(elector),
             'message': 'DNI verificado. Puede proceder a votar'
         }
+
+    def verificar_lote(self, dnis: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Verifica una lista de DNIs (cola de una mesa) con una sola consulta:
+        ELECTOR LEFT JOIN VOTO filtrado por `dni = ANY(:dnis)` en PostgreSQL.
+
+        Retorna un resultado por DNI recibido, en el mismo orden:
+        {"dni": "12345678", "exists": true, "has_voted": true,
+         "id_voto": 10, "fecha": "2026-04-12T09:15:00"}
+        (id_voto y fecha son null si el DNI no votó)
+        """
+        estados = {
+            dni: (id_voto, fecha)
+            for dni, id_voto, fecha in db.session.execute(
+                select(Elector.dni, Voto.id_voto, Voto.fecha)
+                .select_from(Elector)
+                .outerjoin(Voto, Voto.dni == Elector.dni)
+                .where(en_lista(Elector.dni, set(dnis)))
+            )
+        }
+
+        resultados = []
+        for dni in dnis:
+            id_voto, fecha = estados.get(dni, (None, None))
+            resultados.append({
+                'dni': dni,
+                'exists': dni in estados,
+                'has_voted': id_voto is not None,
+                'id_voto': id_voto,
+                'fecha': fecha.isoformat() if fecha else None
+            })
+        return resultados
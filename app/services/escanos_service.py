@@ -0,0 +1,260 @@
+import heapq
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as TiempoAgotadoError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from app.models import db, Elector, ConteoRegion
+from flask import current_app
+from sqlalchemy import select, func
+from .catalogo_service import catalogo_service
+from .resultado_service import resultado_service, PARTIDO_EN_BLANCO
+from .preferencial_service import preferencial_service
+
+
+class CalculoEscanosError(Exception):
+    """El cálculo de la asignación no terminó a tiempo o falló en el pool de procesos"""
+
+
+def cifra_repartidora(votos: Dict[int, int], escanos: int) -> Dict[int, int]:
+    """
+    Reparte `escanos` entre partidos con la serie de divisores 1, 2, 3...
+    (D'Hondt / cifra repartidora). Empates: gana el partido con más votos
+    y luego el de menor ID, para que el resultado sea determinista.
+    """
+    asignados = {id_partido: 0 for id_partido in votos}
+    cocientes = [(-cantidad, -cantidad, id_partido) for id_partido, cantidad in votos.items() if cantidad > 0]
+    heapq.heapify(cocientes)
+    for _ in range(escanos):
+        if not cocientes:
+            break
+        _, total_negativo, id_partido = heapq.heappop(cocientes)
+        asignados[id_partido] += 1
+        heapq.heappush(cocientes, (total_negativo / (asignados[id_partido] + 1), total_negativo, id_partido))
+    return {id_partido: cantidad for id_partido, cantidad in asignados.items() if cantidad}
+
+
+def repartir_escanos_distritos(electores: Dict[str, int], total: int, minimo: int = 1) -> Dict[str, int]:
+    """
+    Distribuye `total` escaños entre distritos en proporción a sus electores
+    (resto mayor), garantizando `minimo` escaños por distrito.
+    """
+    if not electores:
+        return {}
+    distritos = sorted(electores)
+    escanos = {distrito: minimo for distrito in distritos}
+    restantes = total - minimo * len(distritos)
+    padron = sum(electores.values())
+    if restantes <= 0 or padron == 0:
+        return escanos
+
+    cuotas = {distrito: restantes * electores[distrito] / padron for distrito in distritos}
+    for distrito in distritos:
+        escanos[distrito] += int(cuotas[distrito])
+    faltantes = total - sum(escanos.values())
+    for distrito in sorted(distritos, key=lambda d: (-(cuotas[d] % 1), d))[:faltantes]:
+        escanos[distrito] += 1
+    return escanos
+
+
+def calcular_asignacion(entrada: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Cálculo completo de la asignación de una categoría. Solo usa datos
+    serializables para poder ejecutarse en el pool de procesos.
+
+    entrada = {
+        'escanos_por_distrito': {distrito: escanos},
+        'votos': {distrito: {id_partido: votos}},
+        'umbral': 0.05,
+        'candidatos': {id_partido: [candidato, ...]}  # en orden preferencial
+    }
+    """
+    inicio = time.perf_counter()
+    votos_nacionales: Dict[int, int] = {}
+    for votos_distrito in entrada['votos'].values():
+        for id_partido, cantidad in votos_distrito.items():
+            votos_nacionales[id_partido] = votos_nacionales.get(id_partido, 0) + cantidad
+
+    total_validos = sum(votos_nacionales.values())
+    habilitados = {
+        id_partido for id_partido, cantidad in votos_nacionales.items()
+        if total_validos and cantidad / total_validos >= entrada['umbral']
+    }
+
+    distritos = []
+    escanos_por_partido: Dict[int, int] = {}
+    for distrito, escanos in sorted(entrada['escanos_por_distrito'].items()):
+        votos_distrito = {
+            id_partido: cantidad
+            for id_partido, cantidad in entrada['votos'].get(distrito, {}).items()
+            if id_partido in habilitados
+        }
+        asignados = cifra_repartidora(votos_distrito, escanos)
+        for id_partido, cantidad in asignados.items():
+            escanos_por_partido[id_partido] = escanos_por_partido.get(id_partido, 0) + cantidad
+        distritos.append({
+            'distrito': distrito,
+            'escanos': escanos,
+            'asignacion': [
+                {'id_partido': id_partido, 'escanos': cantidad}
+                for id_partido, cantidad in sorted(asignados.items(), key=lambda a: (-a[1], a[0]))
+            ]
+        })
+
+    partidos = [
+        {
+            'id_partido': id_partido,
+            'votos': votos_nacionales[id_partido],
+            'porcentaje': round(100 * votos_nacionales[id_partido] / total_validos, 3),
+            'supera_umbral': id_partido in habilitados,
+            'escanos': escanos_por_partido.get(id_partido, 0),
+            'electos': entrada['candidatos'].get(id_partido, [])[:escanos_por_partido.get(id_partido, 0)]
+        }
+        for id_partido in sorted(votos_nacionales, key=lambda p: (-votos_nacionales[p], p))
+    ]
+
+    return {
+        'total_validos': total_validos,
+        'partidos': partidos,
+        'distritos': distritos,
+        'milisegundos_calculo': round((time.perf_counter() - inicio) * 1000, 3)
+    }
+
+
+class EscanosService:
+    """
+    Asignación de escaños (cifra repartidora) para Diputado y Senador Regional.
+
+    Los distritos electorales son las regiones de los electores. El cálculo
+    corre en un pool de procesos, fuera del hilo de la petición, y el resultado
+    se guarda por versión de resultados: mientras se recalcula una versión
+    nueva se responde con la anterior.
+    """
+
+    # Segundos durante los que se reutiliza el conteo de electores por región
+    VIGENCIA_PADRON = 600
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cache: Dict[int, Dict[str, Any]] = {}
+        self._pendientes: Dict[int, Any] = {}
+        self._padron = (0.0, {})
+        self._lock = threading.Lock()
+
+    def categorias_con_escanos(self) -> Dict[int, int]:
+        """{id_categoria: escaños totales} según ESCANOS_POR_CATEGORIA"""
+        escanos = current_app.config['ESCANOS_POR_CATEGORIA']
+        return {
+            categoria['id_categoria']: escanos[categoria['nombre_categoria']]
+            for categoria in catalogo_service.actual().categorias.values()
+            if categoria['nombre_categoria'] in escanos
+        }
+
+    def obtener(self, id_categoria: int) -> Dict[str, Any]:
+        """
+        Asignación vigente de la categoría; si hay votos nuevos dispara el recálculo
+
+        :raises CalculoEscanosError: Sin asignación previa y el cálculo no
+            terminó en ESCANOS_TIMEOUT o falló
+        """
+        version = resultado_service.version()
+        en_cache = self._cache.get(id_categoria)
+        if en_cache and en_cache['version'] == version:
+            return en_cache
+
+        futuro = self._programar(id_categoria, version)
+        if en_cache:
+            return dict(en_cache, actualizando=True)
+        try:
+            resultado = futuro.result(timeout=current_app.config['ESCANOS_TIMEOUT'])
+        except TiempoAgotadoError:
+            # El cálculo sigue en curso: la próxima petición espera el mismo futuro
+            raise CalculoEscanosError('El cálculo de escaños no terminó a tiempo')
+        except Exception as e:
+            raise CalculoEscanosError(f'Falló el cálculo de escaños: {e}') from e
+        return dict(resultado, id_categoria=id_categoria, version=version)
+
+    def _pendiente(self, id_categoria: int, version: int) -> Optional[Future]:
+        pendiente = self._pendientes.get(id_categoria)
+        if pendiente and pendiente[0] == version:
+            return pendiente[1]
+        return None
+
+    def _programar(self, id_categoria: int, version: int) -> Future:
+        with self._lock:
+            futuro = self._pendiente(id_categoria, version)
+        if futuro is not None:
+            return futuro
+
+        # Las consultas (y el ranking preferencial, que puede recorrer la
+        # tabla) corren sin el lock; si otra petición programó la misma
+        # versión mientras tanto, se usa su futuro
+        entrada = self._entrada(id_categoria)
+        with self._lock:
+            futuro = self._pendiente(id_categoria, version)
+            if futuro is not None:
+                return futuro
+            if self._pool is None:
+                # spawn: los procesos no heredan la aplicación, las conexiones
+                # del pool ni los hilos del notificador del worker
+                self._pool = ProcessPoolExecutor(
+                    max_workers=current_app.config['ESCANOS_PROCESOS'],
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            pool = self._pool
+            futuro = pool.submit(calcular_asignacion, entrada)
+            self._pendientes[id_categoria] = (version, futuro)
+
+        def guardar(completado: Future):
+            error = completado.exception()
+            with self._lock:
+                if self._pendiente(id_categoria, version) is completado:
+                    del self._pendientes[id_categoria]
+                if error is None:
+                    self._cache[id_categoria] = dict(completado.result(), id_categoria=id_categoria, version=version)
+                elif isinstance(error, BrokenProcessPool) and self._pool is pool:
+                    # Un proceso murió: el próximo cálculo crea un pool nuevo
+                    self._pool = None
+                    pool.shutdown(wait=False)
+
+        futuro.add_done_callback(guardar)
+        return futuro
+
+    def _entrada(self, id_categoria: int) -> Dict[str, Any]:
+        """Reúne los datos del cálculo (consultas agregadas) en el hilo de la petición"""
+        votos: Dict[str, Dict[int, int]] = {}
+        for region, id_partido, cantidad in db.session.execute(
+            select(ConteoRegion.region, ConteoRegion.id_partido, func.sum(ConteoRegion.cantidad))
+            .where(ConteoRegion.id_categoria == id_categoria)
+            .where(ConteoRegion.id_partido != PARTIDO_EN_BLANCO)
+            .group_by(ConteoRegion.region, ConteoRegion.id_partido)
+        ):
+            votos.setdefault(region, {})[id_partido] = int(cantidad)
+
+        candidatos = {}
+        if id_categoria in preferencial_service.categorias_preferenciales():
+            for partido in preferencial_service.obtener_top(id_categoria)['partidos']:
+                candidatos[partido['id_partido']] = partido['candidatos']
+
+        return {
+            'escanos_por_distrito': repartir_escanos_distritos(
+                self._electores_por_region(), self.categorias_con_escanos()[id_categoria]
+            ),
+            'votos': votos,
+            'umbral': current_app.config['UMBRAL_ELECTORAL'],
+            'candidatos': candidatos
+        }
+
+    def _electores_por_region(self) -> Dict[str, int]:
+        momento, padron = self._padron
+        if time.monotonic() - momento > self.VIGENCIA_PADRON:
+            padron = dict(db.session.execute(
+                select(Elector.region, func.count()).group_by(Elector.region)
+            ).all())
+            self._padron = (time.monotonic(), padron)
+        return padron
+
+
+escanos_service = EscanosService()
@@ -0,0 +1,256 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+from app.models import db, Elector, Voto
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.local import LocalProxy
+
+logger = logging.getLogger(__name__)
+
+# DNIs de 8 dígitos: 10^8 valores posibles, un bit por DNI en el mapa de votos
+DNI_DIGITOS = 8
+DNI_MAXIMO = 10 ** DNI_DIGITOS
+
+
+def numero_dni(dni: Any) -> Optional[int]:
+    """DNI como entero si tiene exactamente 8 dígitos ASCII; None si no"""
+    dni = str(dni)
+    if len(dni) != DNI_DIGITOS or not dni.isascii() or not dni.isdigit():
+        return None
+    return int(dni)
+
+
+class IndiceDniService:
+    """
+    Índice compacto del padrón para responder "¿existe?" y "¿ya votó?" sin SQL.
+
+    - Los DNIs de 8 dígitos de ELECTOR se guardan como un arreglo int32
+      ordenado (búsqueda binaria); los votos, como un mapa de 10^8 bits (12,5 MB)
+    - Hay una instancia por aplicación (app.extensions['indice_dni']); el resto
+      del código la usa a través de `indice_dni_service`
+    - Se construye en create_app leyendo ELECTOR y VOTO en bloques (yield_per)
+    - VotoService marca los votos después de cada commit del propio worker; los
+      de otros workers se leen por id_voto creciente cada INDICE_DNI_INTERVALO
+      segundos, solo cuando una consulta encuentra el bit apagado
+    - ElectorService agrega los electores nuevos del propio worker y avisa a los
+      demás por el notificador; cada aviso relee los DNIs de ELECTOR en un hilo
+      de fondo (los avisos que llegan mientras tanto se juntan en una relectura
+      más) y hasta que termina las respuestas "no existe" se confirman contra
+      la base
+    - `consultar` retorna None cuando la respuesta debe salir de la base: DNI
+      no numérico (o de otro largo), índice desactivado o no construido
+    """
+
+    # Ids de voto que se releen hacia atrás en cada sincronización: una
+    # transacción con id menor puede confirmarse después de otra con id mayor
+    REVISION = 10_000
+
+    def __init__(self):
+        self._dnis = np.zeros(0, dtype=np.int32)
+        self._agregados = set()
+        self._votaron: Optional[np.ndarray] = None
+        self._electores_completos = False
+        self._ultimo_voto = 0
+        self._sincronizado = 0.0
+        self._lock = threading.Lock()
+        self._app = None
+        # Relectura de ELECTOR en segundo plano pedida por el notificador
+        self._relectura_pendiente = False
+        self._releyendo = False
+
+    def init_app(self, app, notificador) -> None:
+        self._app = app
+        app.extensions['indice_dni'] = self
+        if not app.config['INDICE_DNI']:
+            return
+        notificador.suscribir(self._al_notificar)
+
+        with app.app_context():
+            try:
+                self.reconstruir()
+            except SQLAlchemyError:
+                # Tablas aún no creadas (init_db.py, primer arranque): se construye al primer uso
+                db.session.rollback()
+                logger.warning('Índice de DNI no disponible al iniciar; se construirá al primer uso')
+
+    def _al_notificar(self, tabla: str) -> None:
+        if tabla == '*':
+            self._sincronizado = 0.0
+        if tabla not in ('elector', '*') or self._votaron is None:
+            return
+        with self._lock:
+            self._electores_completos = False
+            self._relectura_pendiente = True
+            if self._releyendo:
+                return
+            self._releyendo = True
+        threading.Thread(target=self._releer_electores, name='indice-dni-electores', daemon=True).start()
+
+    def _releer_electores(self) -> None:
+        """Hilo de fondo: relee ELECTOR hasta que no queden avisos sin atender"""
+        while True:
+            with self._lock:
+                if not self._relectura_pendiente:
+                    self._releyendo = False
+                    return
+                self._relectura_pendiente = False
+            try:
+                with self._app.app_context():
+                    dnis = self._leer_electores()
+            except Exception:
+                # Sigue confirmando contra la base; el próximo aviso reintenta
+                logger.exception('No se pudo releer ELECTOR para el índice de DNI')
+                with self._lock:
+                    self._releyendo = False
+                return
+            with self._lock:
+                self._reemplazar_electores(dnis)
+                # Un aviso llegado durante la lectura puede no estar en `dnis`
+                self._electores_completos = not self._relectura_pendiente
+
+    _numero = staticmethod(numero_dni)
+
+    @classmethod
+    def _numeros(cls, dnis: Sequence[str]) -> np.ndarray:
+        """DNIs de 8 dígitos ASCII como int64 (vectorizado); descarta los demás"""
+        try:
+            arreglo = np.array(dnis, dtype=f'S{DNI_DIGITOS + 1}')
+        except UnicodeEncodeError:
+            return np.fromiter((n for n in map(cls._numero, dnis) if n is not None), dtype=np.int64)
+        validos = (np.strings.str_len(arreglo) == DNI_DIGITOS) & np.strings.isdigit(arreglo)
+        return arreglo[validos].astype(np.int64)
+
+    def _leer_electores(self) -> np.ndarray:
+        """DNIs de ELECTOR como int32 ordenados, leídos en bloques"""
+        # Core sobre la conexión de la sesión: sin el costo de la capa ORM por fila
+        partes = [np.zeros(0, dtype=np.int32)]
+        consulta = select(Elector.__table__.c.dni).execution_options(yield_per=current_app.config['INDICE_DNI_BLOQUE'])
+        for filas in db.session.connection().execute(consulta).scalars().partitions():
+            partes.append(self._numeros(filas).astype(np.int32))
+        return np.unique(np.concatenate(partes))
+
+    def _reemplazar_electores(self, dnis: np.ndarray) -> None:
+        """Con el lock tomado: publica `dnis` conservando los agregados que la lectura no vio"""
+        self._dnis = dnis
+        self._agregados = {numero for numero in self._agregados if not self._contiene_en(dnis, numero)}
+
+    @staticmethod
+    def _contiene_en(dnis: np.ndarray, numero: int) -> bool:
+        # np.int32: con un int de Python NumPy convertiría todo el arreglo antes de buscar
+        posicion = int(dnis.searchsorted(np.int32(numero)))
+        return posicion < len(dnis) and int(dnis[posicion]) == numero
+
+    def reconstruir(self) -> Dict[str, Any]:
+        """Lee ELECTOR y VOTO en bloques y reemplaza el índice completo"""
+        dnis = self._leer_electores()
+
+        votaron = np.zeros(DNI_MAXIMO // 8, dtype=np.uint8)
+        ultimo_voto = 0
+        for ultimo_voto, numeros in self._leer_votos(0):
+            self._marcar(votaron, numeros)
+
+        with self._lock:
+            self._reemplazar_electores(dnis)
+            self._votaron = votaron
+            self._electores_completos = True
+            self._ultimo_voto = ultimo_voto
+            self._sincronizado = time.monotonic()
+        return self.memoria()
+
+    def _leer_votos(self, desde: int) -> Iterator[Tuple[int, np.ndarray]]:
+        """Entrega (mayor id_voto leído, DNIs como enteros) por bloque de votos con id_voto > desde"""
+        tabla = Voto.__table__
+        consulta = (
+            select(tabla.c.id_voto, tabla.c.dni)
+            .where(tabla.c.id_voto > desde)
+            .order_by(tabla.c.id_voto)
+            .execution_options(yield_per=current_app.config['INDICE_DNI_BLOQUE'])
+        )
+        for filas in db.session.connection().execute(consulta).partitions():
+            yield filas[-1][0], self._numeros([dni for _, dni in filas])
+
+    @staticmethod
+    def _marcar(votaron: np.ndarray, numeros: np.ndarray) -> None:
+        np.bitwise_or.at(votaron, numeros >> 3, (1 << (numeros & 7)).astype(np.uint8))
+
+    def _sincronizar_votos(self) -> None:
+        """Incorpora los votos registrados por otros workers desde la última lectura"""
+        bloques = list(self._leer_votos(max(0, self._ultimo_voto - self.REVISION)))
+        with self._lock:
+            for ultimo, numeros in bloques:
+                self._marcar(self._votaron, numeros)
+                self._ultimo_voto = max(self._ultimo_voto, ultimo)
+            self._sincronizado = time.monotonic()
+
+    def _listo(self) -> bool:
+        if not current_app.config['INDICE_DNI']:
+            return False
+        if self._votaron is None:
+            self.reconstruir()
+        return True
+
+    def _contiene(self, numero: int) -> bool:
+        return self._contiene_en(self._dnis, numero) or numero in self._agregados
+
+    def _voto(self, numero: int) -> bool:
+        return bool(self._votaron[numero >> 3] & (1 << (numero & 7)))
+
+    def consultar(self, dni: str) -> Optional[Tuple[bool, bool]]:
+        """
+        Retorna (existe, ya_voto) desde memoria, o None si hay que preguntar a
+        la base. Un "ya votó" es definitivo (los votos no se borran); un "no
+        votó" se confirma releyendo VOTO si pasaron más de INDICE_DNI_INTERVALO
+        segundos desde la última lectura.
+        """
+        numero = self._numero(dni)
+        if numero is None or not self._listo():
+            return None
+
+        # Antes de buscar: si la relectura termina en medio, `completos` sería del arreglo nuevo
+        completos = self._electores_completos
+        if not self._contiene(numero):
+            return (False, False) if completos else None
+
+        if self._voto(numero):
+            return True, True
+        if time.monotonic() - self._sincronizado > current_app.config['INDICE_DNI_INTERVALO']:
+            self._sincronizar_votos()
+        return True, self._voto(numero)
+
+    def registrar_elector(self, dni: str) -> None:
+        """Agrega un elector ya confirmado (después del commit)"""
+        numero = self._numero(dni)
+        if numero is not None:
+            with self._lock:
+                # Confirmado contra la base después de una relectura que ya lo incluyó
+                if not self._contiene_en(self._dnis, numero):
+                    self._agregados.add(numero)
+
+    def registrar_votos(self, dnis: Iterable[str]) -> None:
+        """Marca votos ya confirmados (después del commit)"""
+        if self._votaron is None:
+            return
+        numeros = self._numeros(list(dnis))
+        with self._lock:
+            self._marcar(self._votaron, numeros)
+
+    def memoria(self) -> Dict[str, Any]:
+        """Tamaño del índice: electores indexados, votos marcados y bytes usados"""
+        votaron = self._votaron
+        return {
+            'electores': int(len(self._dnis)) + len(self._agregados),
+            'votos': int(np.bitwise_count(votaron).sum()) if votaron is not None else 0,
+            'bytes_electores': int(self._dnis.nbytes),
+            'bytes_votos': int(votaron.nbytes) if votaron is not None else 0,
+            'electores_completos': self._electores_completos,
+            'ultimo_voto': self._ultimo_voto
+        }
+
+
+# Índice de DNI de la aplicación activa
+indice_dni_service: IndiceDniService = LocalProxy(lambda: current_app.extensions['indice_dni'])
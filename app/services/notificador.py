@@ -0,0 +1,165 @@
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+import weakref
+from typing import Callable, Dict, List
+
+from app.models import db
+from flask import current_app
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from werkzeug.local import LocalProxy
+
+logger = logging.getLogger(__name__)
+
+
+class NotificadorLocal:
+    """
+    Notificador en memoria: reparte los mensajes entre las aplicaciones del
+    mismo proceso. Sustituye a LISTEN/NOTIFY en pruebas y en SQLite.
+    """
+
+    _suscriptores: Dict[str, weakref.WeakSet] = {}
+
+    def __init__(self, canal: str):
+        self.canal = canal
+        self._callbacks: List[Callable[[str], None]] = []
+        self._suscriptores.setdefault(canal, weakref.WeakSet()).add(self)
+
+    def suscribir(self, callback: Callable[[str], None]) -> None:
+        """Registra una función que recibe el mensaje publicado por otro proceso"""
+        self._callbacks.append(callback)
+
+    def publicar(self, mensaje: str) -> None:
+        """Entrega el mensaje a todos los demás notificadores del canal"""
+        for notificador in list(self._suscriptores.get(self.canal, ())):
+            if notificador is not self:
+                notificador._entregar(mensaje)
+
+    def emitir(self, mensaje: str) -> None:
+        """
+        Entrega el mensaje a los suscriptores de este proceso (los errores se
+        propagan al llamador) y lo publica a los demás procesos
+        """
+        for callback in self._callbacks:
+            callback(mensaje)
+        self.publicar(mensaje)
+
+    def iniciar(self) -> None:
+        """Sin hilos que iniciar: los mensajes se entregan en publicar()"""
+
+    def _entregar(self, mensaje: str) -> None:
+        for callback in self._callbacks:
+            try:
+                callback(mensaje)
+            except Exception:
+                logger.exception('Error procesando la notificación %r', mensaje)
+
+
+class NotificadorPostgres(NotificadorLocal):
+    """
+    Notificador entre workers basado en LISTEN/NOTIFY de PostgreSQL.
+    Cada proceso mantiene una conexión dedicada (fuera del pool) escuchando
+    el canal en un hilo daemon; publicar es un pg_notify transaccional.
+
+    El hilo no se inicia al crear la aplicación sino con iniciar(): en cada
+    worker de gunicorn (app.arranque.iniciar_worker) o antes de la primera
+    solicitud del proceso. Así el maestro con preload_app y los procesos
+    creados con fork (pools de cálculo) no abren conexiones LISTEN.
+    """
+
+    INTERVALO_ESPERA = 5
+    INTERVALO_RECONEXION = 2
+
+    def __init__(self, canal: str, app):
+        self.canal = canal
+        self._callbacks = []
+        self._app = app
+        # Proceso cuyo hilo escucha (los hilos no sobreviven a fork())
+        self._pid = None
+        self._lock = threading.Lock()
+        # Identifica a este proceso para ignorar sus propias notificaciones
+        self.origen = uuid.uuid4().hex
+
+    def iniciar(self) -> None:
+        """Inicia el hilo LISTEN de este proceso si aún no escucha (idempotente)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.origen = uuid.uuid4().hex
+            threading.Thread(target=self._escuchar, name=f'listen-{self.canal}', daemon=True).start()
+            self._pid = os.getpid()
+
+    def publicar(self, mensaje: str) -> None:
+        db.session.execute(
+            text('SELECT pg_notify(:canal, :carga)'),
+            {'canal': self.canal, 'carga': f'{self.origen}:{mensaje}'}
+        )
+        db.session.commit()
+
+    def _conectar(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        if self._app.config.get('NOTIFICADOR_URL'):
+            url = make_url(self._app.config['NOTIFICADOR_URL'])
+        else:
+            with self._app.app_context():
+                url = db.engine.url
+        conexion = psycopg2.connect(**url.translate_connect_args(username='user', database='dbname'))
+        conexion.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conexion.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.canal}"')
+        return conexion
+
+    def _escuchar(self) -> None:
+        reconexion = False
+        while True:
+            try:
+                conexion = self._conectar()
+                if reconexion:
+                    # Pudimos perder notificaciones mientras no había conexión
+                    self._entregar('*')
+                reconexion = True
+                while True:
+                    if select.select([conexion], [], [], self.INTERVALO_ESPERA) == ([], [], []):
+                        continue
+                    conexion.poll()
+                    while conexion.notifies:
+                        origen, _, mensaje = conexion.notifies.pop(0).payload.partition(':')
+                        if origen != self.origen:
+                            self._entregar(mensaje)
+            except Exception:
+                logger.exception('Conexión LISTEN del canal %s perdida; reintentando', self.canal)
+                time.sleep(self.INTERVALO_RECONEXION)
+
+
+def crear_notificador(app):
+    """
+    Crea el notificador de la aplicación según NOTIFICADOR_BACKEND:
+    'postgres', 'local' o 'auto' (postgres si la base es PostgreSQL).
+    """
+    backend = app.config.get('NOTIFICADOR_BACKEND', 'auto')
+    canal = app.config.get('NOTIFICADOR_CANAL', 'cambios_referencia')
+    if backend == 'auto':
+        es_postgres = app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql')
+        backend = 'postgres' if es_postgres else 'local'
+        if backend == 'postgres' and app.config.get('DB_PGBOUNCER') and not app.config.get('NOTIFICADOR_URL'):
+            logger.warning('DB_PGBOUNCER sin NOTIFICADOR_URL: LISTEN no funciona a través de PgBouncer en modo '
+                           'transacción; el catálogo solo se invalida en el worker que lo modifica')
+            backend = 'local'
+
+    notificador = NotificadorPostgres(canal, app) if backend == 'postgres' else NotificadorLocal(canal)
+    app.extensions['notificador'] = notificador
+    # Servidor de desarrollo y scripts; en gunicorn lo inicia iniciar_worker
+    app.before_request(notificador.iniciar)
+    return notificador
+
+
+# Notificador de la aplicación activa (cambios en tablas de referencia)
+notificador = LocalProxy(lambda: current_app.extensions['notificador'])
@@ -0,0 +1,352 @@
+"""
+Importación masiva del padrón electoral desde CSV o ancho fijo.
+
+El archivo se lee en flujo, una sola pasada: cada fila se valida (formato del
+DNI, campos obligatorios, largo, DNI repetido en el archivo) y las válidas se
+acumulan en bloques. Cada bloque se copia a una tabla temporal (COPY en
+PostgreSQL) y se fusiona en ELECTOR con INSERT ... ON CONFLICT (dni) DO
+UPDATE, en la misma transacción que actualiza el avance en
+IMPORTACION_PADRON: si la carga falla, se reanuda desde el último bloque
+confirmado. Cada bloque renueva `fecha_actualizacion`; una importación
+en_curso sin latido durante PADRON_ABANDONO segundos (el proceso terminó a
+mitad de la carga) también se puede reanudar.
+
+POST /api/electores/importar copia el archivo a un temporal, valida el
+encabezado y responde 202 con el registro; la carga sigue en un hilo del
+worker (iniciar_en_segundo_plano) y su avance se consulta por id.
+"""
+import csv
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO
+
+import numpy as np
+from app.models import db, Elector, ImportacionPadron
+from flask import current_app
+from sqlalchemy import Column, MetaData, String, Table, select, true
+from .indice_dni_service import indice_dni_service, numero_dni, DNI_MAXIMO
+from .notificador import notificador
+from .sql_utils import insert_dialecto
+
+COLUMNAS = ('dni', 'nombres', 'apellidos', 'distrito', 'region')
+
+# Formato de ancho fijo: caracteres por columna, en el orden de COLUMNAS
+ANCHOS = (8, 40, 40, 40, 30)
+
+FORMATOS = ('csv', 'fijo')
+
+logger = logging.getLogger(__name__)
+
+
+class ImportacionFallidaError(Exception):
+    """La importación se interrumpió; se puede reanudar con su id"""
+
+    def __init__(self, importacion: Dict[str, Any], causa: Exception):
+        super().__init__(f'La importación {importacion["id_importacion"]} falló: {causa}')
+        self.importacion = importacion
+
+
+def leer_csv(texto: TextIO) -> Iterator[List[str]]:
+    """
+    Filas de un CSV con encabezado (separador ',' o ';'); las columnas se
+    ubican por nombre. El encabezado se valida al llamar, antes de iterar.
+    """
+    encabezado = texto.readline()
+    delimitador = ';' if encabezado.count(';') > encabezado.count(',') else ','
+    nombres = [nombre.strip().lower() for nombre in next(csv.reader([encabezado], delimiter=delimitador))]
+    faltantes = [columna for columna in COLUMNAS if columna not in nombres]
+    if faltantes:
+        raise ValueError(f'Faltan columnas en el encabezado: {", ".join(faltantes)}')
+
+    posiciones = [nombres.index(columna) for columna in COLUMNAS]
+    minimo = max(posiciones) + 1
+    # Una fila con menos columnas que el encabezado se entrega vacía (motivo 'columnas')
+    return (
+        [fila[i] for i in posiciones] if len(fila) >= minimo else []
+        for fila in csv.reader(texto, delimiter=delimitador)
+    )
+
+
+def leer_fijo(texto: TextIO) -> Iterator[List[str]]:
+    """Filas de ancho fijo según ANCHOS (sin encabezado)"""
+    cortes = np.cumsum((0,) + ANCHOS).tolist()
+    for linea in texto:
+        linea = linea.rstrip('\r\n')
+        if linea:
+            yield [linea[inicio:fin] for inicio, fin in zip(cortes, cortes[1:])]
+
+
+class PadronService:
+    """Importación del padrón en bloques con validación, fusión (upsert) y avance persistente"""
+
+    def __init__(self):
+        self._largos = {columna: Elector.__table__.c[columna].type.length for columna in COLUMNAS}
+
+    def obtener(self, id_importacion: int) -> Optional[Dict[str, Any]]:
+        importacion = db.session.get(ImportacionPadron, id_importacion)
+        return importacion.to_dict() if importacion else None
+
+    def validar(self, fila: List[str]) -> Optional[str]:
+        """Motivo por el que la fila no es válida, o None"""
+        if len(fila) != len(COLUMNAS):
+            return 'columnas'
+        if numero_dni(fila[0]) is None:
+            return 'dni_invalido'
+        for columna, valor in zip(COLUMNAS[1:], fila[1:]):
+            if not valor:
+                return 'campo_vacio'
+            if len(valor) > self._largos[columna]:
+                return 'campo_largo'
+        return None
+
+    def importar(self, texto: TextIO, formato: str, origen: str,
+                 reanudar: Optional[int] = None,
+                 progreso: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Importa el padrón leído de `texto` y retorna el registro de la importación
+        con un resumen de errores ({'errores': {motivo: cantidad}, 'ejemplos': [...]}).
+
+        - `reanudar`: id de una importación fallida o abandonada (en_curso sin
+          latido durante PADRON_ABANDONO segundos) del mismo archivo; las filas
+          ya confirmadas se leen solo para detectar DNIs repetidos
+        - `progreso`: se llama con el registro actualizado tras cada bloque
+
+        Lanza ValueError (formato, encabezado o importación a reanudar inválidos)
+        o ImportacionFallidaError si la carga se interrumpe.
+        """
+        filas = self._leer(texto, formato)
+        importacion = self._iniciar(origen, formato, reanudar)
+        return self._cargar(importacion, filas, progreso)
+
+    def iniciar_en_segundo_plano(self, flujo: BinaryIO, formato: str, origen: str,
+                                 reanudar: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Copia `flujo` (bytes UTF-8) a un archivo temporal, valida formato y
+        encabezado, registra la importación y la carga en un hilo del proceso.
+        Retorna el registro en_curso. Lanza ValueError como importar().
+
+        Si el proceso termina a mitad de la carga, la importación queda
+        en_curso sin latido y se reanuda pasado PADRON_ABANDONO.
+        """
+        descriptor, ruta = tempfile.mkstemp(prefix='padron_')
+        try:
+            with os.fdopen(descriptor, 'wb') as destino:
+                shutil.copyfileobj(flujo, destino)
+            texto = open(ruta, encoding='utf-8-sig', newline='')
+        except Exception:
+            os.remove(ruta)
+            raise
+        try:
+            filas = self._leer(texto, formato)
+            importacion = self._iniciar(origen, formato, reanudar)
+        except Exception:
+            texto.close()
+            os.remove(ruta)
+            raise
+
+        registro = importacion.to_dict()
+        threading.Thread(
+            target=self._cargar_en_hilo,
+            args=(current_app._get_current_object(), importacion.id_importacion, filas, texto, ruta),
+            name=f'padron-{importacion.id_importacion}', daemon=True
+        ).start()
+        return registro
+
+    def _cargar_en_hilo(self, app, id_importacion: int, filas: Iterator[List[str]],
+                        texto: TextIO, ruta: str) -> None:
+        try:
+            with app.app_context():
+                self._cargar(db.session.get(ImportacionPadron, id_importacion), filas)
+        except ImportacionFallidaError as e:
+            logger.warning('%s', e)  # registrada como fallida, con su error
+        except Exception:
+            logger.exception('La importación %d se interrumpió', id_importacion)
+        finally:
+            texto.close()
+            os.remove(ruta)
+
+    @staticmethod
+    def _leer(texto: TextIO, formato: str) -> Iterator[List[str]]:
+        if formato not in FORMATOS:
+            raise ValueError(f'Formato inválido: {formato} (use {" o ".join(FORMATOS)})')
+        return leer_csv(texto) if formato == 'csv' else leer_fijo(texto)
+
+    def _cargar(self, importacion: ImportacionPadron, filas: Iterator[List[str]],
+                progreso: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        confirmadas = importacion.filas_leidas
+        db.session.commit()  # sin transacción abierta en la sesión mientras dura la carga
+        bloque = current_app.config['PADRON_BLOQUE']
+        maximo_ejemplos = current_app.config['PADRON_ERRORES_MAXIMO']
+
+        # Un bit por DNI posible: repetidos en el archivo en O(1) y 12,5 MB fijos
+        vistos = np.zeros(DNI_MAXIMO // 8, dtype=np.uint8)
+        errores: Dict[str, int] = {}
+        ejemplos: List[Dict[str, Any]] = []
+        pendientes: List[List[str]] = []
+        leidas = validas = invalidas = duplicados = 0
+
+        with db.engine.connect() as conexion:
+            temporal = self._tabla_temporal()
+            try:
+                for leidas, fila in enumerate(filas, 1):
+                    fila = [valor.strip() for valor in fila]
+                    motivo = self.validar(fila)
+                    if motivo is None:
+                        numero = int(fila[0])
+                        if vistos[numero >> 3] & (1 << (numero & 7)):
+                            motivo = 'duplicado'
+                        else:
+                            vistos[numero >> 3] |= 1 << (numero & 7)
+                    if leidas <= confirmadas:
+                        continue  # ya fusionada en una ejecución anterior
+
+                    if motivo is None:
+                        validas += 1
+                        pendientes.append(fila)
+                    else:
+                        if motivo == 'duplicado':
+                            duplicados += 1
+                        else:
+                            invalidas += 1
+                        errores[motivo] = errores.get(motivo, 0) + 1
+                        if len(ejemplos) < maximo_ejemplos:
+                            ejemplos.append({'fila': leidas, 'dni': fila[0] if fila else None, 'motivo': motivo})
+
+                    if len(pendientes) >= bloque:
+                        avance = self._fusionar(conexion, temporal, importacion.id_importacion, pendientes,
+                                                leidas, validas, invalidas, duplicados)
+                        pendientes = []
+                        validas = invalidas = duplicados = 0
+                        if progreso:
+                            progreso(avance)
+
+                if leidas > confirmadas:
+                    self._fusionar(conexion, temporal, importacion.id_importacion, pendientes,
+                                   leidas, validas, invalidas, duplicados)
+            except Exception as e:
+                conexion.rollback()
+                raise ImportacionFallidaError(self._terminar(importacion, 'fallida', str(e)), e) from e
+
+        resultado = self._terminar(importacion, 'completada')
+        # Los demás workers confirman contra la base los DNIs que no tienen
+        if current_app.config['INDICE_DNI']:
+            indice_dni_service.reconstruir()
+        notificador.publicar('elector')
+
+        resultado.update(errores=errores, ejemplos=ejemplos)
+        if progreso:
+            progreso(resultado)
+        return resultado
+
+    def _iniciar(self, origen: str, formato: str, reanudar: Optional[int]) -> ImportacionPadron:
+        if reanudar is None:
+            importacion = ImportacionPadron(origen=origen, formato=formato, estado='en_curso')
+            db.session.add(importacion)
+        else:
+            importacion = db.session.get(ImportacionPadron, reanudar)
+            if importacion is None:
+                raise ValueError(f'La importación {reanudar} no existe')
+            if not self._reanudable(importacion) or importacion.formato != formato:
+                raise ValueError(f'La importación {reanudar} no se puede reanudar '
+                                 f'(estado {importacion.estado}, formato {importacion.formato})')
+            # Solo si nadie la retomó desde que se leyó: mismo estado y mismo latido
+            tabla = ImportacionPadron.__table__
+            retomada = db.session.execute(
+                tabla.update()
+                .where(tabla.c.id_importacion == reanudar)
+                .where(tabla.c.estado == importacion.estado)
+                .where(tabla.c.fecha_actualizacion.is_not_distinct_from(importacion.fecha_actualizacion))
+                .values(estado='en_curso', error=None, fecha_actualizacion=datetime.utcnow())
+            ).rowcount
+            if not retomada:
+                db.session.rollback()
+                raise ValueError(f'La importación {reanudar} ya fue retomada por otro proceso')
+        db.session.commit()
+        return importacion
+
+    @staticmethod
+    def _reanudable(importacion: ImportacionPadron) -> bool:
+        """Fallida, o en_curso sin latido durante PADRON_ABANDONO segundos (proceso caído)"""
+        if importacion.estado == 'fallida':
+            return True
+        latido = importacion.fecha_actualizacion or importacion.fecha_inicio
+        abandono = timedelta(seconds=current_app.config['PADRON_ABANDONO'])
+        return importacion.estado == 'en_curso' and latido < datetime.utcnow() - abandono
+
+    def _terminar(self, importacion: ImportacionPadron, estado: str, error: Optional[str] = None) -> Dict[str, Any]:
+        # El avance lo escribe la conexión de la carga: se relee antes de cerrar
+        db.session.refresh(importacion)
+        importacion.estado = estado
+        importacion.error = error
+        importacion.fecha_fin = importacion.fecha_actualizacion = datetime.utcnow()
+        db.session.commit()
+        return importacion.to_dict()
+
+    @staticmethod
+    def _tabla_temporal() -> Table:
+        """Tabla temporal sin índices con las columnas de ELECTOR"""
+        return Table(
+            'padron_carga', MetaData(),
+            *(Column(columna, String(Elector.__table__.c[columna].type.length)) for columna in COLUMNAS),
+            prefixes=['TEMPORARY']
+        )
+
+    def _fusionar(self, conexion, temporal: Table, id_importacion: int, filas: List[List[str]],
+                  leidas: int, validas: int, invalidas: int, duplicados: int) -> Dict[str, Any]:
+        """
+        Copia el bloque a la tabla temporal, lo fusiona en ELECTOR y guarda el
+        avance, en una transacción. Retorna el registro de la importación.
+        """
+        if filas:
+            # Creada y descartada dentro de la transacción del bloque: no depende del
+            # estado de la sesión (compatible con PgBouncer en modo transacción).
+            # checkfirst: SQLite no revierte el CREATE de un bloque fallido
+            temporal.create(conexion, checkfirst=True)
+            self._copiar(conexion, temporal, filas)
+            fusion = insert_dialecto(Elector.__table__).from_select(
+                list(COLUMNAS),
+                # WHERE true: SQLite lo exige para distinguir el ON CONFLICT de un JOIN
+                select(*temporal.c).where(true())
+            )
+            conexion.execute(fusion.on_conflict_do_update(
+                index_elements=['dni'],
+                set_={columna: fusion.excluded[columna] for columna in COLUMNAS[1:]}
+            ))
+            temporal.drop(conexion)
+
+        tabla = ImportacionPadron.__table__
+        avance = conexion.execute(
+            tabla.update()
+            .where(tabla.c.id_importacion == id_importacion)
+            .values(
+                filas_leidas=leidas,
+                fecha_actualizacion=datetime.utcnow(),
+                filas_validas=tabla.c.filas_validas + validas,
+                filas_invalidas=tabla.c.filas_invalidas + invalidas,
+                duplicados=tabla.c.duplicados + duplicados
+            )
+            .returning(*tabla.c)
+        ).mappings().one()
+        conexion.commit()
+        return ImportacionPadron(**avance).to_dict()
+
+    @staticmethod
+    def _copiar(conexion, temporal: Table, filas: List[List[str]]) -> None:
+        if conexion.dialect.name == 'postgresql':
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(filas)
+            buffer.seek(0)
+            with conexion.connection.dbapi_connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f'COPY {temporal.name} ({", ".join(COLUMNAS)}) FROM STDIN WITH (FORMAT csv)', buffer
+                )
+        else:
+            conexion.execute(temporal.insert(), [dict(zip(COLUMNAS, fila)) for fila in filas])
+
+
+padron_service = PadronService()
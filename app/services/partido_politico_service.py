@@ -1,6 +1,7 @@
 from typing import List, Optional, Dict, Any
 from app.models import db, PartidoPolitico
 from .base_service import BaseService
+from .catalogo_service import catalogo_service
 
 class PartidoPoliticoService(BaseService):
     """Servicio para gestionar partidos políticos"""
@@ -23,4 +24,6 @@ class PartidoPoliticoService(BaseService):
         partido = self.model(**data)
         db.session.add(partido)
         db.session.commit()
-        return self._to_dict(partido)
+        resultado = self._to_dict(partido)
+        catalogo_service.invalidar('partido_politico')
+        return resultado
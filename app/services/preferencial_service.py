@@ -0,0 +1,136 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from app.models import db, VotoCategoria
+from flask import current_app
+from sqlalchemy import select, func
+from .catalogo_service import Catalogo, catalogo_service
+from .resultado_service import resultado_service
+
+
+def contar_bloque(partidos: np.ndarray, pref_1: np.ndarray, pref_2: np.ndarray,
+                  base: int, conteo: np.ndarray) -> None:
+    """
+    Acumula en `conteo` los votos preferenciales de un bloque de filas.
+
+    Cada par (partido, número) se codifica como partido * base + número y se
+    cuenta con np.bincount. Los números fuera de rango (o -1 para NULL) se
+    descartan; el segundo preferencial solo cuenta si difiere del primero.
+    """
+    limite = conteo.shape[0]
+    for numeros, validos in (
+        (pref_1, pref_1 >= 0),
+        (pref_2, (pref_2 >= 0) & (pref_2 != pref_1)),
+    ):
+        validos &= numeros < base
+        claves = partidos[validos] * base + numeros[validos]
+        claves = claves[claves < limite]
+        conteo += np.bincount(claves, minlength=limite)
+
+
+class PreferencialService:
+    """
+    Motor de conteo del voto preferencial (numero_preferencial_1/2).
+
+    Lee VOTO_CATEGORIA de una categoría en bloques (yield_per) y cuenta con
+    NumPy en lugar de recorrer fila por fila en Python. El conteo de cada
+    categoría se guarda por versión de resultados y se recalcula como máximo
+    cada PREFERENCIAL_INTERVALO segundos. Un conteo solo vale para la versión
+    del catálogo con que se calculó (de ella salen `base` y el largo del
+    arreglo): si el catálogo cambia se recalcula sin esperar el intervalo.
+    """
+
+    def __init__(self):
+        # id_categoria -> (versión de resultados, versión del catálogo, instante, conteo)
+        self._cache: Dict[int, Tuple[int, int, float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def categorias_preferenciales(self) -> List[int]:
+        """Categorías cuyos candidatos tienen número (Diputado, Senador, Parlamento Andino)"""
+        return sorted({
+            candidato['id_categoria']
+            for candidato in catalogo_service.actual().candidatos.values()
+            if candidato['numero_candidato'] is not None
+        })
+
+    def contar(self, id_categoria: int, catalogo: Optional[Catalogo] = None) -> Dict[str, Any]:
+        """
+        Retorna {'version', 'base', 'conteo'}: conteo[partido * base + número]
+        es la cantidad de votos preferenciales de ese candidato según
+        `catalogo` (el vigente si no se indica).
+        """
+        catalogo = catalogo or catalogo_service.actual()
+        version = resultado_service.version()
+        intervalo = current_app.config['PREFERENCIAL_INTERVALO']
+        en_cache = self._cache.get(id_categoria)
+        if en_cache and en_cache[1] == catalogo.version and (
+                en_cache[0] == version or time.monotonic() - en_cache[2] < intervalo):
+            return en_cache[3]
+
+        with self._lock:
+            candidatos = [c for c in catalogo.candidatos.values() if c['id_categoria'] == id_categoria]
+            base = max((c['numero_candidato'] or 0 for c in candidatos), default=0) + 1
+            conteo = np.zeros((max(catalogo.partidos, default=0) + 1) * base, dtype=np.int64)
+
+            consulta = (
+                select(
+                    VotoCategoria.id_partido,
+                    func.coalesce(VotoCategoria.numero_preferencial_1, -1),
+                    func.coalesce(VotoCategoria.numero_preferencial_2, -1)
+                )
+                .where(VotoCategoria.id_categoria == id_categoria)
+                .where(VotoCategoria.id_partido.isnot(None))
+                .execution_options(yield_per=current_app.config['PREFERENCIAL_BLOQUE'])
+            )
+            for bloque in db.session.execute(consulta).partitions():
+                filas = np.array(bloque, dtype=np.int64)
+                contar_bloque(filas[:, 0], filas[:, 1], filas[:, 2], base, conteo)
+
+            resultado = {'version': version, 'base': base, 'conteo': conteo}
+            self._cache[id_categoria] = (version, catalogo.version, time.monotonic(), resultado)
+            return resultado
+
+    def obtener_top(self, id_categoria: int, top: Optional[int] = None) -> Dict[str, Any]:
+        """Candidatos ordenados por votos preferenciales dentro de cada partido (top-K por partido)"""
+        catalogo = catalogo_service.actual()
+        resultado = self.contar(id_categoria, catalogo)
+        base, conteo = resultado['base'], resultado['conteo']
+
+        por_partido: Dict[int, List[Dict[str, Any]]] = {}
+        for candidato in catalogo.candidatos.values():
+            if candidato['id_categoria'] != id_categoria or candidato['numero_candidato'] is None:
+                continue
+            clave = candidato['id_partido'] * base + candidato['numero_candidato']
+            por_partido.setdefault(candidato['id_partido'], []).append({
+                'id_candidato': candidato['id_candidato'],
+                'nombre_candidato': candidato['nombre_candidato'],
+                'numero_candidato': candidato['numero_candidato'],
+                'votos_preferenciales': int(conteo[clave]) if clave < conteo.shape[0] else 0
+            })
+
+        partidos = []
+        for id_partido in sorted(por_partido):
+            candidatos = sorted(
+                por_partido[id_partido],
+                key=lambda c: (-c['votos_preferenciales'], c['numero_candidato'])
+            )
+            for posicion, candidato in enumerate(candidatos, 1):
+                candidato['posicion'] = posicion
+            partidos.append({
+                'id_partido': id_partido,
+                'nombre_partido': catalogo.partidos[id_partido]['nombre_partido']
+                if id_partido in catalogo.partidos else None,
+                'candidatos': candidatos[:top] if top else candidatos
+            })
+
+        return {
+            'id_categoria': id_categoria,
+            'nombre_categoria': catalogo.categorias[id_categoria]['nombre_categoria'],
+            'version': resultado['version'],
+            'partidos': partidos
+        }
+
+
+preferencial_service = PreferencialService()
@@ -1,6 +1,9 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from app.models import db, Pregunta
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
 from .base_service import BaseService
+from .notificador import notificador
 
 
 class PreguntaService(BaseService):
@@ -22,9 +25,22 @@ class PreguntaService(BaseService):
         Obtiene todas las preguntas con sus opciones.
         NO expone el campo es_correcta por motivos éticos.
         """
-        preguntas = self.model.query.all()
+        preguntas = self.model.query.options(selectinload(Pregunta.opciones)).all()
         return [p.to_dict_con_opciones() for p in preguntas]
 
+    def listar_con_opciones(self, after: Optional[str] = None, limit: Optional[int] = None,
+                            filtros: Optional[Dict[str, str]] = None,
+                            campos: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Página de preguntas con sus opciones (sin es_correcta), paginada por clave.
+        No admite selección de campos: cada pregunta se devuelve completa.
+        """
+        if campos:
+            raise ValueError('El listado de preguntas no admite selección de campos')
+        consulta, limit = self._pagina(select(Pregunta).options(selectinload(Pregunta.opciones)), after, limit, filtros)
+        preguntas = [p.to_dict_con_opciones() for p in db.session.execute(consulta).scalars()]
+        return self._cortar(preguntas, limit, 'id_pregunta')
+
     def get_by_id(self, pregunta_id: int) -> Optional[Dict[str, Any]]:
         """Obtiene una pregunta por ID"""
         pregunta = self.model.query.get(pregunta_id)
@@ -32,7 +48,7 @@ class PreguntaService(BaseService):
 
     def get_by_id_con_opciones(self, pregunta_id: int) -> Optional[Dict[str, Any]]:
         """Obtiene una pregunta con opciones por ID (sin es_correcta)"""
-        pregunta = self.model.query.get(pregunta_id)
+        pregunta = db.session.get(self.model, pregunta_id, options=[joinedload(Pregunta.opciones)])
         return pregunta.to_dict_con_opciones() if pregunta else None
 
     def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -40,7 +56,9 @@ class PreguntaService(BaseService):
         pregunta = Pregunta(texto=data['texto'])
         db.session.add(pregunta)
         db.session.commit()
-        return self._to_dict(pregunta)
+        resultado = self._to_dict(pregunta)
+        notificador.emitir('pregunta')
+        return resultado
 
 
 pregunta_service = PreguntaService()
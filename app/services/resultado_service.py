@@ -0,0 +1,296 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.models import (
+    db, Voto, VotoCategoria, Elector, ConteoCategoria, ConteoTipoVoto, ConteoRegion, ConteoDistrito
+)
+from flask import current_app
+from sqlalchemy import select, func, literal
+from .sql_utils import insert_dialecto, en_lista, bloquear_escrituras
+from .catalogo_service import catalogo_service
+
+# Clave de partido usada en los conteos para el voto en blanco de una categoría
+PARTIDO_EN_BLANCO = 0
+
+
+class ResultadoService:
+    """
+    Servicio de resultados en vivo.
+
+    Los conteos se incrementan en la misma transacción que registra el voto
+    (ver VotoService), así que leer resultados cuesta O(categorías × partidos ×
+    fragmentos) sin importar cuántos votos existan.
+    """
+
+    def acumular(self, votos_por_tipo: Dict[int, int], votos_por_categoria: Dict[tuple, int],
+                 fragmento: int) -> None:
+        """
+        Incrementa los conteos dentro de la transacción activa (no hace commit).
+
+        :param votos_por_tipo: {id_tipo_voto: cantidad}
+        :param votos_por_categoria: {(id_categoria, id_partido o None): cantidad}
+        :param fragmento: semilla del fragmento (p. ej. el id_voto)
+        """
+        fragmento %= current_app.config['CONTEO_FRAGMENTOS']
+
+        # Filas ordenadas: todas las transacciones bloquean en el mismo orden
+        self._upsert(
+            ConteoTipoVoto.__table__,
+            ['id_tipo_voto', 'fragmento'],
+            [
+                {'id_tipo_voto': id_tipo_voto, 'fragmento': fragmento, 'cantidad': cantidad}
+                for id_tipo_voto, cantidad in sorted(votos_por_tipo.items())
+            ]
+        )
+        self._upsert(
+            ConteoCategoria.__table__,
+            ['id_categoria', 'id_partido', 'fragmento'],
+            [
+                {'id_categoria': id_categoria, 'id_partido': id_partido, 'fragmento': fragmento, 'cantidad': cantidad}
+                for (id_categoria, id_partido), cantidad in sorted(self._claves_partido(votos_por_categoria).items())
+            ]
+        )
+
+    def acumular_geografia(self, ids_voto: List[int], fragmento: int) -> List[str]:
+        """
+        Incrementa los conteos por región y por distrito de los votos indicados
+        (ya insertados en la transacción activa). La región y el distrito salen
+        del elector con un INSERT ... SELECT agrupado: una sentencia por tabla,
+        sin importar cuántos votos tenga el lote.
+
+        Retorna las regiones afectadas (RETURNING), sin repetir.
+        """
+        fragmento %= current_app.config['CONTEO_FRAGMENTOS']
+        regiones = self._upsert_geografia(ConteoRegion.__table__, [Elector.region], ids_voto, fragmento)
+        self._upsert_geografia(ConteoDistrito.__table__, [Elector.region, Elector.distrito], ids_voto, fragmento)
+        return sorted(set(regiones))
+
+    @staticmethod
+    def _select_geografia(columnas_geo: List, fragmento):
+        """SELECT geografía, categoría, partido, fragmento, COUNT(*) de VOTO_CATEGORIA unido a ELECTOR"""
+        id_partido = func.coalesce(VotoCategoria.id_partido, PARTIDO_EN_BLANCO)
+        claves = [*columnas_geo, VotoCategoria.id_categoria, id_partido]
+        return (
+            select(*claves, fragmento, func.count())
+            .select_from(VotoCategoria)
+            .join(Voto, Voto.id_voto == VotoCategoria.id_voto)
+            .join(Elector, Elector.dni == Voto.dni)
+            .group_by(*claves)
+            # Orden estable: todas las transacciones bloquean las filas en el mismo orden
+            .order_by(*claves)
+        )
+
+    def _upsert_geografia(self, tabla, columnas_geo: List, ids_voto: List[int], fragmento: int) -> List[str]:
+        clave = [columna.key for columna in columnas_geo] + ['id_categoria', 'id_partido', 'fragmento']
+        sentencia = insert_dialecto(tabla).from_select(
+            clave + ['cantidad'],
+            self._select_geografia(columnas_geo, literal(fragmento))
+            .where(en_lista(VotoCategoria.id_voto, list(ids_voto)))
+        )
+        return db.session.execute(sentencia.on_conflict_do_update(
+            index_elements=clave,
+            set_={'cantidad': tabla.c.cantidad + sentencia.excluded.cantidad}
+        ).returning(tabla.c.region)).scalars().all()
+
+    @staticmethod
+    def contar_categorias(votos_categoria_data: Iterable[Dict[str, Any]]) -> Counter:
+        """Agrupa los votos por categoría de una o varias papeletas"""
+        return Counter(
+            (vc_data.get('id_categoria'), vc_data.get('id_partido'))
+            for vc_data in votos_categoria_data
+        )
+
+    @staticmethod
+    def _claves_partido(votos_por_categoria: Dict[tuple, int]) -> Counter:
+        claves = Counter()
+        for (id_categoria, id_partido), cantidad in votos_por_categoria.items():
+            claves[(id_categoria, PARTIDO_EN_BLANCO if id_partido is None else id_partido)] += cantidad
+        return claves
+
+    @staticmethod
+    def _upsert(tabla, clave: List[str], filas: List[Dict[str, Any]]) -> None:
+        """INSERT multi-fila ... ON CONFLICT DO UPDATE SET cantidad = cantidad + excluded.cantidad"""
+        if not filas:
+            return
+        sentencia = insert_dialecto(tabla).values(filas)
+        db.session.execute(sentencia.on_conflict_do_update(
+            index_elements=clave,
+            set_={'cantidad': tabla.c.cantidad + sentencia.excluded.cantidad}
+        ))
+
+    def version(self) -> int:
+        """Total de votos contados; crece con cada voto y sirve como versión de los resultados"""
+        return db.session.execute(select(func.coalesce(func.sum(ConteoTipoVoto.cantidad), 0))).scalar()
+
+    def obtener_resultados(self, id_categoria: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Resultados por tipo de voto y por categoría/partido.
+        Si se indica id_categoria, solo se incluye esa categoría.
+        """
+        catalogo = catalogo_service.actual()
+
+        por_tipo = dict(db.session.execute(
+            select(ConteoTipoVoto.id_tipo_voto, func.sum(ConteoTipoVoto.cantidad))
+            .group_by(ConteoTipoVoto.id_tipo_voto)
+        ).all())
+
+        consulta = (
+            select(ConteoCategoria.id_categoria, ConteoCategoria.id_partido, func.sum(ConteoCategoria.cantidad))
+            .group_by(ConteoCategoria.id_categoria, ConteoCategoria.id_partido)
+        )
+        if id_categoria is not None:
+            consulta = consulta.where(ConteoCategoria.id_categoria == id_categoria)
+
+        conteos: Dict[int, Dict[int, int]] = {}
+        for id_cat, id_partido, cantidad in db.session.execute(consulta):
+            conteos.setdefault(id_cat, {})[id_partido] = int(cantidad)
+
+        categorias = [catalogo.categorias[id_categoria]] if id_categoria is not None else catalogo.lista('categorias')
+        return {
+            'total_votos': int(sum(por_tipo.values())),
+            'por_tipo_voto': [
+                {
+                    'id_tipo_voto': tipo['id_tipo_voto'],
+                    'nombre_tipo': tipo['nombre_tipo'],
+                    'votos': int(por_tipo.get(tipo['id_tipo_voto'], 0))
+                }
+                for tipo in catalogo.lista('tipos_voto')
+            ],
+            'categorias': [
+                self._resultado_categoria(categoria, conteos.get(categoria['id_categoria'], {}), catalogo)
+                for categoria in categorias
+            ]
+        }
+
+    def obtener_resultados_region(self, region: str) -> Dict[str, Any]:
+        """Resultados por categoría/partido de los electores de una región"""
+        return self.obtener_resultados_regiones([region])[0]
+
+    def obtener_resultados_regiones(self, regiones: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Resultados de varias regiones (todas si no se indican) con una sola
+        consulta agrupada sobre CONTEO_REGION: un tablero de 26 regiones no
+        necesita 26 peticiones ni ningún join con VOTO o ELECTOR.
+        """
+        consulta = (
+            select(ConteoRegion.region, ConteoRegion.id_categoria, ConteoRegion.id_partido,
+                   func.sum(ConteoRegion.cantidad))
+            .group_by(ConteoRegion.region, ConteoRegion.id_categoria, ConteoRegion.id_partido)
+        )
+        if regiones is not None:
+            consulta = consulta.where(en_lista(ConteoRegion.region, list(regiones)))
+
+        conteos: Dict[str, Dict[int, Dict[int, int]]] = {region: {} for region in regiones or []}
+        for region, id_cat, id_partido, cantidad in db.session.execute(consulta):
+            conteos.setdefault(region, {}).setdefault(id_cat, {})[id_partido] = int(cantidad)
+
+        return [
+            dict({'region': region}, **self._resultado_geografia(conteos[region]))
+            for region in (regiones if regiones is not None else sorted(conteos))
+        ]
+
+    def obtener_resultados_distrito(self, region: str, distrito: str) -> Dict[str, Any]:
+        """Resultados por categoría/partido de los electores de un distrito"""
+        conteos: Dict[int, Dict[int, int]] = {}
+        for id_cat, id_partido, cantidad in db.session.execute(
+            select(ConteoDistrito.id_categoria, ConteoDistrito.id_partido, func.sum(ConteoDistrito.cantidad))
+            .where(ConteoDistrito.region == region, ConteoDistrito.distrito == distrito)
+            .group_by(ConteoDistrito.id_categoria, ConteoDistrito.id_partido)
+        ):
+            conteos.setdefault(id_cat, {})[id_partido] = int(cantidad)
+        return dict({'region': region, 'distrito': distrito}, **self._resultado_geografia(conteos))
+
+    def obtener_distritos(self, region: str) -> List[Dict[str, Any]]:
+        """Distritos con votos en una región y su total de votos por categoría"""
+        distritos: Dict[str, Dict[int, int]] = {}
+        for distrito, id_cat, cantidad in db.session.execute(
+            select(ConteoDistrito.distrito, ConteoDistrito.id_categoria, func.sum(ConteoDistrito.cantidad))
+            .where(ConteoDistrito.region == region)
+            .group_by(ConteoDistrito.distrito, ConteoDistrito.id_categoria)
+            .order_by(ConteoDistrito.distrito)
+        ):
+            distritos.setdefault(distrito, {})[id_cat] = int(cantidad)
+        return [
+            {'distrito': distrito, 'votos_por_categoria': por_categoria}
+            for distrito, por_categoria in distritos.items()
+        ]
+
+    def _resultado_geografia(self, conteos: Dict[int, Dict[int, int]]) -> Dict[str, Any]:
+        catalogo = catalogo_service.actual()
+        return {
+            'categorias': [
+                self._resultado_categoria(categoria, conteos.get(categoria['id_categoria'], {}), catalogo)
+                for categoria in catalogo.lista('categorias')
+            ]
+        }
+
+    @staticmethod
+    def _resultado_categoria(categoria, conteo: Dict[int, int], catalogo) -> Dict[str, Any]:
+        partidos = sorted(
+            (
+                {
+                    'id_partido': id_partido,
+                    'nombre_partido': catalogo.partidos[id_partido]['nombre_partido']
+                    if id_partido in catalogo.partidos else None,
+                    'votos': cantidad
+                }
+                for id_partido, cantidad in conteo.items()
+                if id_partido != PARTIDO_EN_BLANCO
+            ),
+            key=lambda partido: (-partido['votos'], partido['id_partido'])
+        )
+        return {
+            'id_categoria': categoria['id_categoria'],
+            'nombre_categoria': categoria['nombre_categoria'],
+            'partidos': partidos,
+            'en_blanco': conteo.get(PARTIDO_EN_BLANCO, 0),
+            'total': sum(conteo.values())
+        }
+
+    def reconstruir(self) -> Dict[str, int]:
+        """
+        Recalcula todos los conteos desde VOTO y VOTO_CATEGORIA (carga masiva,
+        bases con votos anteriores a las tablas de conteo). Usa el fragmento 0.
+
+        Las tablas de conteo quedan bloqueadas para escritura hasta el commit:
+        los votos que ya incrementaron conteos se confirman antes del DELETE
+        (y los cuenta el SELECT), y los que llegan después esperan y suman
+        sobre los conteos nuevos. Sin el bloqueo un voto concurrente podía
+        contarse dos veces o chocar con una fila del fragmento 0.
+        """
+        # Mismo orden que acumular y acumular_geografia: sin interbloqueos
+        modelos = (ConteoTipoVoto, ConteoCategoria, ConteoRegion, ConteoDistrito)
+        bloquear_escrituras(*(modelo.__table__ for modelo in modelos))
+        for modelo in modelos:
+            db.session.execute(modelo.__table__.delete())
+
+        db.session.execute(
+            ConteoTipoVoto.__table__.insert().from_select(
+                ['id_tipo_voto', 'fragmento', 'cantidad'],
+                select(Voto.id_tipo_voto, literal(0), func.count())
+                .group_by(Voto.id_tipo_voto)
+            )
+        )
+        id_partido = func.coalesce(VotoCategoria.id_partido, PARTIDO_EN_BLANCO)
+        db.session.execute(
+            ConteoCategoria.__table__.insert().from_select(
+                ['id_categoria', 'id_partido', 'fragmento', 'cantidad'],
+                select(VotoCategoria.id_categoria, id_partido, literal(0), func.count())
+                .group_by(VotoCategoria.id_categoria, id_partido)
+            )
+        )
+        for modelo, columnas_geo in (
+            (ConteoRegion, [Elector.region]),
+            (ConteoDistrito, [Elector.region, Elector.distrito])
+        ):
+            db.session.execute(
+                modelo.__table__.insert().from_select(
+                    [columna.key for columna in columnas_geo] + ['id_categoria', 'id_partido', 'fragmento', 'cantidad'],
+                    self._select_geografia(columnas_geo, literal(0))
+                )
+            )
+        db.session.commit()
+        return {'total_votos': self.version()}
+
+
+resultado_service = ResultadoService()
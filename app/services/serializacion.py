@@ -0,0 +1,51 @@
+"""
+Respuestas JSON pre-serializadas: se codifican (y comprimen) una sola vez y
+se sirven como bytes mientras los datos no cambien.
+"""
+import gzip
+import hashlib
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Tuple
+
+from app.instrumentacion import medir_serializacion
+from app.negociacion import empaquetar_json
+from app.proveedor_json import codificar
+
+
+@dataclass(frozen=True)
+class Serializado:
+    """
+    Cuerpo JSON en bytes, su versión gzip, un ETag derivado del contenido y
+    las cabeceras propias de la respuesta (p. ej. X-Siguiente de un listado)
+    """
+    cuerpo: bytes
+    comprimido: bytes
+    etag: str
+    cabeceras: Tuple[Tuple[str, str], ...] = ()
+
+    @classmethod
+    def desde(cls, datos: Any) -> 'Serializado':
+        return cls.desde_bytes(codificar(datos))
+
+    @classmethod
+    def desde_bytes(cls, cuerpo: bytes, cabeceras: Tuple[Tuple[str, str], ...] = ()) -> 'Serializado':
+        with medir_serializacion():
+            return cls(
+                cuerpo=cuerpo,
+                comprimido=gzip.compress(cuerpo, compresslevel=9, mtime=0),
+                # Derivado del contenido: todos los workers generan el mismo ETag
+                etag=hashlib.blake2b(cuerpo, digest_size=16).hexdigest(),
+                cabeceras=cabeceras
+            )
+
+    @cached_property
+    def msgpack(self) -> bytes:
+        """El mismo contenido en MessagePack, codificado la primera vez que un cliente lo pide"""
+        with medir_serializacion():
+            return empaquetar_json(self.cuerpo)
+
+    @cached_property
+    def msgpack_comprimido(self) -> bytes:
+        with medir_serializacion():
+            return gzip.compress(self.msgpack, compresslevel=9, mtime=0)
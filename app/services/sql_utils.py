@@ -0,0 +1,39 @@
+from app.models import db
+from sqlalchemy import any_, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def insert_dialecto(tabla):
+    """
+    Construye un INSERT del dialecto activo para poder usar ON CONFLICT.
+    PostgreSQL es el motor de producción; SQLite se usa en pruebas y benchmarks.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        return pg_insert(tabla)
+    return sqlite_insert(tabla)
+
+
+def en_lista(columna, valores):
+    """
+    Condición `columna IN valores` adecuada para listas grandes.
+    En PostgreSQL se usa `= ANY(:array)`: un solo parámetro y un plan estable
+    sin importar la cantidad de valores.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        return columna == any_(bindparam(None, list(valores), type_=ARRAY(columna.type)))
+    return columna.in_(list(valores))
+
+
+def bloquear_escrituras(*tablas) -> None:
+    """
+    Bloquea las escrituras concurrentes sobre `tablas` hasta el fin de la
+    transacción activa; las lecturas siguen. En PostgreSQL es LOCK TABLE ...
+    IN EXCLUSIVE MODE (espera a las transacciones que ya escribieron); en
+    SQLite no hace nada: la primera escritura de la transacción ya toma el
+    bloqueo de toda la base. Llamar con las tablas en el mismo orden en que
+    las escriben las demás transacciones.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        nombres = ', '.join(db.engine.dialect.identifier_preparer.format_table(tabla) for tabla in tablas)
+        db.session.execute(text(f'LOCK TABLE {nombres} IN EXCLUSIVE MODE'))
@@ -1,6 +1,7 @@
 from typing import List, Optional, Dict, Any
 from app.models import db, TipoVoto
 from .base_service import BaseService
+from .catalogo_service import catalogo_service
 
 class TipoVotoService(BaseService):
     """Servicio para gestionar tipos de voto"""
@@ -23,4 +24,6 @@ class TipoVotoService(BaseService):
         tipo = self.model(**data)
         db.session.add(tipo)
         db.session.commit()
-        return self._to_dict(tipo)
+        resultado = self._to_dict(tipo)
+        catalogo_service.invalidar('tipo_voto')
+        return resultado
@@ -5,6 +5,8 @@ from .base_service import BaseService
 class VotoCategoriaService(BaseService):
     """Servicio para gestionar votos por categoría"""
 
+    filtros = ('id_voto', 'id_categoria')
+
     def __init__(self):
         super().__init__(VotoCategoria)
 
@@ -1,11 +1,74 @@
 from typing import List, Optional, Dict, Any
-from app.models import db, Voto, VotoCategoria, TipoVoto, Categoria
+from collections import Counter
+from datetime import datetime
+from app.models import db, Voto, VotoCategoria, TipoVoto, Elector
 from .base_service import BaseService
+from .sql_utils import insert_dialecto, en_lista
+from .catalogo_service import catalogo_service, como_id
+from .resultado_service import resultado_service
+from .cubo_service import cubo_service
+from .indice_dni_service import indice_dni_service
+from app.metricas import votos_emitidos, dni_duplicado
+from sqlalchemy import select, literal
+from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import IntegrityError
 
+
+class ElectorNoEncontradoError(ValueError):
+    """El DNI no corresponde a ningún elector registrado"""
+
+    def __init__(self, dni: str):
+        super().__init__(f'El elector con DNI {dni} no existe')
+        self.dni = dni
+
+
+class VotoDuplicadoError(ValueError):
+    """El DNI ya registró su voto (restricción UNIQUE de voto.dni)"""
+
+    def __init__(self, dni: str, voto_existente: Optional[Dict[str, Any]] = None):
+        super().__init__(f'El DNI {dni} ya ha registrado un voto. No puede votar nuevamente.')
+        self.dni = dni
+        self.voto_existente = voto_existente
+
+
+class PapeletaInvalidaError(ValueError):
+    """Los votos por categoría no tienen la forma esperada (lista de objetos con IDs enteros)"""
+
+
+# Campos de un voto por categoría que, si vienen, deben ser enteros (id_categoria es obligatorio)
+CAMPOS_ENTEROS = ('id_partido', 'numero_preferencial_1', 'numero_preferencial_2')
+
+
+def _normalizar_votos_categoria(votos_categoria_data: Any) -> List[Dict[str, Any]]:
+    """
+    Copia de los votos por categoría con los IDs convertidos a int ("1" -> 1),
+    para que conteos, cubo, catálogo y métricas solo vean enteros.
+    Lanza PapeletaInvalidaError indicando el campo que no es un entero.
+    """
+    if not isinstance(votos_categoria_data, list):
+        raise PapeletaInvalidaError('El campo votos_categoria debe ser una lista')
+
+    normalizados = []
+    for vc_data in votos_categoria_data:
+        if not isinstance(vc_data, dict):
+            raise PapeletaInvalidaError('Cada voto por categoría debe ser un objeto')
+        normalizado = dict(vc_data)
+        for campo in ('id_categoria', *CAMPOS_ENTEROS):
+            if campo != 'id_categoria' and vc_data.get(campo) is None:
+                continue
+            valor = como_id(vc_data.get(campo))
+            if valor is None:
+                raise PapeletaInvalidaError(f'El campo {campo} debe ser un entero')
+            normalizado[campo] = valor
+        normalizados.append(normalizado)
+    return normalizados
+
+
 class VotoService(BaseService):
     """Servicio para gestionar votos"""
 
+    filtros = ('id_tipo_voto',)
+
     def __init__(self):
         super().__init__(Voto)
 
@@ -15,8 +78,11 @@ class VotoService(BaseService):
         return [self._to_dict(voto) for voto in votos]
 
     def get_by_id(self, id_voto: int) -> Optional[Dict[str, Any]]:
-        """Obtiene un voto por su ID con sus votos por categoría"""
-        voto = self.model.query.get(id_voto)
+        """
+        Obtiene un voto por su ID con sus votos por categoría.
+        joinedload: voto y categorías en una sola consulta (un solo padre).
+        """
+        voto = db.session.get(self.model, id_voto, options=[joinedload(Voto.voto_categorias)])
         if not voto:
             return None
 
@@ -28,39 +94,52 @@ class VotoService(BaseService):
         return voto_dict
 
     def dni_ya_voto(self, dni: str) -> bool:
-        """Verifica si un DNI ya ha votado"""
+        """Verifica si un DNI ya ha votado (índice en memoria; la base solo si no puede responder)"""
+        estado = indice_dni_service.consultar(dni)
+        if estado is not None:
+            return estado[1]
         voto = self.model.query.filter_by(dni=dni).first()
         return voto is not None
 
-    def determinar_tipo_voto(self, votos_categoria_data: List[Dict[str, Any]]) -> int:
+    def nombre_tipo_voto(self, votos_categoria_data: List[Dict[str, Any]]) -> str:
         """
-        Determina el tipo de voto basado en las categorías:
-        - Si todas las categorías están en blanco (sin id_partido) -> Voto en blanco (id=3)
-        - Si hay al menos una categoría con partido -> Voto válido (id=1)
+        Determina el nombre del tipo de voto basado en las categorías:
+        - Si todas las categorías están en blanco (sin id_partido) -> 'En Blanco'
+        - Si hay al menos una categoría con partido -> 'Válido'
         """
-        # Obtener tipos de voto
-        tipo_valido = TipoVoto.query.filter_by(nombre_tipo='Válido').first()
-        tipo_blanco = TipoVoto.query.filter_by(nombre_tipo='En Blanco').first()
-
-        if not tipo_valido or not tipo_blanco:
-            raise ValueError('Los tipos de voto "Válido" y "En Blanco" deben existir en la tabla TIPO_VOTO')
+        tiene_voto_valido = any(vc.get('id_partido') is not None for vc in votos_categoria_data)
+        return 'Válido' if tiene_voto_valido else 'En Blanco'
 
-        # Si no hay votos por categoría o todos tienen id_partido=None, es voto en blanco
-        if not votos_categoria_data:
-            return tipo_blanco.id_tipo_voto
+    def determinar_tipo_voto(self, votos_categoria_data: List[Dict[str, Any]]) -> int:
+        """Determina el ID del tipo de voto (ver nombre_tipo_voto) usando el catálogo en memoria"""
+        nombre_tipo = self.nombre_tipo_voto(votos_categoria_data)
+        id_tipo_voto = catalogo_service.actual().id_tipo_voto(nombre_tipo)
+        if id_tipo_voto is None:
+            id_tipo_voto = catalogo_service.recargar().id_tipo_voto(nombre_tipo)
 
-        tiene_voto_valido = any(vc.get('id_partido') is not None for vc in votos_categoria_data)
+        if id_tipo_voto is None:
+            raise ValueError('Los tipos de voto "Válido" y "En Blanco" deben existir en la tabla TIPO_VOTO')
 
-        return tipo_valido.id_tipo_voto if tiene_voto_valido else tipo_blanco.id_tipo_voto
+        return id_tipo_voto
 
     def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Crea un nuevo voto con sus respectivos votos por categoría.
 
-        Maneja:
-        1. Validación de DNI duplicado
-        2. Votos en blanco (todas las categorías sin partido)
-        3. Determinación automática del tipo de voto
+        Todo el voto se registra en una sola transacción con un número fijo de sentencias:
+        1. INSERT ... SELECT desde ELECTOR con ON CONFLICT (dni) DO NOTHING:
+           valida existencia del elector y DNI duplicado a la vez
+        2. INSERT multi-fila de VOTO_CATEGORIA
+        3. Incremento de los conteos de resultados (ResultadoService.acumular)
+           y de los conteos por región/distrito (ResultadoService.acumular_geografia)
+        Tras el commit se suma al cubo de resultados en memoria (CuboService)
+        y se marca el DNI en el índice de DNI (IndiceDniService).
+        El tipo de voto y las categorías del voto en blanco salen del catálogo
+        en memoria. La respuesta se arma con los datos insertados (RETURNING), sin releerlos.
+
+        Lanza PapeletaInvalidaError si algún ID no es un entero (los textos
+        numéricos como "1" se aceptan), ElectorNoEncontradoError o
+        VotoDuplicadoError (todas ValueError).
 
         Espera data con formato:
         {
@@ -76,62 +155,288 @@ class VotoService(BaseService):
         }
         """
         dni = data.get('dni')
-
-        # Validar que el DNI no haya votado ya
-        if self.dni_ya_voto(dni):
-            raise ValueError(f'El DNI {dni} ya ha registrado un voto. No puede votar nuevamente.')
-
-        # Extraer votos por categoría
-        votos_categoria_data = data.pop('votos_categoria', [])
-
-        # Determinar automáticamente el tipo de voto
+        votos_categoria_data = _normalizar_votos_categoria(data.pop('votos_categoria', None) or [])
         id_tipo_voto = self.determinar_tipo_voto(votos_categoria_data)
+        fecha = datetime.utcnow()
 
         # Si no se proporcionaron votos por categoría, crear uno por cada categoría en blanco
         if not votos_categoria_data:
-            categorias = Categoria.query.all()
             votos_categoria_data = [
-                {
-                    'id_categoria': cat.id_categoria,
-                    'id_partido': None,
-                    'numero_preferencial_1': None,
-                    'numero_preferencial_2': None
-                }
-                for cat in categorias
+                {'id_categoria': id_categoria} for id_categoria in sorted(catalogo_service.actual().categorias)
             ]
 
-        # Crear el voto principal
-        voto = self.model(
-            dni=dni,
-            id_tipo_voto=id_tipo_voto
+        tabla_voto = self.model.__table__
+        tabla_voto_categoria = VotoCategoria.__table__
+
+        insert_voto = (
+            insert_dialecto(tabla_voto)
+            .from_select(
+                ['fecha', 'dni', 'id_tipo_voto'],
+                select(
+                    literal(fecha, type_=tabla_voto.c.fecha.type),
+                    Elector.dni,
+                    literal(id_tipo_voto, type_=tabla_voto.c.id_tipo_voto.type)
+                ).where(Elector.dni == dni)
+            )
+            .on_conflict_do_nothing(index_elements=['dni'])
+            .returning(tabla_voto.c.id_voto)
         )
-        db.session.add(voto)
 
         try:
-            db.session.flush()  # Para obtener el id_voto antes del commit
+            id_voto = db.session.execute(insert_voto).scalar()
+            if id_voto is None:
+                db.session.rollback()
+                self._diagnosticar_rechazo(dni)
 
-            # Crear votos por categoría asociados
-            for vc_data in votos_categoria_data:
-                voto_categoria = VotoCategoria(
-                    id_voto=voto.id_voto,
-                    id_categoria=vc_data.get('id_categoria'),
-                    id_partido=vc_data.get('id_partido'),  # Puede ser NULL para voto en blanco
-                    numero_preferencial_1=vc_data.get('numero_preferencial_1'),
-                    numero_preferencial_2=vc_data.get('numero_preferencial_2')
+            # INSERT multi-fila (insertmanyvalues): una sola sentencia
+            filas = [
+                fila._asdict() for fila in db.session.execute(
+                    tabla_voto_categoria.insert().returning(*tabla_voto_categoria.c),
+                    [
+                        {
+                            'id_voto': id_voto,
+                            'id_categoria': vc_data.get('id_categoria'),
+                            'id_partido': vc_data.get('id_partido'),  # Puede ser NULL para voto en blanco
+                            'numero_preferencial_1': vc_data.get('numero_preferencial_1'),
+                            'numero_preferencial_2': vc_data.get('numero_preferencial_2')
+                        }
+                        for vc_data in votos_categoria_data
+                    ]
                 )
-                db.session.add(voto_categoria)
+            ]
+
+            votos_por_categoria = resultado_service.contar_categorias(votos_categoria_data)
+            resultado_service.acumular({id_tipo_voto: 1}, votos_por_categoria, id_voto)
+            regiones = resultado_service.acumular_geografia([id_voto], id_voto)
 
-            db.session.commit()
+            # Sin una reconstrucción del cubo entre el commit y su registro
+            with cubo_service.registro():
+                db.session.commit()
+                for region in regiones:
+                    cubo_service.registrar(
+                        ((region, id_categoria, id_partido), cantidad)
+                        for (id_categoria, id_partido), cantidad in votos_por_categoria.items()
+                    )
 
-        except IntegrityError as e:
+        except IntegrityError:
             db.session.rollback()
-            if 'unique constraint' in str(e).lower() or 'duplicate' in str(e).lower():
-                raise ValueError(f'El DNI {dni} ya ha registrado un voto. No puede votar nuevamente.')
             raise
 
-        # Retornar con votos por categoría incluidos
-        voto_dict = self._to_dict(voto)
+        indice_dni_service.registrar_votos([dni])
+        votos_emitidos.labels(self.nombre_tipo_voto(votos_categoria_data)).inc()
+
+        # Retornar con votos por categoría incluidos, a partir de lo insertado
+        voto_dict = self.model(id_voto=id_voto, fecha=fecha, dni=dni, id_tipo_voto=id_tipo_voto).to_dict()
         voto_dict['votos_categoria'] = [
-            vc.to_dict() for vc in voto.voto_categorias
+            VotoCategoria(**fila).to_dict()
+            for fila in sorted(filas, key=lambda fila: fila['id_voto_categoria'])
         ]
         return voto_dict
+
+    def create_many(self, votos_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Registra un lote de votos (consolidación de mesas) en una sola transacción.
+
+        La validación es por conjuntos: una consulta para los DNIs (elector y
+        voto previo); tipos de voto, categorías y partidos se validan contra el
+        catálogo en memoria. Los votos y sus categorías se escriben con INSERT
+        multi-fila y los conteos de resultados se incrementan una vez por lote.
+
+        Retorna un resultado por papeleta, en el mismo orden recibido:
+        {
+            "indice": 0,
+            "dni": "12345678",
+            "estado": "registrado" | "duplicado" | "elector_no_encontrado" | "invalido",
+            "id_voto": 10,        # solo si estado == "registrado"
+            "error": "..."        # solo si no se registró
+        }
+        """
+        dnis = {str(v.get('dni')) for v in votos_data if isinstance(v, dict) and v.get('dni')}
+
+        electores = {}
+        regiones = {}
+        if dnis:
+            for dni, id_voto, region in db.session.execute(
+                select(Elector.dni, Voto.id_voto, Elector.region)
+                .select_from(Elector)
+                .outerjoin(Voto, Voto.dni == Elector.dni)
+                .where(en_lista(Elector.dni, dnis))
+            ):
+                electores[dni] = id_voto
+                regiones[dni] = region
+        catalogo = catalogo_service.actual()
+        if self._referencias_nuevas(votos_data, catalogo):
+            # Pueden haberse creado en otro worker: a lo sumo una recarga por lote
+            catalogo = catalogo_service.recargar_por_fallo()
+        categorias = catalogo.categorias.keys()
+        partidos = catalogo.partidos.keys()
+        tipos = {nombre: catalogo.id_tipo_voto(nombre) for nombre in ('Válido', 'En Blanco')}
+
+        if None in tipos.values():
+            raise ValueError('Los tipos de voto "Válido" y "En Blanco" deben existir en la tabla TIPO_VOTO')
+
+        resultados = []
+        aceptados = {}
+        for indice, voto_data in enumerate(votos_data):
+            resultado, dni, votos_categoria_data = self._validar_papeleta(
+                indice, voto_data, electores, categorias, partidos
+            )
+            resultados.append(resultado)
+            if resultado['estado'] != 'registrado':
+                continue
+            if dni in aceptados:
+                resultado.update(estado='duplicado', error=f'El DNI {dni} aparece más de una vez en el lote')
+                continue
+            aceptados[dni] = (resultado, votos_categoria_data)
+
+        if not aceptados:
+            return resultados
+
+        fecha = datetime.utcnow()
+        tabla_voto = self.model.__table__
+        try:
+            insertados = dict(db.session.execute(
+                insert_dialecto(tabla_voto)
+                .on_conflict_do_nothing(index_elements=['dni'])
+                .returning(tabla_voto.c.dni, tabla_voto.c.id_voto),
+                [
+                    {
+                        'fecha': fecha,
+                        'dni': dni,
+                        'id_tipo_voto': tipos[self.nombre_tipo_voto(votos_categoria_data)]
+                    }
+                    for dni, (_, votos_categoria_data) in aceptados.items()
+                ]
+            ).all())
+
+            filas_categoria = []
+            votos_por_tipo = Counter()
+            votos_por_region = Counter()
+            for dni, (resultado, votos_categoria_data) in aceptados.items():
+                id_voto = insertados.get(dni)
+                if id_voto is None:
+                    # Otro proceso registró el DNI entre la validación y el INSERT
+                    resultado.update(estado='duplicado', error=f'El DNI {dni} ya ha registrado un voto')
+                    continue
+                resultado['id_voto'] = id_voto
+                votos_por_tipo[tipos[self.nombre_tipo_voto(votos_categoria_data)]] += 1
+                if not votos_categoria_data:
+                    votos_categoria_data = [{'id_categoria': id_categoria} for id_categoria in sorted(categorias)]
+                filas_categoria.extend(
+                    {
+                        'id_voto': id_voto,
+                        'id_categoria': vc_data.get('id_categoria'),
+                        'id_partido': vc_data.get('id_partido'),
+                        'numero_preferencial_1': vc_data.get('numero_preferencial_1'),
+                        'numero_preferencial_2': vc_data.get('numero_preferencial_2')
+                    }
+                    for vc_data in votos_categoria_data
+                )
+                votos_por_region.update(
+                    (regiones[dni], vc_data.get('id_categoria'), vc_data.get('id_partido'))
+                    for vc_data in votos_categoria_data
+                )
+
+            if filas_categoria:
+                db.session.execute(VotoCategoria.__table__.insert(), filas_categoria)
+                fragmento = min(insertados.values())
+                resultado_service.acumular(
+                    votos_por_tipo, resultado_service.contar_categorias(filas_categoria), fragmento
+                )
+                resultado_service.acumular_geografia(list(insertados.values()), fragmento)
+
+            # Sin una reconstrucción del cubo entre el commit y su registro
+            with cubo_service.registro():
+                db.session.commit()
+                cubo_service.registrar(votos_por_region.items())
+
+        except IntegrityError:
+            db.session.rollback()
+            raise
+
+        indice_dni_service.registrar_votos(insertados.keys())
+        for nombre, id_tipo_voto in tipos.items():
+            if votos_por_tipo[id_tipo_voto]:
+                votos_emitidos.labels(nombre).inc(votos_por_tipo[id_tipo_voto])
+        duplicados = sum(resultado['estado'] == 'duplicado' for resultado in resultados)
+        if duplicados:
+            dni_duplicado.labels('lote').inc(duplicados)
+        return resultados
+
+    @staticmethod
+    def _referencias_nuevas(votos_data, catalogo) -> bool:
+        """Indica si el lote menciona categorías o partidos que podrían faltar en el catálogo"""
+        for voto_data in votos_data:
+            if not isinstance(voto_data, dict) or not isinstance(voto_data.get('votos_categoria'), list):
+                continue
+            for vc_data in voto_data['votos_categoria']:
+                if not isinstance(vc_data, dict):
+                    continue
+                # Los IDs que no son enteros invalidan solo su papeleta (_validar_papeleta)
+                id_categoria, id_partido = como_id(vc_data.get('id_categoria')), como_id(vc_data.get('id_partido'))
+                if id_categoria is not None and catalogo.podria_faltar('categorias', id_categoria):
+                    return True
+                if id_partido is not None and catalogo.podria_faltar('partidos', id_partido):
+                    return True
+        return False
+
+    def _validar_papeleta(self, indice, voto_data, electores, categorias, partidos):
+        """
+        Valida una papeleta del lote contra los conjuntos ya consultados.
+        Retorna (resultado, dni, votos por categoría normalizados).
+        """
+        if not isinstance(voto_data, dict) or not voto_data.get('dni'):
+            return {'indice': indice, 'dni': None, 'estado': 'invalido',
+                    'error': 'El campo dni es requerido'}, None, []
+
+        dni = str(voto_data['dni'])
+        resultado = {'indice': indice, 'dni': dni, 'estado': 'registrado'}
+        votos_categoria_data = []
+
+        if dni not in electores:
+            resultado.update(estado='elector_no_encontrado', error=f'El elector con DNI {dni} no existe')
+        elif electores[dni] is not None:
+            resultado.update(estado='duplicado', error=f'El DNI {dni} ya ha registrado un voto')
+        else:
+            try:
+                votos_categoria_data = _normalizar_votos_categoria(voto_data.get('votos_categoria') or [])
+            except PapeletaInvalidaError as e:
+                resultado.update(estado='invalido', error=str(e))
+            for vc_data in votos_categoria_data:
+                if vc_data.get('id_categoria') not in categorias:
+                    resultado.update(estado='invalido',
+                                     error=f'La categoría con ID {vc_data.get("id_categoria")} no existe')
+                    break
+                if vc_data.get('id_partido') is not None and vc_data['id_partido'] not in partidos:
+                    resultado.update(estado='invalido',
+                                     error=f'El partido con ID {vc_data["id_partido"]} no existe')
+                    break
+
+        return resultado, dni, votos_categoria_data
+
+    def _diagnosticar_rechazo(self, dni: str) -> None:
+        """
+        Explica por qué el INSERT del voto no insertó ninguna fila.
+        Solo se ejecuta en el camino de error.
+        """
+        fila = db.session.execute(
+            select(Elector.dni, Voto.id_voto, Voto.fecha, TipoVoto.nombre_tipo)
+            .select_from(Elector)
+            .outerjoin(Voto, Voto.dni == Elector.dni)
+            .outerjoin(TipoVoto, TipoVoto.id_tipo_voto == Voto.id_tipo_voto)
+            .where(Elector.dni == dni)
+        ).first()
+
+        if fila is None:
+            raise ElectorNoEncontradoError(dni)
+
+        if fila.id_voto is not None:
+            dni_duplicado.labels('voto').inc()
+            raise VotoDuplicadoError(dni, {
+                'id_voto': fila.id_voto,
+                'fecha': fila.fecha.isoformat(),
+                'tipo_voto': fila.nombre_tipo
+            })
+
+        # El voto en conflicto se revirtió antes de que pudiéramos leerlo
+        raise ValueError(f'No se pudo registrar el voto del DNI {dni}. Intente nuevamente.')
@@ -1,3 +1,17 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import orjson
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# Clave de extensión (x-) con la huella de las vistas documentadas de la especificación
+CLAVE_HUELLA = 'x-huella-vistas'
+
 swagger_template = {
     "swagger": "2.0",
     "info": {
@@ -28,3 +42,103 @@ swagger_config = {
     "swagger_ui": True,
     "specs_route": "/api/docs"
 }
+
+
+class EspecificacionApi:
+    """
+    Especificación OpenAPI (/apispec.json) pre-serializada: cuerpo, gzip y ETag.
+
+    - Hay una instancia por aplicación (app.extensions['apispec'])
+    - Si existe APISPEC_ARCHIVO (generado en el build con generar_apispec.py)
+      y su huella coincide con la de las vistas de la aplicación, se sirven
+      sus bytes sin importar flasgger
+    - Si no existe o quedó desactualizado (cambió una ruta o un docstring
+      después del build), flasgger recorre los docstrings YAML de las vistas
+      una sola vez, en la primera solicitud
+    """
+
+    def __init__(self, archivo: str):
+        self._archivo = archivo
+        self._serializado = None
+        self._lock = threading.Lock()
+
+    def obtener(self, app):
+        serializado = self._serializado
+        if serializado is not None:
+            return serializado
+        with self._lock:
+            if self._serializado is None:
+                from app.services.serializacion import Serializado
+                cuerpo = self._leer_archivo(app)
+                if cuerpo is not None:
+                    self._serializado = Serializado.desde_bytes(cuerpo)
+                else:
+                    self._serializado = Serializado.desde(generar_especificacion(app))
+            return self._serializado
+
+    def _leer_archivo(self, app):
+        """Bytes de APISPEC_ARCHIVO si existe y corresponde a las vistas de `app`, o None"""
+        if not os.path.exists(self._archivo):
+            return None
+        with open(self._archivo, 'rb') as archivo:
+            cuerpo = archivo.read()
+        try:
+            huella = orjson.loads(cuerpo).get(CLAVE_HUELLA)
+        except (orjson.JSONDecodeError, AttributeError):
+            huella = None
+        if huella != huella_vistas(app):
+            logger.warning('%s no corresponde a las vistas actuales; se genera la especificación '
+                           '(ejecute generar_apispec.py en el build)', self._archivo)
+            return None
+        return cuerpo
+
+
+def huella_vistas(app) -> str:
+    """
+    Huella de lo que documenta la especificación: regla, métodos y docstring
+    de cada vista con sección YAML (las de flasgger no cuentan, así que no
+    depende de SWAGGER_UI) y la plantilla base
+    """
+    vistas = []
+    for regla in app.url_map.iter_rules():
+        documentacion = app.view_functions[regla.endpoint].__doc__ or ''
+        if '---' in documentacion:
+            metodos = sorted((regla.methods or set()) - {'HEAD', 'OPTIONS'})
+            vistas.append((regla.rule, metodos, documentacion))
+    vistas.sort()
+    contenido = json.dumps([swagger_template, vistas], ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(contenido.encode(), digest_size=16).hexdigest()
+
+
+def generar_especificacion(app) -> dict:
+    """
+    Especificación OpenAPI de `app` a partir de los docstrings de sus vistas,
+    con la huella de esas vistas en CLAVE_HUELLA
+    """
+    from flasgger import Swagger
+    generador = Swagger(template=swagger_template, config=swagger_config)
+    generador.app = app  # get_apispecs consulta app.debug; no se registran vistas
+    with app.app_context():
+        especificacion = generador.get_apispecs(swagger_config['specs'][0]['endpoint'])
+    especificacion[CLAVE_HUELLA] = huella_vistas(app)
+    return especificacion
+
+
+def servir_especificacion():
+    from app.controllers.cache_http import respuesta_serializada
+    return respuesta_serializada(current_app.extensions['apispec'].obtener(current_app), 'no-cache')
+
+
+def init_app(app) -> None:
+    """
+    Registra /apispec.json (cacheado) y, con SWAGGER_UI, la interfaz de
+    flasgger en /api/docs; sin SWAGGER_UI flasgger no se importa al iniciar
+    """
+    app.extensions['apispec'] = EspecificacionApi(app.config['APISPEC_ARCHIVO'])
+    if app.config['SWAGGER_UI']:
+        from flasgger import Swagger
+        Swagger(app, template=swagger_template, config=swagger_config)
+        # La interfaz pide la especificación a la vista de flasgger: se sirve la cacheada
+        app.view_functions['flasgger.apispec'] = servir_especificacion
+    else:
+        app.add_url_rule(swagger_config['specs'][0]['route'], 'apispec', servir_especificacion)
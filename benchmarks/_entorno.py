@@ -0,0 +1,100 @@
+"""
+Utilidades compartidas por los benchmarks.
+
+Por defecto usan una base SQLite temporal; para medir contra PostgreSQL
+exporte DATABASE_URL antes de ejecutarlos.
+"""
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+
+def crear_app_benchmark(num_electores: int = 0):
+    """
+    Crea la aplicación con los datos de init_db.py y, opcionalmente,
+    `num_electores` electores sintéticos adicionales (DNI '0xxxxxxx').
+    """
+    if not os.getenv('DATABASE_URL'):
+        descriptor, ruta = tempfile.mkstemp(prefix='benchmark_', suffix='.db')
+        os.close(descriptor)
+        os.environ['DATABASE_URL'] = f'sqlite:///{ruta}'
+
+    from init_db import init_database
+    from app import create_app
+    from app.models import db, Elector
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_database()
+
+    app = create_app()
+    if num_electores:
+        with app.app_context():
+            db.session.execute(
+                Elector.__table__.insert(),
+                [
+                    {
+                        'dni': dni_sintetico(i),
+                        'nombres': 'Elector',
+                        'apellidos': f'Sintético {i}',
+                        'distrito': 'Lima',
+                        'region': 'Lima'
+                    }
+                    for i in range(num_electores)
+                ]
+            )
+            db.session.commit()
+            # El índice de DNI se construyó en create_app, antes de esta inserción
+            if app.config['INDICE_DNI']:
+                from app.services.indice_dni_service import indice_dni_service
+                indice_dni_service.reconstruir()
+    return app
+
+
+def dni_sintetico(i: int) -> str:
+    """DNI de 8 dígitos que no colisiona con los de init_db.py"""
+    return f'0{i:07d}'
+
+
+class ContadorConsultas:
+    """Cuenta las sentencias SQL enviadas al motor mientras está activo"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.total = 0
+
+    def _contar(self, conn, cursor, statement, parameters, context, executemany):
+        self.total += 1
+
+    def __enter__(self):
+        from sqlalchemy import event
+        event.listen(self.engine, 'before_cursor_execute', self._contar)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        event.remove(self.engine, 'before_cursor_execute', self._contar)
+
+
+def percentil(valores, p: float) -> float:
+    """Percentil por rango más cercano"""
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    indice = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return ordenados[indice]
+
+
+def rss_mb() -> float:
+    """Memoria residente del proceso en MB (Linux)"""
+    with open('/proc/self/status') as estado:
+        for linea in estado:
+            if linea.startswith('VmRSS:'):
+                return int(linea.split()[1]) / 1024
+    return 0.0
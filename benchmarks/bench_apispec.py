@@ -0,0 +1,84 @@
+"""
+Benchmark del arranque con y sin Swagger UI y de /apispec.json.
+
+Cada medición corre en un proceso nuevo (las importaciones no quedan en
+caché entre modos):
+
+- ui:              SWAGGER_UI=true, especificación generada al primer pedido
+- sin_ui:          SWAGGER_UI=false, especificación generada al primer pedido
+- sin_ui+archivo:  SWAGGER_UI=false, especificación de generar_apispec.py
+
+Se informa la mediana de create_app (importaciones incluidas), la memoria
+residente tras crearla, si flasgger quedó importado y la latencia del primer
+/apispec.json y de los siguientes (bytes en caché).
+
+Uso:
+    python -m benchmarks.bench_apispec [repeticiones]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks._entorno import RAIZ, crear_app_benchmark
+
+CODIGO = '''
+import json, sys, time
+inicio = time.perf_counter()
+from app import create_app
+app = create_app()
+arranque = time.perf_counter() - inicio
+from benchmarks._entorno import rss_mb
+rss = rss_mb()
+flasgger = 'flasgger' in sys.modules
+cliente = app.test_client()
+tiempos = []
+for _ in range(20):
+    inicio = time.perf_counter()
+    respuesta = cliente.get('/apispec.json')
+    tiempos.append(time.perf_counter() - inicio)
+print(json.dumps({
+    'arranque': arranque, 'rss': rss, 'flasgger': flasgger,
+    'primera': tiempos[0], 'siguientes': sorted(tiempos[1:])[len(tiempos) // 2],
+    'bytes': len(respuesta.data)
+}))
+'''
+
+
+def ejecutar(entorno: dict) -> dict:
+    salida = subprocess.run([sys.executable, '-c', CODIGO], cwd=RAIZ, env=entorno,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(salida.strip().splitlines()[-1])
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    crear_app_benchmark()  # base con los datos de init_db.py (DATABASE_URL)
+    archivo = os.path.join(tempfile.mkdtemp(prefix='apispec_'), 'apispec.json')
+    subprocess.run([sys.executable, 'generar_apispec.py', archivo], cwd=RAIZ, check=True,
+                   capture_output=True, env={**os.environ})
+
+    inexistente = archivo + '.no'
+    base = {**os.environ, 'METRICAS': 'false', 'INSTRUMENTACION_SQL': 'false'}
+    modos = {
+        'ui': {**base, 'SWAGGER_UI': 'true', 'APISPEC_ARCHIVO': inexistente},
+        'sin_ui': {**base, 'SWAGGER_UI': 'false', 'APISPEC_ARCHIVO': inexistente},
+        'sin_ui+archivo': {**base, 'SWAGGER_UI': 'false', 'APISPEC_ARCHIVO': archivo},
+    }
+
+    print(f'{repeticiones} procesos por modo (medianas)')
+    print(f'{"modo":<16}{"create_app":>12}{"RSS":>10}{"flasgger":>10}{"1er apispec":>13}{"siguientes":>12}{"bytes":>9}')
+    for modo, entorno in modos.items():
+        corridas = [ejecutar(entorno) for _ in range(repeticiones)]
+        mediana = {clave: statistics.median(c[clave] for c in corridas)
+                   for clave in ('arranque', 'rss', 'primera', 'siguientes')}
+        print(f'{modo:<16}{mediana["arranque"] * 1000:>9.0f} ms{mediana["rss"]:>7.1f} MB'
+              f'{"sí" if corridas[0]["flasgger"] else "no":>10}{mediana["primera"] * 1000:>10.2f} ms'
+              f'{mediana["siguientes"] * 1000:>9.3f} ms{corridas[0]["bytes"]:>9}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark de arranque: servidor de desarrollo (app.py) contra gunicorn con
+wsgi.py, con y sin preload_app.
+
+Para cada modo se lanza el servidor como subproceso sobre la misma base y se
+mide:
+
+- segundos hasta que /api/sistema/vivo responde
+- latencia de la primera solicitud a cada listado de referencia y la mediana
+  de las siguientes (el costo de primera solicitud que evita el precalentamiento)
+- memoria de cada worker según /proc/<pid>/smaps_rollup: RSS, USS (páginas
+  propias) y PSS (páginas compartidas repartidas entre los procesos). Con
+  preload_app y gc.freeze() el heap de la aplicación es compartido: el USS
+  por worker y el PSS total bajan
+
+Uso:
+    python -m benchmarks.bench_arranque [electores] [workers]
+"""
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+from benchmarks._entorno import RAIZ, crear_app_benchmark
+
+RUTAS = ('/api/categorias/', '/api/partidos/', '/api/candidatos/', '/api/cedula/bundle', '/api/tipos-voto/')
+REPETICIONES = 20
+
+
+def puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def obtener(url: str) -> float:
+    """Milisegundos de una solicitud GET completa"""
+    inicio = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=30) as respuesta:
+        respuesta.read()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def descendientes(pid: int) -> List[int]:
+    hijos: Dict[int, List[int]] = {}
+    for entrada in os.listdir('/proc'):
+        if not entrada.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entrada}/stat') as stat:
+                # El nombre del proceso puede tener espacios: los campos siguen al último ')'
+                padre = int(stat.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        hijos.setdefault(padre, []).append(int(entrada))
+    resultado, pendientes = [], [pid]
+    while pendientes:
+        actual = pendientes.pop()
+        resultado.append(actual)
+        pendientes.extend(hijos.get(actual, []))
+    return resultado
+
+
+def memoria(pid: int) -> Dict[str, float]:
+    """RSS, PSS y USS del proceso en MB"""
+    campos = {}
+    with open(f'/proc/{pid}/smaps_rollup') as rollup:
+        for linea in rollup:
+            partes = linea.split()
+            if len(partes) == 3 and partes[2] == 'kB':
+                campos[partes[0].rstrip(':')] = int(partes[1]) / 1024
+    return {
+        'rss': campos.get('Rss', 0.0),
+        'pss': campos.get('Pss', 0.0),
+        'uss': campos.get('Private_Clean', 0.0) + campos.get('Private_Dirty', 0.0)
+    }
+
+
+def medir(modo: str, comando: List[str], entorno: Dict[str, str]) -> Dict[str, object]:
+    puerto = puerto_libre()
+    entorno = {**entorno, 'PORT': str(puerto)}
+    base = f'http://127.0.0.1:{puerto}'
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(comando, cwd=RAIZ, env=entorno, start_new_session=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            if proceso.poll() is not None:
+                raise RuntimeError(f'{modo}: el servidor terminó con código {proceso.returncode}')
+            try:
+                obtener(base + '/api/sistema/vivo')
+                break
+            except OSError:
+                time.sleep(0.05)
+        arranque = time.perf_counter() - inicio
+
+        primeras, siguientes = {}, {}
+        for ruta in RUTAS:
+            primeras[ruta] = obtener(base + ruta)
+            siguientes[ruta] = statistics.median(obtener(base + ruta) for _ in range(REPETICIONES))
+
+        # Los procesos sin hijos son los que atienden (workers, o el hijo del reloader)
+        arbol = descendientes(proceso.pid)
+        hojas = [pid for pid in arbol if descendientes(pid) == [pid]]
+        memorias = {pid: memoria(pid) for pid in arbol}
+    finally:
+        os.killpg(proceso.pid, signal.SIGTERM)
+        proceso.wait(timeout=60)
+
+    return {
+        'arranque': arranque,
+        'primeras': primeras,
+        'siguientes': siguientes,
+        'workers': len(hojas),
+        'rss_worker': statistics.mean(memorias[pid]['rss'] for pid in hojas),
+        'uss_worker': statistics.mean(memorias[pid]['uss'] for pid in hojas),
+        'pss_total': sum(m['pss'] for m in memorias.values())
+    }
+
+
+def main():
+    electores = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    workers = sys.argv[2] if len(sys.argv) > 2 else '4'
+
+    crear_app_benchmark(electores)  # crea la base (DATABASE_URL) con los electores sintéticos
+    entorno = {**os.environ, 'GUNICORN_WORKERS': workers, 'DRENAJE_SEGUNDOS': '0'}
+    entorno.pop('PROMETHEUS_MULTIPROC_DIR', None)
+    gunicorn = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py']
+    modos = {
+        'desarrollo': ([sys.executable, 'app.py'], entorno),
+        'gunicorn': (gunicorn, {**entorno, 'GUNICORN_PRECARGA': 'false'}),
+        'gunicorn+precarga': (gunicorn, {**entorno, 'GUNICORN_PRECARGA': 'true'}),
+    }
+
+    print(f'{electores} electores; gunicorn con {workers} workers')
+    resultados = {modo: medir(modo, comando, env) for modo, (comando, env) in modos.items()}
+
+    print(f'\n{"modo":<19}{"arranque":>10}{"workers":>9}{"RSS/worker":>12}{"USS/worker":>12}{"PSS total":>11}')
+    for modo, r in resultados.items():
+        print(f'{modo:<19}{r["arranque"]:>9.2f}s{r["workers"]:>9}{r["rss_worker"]:>9.1f} MB'
+              f'{r["uss_worker"]:>9.1f} MB{r["pss_total"]:>8.1f} MB')
+
+    print(f'\nPrimera solicitud / mediana de las {REPETICIONES} siguientes (ms)')
+    print(f'{"ruta":<22}' + ''.join(f'{modo:>22}' for modo in resultados))
+    for ruta in RUTAS:
+        print(f'{ruta:<22}' + ''.join(
+            f'{r["primeras"][ruta]:>12.2f} / {r["siguientes"][ruta]:>6.2f}' for r in resultados.values()
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark del cubo de resultados en memoria.
+
+Llena CONTEO_REGION con 26 regiones, las categorías de init_db.py, 30
+partidos y todos los fragmentos; mide la construcción del cubo (lectura en
+bloques), su huella en memoria y los cortes típicos de un tablero frente a
+la misma consulta agrupada en SQL.
+
+Uso:
+    python -m benchmarks.bench_cubo [repeticiones]
+"""
+import random
+import sys
+import time
+
+from benchmarks._entorno import crear_app_benchmark, percentil
+
+NUM_REGIONES = 26
+NUM_PARTIDOS = 30
+
+
+def poblar_conteos(app, semilla=2026):
+    from app.models import db, ConteoRegion
+    from app.services.catalogo_service import catalogo_service
+
+    rng = random.Random(semilla)
+    with app.app_context():
+        categorias = list(catalogo_service.actual().categorias)
+        db.session.execute(
+            ConteoRegion.__table__.insert(),
+            [
+                {
+                    'region': f'Región {r:02d}',
+                    'id_categoria': id_categoria,
+                    'id_partido': id_partido,
+                    'fragmento': fragmento,
+                    'cantidad': rng.randint(0, 50_000)
+                }
+                for r in range(NUM_REGIONES)
+                for id_categoria in categorias
+                for id_partido in range(NUM_PARTIDOS + 1)  # 0: voto en blanco
+                for fragmento in range(app.config['CONTEO_FRAGMENTOS'])
+            ]
+        )
+        db.session.commit()
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1_000_000)
+    return tiempos
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    app = crear_app_benchmark()
+    from app.models import db, ConteoRegion
+    from app.services.cubo_service import cubo_service
+    from sqlalchemy import select, func
+
+    app.config['CUBO_INTERVALO'] = float('inf')  # medir solo el corte, sin comprobación contra la base
+    poblar_conteos(app)
+
+    with app.app_context():
+        filas = db.session.execute(select(func.count()).select_from(ConteoRegion)).scalar()
+        inicio = time.perf_counter()
+        memoria = cubo_service.reconstruir()
+        construccion = time.perf_counter() - inicio
+
+        print(f'Construcción desde {filas} filas de conteo_region: {construccion * 1000:.1f} ms')
+        print(f'Forma {memoria["forma"]}, datos {memoria["bytes_datos"] / 1024:.1f} KiB, '
+              f'índices {memoria["bytes_indices"] / 1024:.1f} KiB')
+
+        casos = {
+            'nacional por categoría': (
+                lambda: cubo_service.consultar(por=['categoria', 'partido']),
+                select(ConteoRegion.id_categoria, ConteoRegion.id_partido, func.sum(ConteoRegion.cantidad))
+                .group_by(ConteoRegion.id_categoria, ConteoRegion.id_partido)
+            ),
+            'una región': (
+                lambda: cubo_service.consultar(regiones=['Región 07'], por=['categoria', 'partido']),
+                select(ConteoRegion.id_categoria, ConteoRegion.id_partido, func.sum(ConteoRegion.cantidad))
+                .where(ConteoRegion.region == 'Región 07')
+                .group_by(ConteoRegion.id_categoria, ConteoRegion.id_partido)
+            ),
+            'partido por región': (
+                lambda: cubo_service.consultar(partidos=[3], por=['region', 'categoria']),
+                select(ConteoRegion.region, ConteoRegion.id_categoria, func.sum(ConteoRegion.cantidad))
+                .where(ConteoRegion.id_partido == 3)
+                .group_by(ConteoRegion.region, ConteoRegion.id_categoria)
+            ),
+        }
+
+        print(f'{"corte":<26}{"cubo p50 (µs)":>16}{"SQL p50 (µs)":>16}')
+        for nombre, (corte, consulta) in casos.items():
+            cubo = medir(corte, repeticiones)
+            sql = medir(lambda: db.session.execute(consulta).all(), max(1, repeticiones // 10))
+            print(f'{nombre:<26}{percentil(cubo, 50):>16.1f}{percentil(sql, 50):>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
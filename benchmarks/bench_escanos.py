@@ -0,0 +1,71 @@
+"""
+Benchmark de la asignación de escaños con distritos y partidos realistas
+(27 distritos, 30 partidos, 130 escaños, candidatos preferenciales).
+
+Mide calcular_asignacion en el proceso actual y la ida y vuelta completa a
+través del pool de procesos que usa EscanosService.
+
+Uso:
+    python -m benchmarks.bench_escanos [repeticiones]
+"""
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks._entorno import percentil
+from app.services.escanos_service import calcular_asignacion, repartir_escanos_distritos
+
+NUM_DISTRITOS = 27
+NUM_PARTIDOS = 30
+ESCANOS = 130
+
+
+def generar_entrada(semilla=2026):
+    rng = random.Random(semilla)
+    distritos = [f'Distrito {i:02d}' for i in range(NUM_DISTRITOS)]
+    electores = {d: rng.randint(100_000, 8_000_000) for d in distritos}
+    # Popularidad desigual de partidos, como en una elección real
+    peso = {p: rng.paretovariate(1.2) for p in range(1, NUM_PARTIDOS + 1)}
+    return {
+        'escanos_por_distrito': repartir_escanos_distritos(electores, ESCANOS),
+        'votos': {
+            d: {p: int(electores[d] * 0.8 * peso[p] / sum(peso.values()) * rng.uniform(0.7, 1.3)) for p in peso}
+            for d in distritos
+        },
+        'umbral': 0.05,
+        'candidatos': {
+            p: [{'id_candidato': p * 1000 + n, 'numero_candidato': n} for n in range(1, ESCANOS + 1)]
+            for p in peso
+        }
+    }
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    entrada = generar_entrada()
+
+    local = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        calcular_asignacion(entrada)
+        local.append((time.perf_counter() - inicio) * 1000)
+
+    remoto = []
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        pool.submit(calcular_asignacion, entrada).result()  # arranque del proceso
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            pool.submit(calcular_asignacion, entrada).result()
+            remoto.append((time.perf_counter() - inicio) * 1000)
+
+    resultado = calcular_asignacion(entrada)
+    asignados = sum(p['escanos'] for p in resultado['partidos'])
+    print(f'Asignación de {asignados} escaños, {NUM_DISTRITOS} distritos, {NUM_PARTIDOS} partidos')
+    print(f'{"modo":<22}{"p50 (ms)":>10}{"p99 (ms)":>10}')
+    for nombre, tiempos in (('mismo proceso', local), ('pool de procesos', remoto)):
+        print(f'{nombre:<22}{percentil(tiempos, 50):>10.3f}{percentil(tiempos, 99):>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark de memoria de la exportación en flujo de VOTO_CATEGORIA.
+
+Inserta N filas sintéticas y consume GET /api/votos-categoria/exportar
+(NDJSON y CSV) bloque a bloque, muestreando la memoria residente (RSS). Con
+lectura por bloques la RSS queda plana; como referencia mide también la
+carga completa con query.all() + jsonify sobre una fracción de las filas.
+
+Uso:
+    python -m benchmarks.bench_exportacion [filas] [filas_referencia]
+"""
+import sys
+import time
+
+from benchmarks._entorno import crear_app_benchmark, rss_mb
+
+LOTE_INSERCION = 100_000
+
+
+def poblar(app, filas: int) -> None:
+    from app.models import db, VotoCategoria
+
+    columnas = [c.name for c in VotoCategoria.__table__.c]
+    with app.app_context():
+        for inicio in range(0, filas, LOTE_INSERCION):
+            db.session.execute(
+                VotoCategoria.__table__.insert(),
+                [
+                    dict(zip(columnas, (i + 1, i // 6 + 1, i % 6 + 1, i % 30 + 1, i % 130 + 1, None)))
+                    for i in range(inicio, min(filas, inicio + LOTE_INSERCION))
+                ]
+            )
+            db.session.commit()
+
+
+def medir_flujo(cliente, formato: str):
+    respuesta = cliente.get(f'/api/votos-categoria/exportar?formato={formato}', buffered=False)
+    inicial = rss_mb()
+    maxima = inicial
+    total_bytes = 0
+    inicio = time.perf_counter()
+    for i, bloque in enumerate(respuesta.response):
+        total_bytes += len(bloque)
+        if i % 20 == 0:
+            maxima = max(maxima, rss_mb())
+    respuesta.close()
+    return time.perf_counter() - inicio, total_bytes, inicial, max(maxima, rss_mb())
+
+
+def medir_carga_completa(app, filas: int):
+    from app.models import VotoCategoria
+    from flask import jsonify
+
+    inicial = rss_mb()
+    with app.test_request_context():
+        datos = [v.to_dict() for v in VotoCategoria.query.limit(filas).all()]
+        respuesta = jsonify(datos)
+        maxima = rss_mb()
+        del datos, respuesta
+    return inicial, maxima
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    filas_referencia = int(sys.argv[2]) if len(sys.argv) > 2 else 500_000
+
+    app = crear_app_benchmark()
+    inicio = time.perf_counter()
+    poblar(app, filas)
+    print(f'{filas} filas de voto_categoria insertadas en {time.perf_counter() - inicio:.1f} s')
+
+    cliente = app.test_client()
+    print(f'{"modo":<28}{"filas":>10}{"s":>8}{"MB enviados":>13}{"RSS ini":>9}{"RSS max":>9}')
+    for formato in ('ndjson', 'csv'):
+        segundos, total_bytes, inicial, maxima = medir_flujo(cliente, formato)
+        print(f'{"flujo " + formato:<28}{filas:>10}{segundos:>8.1f}{total_bytes / 2**20:>13.0f}'
+              f'{inicial:>9.0f}{maxima:>9.0f}')
+
+    if filas_referencia:
+        inicial, maxima = medir_carga_completa(app, filas_referencia)
+        print(f'{"query.all() + jsonify":<28}{filas_referencia:>10}{"":>8}{"":>13}{inicial:>9.0f}{maxima:>9.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark de la importación del padrón.
+
+Genera un CSV y un archivo de ancho fijo con N electores sintéticos (la mitad
+ya registrados, para medir también la actualización) y los importa con
+PadronService; compara las filas por segundo con ElectorService.create, un
+commit por elector.
+
+Uso:
+    python -m benchmarks.bench_importacion_padron [filas] [filas_uno_a_uno]
+"""
+import io
+import sys
+import time
+
+from benchmarks._entorno import crear_app_benchmark, dni_sintetico, ContadorConsultas
+
+
+def generar(formato: str, desde: int, filas: int) -> str:
+    from app.services.padron_service import ANCHOS
+
+    if formato == 'csv':
+        lineas = ['dni,nombres,apellidos,distrito,region']
+        lineas.extend(f'{dni_sintetico(i)},Elector,Importado {i},Lima,Lima' for i in range(desde, desde + filas))
+    else:
+        lineas = [
+            ''.join(valor.ljust(ancho) for valor, ancho in
+                    zip((dni_sintetico(i), 'Elector', f'Importado {i}', 'Lima', 'Lima'), ANCHOS))
+            for i in range(desde, desde + filas)
+        ]
+    return '\n'.join(lineas) + '\n'
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    filas_uno_a_uno = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    # La mitad de cada archivo ya está en ELECTOR: ejercita la rama ON CONFLICT
+    app = crear_app_benchmark(filas // 2)
+    from app.models import db
+    from app.services.elector_service import ElectorService
+    from app.services.padron_service import padron_service
+
+    elector_service = ElectorService()
+    print(f'{"carga":<12}{"filas":>10}{"segundos":>10}{"filas/s":>12}{"consultas":>11}')
+    with app.app_context():
+        for formato in ('csv', 'fijo'):
+            texto = io.StringIO(generar(formato, 0, filas))
+            with ContadorConsultas(db.engine) as consultas:
+                inicio = time.perf_counter()
+                resultado = padron_service.importar(texto, formato, f'benchmark.{formato}')
+                segundos = time.perf_counter() - inicio
+            assert resultado['filas_validas'] == filas, resultado
+            print(f'{formato:<12}{filas:>10}{segundos:>10.2f}{filas / segundos:>12,.0f}{consultas.total:>11}')
+
+        with ContadorConsultas(db.engine) as consultas:
+            inicio = time.perf_counter()
+            for i in range(filas, filas + filas_uno_a_uno):
+                elector_service.create({'dni': dni_sintetico(i), 'nombres': 'Elector', 'apellidos': f'Uno {i}',
+                                       'distrito': 'Lima', 'region': 'Lima'})
+            segundos = time.perf_counter() - inicio
+        print(f'{"uno a uno":<12}{filas_uno_a_uno:>10}{segundos:>10.2f}{filas_uno_a_uno / segundos:>12,.0f}'
+              f'{consultas.total:>11}')
+
+
+if __name__ == '__main__':
+    main()
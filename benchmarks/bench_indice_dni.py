@@ -0,0 +1,90 @@
+"""
+Benchmark del índice de DNI en memoria.
+
+Inserta N electores sintéticos y marca como votados la mitad; mide la
+construcción del índice (lectura en bloques de ELECTOR y VOTO), su tamaño y
+la verificación "¿existe? / ¿ya votó?" desde el índice frente a la consulta
+equivalente en SQL (elector LEFT JOIN voto por DNI).
+
+Uso:
+    python -m benchmarks.bench_indice_dni [electores] [repeticiones]
+"""
+import random
+import sys
+import time
+from datetime import datetime
+
+from benchmarks._entorno import crear_app_benchmark, dni_sintetico, percentil
+
+LOTE_INSERCION = 100_000
+
+
+def poblar_votos(app, num_electores: int) -> None:
+    from app.models import db, Voto
+    from app.services.catalogo_service import catalogo_service
+
+    with app.app_context():
+        id_tipo_voto = catalogo_service.actual().id_tipo_voto('Válido')
+        fecha = datetime.utcnow()
+        for inicio in range(0, num_electores, 2 * LOTE_INSERCION):
+            db.session.execute(
+                Voto.__table__.insert(),
+                [
+                    {'fecha': fecha, 'dni': dni_sintetico(i), 'id_tipo_voto': id_tipo_voto}
+                    for i in range(inicio, min(num_electores, inicio + 2 * LOTE_INSERCION), 2)
+                ]
+            )
+            db.session.commit()
+
+
+def medir(funcion, argumentos):
+    tiempos = []
+    for argumento in argumentos:
+        inicio = time.perf_counter()
+        funcion(argumento)
+        tiempos.append((time.perf_counter() - inicio) * 1_000_000)
+    return tiempos
+
+
+def main():
+    num_electores = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+
+    inicio = time.perf_counter()
+    app = crear_app_benchmark(num_electores)
+    poblar_votos(app, num_electores)
+    print(f'{num_electores} electores ({num_electores // 2} con voto) insertados en '
+          f'{time.perf_counter() - inicio:.1f} s')
+
+    from app.models import db, Elector, Voto
+    from app.services.indice_dni_service import indice_dni_service
+    from sqlalchemy import select
+
+    app.config['INDICE_DNI_INTERVALO'] = float('inf')  # medir solo la búsqueda, sin relectura de votos
+
+    rng = random.Random(2026)
+    # Mezcla de DNIs registrados (con y sin voto) y no registrados
+    dnis = [dni_sintetico(rng.randrange(num_electores * 5 // 4)) for _ in range(repeticiones)]
+
+    with app.app_context():
+        inicio = time.perf_counter()
+        memoria = indice_dni_service.reconstruir()
+        print(f'Construcción: {(time.perf_counter() - inicio) * 1000:.0f} ms; '
+              f'{memoria["electores"]} electores ({memoria["bytes_electores"] / 2**20:.1f} MB), '
+              f'{memoria["votos"]} votos ({memoria["bytes_votos"] / 2**20:.1f} MB)')
+
+        consulta = (
+            select(Elector.dni, Voto.id_voto)
+            .outerjoin(Voto, Voto.dni == Elector.dni)
+        )
+        indice = medir(indice_dni_service.consultar, dnis)
+        sql = medir(lambda dni: db.session.execute(consulta.where(Elector.dni == dni)).first(),
+                    dnis[:max(1, repeticiones // 10)])
+
+    print(f'{"verificación":<16}{"p50 (µs)":>12}{"p99 (µs)":>12}')
+    print(f'{"índice":<16}{percentil(indice, 50):>12.1f}{percentil(indice, 99):>12.1f}')
+    print(f'{"SQL":<16}{percentil(sql, 50):>12.1f}{percentil(sql, 99):>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
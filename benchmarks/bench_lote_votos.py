@@ -0,0 +1,47 @@
+"""
+Benchmark de ingesta de votos: VotoService.create (uno por transacción)
+frente a VotoService.create_many (lotes con validación por conjuntos).
+
+Uso:
+    python -m benchmarks.bench_lote_votos [num_votos] [tamano_lote]
+"""
+import sys
+import time
+
+from benchmarks._entorno import crear_app_benchmark, ContadorConsultas
+from benchmarks.bench_registro_voto import papeleta
+
+
+def main():
+    num_votos = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    tamano_lote = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    app = crear_app_benchmark(num_electores=2 * num_votos)
+
+    from app.models import db
+    from app.services import VotoService
+    voto_service = VotoService()
+
+    with app.app_context():
+        with ContadorConsultas(db.engine) as individual:
+            inicio = time.perf_counter()
+            for i in range(num_votos):
+                voto_service.create(papeleta(i))
+            segundos_individual = time.perf_counter() - inicio
+
+        with ContadorConsultas(db.engine) as lotes:
+            inicio = time.perf_counter()
+            for desde in range(num_votos, 2 * num_votos, tamano_lote):
+                resultados = voto_service.create_many(
+                    [papeleta(i) for i in range(desde, min(desde + tamano_lote, 2 * num_votos))]
+                )
+                assert all(r['estado'] == 'registrado' for r in resultados)
+            segundos_lotes = time.perf_counter() - inicio
+
+    print(f'Ingesta de {num_votos} votos (lotes de {tamano_lote})')
+    print(f'{"modo":<14}{"votos/s":>12}{"sentencias":>12}')
+    print(f'{"individual":<14}{num_votos / segundos_individual:>12.0f}{individual.total:>12}')
+    print(f'{"lote":<14}{num_votos / segundos_lotes:>12.0f}{lotes.total:>12}')
+
+
+if __name__ == '__main__':
+    main()
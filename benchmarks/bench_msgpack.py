@@ -0,0 +1,107 @@
+"""
+Benchmark de JSON (orjson) contra MessagePack para los clientes de kiosco.
+
+Cargas medidas, con los datos de init_db.py:
+
+- cedula:     GET /api/cedula/bundle (catálogo de la cédula)
+- categorias: GET /api/categorias/
+- partidos:   GET /api/partidos/
+- candidatos: GET /api/candidatos/
+- verificar:  GET /api/electores/verificar/<dni>
+- voto:       cuerpo de POST /api/votos/ (un voto por categoría con preferenciales)
+
+Para cada una se informa el tamaño en bytes (sin comprimir y con gzip) y el
+tiempo de codificar y decodificar en microsegundos (mediana de N repeticiones).
+Al final registra N votos de punta a punta con cada formato.
+
+Uso:
+    python -m benchmarks.bench_msgpack [repeticiones]
+"""
+import gzip
+import statistics
+import sys
+import time
+
+import msgpack
+import orjson
+
+from benchmarks._entorno import crear_app_benchmark, dni_sintetico
+
+RUTAS = {
+    'cedula': '/api/cedula/bundle',
+    'categorias': '/api/categorias/',
+    'partidos': '/api/partidos/',
+    'candidatos': '/api/candidatos/',
+}
+
+
+def mediana_us(funcion, dato, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(dato)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1e6
+
+
+def cargas(app, cliente) -> dict:
+    from app.models import db, Categoria, Elector
+
+    datos = {nombre: cliente.get(ruta).json for nombre, ruta in RUTAS.items()}
+    with app.app_context():
+        dni = db.session.query(Elector.dni).limit(1).scalar()
+        categorias = [c.id_categoria for c in db.session.query(Categoria.id_categoria)]
+    datos['verificar'] = cliente.get(f'/api/electores/verificar/{dni}').json
+    datos['voto'] = {
+        'dni': dni,
+        'votos_categoria': [
+            {'id_categoria': id_categoria, 'id_partido': 1,
+             'numero_preferencial_1': 101, 'numero_preferencial_2': 102}
+            for id_categoria in categorias
+        ]
+    }
+    return datos
+
+
+def registrar(cliente, votos: int, desde: int, formato: str) -> float:
+    inicio = time.perf_counter()
+    for i in range(desde, desde + votos):
+        cuerpo = {'dni': dni_sintetico(i), 'votos_categoria': [{'id_categoria': 1, 'id_partido': 1}]}
+        if formato == 'msgpack':
+            respuesta = cliente.post('/api/votos/', data=msgpack.packb(cuerpo),
+                                     content_type='application/msgpack',
+                                     headers={'Accept': 'application/msgpack'})
+        else:
+            respuesta = cliente.post('/api/votos/', json=cuerpo)
+        assert respuesta.status_code == 201, respuesta.data
+    return (time.perf_counter() - inicio) / votos * 1000
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    votos = 200
+
+    app = crear_app_benchmark(num_electores=2 * votos)
+    cliente = app.test_client()
+
+    print(f'Tamaño en bytes y mediana de {repeticiones} repeticiones (µs)')
+    print(f'{"carga":<12}{"json":>8}{"msgpack":>9}{"json.gz":>9}{"mp.gz":>8}'
+          f'{"cod.json":>10}{"cod.mp":>8}{"dec.json":>10}{"dec.mp":>8}')
+    for nombre, dato in cargas(app, cliente).items():
+        cuerpo_json = orjson.dumps(dato)
+        cuerpo_mp = msgpack.packb(dato)
+        assert msgpack.unpackb(cuerpo_mp) == orjson.loads(cuerpo_json)
+        print(f'{nombre:<12}{len(cuerpo_json):>8}{len(cuerpo_mp):>9}'
+              f'{len(gzip.compress(cuerpo_json)):>9}{len(gzip.compress(cuerpo_mp)):>8}'
+              f'{mediana_us(orjson.dumps, dato, repeticiones):>10.1f}'
+              f'{mediana_us(msgpack.packb, dato, repeticiones):>8.1f}'
+              f'{mediana_us(orjson.loads, cuerpo_json, repeticiones):>10.1f}'
+              f'{mediana_us(msgpack.unpackb, cuerpo_mp, repeticiones):>8.1f}')
+
+    print(f'\nPOST /api/votos/ de punta a punta, {votos} votos (ms por voto)')
+    for indice, formato in enumerate(('json', 'msgpack')):
+        print(f'  {formato:<9}{registrar(cliente, votos, indice * votos, formato):>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark del pool de conexiones bajo contención.
+
+Muchos hilos (kioscos) piden una conexión, verifican un DNI y la retienen
+--trabajo milisegundos (el resto de la solicitud) antes de devolverla. Para
+cada modo se crea un motor con opciones_motor y se mide el rendimiento, la
+latencia por operación, la espera por checkout, las esperas agotadas y las
+conexiones que se abrieron (tormentas de conexiones):
+
+- defecto:   pool de SQLAlchemy sin configurar (5 + 10, espera 30 s)
+- ajustado:  valores de ProductionConfig sin pre-ping
+- pre_ping:  valores de ProductionConfig (con pre-ping)
+- pgbouncer: DB_PGBOUNCER (NullPool: una conexión nueva por operación)
+
+Uso:
+    python -m benchmarks.bench_pool [hilos] [operaciones_por_hilo] [trabajo_ms]
+"""
+import random
+import sys
+import threading
+import time
+
+from benchmarks._entorno import crear_app_benchmark, dni_sintetico, percentil
+
+NUM_ELECTORES = 10_000
+
+
+def configuracion(clase, **cambios):
+    valores = {clave: getattr(clase, clave) for clave in dir(clase) if clave.isupper()}
+    valores.update(cambios)
+    return valores
+
+
+def medir(url: str, opciones: dict, hilos: int, operaciones: int, trabajo: float) -> dict:
+    from app.metricas import estadisticas_pool, medir_pool
+    from app.models import Elector
+    from sqlalchemy import create_engine, event, select
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+    engine = create_engine(url, **opciones)
+    medir_pool(engine)
+    abiertas = []
+    event.listen(engine, 'connect', lambda *_: abiertas.append(1))
+    consulta = select(Elector.dni)
+
+    latencias = []
+    errores = []
+    barrera = threading.Barrier(hilos + 1)
+
+    def kiosco(semilla):
+        rng = random.Random(semilla)
+        propias = []
+        barrera.wait()
+        for _ in range(operaciones):
+            inicio = time.perf_counter()
+            try:
+                with engine.connect() as conexion:
+                    conexion.execute(consulta.where(Elector.dni == dni_sintetico(rng.randrange(NUM_ELECTORES))))
+                    time.sleep(trabajo)
+                propias.append((time.perf_counter() - inicio) * 1000)
+            except PoolTimeoutError:
+                errores.append(1)
+        latencias.extend(propias)
+
+    trabajadores = [threading.Thread(target=kiosco, args=(i,)) for i in range(hilos)]
+    for trabajador in trabajadores:
+        trabajador.start()
+    barrera.wait()
+    inicio = time.perf_counter()
+    for trabajador in trabajadores:
+        trabajador.join()
+    segundos = time.perf_counter() - inicio
+
+    estadisticas = estadisticas_pool(engine)
+    engine.dispose()
+    return {
+        'ops_s': len(latencias) / segundos,
+        'p50': percentil(latencias, 50),
+        'p99': percentil(latencias, 99),
+        'espera_media': estadisticas['espera']['media_ms'],
+        'espera_maxima': estadisticas['espera']['maxima_ms'],
+        'agotados': len(errores),
+        'conexiones': len(abiertas)
+    }
+
+
+def main():
+    hilos = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    operaciones = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    trabajo = (float(sys.argv[3]) if len(sys.argv) > 3 else 5.0) / 1000
+
+    app = crear_app_benchmark(NUM_ELECTORES)
+    from config.config import Config, ProductionConfig, opciones_motor
+
+    url = app.config['SQLALCHEMY_DATABASE_URI']
+    modos = {
+        'defecto': {},
+        'ajustado': opciones_motor(configuracion(ProductionConfig, SQLALCHEMY_DATABASE_URI=url,
+                                                 DB_POOL_PRE_PING=False)),
+        'pre_ping': opciones_motor(configuracion(ProductionConfig, SQLALCHEMY_DATABASE_URI=url)),
+        'pgbouncer': opciones_motor(configuracion(Config, SQLALCHEMY_DATABASE_URI=url, DB_PGBOUNCER=True)),
+    }
+
+    print(f'{hilos} hilos x {operaciones} operaciones, {trabajo * 1000:.0f} ms con la conexión retenida')
+    print(f'{"modo":<11}{"ops/s":>9}{"p50 ms":>9}{"p99 ms":>9}{"espera media":>14}{"espera máx.":>13}'
+          f'{"agotadas":>10}{"conexiones":>12}')
+    for modo, opciones in modos.items():
+        r = medir(url, opciones, hilos, operaciones, trabajo)
+        print(f'{modo:<11}{r["ops_s"]:>9.0f}{r["p50"]:>9.2f}{r["p99"]:>9.2f}{r["espera_media"]:>11.2f} ms'
+              f'{r["espera_maxima"]:>10.1f} ms{r["agotados"]:>10}{r["conexiones"]:>12}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark del motor de conteo preferencial sobre papeletas sintéticas.
+
+Compara contar_bloque (NumPy, bloques de 100 000 filas) con un conteo fila por
+fila en Python (collections.Counter), sobre las mismas columnas
+(id_partido, numero_preferencial_1, numero_preferencial_2).
+
+Uso:
+    python -m benchmarks.bench_preferencial [num_papeletas]
+"""
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from benchmarks._entorno import RAIZ  # noqa: F401  (agrega la raíz al sys.path)
+from app.services.preferencial_service import contar_bloque
+
+NUM_PARTIDOS = 30
+CANDIDATOS_POR_PARTIDO = 130
+BLOQUE = 100_000
+
+
+def generar(num_papeletas, semilla=2026):
+    """Columnas sintéticas: ~60% usa el 1er preferencial y ~35% el 2do; -1 representa NULL"""
+    rng = np.random.default_rng(semilla)
+    partidos = rng.integers(1, NUM_PARTIDOS + 1, num_papeletas)
+    pref_1 = rng.integers(1, CANDIDATOS_POR_PARTIDO + 1, num_papeletas)
+    pref_2 = rng.integers(1, CANDIDATOS_POR_PARTIDO + 1, num_papeletas)
+    pref_1[rng.random(num_papeletas) > 0.60] = -1
+    pref_2[rng.random(num_papeletas) > 0.35] = -1
+    return partidos, pref_1, pref_2
+
+
+def contar_numpy(partidos, pref_1, pref_2):
+    base = CANDIDATOS_POR_PARTIDO + 1
+    conteo = np.zeros((NUM_PARTIDOS + 1) * base, dtype=np.int64)
+    for inicio in range(0, partidos.shape[0], BLOQUE):
+        fin = inicio + BLOQUE
+        contar_bloque(partidos[inicio:fin], pref_1[inicio:fin], pref_2[inicio:fin], base, conteo)
+    return conteo
+
+
+def contar_python(filas):
+    conteo = Counter()
+    for id_partido, numero_1, numero_2 in filas:
+        if numero_1 >= 0:
+            conteo[(id_partido, numero_1)] += 1
+        if numero_2 >= 0 and numero_2 != numero_1:
+            conteo[(id_partido, numero_2)] += 1
+    return conteo
+
+
+def main():
+    num_papeletas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    partidos, pref_1, pref_2 = generar(num_papeletas)
+    filas = list(zip(partidos.tolist(), pref_1.tolist(), pref_2.tolist()))
+
+    inicio = time.perf_counter()
+    conteo = contar_numpy(partidos, pref_1, pref_2)
+    segundos_numpy = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    esperado = contar_python(filas)
+    segundos_python = time.perf_counter() - inicio
+
+    base = CANDIDATOS_POR_PARTIDO + 1
+    assert all(conteo[p * base + n] == c for (p, n), c in esperado.items())
+    assert conteo.sum() == sum(esperado.values())
+
+    print(f'Conteo preferencial de {num_papeletas:,} papeletas')
+    print(f'{"motor":<22}{"segundos":>10}{"filas/s":>16}')
+    for nombre, segundos in (('Python (Counter)', segundos_python), ('NumPy (bincount)', segundos_numpy)):
+        print(f'{nombre:<22}{segundos:>10.2f}{num_papeletas / segundos:>16,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark del registro de un voto (POST /api/votos/).
+
+Compara el flujo anterior (validaciones en el controlador, ORM fila por fila
+y relectura posterior al commit) con VotoService.create, que registra el
+voto en una sola transacción con un número fijo de sentencias.
+
+Uso:
+    python -m benchmarks.bench_registro_voto [num_votos]
+"""
+import sys
+import time
+
+from benchmarks._entorno import crear_app_benchmark, dni_sintetico, ContadorConsultas, percentil
+
+
+def registrar_voto_legado(data):
+    """Réplica del flujo anterior de create_voto + VotoService.create"""
+    from app.models import db, Elector, Voto, VotoCategoria, TipoVoto, Categoria
+
+    dni = data['dni']
+    Elector.query.get(dni)
+    Voto.query.filter_by(dni=dni).first()
+    Voto.query.filter_by(dni=dni).first()
+
+    votos_categoria_data = data.pop('votos_categoria', [])
+    tipo_valido = TipoVoto.query.filter_by(nombre_tipo='Válido').first()
+    tipo_blanco = TipoVoto.query.filter_by(nombre_tipo='En Blanco').first()
+    tiene_voto_valido = any(vc.get('id_partido') is not None for vc in votos_categoria_data)
+    id_tipo_voto = tipo_valido.id_tipo_voto if tiene_voto_valido else tipo_blanco.id_tipo_voto
+
+    if not votos_categoria_data:
+        votos_categoria_data = [
+            {'id_categoria': cat.id_categoria, 'id_partido': None}
+            for cat in Categoria.query.all()
+        ]
+
+    voto = Voto(dni=dni, id_tipo_voto=id_tipo_voto)
+    db.session.add(voto)
+    db.session.flush()
+    for vc_data in votos_categoria_data:
+        db.session.add(VotoCategoria(id_voto=voto.id_voto, **vc_data))
+    db.session.commit()
+
+    voto_dict = voto.to_dict()
+    voto_dict['votos_categoria'] = [vc.to_dict() for vc in voto.voto_categorias]
+    return voto_dict
+
+
+def papeleta(i):
+    """Alterna votos válidos (6 categorías) y votos en blanco sin categorías"""
+    if i % 2:
+        return {'dni': dni_sintetico(i), 'votos_categoria': []}
+    return {
+        'dni': dni_sintetico(i),
+        'votos_categoria': [
+            {
+                'id_categoria': id_categoria,
+                'id_partido': 1 + (i + id_categoria) % 10,
+                'numero_preferencial_1': None,
+                'numero_preferencial_2': None
+            }
+            for id_categoria in range(1, 7)
+        ]
+    }
+
+
+def medir(app, registrar, desde, num_votos):
+    from app.models import db
+
+    latencias = []
+    with app.app_context():
+        with ContadorConsultas(db.engine) as contador:
+            for i in range(desde, desde + num_votos):
+                inicio = time.perf_counter()
+                registrar(papeleta(i))
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                db.session.remove()
+    return {
+        'consultas_por_voto': contador.total / num_votos,
+        'p50_ms': percentil(latencias, 50),
+        'p99_ms': percentil(latencias, 99)
+    }
+
+
+def main():
+    num_votos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    app = crear_app_benchmark(num_electores=2 * num_votos)
+
+    from app.services import VotoService
+    voto_service = VotoService()
+
+    resultados = {
+        'anterior': medir(app, registrar_voto_legado, 0, num_votos),
+        'una transacción': medir(app, voto_service.create, num_votos, num_votos)
+    }
+
+    print(f'Registro de {num_votos} votos ({app.config["SQLALCHEMY_DATABASE_URI"].split(":")[0]})')
+    print(f'{"flujo":<18}{"consultas/voto":>16}{"p50 (ms)":>12}{"p99 (ms)":>12}')
+    for nombre, r in resultados.items():
+        print(f'{nombre:<18}{r["consultas_por_voto"]:>16.1f}{r["p50_ms"]:>12.3f}{r["p99_ms"]:>12.3f}')
+
+
+if __name__ == '__main__':
+    main()
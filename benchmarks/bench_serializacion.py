@@ -0,0 +1,113 @@
+"""
+Microbenchmark de serialización de un listado de VOTO_CATEGORIA.
+
+Inserta N filas y mide, para las mismas N filas (mejor de R corridas), cada
+etapa de cuatro caminos: leer las filas, armar los objetos a codificar y
+codificar el JSON.
+
+- orm+to_dict+json:   objetos del ORM, to_dict y el proveedor JSON de Flask
+                      anterior (json de la biblioteca estándar); el camino de
+                      los listados antes de la paginación por Core
+- core+dict+json:     tuplas de Core, un diccionario por fila con fechas ya
+                      convertidas (BaseService.listar) y json estándar
+- core+dict+orjson:   ?forma=objetos (respuesta_listado con ProveedorJSON)
+- core+tuplas+orjson: ?forma=filas, sin un diccionario por fila
+
+Al final mide las dos formas de GET /api/votos-categoria/ de punta a punta.
+
+Uso:
+    python -m benchmarks.bench_serializacion [filas] [corridas]
+"""
+import sys
+import time
+
+from benchmarks._entorno import crear_app_benchmark
+from benchmarks.bench_exportacion import poblar
+
+
+def cronometrar(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, (time.perf_counter() - inicio) * 1000
+
+
+def caminos(app, filas: int):
+    from flask.json.provider import DefaultJSONProvider
+    from sqlalchemy import select
+    from app.models import db, VotoCategoria
+    from app.proveedor_json import ProveedorJSON
+    from app.services import VotoCategoriaService
+    from app.services.exportacion import serializar_valor
+
+    servicio = VotoCategoriaService()
+    json_estandar = DefaultJSONProvider(app)
+    json_orjson = ProveedorJSON(app)
+
+    def leer_orm():
+        db.session.expunge_all()  # sin el mapa de identidad de la corrida anterior
+        return db.session.execute(
+            select(VotoCategoria).order_by(VotoCategoria.id_voto_categoria).limit(filas)
+        ).scalars().all()
+
+    def leer_core():
+        return servicio.listar_filas(limit=filas)
+
+    return {
+        'orm+to_dict+json': (
+            leer_orm,
+            lambda entidades: [v.to_dict() for v in entidades],
+            lambda datos: json_estandar.dumps(datos).encode('utf-8')
+        ),
+        'core+dict+json': (
+            leer_core,
+            lambda pagina: [dict(zip(pagina[0], map(serializar_valor, fila))) for fila in pagina[1]],
+            lambda datos: json_estandar.dumps(datos).encode('utf-8')
+        ),
+        'core+dict+orjson': (
+            leer_core,
+            lambda pagina: [dict(zip(pagina[0], fila)) for fila in pagina[1]],
+            json_orjson.codificar
+        ),
+        'core+tuplas+orjson': (
+            leer_core,
+            lambda pagina: {'columnas': pagina[0], 'filas': pagina[1]},
+            json_orjson.codificar
+        ),
+    }
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    corridas = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    app = crear_app_benchmark()
+    app.config['LISTADO_LIMITE_MAXIMO'] = filas
+    poblar(app, filas)
+
+    print(f'{filas} filas de voto_categoria, mejor de {corridas} corridas (ms)')
+    print(f'{"camino":<21}{"lectura":>9}{"armado":>9}{"codific.":>10}{"total":>9}{"MB":>8}')
+    with app.test_request_context():
+        for nombre, (leer, armar, codificar) in caminos(app, filas).items():
+            mejores = None
+            for _ in range(corridas):
+                leidas, t_lectura = cronometrar(leer)
+                datos, t_armado = cronometrar(armar, leidas)
+                cuerpo, t_codificacion = cronometrar(codificar, datos)
+                tiempos = (t_lectura, t_armado, t_codificacion)
+                if mejores is None or sum(tiempos) < sum(mejores):
+                    mejores = tiempos
+            print(f'{nombre:<21}{mejores[0]:>9.1f}{mejores[1]:>9.1f}{mejores[2]:>10.1f}'
+                  f'{sum(mejores):>9.1f}{len(cuerpo) / 1e6:>8.2f}')
+
+    print('\nGET /api/votos-categoria/ de punta a punta (ms)')
+    cliente = app.test_client()
+    for forma in ('objetos', 'filas'):
+        mejor = min(
+            cronometrar(cliente.get, f'/api/votos-categoria/?limit={filas}&forma={forma}')[1]
+            for _ in range(corridas)
+        )
+        print(f'  forma={forma:<8}{mejor:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
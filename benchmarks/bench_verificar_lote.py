@@ -0,0 +1,58 @@
+"""
+Benchmark de POST /api/electores/verificar-lote frente a una llamada a
+GET /api/electores/verificar/<dni> por DNI, para lotes de distinto tamaño.
+El índice de DNI en memoria se desactiva para comparar solo el acceso a la base.
+
+Uso:
+    python -m benchmarks.bench_verificar_lote [electores] [repeticiones]
+"""
+import os
+import random
+import sys
+import time
+
+from benchmarks._entorno import crear_app_benchmark, dni_sintetico, percentil, ContadorConsultas
+
+TAMANOS = (1, 10, 100, 1000, 10000)
+
+
+def main():
+    num_electores = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    os.environ['INDICE_DNI'] = 'false'
+    app = crear_app_benchmark(num_electores)
+    from app.models import db
+
+    cliente = app.test_client()
+    rng = random.Random(2026)
+
+    print(f'{"DNIs":>7}{"lote p50 (ms)":>16}{"consultas":>11}{"uno a uno (ms)":>16}{"consultas":>11}')
+    for tamano in TAMANOS:
+        # Un 20 % de DNIs no registrados
+        dnis = [dni_sintetico(rng.randrange(num_electores * 5 // 4)) for _ in range(tamano)]
+
+        tiempos = []
+        with app.app_context(), ContadorConsultas(db.engine) as lote:
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                respuesta = cliente.post('/api/electores/verificar-lote', json={'dnis': dnis})
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+                assert respuesta.status_code == 200
+
+        individual = ''
+        consultas_individual = ''
+        if tamano <= 1000:
+            with app.app_context(), ContadorConsultas(db.engine) as uno_a_uno:
+                inicio = time.perf_counter()
+                for dni in dnis:
+                    cliente.get(f'/api/electores/verificar/{dni}')
+                individual = f'{(time.perf_counter() - inicio) * 1000:.1f}'
+            consultas_individual = uno_a_uno.total
+
+        print(f'{tamano:>7}{percentil(tiempos, 50):>16.2f}{lote.total // repeticiones:>11}'
+              f'{individual:>16}{consultas_individual:>11}')
+
+
+if __name__ == '__main__':
+    main()
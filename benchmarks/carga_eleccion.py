@@ -0,0 +1,328 @@
+"""
+Prueba de carga de la jornada electoral.
+
+Levanta la aplicación real (create_app) sobre SQLite temporal o sobre la base
+de DATABASE_URL y reproduce la curva de llegadas de electores de un día de
+elección, comprimida en --duracion segundos. Cada elector que llega:
+
+1. Verifica su DNI (GET /api/electores/verificar/<dni>)
+2. Carga la cédula (categorías, partidos y candidatos)
+3. Emite su voto (POST /api/votos/)
+4. Con probabilidad --cuestionario, envía el cuestionario (POST /api/cuestionarios/)
+
+Una fracción de DNIs no está registrada (solo verifica) y otra repite el DNI
+de un elector anterior (el voto puede responder 409). Las llegadas son de
+lazo abierto: si los hilos no dan abasto, los electores esperan en cola y el
+retraso se reporta aparte.
+
+El resultado (rendimiento, p50/p95/p99 por endpoint, consultas SQL por
+solicitud y tasa de errores) se guarda en JSON; --comparar muestra la
+diferencia con una ejecución anterior y --tolerancia la convierte en una
+verificación (código de salida 1 si el p95 empeora más de ese porcentaje o
+aumenta la tasa de errores).
+
+Uso:
+    python -m benchmarks.carga_eleccion [--votantes 2000] [--duracion 60] [--concurrencia 8]
+    python -m benchmarks.carga_eleccion --salida actual.json --comparar anterior.json --tolerancia 20
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks._entorno import crear_app_benchmark, dni_sintetico, percentil
+
+# Fracción de electores que llega en cada hora de la jornada (07:00 a 16:59):
+# pico a media mañana, valle al mediodía y un repunte antes del cierre
+CURVA_LLEGADAS = (0.07, 0.12, 0.14, 0.13, 0.11, 0.08, 0.07, 0.09, 0.11, 0.08)
+HORA_APERTURA = 7
+
+VERIFICAR = 'GET /api/electores/verificar/<dni>'
+CATEGORIAS = 'GET /api/categorias/'
+PARTIDOS = 'GET /api/partidos/'
+CANDIDATOS = 'GET /api/candidatos/'
+VOTAR = 'POST /api/votos/'
+CUESTIONARIO = 'POST /api/cuestionarios/'
+
+
+class Registro:
+    """Mediciones por endpoint, compartidas por los hilos de la prueba"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencias = defaultdict(list)
+        self.consultas = defaultdict(int)
+        self.estados = defaultdict(lambda: defaultdict(int))
+        self.errores = defaultdict(int)
+        self.retrasos = []
+
+    def anotar(self, endpoint: str, milisegundos: float, consultas: int, estado: int, esperado: bool) -> None:
+        with self._lock:
+            self.latencias[endpoint].append(milisegundos)
+            self.consultas[endpoint] += consultas
+            self.estados[endpoint][str(estado)] += 1
+            if not esperado:
+                self.errores[endpoint] += 1
+
+    def anotar_retraso(self, milisegundos: float) -> None:
+        with self._lock:
+            self.retrasos.append(milisegundos)
+
+
+class Cliente:
+    """
+    Cliente de prueba de un hilo: mide cada solicitud y cuenta las sentencias
+    SQL que ejecuta (el test client atiende la solicitud en el mismo hilo)
+    """
+
+    _hilo = threading.local()
+
+    def __init__(self, app, registro: Registro):
+        self._cliente = app.test_client()
+        self._registro = registro
+
+    @classmethod
+    def contar(cls, conn, cursor, statement, parameters, context, executemany):
+        cls._hilo.consultas = getattr(cls._hilo, 'consultas', 0) + 1
+
+    def solicitar(self, endpoint: str, metodo: str, ruta: str, esperados=(200,), **kwargs):
+        self._hilo.consultas = 0
+        inicio = time.perf_counter()
+        try:
+            respuesta = self._cliente.open(ruta, method=metodo, **kwargs)
+            estado = respuesta.status_code
+        except Exception:
+            respuesta, estado = None, 599  # excepción no manejada por la aplicación
+        milisegundos = (time.perf_counter() - inicio) * 1000
+        self._registro.anotar(endpoint, milisegundos, self._hilo.consultas, estado, estado in esperados)
+        return respuesta if estado in esperados else None
+
+
+def planificar(args, rng: random.Random):
+    """Lista ordenada de (instante en segundos, DNI, perfil) según CURVA_LLEGADAS"""
+    horas = len(CURVA_LLEGADAS)
+    instantes = sorted(
+        (hora + rng.random()) * args.duracion / horas
+        for hora in rng.choices(range(horas), weights=CURVA_LLEGADAS, k=args.votantes)
+    )
+    electores = list(range(args.votantes))
+    rng.shuffle(electores)
+
+    llegadas = []
+    for i, instante in enumerate(instantes):
+        sorteo = rng.random()
+        if sorteo < args.no_registrados:
+            llegadas.append((instante, dni_sintetico(args.votantes + i), 'no_registrado'))
+        elif sorteo < args.no_registrados + args.repetidos and i:
+            llegadas.append((instante, llegadas[rng.randrange(i)][1], 'repetido'))
+        else:
+            llegadas.append((instante, dni_sintetico(electores[i]), 'votante'))
+    return llegadas
+
+
+def papeleta(dni, categorias, partidos, candidatos, rng: random.Random):
+    """Voto en blanco (10 %) o un partido por categoría, a veces con voto preferencial"""
+    if rng.random() < 0.10:
+        return {'dni': dni, 'votos_categoria': []}
+    votos = []
+    for categoria in categorias:
+        id_partido = rng.choice(partidos)['id_partido']
+        lista = candidatos.get((categoria['id_categoria'], id_partido), [])
+        preferencial = rng.choice(lista) if lista and rng.random() < 0.5 else None
+        votos.append({
+            'id_categoria': categoria['id_categoria'],
+            'id_partido': id_partido,
+            'numero_preferencial_1': preferencial,
+            'numero_preferencial_2': None
+        })
+    return {'dni': dni, 'votos_categoria': votos}
+
+
+def sesion(cliente: Cliente, dni: str, perfil: str, preguntas, probabilidad_cuestionario: float,
+           rng: random.Random) -> None:
+    respuesta = cliente.solicitar(VERIFICAR, 'GET', f'/api/electores/verificar/{dni}')
+    if respuesta is None or not respuesta.json['exists']:
+        return
+
+    categorias = cliente.solicitar(CATEGORIAS, 'GET', '/api/categorias/')
+    partidos = cliente.solicitar(PARTIDOS, 'GET', '/api/partidos/')
+    candidatos = cliente.solicitar(CANDIDATOS, 'GET', '/api/candidatos/?limit=1000')
+    if categorias is None or partidos is None or candidatos is None:
+        return
+    por_lista = defaultdict(list)
+    for candidato in candidatos.json:
+        por_lista[(candidato['id_categoria'], candidato['id_partido'])].append(candidato['numero_candidato'])
+
+    esperados = (201, 409) if perfil == 'repetido' else (201,)
+    cliente.solicitar(VOTAR, 'POST', '/api/votos/', esperados=esperados,
+                      json=papeleta(dni, categorias.json, partidos.json, por_lista, rng))
+
+    if preguntas and rng.random() < probabilidad_cuestionario:
+        cliente.solicitar(CUESTIONARIO, 'POST', '/api/cuestionarios/', esperados=(200, 201), json={
+            'respuestas': [
+                {'id_pregunta': pregunta['id_pregunta'], 'id_opcion': rng.choice(pregunta['opciones'])['id_opcion']}
+                for pregunta in preguntas if pregunta['opciones']
+            ]
+        })
+
+
+def ejecutar(app, args) -> dict:
+    from app.models import db
+    from sqlalchemy import event
+
+    with app.app_context():
+        motor = db.engine
+    preguntas = app.test_client().get('/api/preguntas/').json or []
+
+    rng = random.Random(args.semilla)
+    llegadas = planificar(args, rng)
+    registro = Registro()
+    hilos = threading.local()
+
+    def atender(i, dni, perfil, programado):
+        registro.anotar_retraso((time.perf_counter() - programado) * 1000)
+        if not hasattr(hilos, 'cliente'):
+            hilos.cliente = Cliente(app, registro)
+        sesion(hilos.cliente, dni, perfil, preguntas, args.cuestionario, random.Random(args.semilla * 1_000_003 + i))
+
+    event.listen(motor, 'before_cursor_execute', Cliente.contar)
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrencia) as ejecutor:
+            inicio = time.perf_counter()
+            for i, (instante, dni, perfil) in enumerate(llegadas):
+                programado = inicio + instante
+                espera = programado - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+                ejecutor.submit(atender, i, dni, perfil, programado)
+        duracion = time.perf_counter() - inicio
+    finally:
+        event.remove(motor, 'before_cursor_execute', Cliente.contar)
+
+    return resumir(registro, args, motor.dialect.name, llegadas, duracion)
+
+
+def resumir(registro: Registro, args, dialecto: str, llegadas, duracion: float) -> dict:
+    endpoints = {}
+    for endpoint, latencias in sorted(registro.latencias.items()):
+        solicitudes = len(latencias)
+        endpoints[endpoint] = {
+            'solicitudes': solicitudes,
+            'solicitudes_por_s': round(solicitudes / duracion, 2),
+            'p50_ms': round(percentil(latencias, 50), 3),
+            'p95_ms': round(percentil(latencias, 95), 3),
+            'p99_ms': round(percentil(latencias, 99), 3),
+            'max_ms': round(max(latencias), 3),
+            'consultas_por_solicitud': round(registro.consultas[endpoint] / solicitudes, 2),
+            'errores': registro.errores[endpoint],
+            'tasa_error': round(registro.errores[endpoint] / solicitudes, 5),
+            'estados': dict(registro.estados[endpoint])
+        }
+
+    solicitudes = sum(datos['solicitudes'] for datos in endpoints.values())
+    errores = sum(datos['errores'] for datos in endpoints.values())
+    votos = endpoints.get(VOTAR, {}).get('estados', {}).get('201', 0)
+    perfiles = defaultdict(int)
+    for _, _, perfil in llegadas:
+        perfiles[perfil] += 1
+
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'commit': version_codigo(),
+        'base_datos': dialecto,
+        'parametros': vars(args),
+        'curva_llegadas': {f'{HORA_APERTURA + hora:02d}:00': fraccion for hora, fraccion in enumerate(CURVA_LLEGADAS)},
+        'duracion_s': round(duracion, 3),
+        'electores': dict(perfiles),
+        'solicitudes': solicitudes,
+        'solicitudes_por_s': round(solicitudes / duracion, 2),
+        'votos_registrados': votos,
+        'votos_por_s': round(votos / duracion, 2),
+        'errores': errores,
+        'tasa_error': round(errores / solicitudes, 5) if solicitudes else 0.0,
+        'retraso_inicio_ms': {
+            f'p{p}': round(percentil(registro.retrasos, p), 3) for p in (50, 95, 99)
+        },
+        'endpoints': endpoints
+    }
+
+
+def version_codigo():
+    """Commit de git del código medido, si está disponible"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def imprimir(resultado: dict) -> None:
+    print(f'{resultado["base_datos"]}, {resultado["duracion_s"]:.1f} s: {resultado["solicitudes"]} solicitudes '
+          f'({resultado["solicitudes_por_s"]:.1f}/s), {resultado["votos_registrados"]} votos '
+          f'({resultado["votos_por_s"]:.1f}/s), tasa de error {resultado["tasa_error"]:.2%}, '
+          f'retraso de inicio p95 {resultado["retraso_inicio_ms"]["p95"]:.1f} ms')
+    print(f'{"endpoint":<38}{"solic.":>8}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"consultas":>11}{"errores":>9}')
+    for endpoint, datos in resultado['endpoints'].items():
+        print(f'{endpoint:<38}{datos["solicitudes"]:>8}{datos["p50_ms"]:>9.2f}{datos["p95_ms"]:>9.2f}'
+              f'{datos["p99_ms"]:>9.2f}{datos["consultas_por_solicitud"]:>11.2f}{datos["errores"]:>9}')
+
+
+def comparar(anterior: dict, actual: dict, tolerancia) -> bool:
+    """Imprime la diferencia con una ejecución anterior; False si hay una regresión fuera de tolerancia"""
+    print(f'\nFrente a {anterior.get("commit") or "?"} ({anterior.get("fecha")}):')
+    print(f'{"endpoint":<38}{"p95 antes":>11}{"p95 ahora":>11}{"cambio":>9}{"consultas":>12}{"tasa error":>14}')
+    aceptable = True
+    for endpoint, datos in actual['endpoints'].items():
+        previo = anterior.get('endpoints', {}).get(endpoint)
+        if previo is None:
+            print(f'{endpoint:<38}{"-":>11}{datos["p95_ms"]:>11.2f}')
+            continue
+        cambio = (datos['p95_ms'] / previo['p95_ms'] - 1) * 100 if previo['p95_ms'] else 0.0
+        regresion = tolerancia is not None and (cambio > tolerancia or datos['tasa_error'] > previo['tasa_error'])
+        aceptable = aceptable and not regresion
+        print(f'{endpoint:<38}{previo["p95_ms"]:>11.2f}{datos["p95_ms"]:>11.2f}{cambio:>+8.1f}%'
+              f'{previo["consultas_por_solicitud"]:>6.1f}→{datos["consultas_por_solicitud"]:<5.1f}'
+              f'{previo["tasa_error"]:>7.2%}→{datos["tasa_error"]:<6.2%}{"  REGRESIÓN" if regresion else ""}')
+    return aceptable
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Prueba de carga de la jornada electoral')
+    parser.add_argument('--votantes', type=int, default=2000, help='electores que llegan en la jornada')
+    parser.add_argument('--duracion', type=float, default=60.0, help='segundos en que se comprime la jornada')
+    parser.add_argument('--concurrencia', type=int, default=8, help='hilos que atienden a los electores')
+    parser.add_argument('--no-registrados', type=float, default=0.03, help='fracción de DNIs no registrados')
+    parser.add_argument('--repetidos', type=float, default=0.02, help='fracción que repite un DNI anterior')
+    parser.add_argument('--cuestionario', type=float, default=0.3, help='fracción que envía el cuestionario')
+    parser.add_argument('--semilla', type=int, default=2026)
+    parser.add_argument('--salida', default=None, help='archivo JSON de resultados (carga_<fecha>.json)')
+    parser.add_argument('--comparar', default=None, help='resultados JSON de una ejecución anterior')
+    parser.add_argument('--tolerancia', type=float, default=None,
+                        help='aumento máximo del p95 (%%) frente a --comparar; si se supera, sale con 1')
+    args = parser.parse_args(argv)
+
+    app = crear_app_benchmark(args.votantes)
+    resultado = ejecutar(app, args)
+    imprimir(resultado)
+
+    salida = args.salida or f'carga_{datetime.now():%Y%m%d_%H%M%S}.json'
+    with open(salida, 'w', encoding='utf-8') as archivo:
+        json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+    print(f'Resultados en {salida}')
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            if not comparar(json.load(archivo), resultado, args.tolerancia):
+                return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,9 @@
 import os
 from dotenv import load_dotenv
 from urllib.parse import quote_plus
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+from typing import Optional
 
 load_dotenv()
 
@@ -26,6 +29,116 @@ class Config:
     SQLALCHEMY_DATABASE_URI = database_url
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Pool de conexiones de cada worker (ver opciones_motor): conexiones permanentes,
+    # conexiones extra en picos, segundos máximos de espera por una conexión,
+    # segundos antes de reciclar una conexión (-1 nunca) y ping antes de entregarla
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', -1))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'false').lower() in ('1', 'true', 'si')
+
+    # Conexiones de PostgreSQL disponibles para los workers de este host (max_connections
+    # menos las reservadas, las de otros hosts y las administrativas). gunicorn.conf.py
+    # advierte al arrancar si workers × (pool + desborde + LISTEN) las supera
+    DB_CONEXIONES_MAXIMO = int(os.getenv('DB_CONEXIONES_MAXIMO', 90))
+
+    # PgBouncer en modo transacción: sin pool propio (PgBouncer reparte las conexiones)
+    # y sin sentencias preparadas en el servidor
+    DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'false').lower() in ('1', 'true', 'si')
+
+    # Modo estricto del ORM: toda relación no cargada explícitamente
+    # (joinedload/selectinload) lanza un error en vez de hacer una consulta perezosa.
+    # Pensado para pruebas y desarrollo
+    ORM_CARGA_ESTRICTA = os.getenv('ORM_CARGA_ESTRICTA', 'false').lower() in ('1', 'true', 'si')
+
+    # Invalidación entre workers del catálogo de referencia:
+    # 'auto' (LISTEN/NOTIFY si la base es PostgreSQL), 'postgres' o 'local'
+    NOTIFICADOR_BACKEND = os.getenv('NOTIFICADOR_BACKEND', 'auto')
+    NOTIFICADOR_CANAL = os.getenv('NOTIFICADOR_CANAL', 'cambios_referencia')
+    # Conexión directa a PostgreSQL para LISTEN (necesaria con DB_PGBOUNCER: LISTEN no
+    # funciona a través de PgBouncer en modo transacción); por defecto, la de la aplicación
+    NOTIFICADOR_URL = os.getenv('NOTIFICADOR_URL')
+
+    # Fragmentos (filas) por contador de resultados; reduce la contención de bloqueos
+    CONTEO_FRAGMENTOS = int(os.getenv('CONTEO_FRAGMENTOS', 16))
+
+    # Cubo de resultados en memoria: filas por bloque al construirlo y segundos
+    # entre comprobaciones contra la base (votos registrados por otros workers)
+    CUBO_BLOQUE = int(os.getenv('CUBO_BLOQUE', 10000))
+    CUBO_INTERVALO = float(os.getenv('CUBO_INTERVALO', 5))
+
+    # Índice de DNI en memoria (existe / ya votó): activación, filas por bloque al
+    # construirlo y segundos antes de releer los votos registrados por otros workers
+    INDICE_DNI = os.getenv('INDICE_DNI', 'true').lower() in ('1', 'true', 'si')
+    INDICE_DNI_BLOQUE = int(os.getenv('INDICE_DNI_BLOQUE', 50000))
+    INDICE_DNI_INTERVALO = float(os.getenv('INDICE_DNI_INTERVALO', 1))
+
+    # Conteo preferencial: filas por bloque leído y segundos mínimos entre recálculos
+    PREFERENCIAL_BLOQUE = int(os.getenv('PREFERENCIAL_BLOQUE', 100000))
+    PREFERENCIAL_INTERVALO = float(os.getenv('PREFERENCIAL_INTERVALO', 5))
+
+    # Asignación de escaños: umbral nacional, escaños totales por categoría
+    # (repartidos entre regiones según su padrón) y pool de procesos del cálculo
+    UMBRAL_ELECTORAL = float(os.getenv('UMBRAL_ELECTORAL', 0.05))
+    ESCANOS_POR_CATEGORIA = {
+        'Diputado': 130,
+        'Senador Regional': 30,
+    }
+    ESCANOS_PROCESOS = int(os.getenv('ESCANOS_PROCESOS', 1))
+    ESCANOS_TIMEOUT = float(os.getenv('ESCANOS_TIMEOUT', 10))
+
+    # Segundos de caché de /api/cedula/bundle?v=<ETag> (URL versionada, inmutable)
+    CEDULA_MAX_AGE = int(os.getenv('CEDULA_MAX_AGE', 31536000))
+
+    # Entradas máximas (LRU) de la caché de respuestas de los listados de referencia
+    CACHE_RESPUESTAS_MAXIMO = int(os.getenv('CACHE_RESPUESTAS_MAXIMO', 1024))
+
+    # Listados paginados (?after=&limit=): tamaño de página por defecto y máximo
+    LISTADO_LIMITE = int(os.getenv('LISTADO_LIMITE', 100))
+    LISTADO_LIMITE_MAXIMO = int(os.getenv('LISTADO_LIMITE_MAXIMO', 1000))
+
+    # Filas leídas por bloque en las exportaciones NDJSON/CSV
+    EXPORTACION_BLOQUE = int(os.getenv('EXPORTACION_BLOQUE', 10000))
+
+    # Máximo de papeletas aceptadas por POST /api/votos/lote
+    VOTOS_LOTE_MAXIMO = int(os.getenv('VOTOS_LOTE_MAXIMO', 10000))
+
+    # Máximo de DNIs aceptados por POST /api/electores/verificar-lote
+    VERIFICAR_LOTE_MAXIMO = int(os.getenv('VERIFICAR_LOTE_MAXIMO', 10000))
+
+    # Importación del padrón: filas válidas por bloque (COPY + fusión + avance en una
+    # transacción) y filas con error que se devuelven como ejemplo
+    PADRON_BLOQUE = int(os.getenv('PADRON_BLOQUE', 50000))
+    PADRON_ERRORES_MAXIMO = int(os.getenv('PADRON_ERRORES_MAXIMO', 1000))
+    # Segundos sin bloques nuevos tras los que una importación en_curso se da por
+    # abandonada (proceso caído) y se puede reanudar
+    PADRON_ABANDONO = float(os.getenv('PADRON_ABANDONO', 600))
+
+    # Instrumentación por solicitud: cabecera Server-Timing (db, serialize, total),
+    # consultas lentas (ms; 0 desactiva), aviso de N+1 cuando una misma sentencia se
+    # repite N_MAS_1_UMBRAL veces en una solicitud (0 desactiva) y una línea JSON
+    # por solicitud en el logger 'app.solicitudes'
+    INSTRUMENTACION_SQL = os.getenv('INSTRUMENTACION_SQL', 'true').lower() in ('1', 'true', 'si')
+    SQL_LENTA_MS = float(os.getenv('SQL_LENTA_MS', 100))
+    N_MAS_1_UMBRAL = int(os.getenv('N_MAS_1_UMBRAL', 5))
+    LOG_SOLICITUDES = os.getenv('LOG_SOLICITUDES', 'false').lower() in ('1', 'true', 'si')
+
+    # Métricas Prometheus en /metrics (con gunicorn, sumadas entre workers vía
+    # PROMETHEUS_MULTIPROC_DIR; ver gunicorn.conf.py)
+    METRICAS = os.getenv('METRICAS', 'true').lower() in ('1', 'true', 'si')
+
+    # Segundos que un worker sigue atendiendo tras SIGTERM con /api/sistema/listo en
+    # 503, para que el balanceador lo retire antes de que se detenga (ver app/arranque.py)
+    DRENAJE_SEGUNDOS = float(os.getenv('DRENAJE_SEGUNDOS', 5))
+
+    # Swagger UI en /api/docs (flasgger) y especificación OpenAPI generada en el build
+    # (python generar_apispec.py); si el archivo no existe se genera al primer pedido
+    SWAGGER_UI = os.getenv('SWAGGER_UI', 'true').lower() in ('1', 'true', 'si')
+    APISPEC_ARCHIVO = os.getenv(
+        'APISPEC_ARCHIVO', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'apispec.json')
+    )
+
 class DevelopmentConfig(Config):
     """Configuración para desarrollo"""
     DEBUG = True
@@ -34,8 +147,72 @@ class ProductionConfig(Config):
     """Configuración para producción"""
     DEBUG = False
 
+    # Miles de kioscos concurrentes: el pool de cada worker se dimensiona repartiendo
+    # DB_CONEXIONES_MAXIMO entre los GUNICORN_WORKERS del host (una conexión de cada
+    # uno queda para el LISTEN del notificador), dos tercios permanentes y el resto
+    # como desborde: 90 conexiones y 4 workers dan 14 + 7. Espera corta (mejor un 503
+    # rápido que solicitudes apiladas), reciclado antes del idle timeout del servidor
+    # y pre-ping para descartar conexiones cortadas por la red
+    _conexiones_worker = max(
+        int(os.getenv('DB_CONEXIONES_MAXIMO', 90)) // max(int(os.getenv('GUNICORN_WORKERS', 4)), 1) - 1, 2
+    )
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', _conexiones_worker * 2 // 3))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', _conexiones_worker - _conexiones_worker * 2 // 3))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'si')
+
+    # La interfaz de documentación no se publica en producción salvo que se pida
+    SWAGGER_UI = os.getenv('SWAGGER_UI', 'false').lower() in ('1', 'true', 'si')
+
 config_by_name = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
     'default': DevelopmentConfig
 }
+
+
+def opciones_motor(config) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS a partir de DB_POOL_* y DB_PGBOUNCER"""
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if config['DB_PGBOUNCER']:
+        opciones = {'poolclass': NullPool}
+        if url.get_driver_name() == 'psycopg':
+            # psycopg 3 prepara en el servidor las sentencias repetidas; psycopg2 nunca lo hace
+            opciones['connect_args'] = {'prepare_threshold': None}
+        return opciones
+
+    opciones = {'pool_pre_ping': config['DB_POOL_PRE_PING']}
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return opciones  # SingletonThreadPool: una conexión por hilo, sin tamaño configurable
+    opciones.update(
+        pool_size=config['DB_POOL_SIZE'],
+        max_overflow=config['DB_MAX_OVERFLOW'],
+        pool_timeout=config['DB_POOL_TIMEOUT'],
+        pool_recycle=config['DB_POOL_RECYCLE']
+    )
+    return opciones
+
+
+def conexiones_por_worker(config) -> int:
+    """
+    Conexiones a PostgreSQL que puede abrir un worker: su pool completo
+    (DB_POOL_SIZE + DB_MAX_OVERFLOW) más la del LISTEN del notificador.
+    0 si la base no es PostgreSQL o si las reparte PgBouncer (DB_PGBOUNCER)
+    """
+    if make_url(config['SQLALCHEMY_DATABASE_URI']).get_backend_name() != 'postgresql' or config['DB_PGBOUNCER']:
+        return 0
+    escucha = 0 if config['NOTIFICADOR_BACKEND'] == 'local' else 1
+    return config['DB_POOL_SIZE'] + config['DB_MAX_OVERFLOW'] + escucha
+
+
+def verificar_conexiones(config, workers: int) -> Optional[str]:
+    """Advertencia si `workers` procesos pueden abrir más de DB_CONEXIONES_MAXIMO conexiones, o None"""
+    por_worker = conexiones_por_worker(config)
+    if workers * por_worker <= config['DB_CONEXIONES_MAXIMO']:
+        return None
+    return (
+        f'{workers} workers x {por_worker} conexiones (DB_POOL_SIZE + DB_MAX_OVERFLOW + LISTEN) = '
+        f'{workers * por_worker} superan DB_CONEXIONES_MAXIMO={config["DB_CONEXIONES_MAXIMO"]}: '
+        f'en picos PostgreSQL rechazará conexiones (max_connections). Reduzca el pool o los workers'
+    )
@@ -5,11 +5,14 @@
 
 const API_BASE_URL = 'http://localhost:5000/api';
 
+// Versión (ETag) de la cédula de la última carga, para pedir su URL inmutable
+const CLAVE_VERSION_CEDULA = 'cedulaVersion';
+
 const API = {
     /**
      * Realiza una petición fetch con reintentos
      */
-    async fetchWithRetry(url, options = {}, retries = 3) {
+    async fetchWithRetry(url, options = {}, retries = 3, conRespuesta = false) {
         for (let i = 0; i < retries; i++) {
             try {
                 const response = await fetch(url, {
@@ -25,7 +28,8 @@ const API = {
                     throw new Error(error.error || `HTTP error! status: ${response.status}`);
                 }
 
-                return await response.json();
+                const datos = await response.json();
+                return conRespuesta ? { datos, response } : datos;
             } catch (error) {
                 if (i === retries - 1) throw error;
                 // Esperar antes de reintentar (backoff exponencial)
@@ -35,50 +39,100 @@ const API = {
     },
 
     /**
-     * Obtiene todos los candidatos de una categoría específica
+     * Obtiene todas las páginas de un listado paginado.
+     * El backend indica la página siguiente en la cabecera X-Siguiente.
      */
-    async getCandidatosPorCategoria(nombreCategoria) {
-        try {
-            // Primero obtener la categoría
-            const categorias = await this.fetchWithRetry(`${API_BASE_URL}/categorias/`);
-            const categoria = categorias.find(c =>
-                c.nombre_categoria.toLowerCase().includes(nombreCategoria.toLowerCase())
-            );
+    async fetchTodos(url) {
+        const separador = url.includes('?') ? '&' : '?';
+        const registros = [];
+        let siguiente = null;
+
+        do {
+            const pagina = siguiente === null
+                ? url
+                : `${url}${separador}after=${encodeURIComponent(siguiente)}`;
+            const { datos, response } = await this.fetchWithRetry(pagina, {}, 3, true);
+            registros.push(...datos);
+            siguiente = response.headers.get('X-Siguiente');
+        } while (siguiente !== null);
+
+        return registros;
+    },
 
-            if (!categoria) {
-                throw new Error(`Categoría ${nombreCategoria} no encontrada`);
+    /**
+     * Obtiene la definición completa de la cédula (categorías, partidos y
+     * candidatos agrupados) con una sola petición por carga de página.
+     * El backend la sirve con ETag y gzip; las llamadas siguientes reutilizan la promesa.
+     *
+     * Con la versión de la carga anterior pide /cedula/bundle?v=<versión>:
+     * la respuesta es inmutable y la entrega la caché HTTP sin ir a la red.
+     * Después revalida la URL sin versión (304 sin cuerpo si no cambió); si
+     * el catálogo cambió, guarda la versión nueva y descarta la promesa, así
+     * la próxima llamada (o la próxima carga de página) usa la cédula nueva.
+     */
+    getCedula() {
+        if (!this._cedula) {
+            const url = `${API_BASE_URL}/cedula/bundle`;
+            const version = localStorage.getItem(CLAVE_VERSION_CEDULA);
+            const pedida = version ? `${url}?v=${encodeURIComponent(version)}` : url;
+
+            this._cedula = this.fetchWithRetry(pedida, {}, 3, true).then(({ datos, response }) => {
+                if (version) {
+                    this.revalidarCedula(url, version);
+                } else {
+                    this.guardarVersionCedula(response);
+                }
+                return datos;
+            }).catch(error => {
+                this._cedula = null;  // Permitir reintentar en la próxima llamada
+                throw error;
+            });
+        }
+        return this._cedula;
+    },
+
+    /**
+     * Compara la versión fijada con la vigente (petición condicional, sin cuerpo si coincide)
+     */
+    async revalidarCedula(url, version) {
+        try {
+            const response = await fetch(url, { cache: 'no-cache' });
+            if (response.ok && this.guardarVersionCedula(response) !== version) {
+                this._cedula = null;
             }
+        } catch (error) {
+            console.warn('No se pudo revalidar la cédula:', error);
+        }
+    },
 
-            // Obtener todos los candidatos
-            const candidatos = await this.fetchWithRetry(`${API_BASE_URL}/candidatos/`);
+    /**
+     * Guarda el ETag de la respuesta (sin comillas) como versión de la cédula y lo retorna
+     */
+    guardarVersionCedula(response) {
+        const etag = response.headers.get('ETag');
+        if (!etag) return null;
+        const version = etag.replace(/^W\//, '').replace(/"/g, '');
+        localStorage.setItem(CLAVE_VERSION_CEDULA, version);
+        return version;
+    },
 
-            // Filtrar por categoría
-            const candidatosFiltrados = candidatos.filter(c =>
-                c.id_categoria === categoria.id_categoria
+    /**
+     * Obtiene todos los candidatos de una categoría específica, agrupados por partido
+     */
+    async getCandidatosPorCategoria(nombreCategoria) {
+        try {
+            const cedula = await this.getCedula();
+            const entrada = cedula.categorias.find(c =>
+                c.categoria.nombre_categoria.toLowerCase().includes(nombreCategoria.toLowerCase())
             );
 
-            // Obtener información de partidos para cada candidato
-            const partidos = await this.fetchWithRetry(`${API_BASE_URL}/partidos/`);
-
-            // Agrupar candidatos por partido
-            const candidatosPorPartido = {};
-
-            for (const candidato of candidatosFiltrados) {
-                const partido = partidos.find(p => p.id_partido === candidato.id_partido);
-
-                if (!candidatosPorPartido[candidato.id_partido]) {
-                    candidatosPorPartido[candidato.id_partido] = {
-                        partido: partido,
-                        candidatos: []
-                    };
-                }
-
-                candidatosPorPartido[candidato.id_partido].candidatos.push(candidato);
+            if (!entrada) {
+                throw new Error(`Categoría ${nombreCategoria} no encontrada`);
             }
 
             return {
-                categoria: categoria,
-                partidosConCandidatos: Object.values(candidatosPorPartido)
+                categoria: entrada.categoria,
+                partidosConCandidatos: entrada.partidos
             };
 
         } catch (error) {
@@ -91,21 +145,21 @@ const API = {
      * Obtiene todos los partidos políticos
      */
     async getPartidos() {
-        return await this.fetchWithRetry(`${API_BASE_URL}/partidos/`);
+        return await this.fetchTodos(`${API_BASE_URL}/partidos/`);
     },
 
     /**
      * Obtiene todas las categorías
      */
     async getCategorias() {
-        return await this.fetchWithRetry(`${API_BASE_URL}/categorias/`);
+        return await this.fetchTodos(`${API_BASE_URL}/categorias/`);
     },
 
     /**
      * Obtiene todos los tipos de voto
      */
     async getTiposVoto() {
-        return await this.fetchWithRetry(`${API_BASE_URL}/tipos-voto/`);
+        return await this.fetchTodos(`${API_BASE_URL}/tipos-voto/`);
     },
 
     /**
@@ -143,7 +197,8 @@ const API = {
     async registrarVoto(dni, votosPorCategoria) {
         try {
             // Obtener todas las categorías para asegurar que se envían todas
-            const categorias = await this.getCategorias();
+            const cedula = await this.getCedula();
+            const categorias = cedula.categorias.map(c => c.categoria);
 
             // Preparar los votos por categoría
             const votosCategoria = [];
@@ -110,11 +110,11 @@ const Cuestionario = {
      * Carga las preguntas del backend
      */
     async cargarPreguntas() {
-        const response = await fetch('http://localhost:5000/api/preguntas/');
-        if (!response.ok) {
+        try {
+            this.estado.preguntas = await API.fetchTodos('http://localhost:5000/api/preguntas/');
+        } catch (error) {
             throw new Error('Error al cargar preguntas');
         }
-        this.estado.preguntas = await response.json();
     },
 
     /**
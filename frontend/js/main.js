@@ -91,6 +91,9 @@ const App = {
      */
     async cargarDatos() {
         try {
+            // Una sola petición al backend: todas las categorías salen de la cédula completa
+            await API.getCedula();
+
             const [presidente, senadorNacional, senadorRegional, diputado, parlamento] = await Promise.all([
                 API.getCandidatosPorCategoria('Presidente'),
                 API.getCandidatosPorCategoria('Senador Nacional'),
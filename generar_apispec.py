@@ -0,0 +1,38 @@
+"""
+Genera la especificación OpenAPI (/apispec.json) en tiempo de build.
+
+Recorre los docstrings YAML de todas las vistas con flasgger y escribe el
+JSON en APISPEC_ARCHIVO (o en el archivo indicado). La aplicación sirve esos
+bytes tal cual, sin importar flasgger ni generar la especificación al
+iniciar. El archivo guarda una huella de las rutas y docstrings
+(x-huella-vistas): si al servirlo no coincide con la aplicación, se genera
+de nuevo en memoria. Es un artefacto del build (ignorado por git).
+
+Uso:
+    python generar_apispec.py
+    python generar_apispec.py build/apispec.json
+"""
+import json
+import os
+import sys
+
+# La especificación no depende de los datos: una base en memoria evita conectarse
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from app import create_app
+from app.swagger import generar_especificacion
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    app = create_app(os.getenv('FLASK_ENV', 'production'))
+    destino = argv[0] if argv else app.config['APISPEC_ARCHIVO']
+
+    especificacion = generar_especificacion(app)
+    with open(destino, 'w', encoding='utf-8') as archivo:
+        json.dump(especificacion, archivo, ensure_ascii=False, separators=(',', ':'))
+    print(f"Especificación con {len(especificacion['paths'])} rutas escrita en {destino}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,438 @@
+"""
+Generador de un padrón y una votación sintéticos a escala nacional, para
+pruebas de rendimiento.
+
+Crea tipos de voto, las categorías de init_db.py, P partidos con listas
+completas de candidatos por categoría, N electores repartidos por región y
+distrito con pesos cercanos al padrón real, y M votos con proporciones
+configurables de votos en blanco y de voto preferencial. Al final recalcula
+las tablas de conteo (ResultadoService.reconstruir).
+
+- Determinista: con la misma --semilla y el mismo --bloque se generan
+  exactamente los mismos datos, sin importar --procesos
+- En PostgreSQL cada bloque se carga con COPY desde un proceso del pool
+  (conexión propia); en otros motores, con INSERT multi-fila en este proceso
+- Los DNIs salen de una permutación de 10^8 (8 dígitos, únicos, dispersos);
+  la región y el distrito de cada elector dependen solo de su posición, así
+  que los votos conocen la región del votante sin releer el padrón
+
+Requiere las tablas de la elección vacías (--reemplazar las vacía antes).
+El módulo de cuestionario no se modifica.
+
+Uso:
+    python generar_datos.py --electores 25000000 --votos 18000000 --procesos 8
+    python generar_datos.py --electores 100000 --votos 60000 --reemplazar
+"""
+import argparse
+import csv
+import io
+import math
+import multiprocessing
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app import create_app
+from app.models import (
+    db, Elector, Voto, VotoCategoria, TipoVoto, PartidoPolitico, Categoria, Candidato,
+    ConteoTipoVoto, ConteoCategoria, ConteoRegion, ConteoDistrito
+)
+
+# Electores (miles, aproximado) y distritos por región
+REGIONES = [
+    ('Lima', 7600, 171), ('Callao', 850, 7), ('Piura', 1400, 65), ('La Libertad', 1400, 83),
+    ('Arequipa', 1150, 109), ('Cajamarca', 1100, 127), ('Junín', 960, 124), ('Cusco', 940, 112),
+    ('Lambayeque', 930, 38), ('Puno', 900, 110), ('Áncash', 880, 166), ('Loreto', 680, 53),
+    ('Ica', 640, 43), ('San Martín', 610, 77), ('Huánuco', 570, 84), ('Ayacucho', 470, 119),
+    ('Ucayali', 380, 17), ('Apurímac', 310, 84), ('Amazonas', 300, 84), ('Huancavelica', 300, 100),
+    ('Tacna', 280, 28), ('Pasco', 200, 29), ('Tumbes', 180, 13), ('Moquegua', 150, 20),
+    ('Madre de Dios', 110, 11), ('Extranjero', 1000, 70),
+]
+
+CATEGORIAS = [
+    ('Presidente', 'Nacional'), ('Vicepresidente', 'Nacional'), ('Diputado', 'Nacional'),
+    ('Senador Nacional', 'Nacional'), ('Senador Regional', 'Regional'), ('Parlamento Andino', 'Nacional'),
+]
+
+# Candidatos por lista (partido y categoría); None: lista sin número (sin voto preferencial)
+CANDIDATOS_POR_LISTA = {
+    'Presidente': (1, None), 'Vicepresidente': (2, None), 'Diputado': (130, 'numerada'),
+    'Senador Nacional': (30, 'numerada'), 'Senador Regional': (30, 'numerada'),
+    'Parlamento Andino': (15, 'numerada'),
+}
+
+NOMBRES = [
+    'Juan', 'María', 'José', 'Rosa', 'Luis', 'Carmen', 'Carlos', 'Ana', 'Jorge', 'Julia', 'Pedro',
+    'Lucía', 'Miguel', 'Elena', 'César', 'Patricia', 'Víctor', 'Gloria', 'Raúl', 'Sofía', 'Manuel',
+    'Teresa', 'Jesús', 'Isabel', 'Fernando', 'Milagros', 'Ricardo', 'Verónica', 'Alberto', 'Diana',
+    'Eduardo', 'Claudia', 'Hugo', 'Sandra', 'Walter', 'Flor', 'Óscar', 'Norma', 'Edwin', 'Yolanda',
+]
+APELLIDOS = [
+    'Quispe', 'Flores', 'Sánchez', 'Rodríguez', 'García', 'Rojas', 'Huamán', 'Mamani', 'Díaz',
+    'Vásquez', 'Ramírez', 'Chávez', 'Torres', 'Mendoza', 'Castillo', 'Gonzales', 'López', 'Pérez',
+    'Ramos', 'Ruiz', 'Condori', 'Espinoza', 'Vargas', 'Fernández', 'Gutiérrez', 'Romero', 'Cruz',
+    'Silva', 'Salazar', 'Castro', 'Morales', 'Herrera', 'Reyes', 'Ccahuana', 'Paredes', 'Ticona',
+    'Cárdenas', 'Aguilar', 'Medina', 'Vega', 'Palomino', 'Álvarez', 'Soto', 'Chambi', 'Zapata',
+]
+PREFIJOS_PARTIDO = ['Partido', 'Alianza', 'Frente', 'Movimiento', 'Unión', 'Fuerza', 'Acción', 'Perú']
+SUFIJOS_PARTIDO = [
+    'Popular', 'Nacional', 'Democrático', 'Progresista', 'Ciudadano', 'Libertad', 'Regional',
+    'Republicano', 'Patriótico', 'Solidario', 'Unido', 'Renovador',
+]
+
+# Permutación de 10^8 para los DNIs: multiplicador coprimo con 10
+DNI_MULTIPLICADOR = 73_939_133
+DNI_DESPLAZAMIENTO = 10_000_019
+DNI_MODULO = 10 ** 8
+
+# Jornada electoral: fechas de los votos entre las 07:00 y las 17:00
+INICIO_JORNADA = datetime(2026, 4, 12, 7, 0, 0)
+DURACION_JORNADA = 10 * 3600
+
+# Estado de cada proceso del pool (PostgreSQL)
+_parametros = None
+_conexion = None
+
+
+def dni(indice: int) -> str:
+    return f'{(indice * DNI_MULTIPLICADOR + DNI_DESPLAZAMIENTO) % DNI_MODULO:08d}'
+
+
+def coprimo(n: int, semilla: int) -> int:
+    """Multiplicador coprimo con n (permutación del orden de los votantes)"""
+    candidato = max(1, int(n * 0.6180339887) + semilla % 997)
+    while math.gcd(candidato, n) != 1:
+        candidato += 1
+    return candidato
+
+
+def geografia(num_electores: int):
+    """
+    Reparte los índices de elector en tramos contiguos por distrito.
+    Retorna (fronteras, nombres): el elector i pertenece al distrito
+    nombres[searchsorted(fronteras, i, 'right')] = (region, distrito).
+    Dentro de cada región los distritos siguen una distribución de Zipf.
+    """
+    pesos_region = np.array([electores for _, electores, _ in REGIONES], dtype=np.float64)
+    limites_region = np.rint(np.cumsum(pesos_region) / pesos_region.sum() * num_electores).astype(np.int64)
+
+    fronteras, nombres = [], []
+    inicio = 0
+    for (region, _, num_distritos), fin in zip(REGIONES, limites_region):
+        pesos = 1 / np.arange(1, num_distritos + 1) ** 0.9
+        cortes = inicio + np.rint(np.cumsum(pesos) / pesos.sum() * (fin - inicio)).astype(np.int64)
+        for d, corte in enumerate(cortes):
+            fronteras.append(corte)
+            nombres.append((region, region if d == 0 else f'{region} {d:03d}'))
+        inicio = fin
+    return np.array(fronteras, dtype=np.int64), nombres
+
+
+def preferencias(semilla: int, num_partidos: int) -> np.ndarray:
+    """
+    Probabilidad acumulada de cada partido por región: una popularidad
+    nacional (Zipf) con variación regional (log-normal), determinista por semilla.
+    """
+    rng = np.random.default_rng([semilla, 0])
+    nacional = 1 / np.arange(1, num_partidos + 1) ** 1.1
+    rng.shuffle(nacional)
+    regional = nacional * rng.lognormal(0, 0.6, size=(len(REGIONES), num_partidos))
+    return np.cumsum(regional / regional.sum(axis=1, keepdims=True), axis=1)
+
+
+def filas_electores(inicio: int, fin: int, p) -> list:
+    rng = np.random.default_rng([p['semilla'], 1, inicio])
+    tamano = fin - inicio
+    nombre = rng.integers(len(NOMBRES), size=(tamano, 2))
+    apellido = rng.integers(len(APELLIDOS), size=(tamano, 2))
+    distritos = np.searchsorted(p['fronteras'], np.arange(inicio, fin), side='right')
+    return [
+        (
+            dni(i),
+            f'{NOMBRES[n1]} {NOMBRES[n2]}' if n1 != n2 else NOMBRES[n1],
+            f'{APELLIDOS[a1]} {APELLIDOS[a2]}',
+            p['distritos'][d][1],
+            p['distritos'][d][0]
+        )
+        for i, (n1, n2), (a1, a2), d in zip(range(inicio, fin), nombre.tolist(), apellido.tolist(), distritos.tolist())
+    ]
+
+
+def filas_votos(inicio: int, fin: int, p):
+    """
+    Votos [inicio, fin): cada uno con todas las categorías (como VotoService).
+    Retorna (filas de VOTO, filas de VOTO_CATEGORIA) con ids explícitos.
+    """
+    rng = np.random.default_rng([p['semilla'], 2, inicio])
+    tamano = fin - inicio
+    indices = np.arange(inicio, fin, dtype=np.int64)
+    votantes = (indices * p['multiplicador_votantes'] + p['semilla']) % p['electores']
+    distrito = np.searchsorted(p['fronteras'], votantes, side='right')
+    region = p['region_de_distrito'][distrito]
+
+    en_blanco = rng.random(tamano) < p['blancos']
+    categorias = p['categorias']
+    num_categorias = len(categorias)
+
+    # Partido por categoría: según las preferencias de la región; 0 = en blanco
+    u = rng.random((tamano, num_categorias))
+    partido = np.zeros((tamano, num_categorias), dtype=np.int64)
+    for r in np.unique(region):
+        filas = region == r
+        partido[filas] = np.searchsorted(p['preferencias'][r], u[filas]) + 1
+    partido = np.minimum(partido, len(p['partidos']))
+    partido[rng.random((tamano, num_categorias)) < p['blanco_categoria']] = 0
+    partido[en_blanco] = 0
+
+    # Preferenciales: posiciones de la lista sesgadas hacia los primeros números
+    largo = np.array([largo for _, largo in categorias], dtype=np.int64)
+    usa = (rng.random((tamano, num_categorias)) < p['preferencial']) & (largo > 0) & (partido > 0)
+    segundo = usa & (rng.random((tamano, num_categorias)) < 0.5)
+    pref1 = (np.floor(largo * rng.random((tamano, num_categorias)) ** 2) + 1).astype(np.int64)
+    pref2 = (np.floor(largo * rng.random((tamano, num_categorias)) ** 2) + 1).astype(np.int64)
+    segundo &= pref2 != pref1
+
+    segundos = rng.integers(DURACION_JORNADA, size=tamano).tolist()
+    valido = (partido > 0).any(axis=1).tolist()
+
+    votos, votos_categoria = [], []
+    ids_partido = p['partidos']
+    partido, usa, segundo, pref1, pref2 = (a.tolist() for a in (partido, usa, segundo, pref1, pref2))
+    for j in range(tamano):
+        id_voto = inicio + j + 1
+        votos.append((
+            id_voto,
+            INICIO_JORNADA + timedelta(seconds=segundos[j]),
+            dni(int(votantes[j])),
+            p['tipo_valido'] if valido[j] else p['tipo_blanco']
+        ))
+        base_vc = (inicio + j) * num_categorias
+        for k, (id_categoria, _) in enumerate(categorias):
+            votos_categoria.append((
+                base_vc + k + 1,
+                id_voto,
+                id_categoria,
+                ids_partido[partido[j][k] - 1] if partido[j][k] else None,
+                pref1[j][k] if usa[j][k] else None,
+                pref2[j][k] if segundo[j][k] else None
+            ))
+    return votos, votos_categoria
+
+
+COLUMNAS = {
+    'elector': ('dni', 'nombres', 'apellidos', 'distrito', 'region'),
+    'voto': ('id_voto', 'fecha', 'dni', 'id_tipo_voto'),
+    'voto_categoria': ('id_voto_categoria', 'id_voto', 'id_categoria', 'id_partido',
+                       'numero_preferencial_1', 'numero_preferencial_2'),
+}
+
+
+def generar_bloque(tarea, p):
+    """Filas de un bloque: {tabla: filas}"""
+    tipo, inicio, fin = tarea
+    if tipo == 'elector':
+        return {'elector': filas_electores(inicio, fin, p)}
+    votos, votos_categoria = filas_votos(inicio, fin, p)
+    return {'voto': votos, 'voto_categoria': votos_categoria}
+
+
+def _iniciar_proceso(url: str, parametros) -> None:
+    global _conexion, _parametros
+    import psycopg2
+    from sqlalchemy.engine import make_url
+
+    _parametros = parametros
+    _conexion = psycopg2.connect(**make_url(url).translate_connect_args(username='user', database='dbname'))
+    with _conexion.cursor() as cursor:
+        # La carga se puede repetir entera si falla: no hace falta esperar al WAL en cada COPY
+        cursor.execute('SET synchronous_commit = off')
+    _conexion.commit()
+
+
+def _copiar_bloque(tarea) -> int:
+    """Genera un bloque y lo carga con COPY (una transacción por bloque)"""
+    total = 0
+    with _conexion.cursor() as cursor:
+        for tabla, filas in generar_bloque(tarea, _parametros).items():
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(filas)
+            buffer.seek(0)
+            cursor.copy_expert(f'COPY {tabla} ({", ".join(COLUMNAS[tabla])}) FROM STDIN WITH (FORMAT csv)', buffer)
+            total += len(filas)
+    _conexion.commit()
+    return total
+
+
+def tareas(tipo: str, total: int, bloque: int):
+    return [(tipo, inicio, min(total, inicio + bloque)) for inicio in range(0, total, bloque)]
+
+
+def cargar(tipo: str, total: int, parametros, args) -> None:
+    """Carga todos los bloques de un tipo e informa el avance y las filas por segundo"""
+    lista = tareas(tipo, total, args.bloque)
+    inicio = time.perf_counter()
+    filas = 0
+
+    def informar(hechos):
+        segundos = time.perf_counter() - inicio
+        print(f'\r  {tipo}: {hechos}/{len(lista)} bloques, {filas} filas, '
+              f'{filas / segundos if segundos else 0:,.0f} filas/s', end='', flush=True)
+
+    if db.engine.dialect.name == 'postgresql':
+        url = db.engine.url.render_as_string(hide_password=False)
+        # spawn: los procesos no heredan la aplicación ni los hilos del notificador
+        with multiprocessing.get_context('spawn').Pool(
+            args.procesos, initializer=_iniciar_proceso, initargs=(url, parametros)
+        ) as pool:
+            for hechos, cantidad in enumerate(pool.imap_unordered(_copiar_bloque, lista), 1):
+                filas += cantidad
+                informar(hechos)
+    else:
+        tablas = {nombre: db.metadata.tables[nombre] for nombre in COLUMNAS}
+        for hechos, tarea in enumerate(lista, 1):
+            for tabla, bloque in generar_bloque(tarea, parametros).items():
+                db.session.execute(tablas[tabla].insert(), [dict(zip(COLUMNAS[tabla], fila)) for fila in bloque])
+                filas += len(bloque)
+            db.session.commit()
+            informar(hechos)
+    print()
+
+
+def cargar_referencia(num_partidos: int, semilla: int):
+    """Tipos de voto, categorías, partidos y listas completas de candidatos (ORM; son pocos)"""
+    rng = np.random.default_rng([semilla, 3])
+    tipos = [TipoVoto(nombre_tipo=nombre) for nombre in ('Válido', 'Nulo', 'En Blanco')]
+    categorias = [Categoria(nombre_categoria=nombre, ambito=ambito) for nombre, ambito in CATEGORIAS]
+
+    nombres_partido = []
+    for i in range(num_partidos):
+        nombre = f'{PREFIJOS_PARTIDO[i % len(PREFIJOS_PARTIDO)]} {SUFIJOS_PARTIDO[i % len(SUFIJOS_PARTIDO)]}'
+        if i >= len(PREFIJOS_PARTIDO) * len(SUFIJOS_PARTIDO) or nombre in nombres_partido:
+            nombre = f'{nombre} {i + 1}'
+        nombres_partido.append(nombre)
+    partidos = [PartidoPolitico(nombre_partido=nombre, logo=None) for nombre in nombres_partido]
+    db.session.add_all(tipos + categorias + partidos)
+    db.session.flush()
+
+    candidatos = []
+    for categoria in categorias:
+        largo, numerada = CANDIDATOS_POR_LISTA[categoria.nombre_categoria]
+        for partido in partidos:
+            nombre = rng.integers(len(NOMBRES), size=largo)
+            apellido = rng.integers(len(APELLIDOS), size=largo)
+            candidatos.extend(
+                Candidato(
+                    nombre_candidato=f'{NOMBRES[n]} {APELLIDOS[a]}',
+                    numero_candidato=posicion if numerada else None,
+                    id_partido=partido.id_partido,
+                    id_categoria=categoria.id_categoria
+                )
+                for posicion, (n, a) in enumerate(zip(nombre.tolist(), apellido.tolist()), 1)
+            )
+    db.session.add_all(candidatos)
+    db.session.commit()
+
+    return {
+        'tipo_valido': tipos[0].id_tipo_voto,
+        'tipo_blanco': tipos[2].id_tipo_voto,
+        'categorias': [
+            (c.id_categoria, CANDIDATOS_POR_LISTA[c.nombre_categoria][0]
+             if CANDIDATOS_POR_LISTA[c.nombre_categoria][1] else 0)
+            for c in categorias
+        ],
+        'partidos': [p.id_partido for p in partidos],
+        'candidatos': len(candidatos),
+    }
+
+
+TABLAS_ELECCION = (
+    ConteoDistrito, ConteoRegion, ConteoCategoria, ConteoTipoVoto,
+    VotoCategoria, Voto, Candidato, Elector, PartidoPolitico, Categoria, TipoVoto
+)
+
+
+def ajustar_secuencias() -> None:
+    """Tras cargar ids explícitos, las secuencias de PostgreSQL deben continuar desde el máximo"""
+    if db.engine.dialect.name != 'postgresql':
+        return
+    for tabla, columna in (('voto', 'id_voto'), ('voto_categoria', 'id_voto_categoria')):
+        db.session.execute(db.text(
+            f"SELECT setval(pg_get_serial_sequence('{tabla}', '{columna}'), "
+            f"COALESCE((SELECT MAX({columna}) FROM {tabla}), 0) + 1, false)"
+        ))
+    db.session.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Genera un padrón y una votación sintéticos')
+    parser.add_argument('--electores', type=int, default=1_000_000)
+    parser.add_argument('--votos', type=int, default=None, help='por defecto, 72 %% de los electores')
+    parser.add_argument('--partidos', type=int, default=36)
+    parser.add_argument('--semilla', type=int, default=2026)
+    parser.add_argument('--blancos', type=float, default=0.05, help='proporción de cédulas totalmente en blanco')
+    parser.add_argument('--blanco-categoria', type=float, default=0.08,
+                        help='proporción de categorías en blanco en las demás cédulas')
+    parser.add_argument('--preferencial', type=float, default=0.6,
+                        help='proporción de votos por lista numerada que marcan preferencial')
+    parser.add_argument('--procesos', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--bloque', type=int, default=50_000, help='filas por bloque (parte de la semilla)')
+    parser.add_argument('--reemplazar', action='store_true', help='vacía antes las tablas de la elección')
+    args = parser.parse_args(argv)
+
+    votos = int(args.electores * 0.72) if args.votos is None else args.votos
+    if not 0 <= votos <= args.electores:
+        parser.error('--votos debe estar entre 0 y --electores')
+    if not args.electores <= DNI_MODULO:
+        parser.error(f'--electores no puede superar {DNI_MODULO}')
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if Elector.query.first() is not None or TipoVoto.query.first() is not None:
+            if not args.reemplazar:
+                print('Las tablas de la elección ya tienen datos; use --reemplazar para vaciarlas.')
+                return 1
+            print('Vaciando tablas de la elección...')
+            for modelo in TABLAS_ELECCION:
+                db.session.execute(modelo.__table__.delete())
+            db.session.commit()
+
+        inicio = time.perf_counter()
+        referencia = cargar_referencia(args.partidos, args.semilla)
+        print(f'Referencia: {len(referencia["partidos"])} partidos, {referencia["candidatos"]} candidatos')
+
+        fronteras, distritos = geografia(args.electores)
+        parametros = {
+            **referencia,
+            'semilla': args.semilla,
+            'electores': args.electores,
+            'fronteras': fronteras,
+            'distritos': distritos,
+            'region_de_distrito': np.array([
+                [nombre for nombre, _, _ in REGIONES].index(region) for region, _ in distritos
+            ]),
+            'preferencias': preferencias(args.semilla, args.partidos),
+            'multiplicador_votantes': coprimo(args.electores, args.semilla),
+            'blancos': args.blancos,
+            'blanco_categoria': args.blanco_categoria,
+            'preferencial': args.preferencial,
+        }
+
+        print(f'Cargando {args.electores} electores y {votos} votos '
+              f'({args.procesos if db.engine.dialect.name == "postgresql" else 1} procesos)...')
+        cargar('elector', args.electores, parametros, args)
+        cargar('voto', votos, parametros, args)
+        ajustar_secuencias()
+
+        print('Recalculando conteos de resultados...')
+        from app.services.resultado_service import resultado_service
+        resultado_service.reconstruir()
+
+        print(f'Listo en {time.perf_counter() - inicio:.1f} s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Configuración de gunicorn:
+
+    gunicorn -c gunicorn.conf.py
+
+- preload_app (GUNICORN_PRECARGA): wsgi.py crea y precalienta la aplicación
+  una vez en el maestro; antes del primer fork se cierran sus conexiones y
+  gc.freeze() deja el heap compartido copy-on-write entre los workers
+- Cada worker abre su pool antes de aceptar solicitudes e instala el drenaje
+  de SIGTERM (DRENAJE_SEGUNDOS con /api/sistema/listo en 503); graceful_timeout
+  lo incluye
+- Al arrancar advierte si workers × (pool + desborde + LISTEN) supera
+  DB_CONEXIONES_MAXIMO (las conexiones que PostgreSQL admite para este host)
+- Las métricas de /metrics se suman entre workers: cada proceso escribe sus
+  valores en PROMETHEUS_MULTIPROC_DIR, que se define aquí (antes de que se
+  importe prometheus_client) y se vacía al arrancar el maestro
+"""
+import gc
+import glob
+import os
+import tempfile
+
+wsgi_app = 'wsgi:app'
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+workers = int(os.getenv('GUNICORN_WORKERS', 4))
+# Con más de un hilo por worker gunicorn usa el worker gthread
+threads = int(os.getenv('GUNICORN_HILOS', 1))
+preload_app = os.getenv('GUNICORN_PRECARGA', 'true').lower() in ('1', 'true', 'si')
+graceful_timeout = int(float(os.getenv('DRENAJE_SEGUNDOS', 5))) + 30
+
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'votacion_metricas'))
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+if preload_app:
+    # Sin colecciones mientras se carga la aplicación: los objetos quedan contiguos
+    # y gc.freeze() los congela en when_ready (recomendación de la documentación de gc)
+    gc.disable()
+
+
+def on_starting(server):
+    from flask import Config
+    from config.config import config_by_name, verificar_conexiones
+
+    config = Config(os.path.dirname(os.path.abspath(__file__)))
+    config.from_object(config_by_name[os.getenv('FLASK_ENV', 'default')])
+    advertencia = verificar_conexiones(config, server.cfg.workers)
+    if advertencia:
+        server.log.warning(advertencia)
+
+    # Archivos de una ejecución anterior: sus contadores se sumarían a los nuevos
+    for archivo in glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], '*.db')):
+        os.remove(archivo)
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from app.arranque import antes_de_fork
+        antes_de_fork(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    from app.arranque import iniciar_worker
+    iniciar_worker(worker.wsgi)
+
+
+def child_exit(server, worker):
+    from app.metricas import proceso_terminado
+    proceso_terminado(worker.pid)
@@ -0,0 +1,67 @@
+"""
+Importa el padrón electoral desde un archivo CSV o de ancho fijo.
+
+Valida cada fila en una sola pasada (DNI de 8 dígitos, campos obligatorios,
+DNIs repetidos) y fusiona las válidas en ELECTOR por bloques (COPY a una
+tabla temporal + INSERT ... ON CONFLICT). Muestra el avance en filas por
+segundo; si la carga se interrumpe, se reanuda con --reanudar <id>.
+
+Uso:
+    python importar_padron.py padron.csv
+    python importar_padron.py padron.txt --formato fijo
+    python importar_padron.py padron.csv --reanudar 3
+"""
+import argparse
+import os
+import sys
+import time
+
+from app import create_app
+from app.services.padron_service import padron_service, ImportacionFallidaError, FORMATOS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Importa el padrón electoral')
+    parser.add_argument('archivo')
+    parser.add_argument('--formato', choices=FORMATOS, default=None,
+                        help='csv o fijo (por defecto, según la extensión: .csv es CSV)')
+    parser.add_argument('--reanudar', type=int, default=None, help='id de una importación fallida')
+    parser.add_argument('--bloque', type=int, default=None, help='filas válidas por bloque (PADRON_BLOQUE)')
+    args = parser.parse_args(argv)
+
+    formato = args.formato or ('csv' if args.archivo.lower().endswith('.csv') else 'fijo')
+    app = create_app()
+    if args.bloque:
+        app.config['PADRON_BLOQUE'] = args.bloque
+
+    inicio = time.perf_counter()
+
+    def progreso(importacion):
+        segundos = time.perf_counter() - inicio
+        print(f'\r  {importacion["filas_leidas"]} filas leídas, {importacion["filas_validas"]} válidas, '
+              f'{importacion["filas_invalidas"]} inválidas, {importacion["duplicados"]} duplicadas '
+              f'({importacion["filas_leidas"] / segundos if segundos else 0:,.0f} filas/s)', end='', flush=True)
+
+    with app.app_context(), open(args.archivo, encoding='utf-8-sig', newline='') as texto:
+        try:
+            resultado = padron_service.importar(
+                texto, formato, os.path.basename(args.archivo), reanudar=args.reanudar, progreso=progreso
+            )
+        except ValueError as e:
+            print(f'Error: {e}')
+            return 1
+        except ImportacionFallidaError as e:
+            print(f'\n{e}\nReanudar con: python importar_padron.py {args.archivo} '
+                  f'--formato {formato} --reanudar {e.importacion["id_importacion"]}')
+            return 1
+
+    print(f'\nImportación {resultado["id_importacion"]} completada en {time.perf_counter() - inicio:.1f} s')
+    for motivo, cantidad in sorted(resultado['errores'].items()):
+        print(f'  {motivo}: {cantidad}')
+    for ejemplo in resultado['ejemplos'][:20]:
+        print(f'  fila {ejemplo["fila"]}: {ejemplo["motivo"]} ({ejemplo["dni"]})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
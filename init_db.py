@@ -12,6 +12,11 @@ def init_database():
         # Crear todas las tablas
         print("Creando tablas...")
         db.create_all()
+        # create_all no agrega índices a tablas que ya existen (bases creadas
+        # antes de esos índices): se crean los que falten
+        for tabla in db.metadata.sorted_tables:
+            for indice in tabla.indexes:
+                indice.create(db.engine, checkfirst=True)
         print("Tablas creadas exitosamente")
 
         # Verificar si ya existen datos
@@ -0,0 +1,109 @@
+"""
+Fixtures de las pruebas.
+
+Cada prueba parte de una base SQLite temporal con los datos de init_db.py,
+copiada de una plantilla que se crea una sola vez por sesión. `otro_worker`
+crea una segunda aplicación sobre la misma base: con NotificadorLocal los
+avisos entre ambas se entregan como entre dos workers de gunicorn.
+
+Uso:
+    python -m pytest -q
+"""
+import contextlib
+import gc
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+_DIRECTORIO = tempfile.mkdtemp(prefix='pruebas_votacion_')
+_BASE = os.path.join(_DIRECTORIO, 'votacion.db')
+
+# Config lee el entorno al importarse: se fija antes de importar la aplicación,
+# sin importar el DATABASE_URL del entorno (las pruebas nunca tocan otra base)
+os.environ['DATABASE_URL'] = f'sqlite:///{_BASE}'
+os.environ['NOTIFICADOR_BACKEND'] = 'local'
+# Una relación sin joinedload/selectinload explícito falla la prueba en lugar de consultar (N+1)
+os.environ['ORM_CARGA_ESTRICTA'] = 'true'
+
+
+def _cerrar(aplicacion) -> None:
+    from app.models import db
+
+    with aplicacion.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture(scope='session')
+def plantilla():
+    """Base con los datos de init_db.py, creada una vez por sesión"""
+    from init_db import init_database
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_database()
+    ruta = os.path.join(_DIRECTORIO, 'plantilla.db')
+    shutil.copyfile(_BASE, ruta)
+    yield ruta
+    shutil.rmtree(_DIRECTORIO, ignore_errors=True)
+
+
+@pytest.fixture
+def aplicaciones(plantilla):
+    """Aplicaciones creadas en la prueba; se cierran al terminar"""
+    # Reemplaza el archivo (no lo sobrescribe): una conexión que siga abierta apunta al anterior
+    if os.path.exists(_BASE):
+        os.remove(_BASE)
+    shutil.copyfile(plantilla, _BASE)
+
+    creadas = []
+    yield creadas
+    for aplicacion in creadas:
+        _cerrar(aplicacion)
+    creadas.clear()
+    # NotificadorLocal guarda referencias débiles: las aplicaciones de la prueba dejan el canal
+    gc.collect()
+
+
+@pytest.fixture
+def app(aplicaciones):
+    from app import create_app
+
+    aplicacion = create_app()
+    aplicaciones.append(aplicacion)
+    return aplicacion
+
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def otro_worker(app, aplicaciones):
+    """Segunda aplicación sobre la misma base (otro worker del mismo servidor)"""
+    from app import create_app
+
+    aplicacion = create_app()
+    aplicaciones.append(aplicacion)
+    return aplicacion
+
+
+def votar(cliente, dni: str, *votos_categoria) -> dict:
+    """Registra un voto con pares (id_categoria, id_partido) y retorna la respuesta JSON"""
+    respuesta = cliente.post('/api/votos/', json={
+        'dni': dni,
+        'votos_categoria': [
+            {'id_categoria': id_categoria, 'id_partido': id_partido}
+            for id_categoria, id_partido in votos_categoria
+        ]
+    })
+    assert respuesta.status_code == 201, respuesta.json
+    return respuesta.json
@@ -0,0 +1,61 @@
+"""Especificación OpenAPI cacheada (/apispec.json) y el archivo generado en el build"""
+import json
+
+from app.swagger import CLAVE_HUELLA, EspecificacionApi, generar_especificacion, huella_vistas
+
+
+def test_especificacion_con_huella_y_etag(app, cliente):
+    respuesta = cliente.get('/apispec.json')
+
+    assert respuesta.status_code == 200
+    assert respuesta.headers['Cache-Control'] == 'no-cache'
+    assert '/api/votos/' in respuesta.json['paths']
+    assert respuesta.json[CLAVE_HUELLA] == huella_vistas(app)
+    assert cliente.get('/apispec.json', headers={'If-None-Match': respuesta.headers['ETag']}).status_code == 304
+
+
+def test_sirve_el_archivo_del_build_tal_cual(app, tmp_path):
+    archivo = tmp_path / 'apispec.json'
+    # Con sangría: distinto de lo que generaría la aplicación
+    archivo.write_text(json.dumps(generar_especificacion(app), indent=2), encoding='utf-8')
+
+    assert EspecificacionApi(str(archivo)).obtener(app).cuerpo == archivo.read_bytes()
+
+
+def test_descarta_el_archivo_desactualizado(app, tmp_path):
+    archivo = tmp_path / 'apispec.json'
+    archivo.write_text(json.dumps({'paths': {}, CLAVE_HUELLA: 'de-otro-build'}), encoding='utf-8')
+
+    especificacion = json.loads(EspecificacionApi(str(archivo)).obtener(app).cuerpo)
+
+    assert '/api/votos/' in especificacion['paths']
+    assert especificacion[CLAVE_HUELLA] == huella_vistas(app)
+
+
+def test_archivo_invalido_o_ausente(app, tmp_path):
+    archivo = tmp_path / 'apispec.json'
+    archivo.write_text('no es JSON', encoding='utf-8')
+
+    assert json.loads(EspecificacionApi(str(archivo)).obtener(app).cuerpo)[CLAVE_HUELLA] == huella_vistas(app)
+    assert json.loads(EspecificacionApi(str(tmp_path / 'no_existe.json')).obtener(app).cuerpo)['paths']
+
+
+def test_huella_cambia_con_las_vistas(aplicaciones):
+    from app import create_app
+
+    app = create_app()
+    aplicaciones.append(app)
+    antes = huella_vistas(app)
+
+    def vista_nueva():
+        """
+        Vista agregada después del build
+        ---
+        responses:
+          200:
+            description: OK
+        """
+
+    app.add_url_rule('/api/nueva', 'nueva', vista_nueva)
+
+    assert huella_vistas(app) != antes
@@ -0,0 +1,58 @@
+"""Precalentamiento, sondas de vida y disponibilidad y drenaje con SIGTERM"""
+import signal
+
+import pytest
+
+from app.arranque import EstadoArranque, instalar_drenaje, precalentar
+
+
+def test_sin_precalentar_solo_comprueba_la_base(cliente):
+    assert cliente.get('/api/sistema/vivo').json['estado'] == 'vivo'
+
+    respuesta = cliente.get('/api/sistema/listo')
+
+    assert respuesta.status_code == 200
+    assert respuesta.json['precalentamiento'] is None
+
+
+def test_precalentando_no_esta_listo(app, cliente):
+    app.extensions['arranque'] = EstadoArranque()
+
+    respuesta = cliente.get('/api/sistema/listo')
+
+    assert respuesta.status_code == 503
+    assert respuesta.json['estado'] == 'precalentando'
+
+
+def test_precalentar_llena_la_cache_de_los_listados(app, cliente):
+    estado = precalentar(app)
+
+    assert estado.listo
+    assert {'mapeadores', 'servicios', 'respuestas', 'pool', 'total'} <= set(estado.tiempos)
+    assert cliente.get('/api/partidos/').headers['X-Cache'] == 'HIT'
+    assert cliente.get('/api/sistema/listo').json['precalentamiento'] == estado.tiempos
+
+
+@pytest.fixture
+def sigterm():
+    """Manejador de SIGTERM del servidor simulado; se restaura el original al terminar"""
+    recibidas = []
+    original = signal.signal(signal.SIGTERM, lambda signum, frame: recibidas.append(signum))
+    yield recibidas
+    signal.signal(signal.SIGTERM, original)
+
+
+def test_sigterm_drena_y_encadena_el_manejador_del_servidor(app, cliente, sigterm):
+    app.config['DRENAJE_SEGUNDOS'] = 0
+    instalar_drenaje(app)
+
+    signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+
+    assert sigterm == [signal.SIGTERM]
+    respuesta = cliente.get('/api/sistema/listo')
+    assert respuesta.status_code == 503
+    assert respuesta.json['estado'] == 'drenando'
+
+    # Un segundo SIGTERM durante el drenaje no vuelve a encadenar
+    signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+    assert sigterm == [signal.SIGTERM]
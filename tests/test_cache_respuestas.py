@@ -0,0 +1,49 @@
+"""Caché de respuestas de los listados de referencia e invalidación entre workers"""
+
+
+def test_segundo_pedido_sale_de_la_cache(cliente):
+    primera = cliente.get('/api/partidos/')
+    segunda = cliente.get('/api/partidos/')
+
+    assert primera.headers['X-Cache'] == 'MISS'
+    assert segunda.headers['X-Cache'] == 'HIT'
+    assert segunda.get_data() == primera.get_data()
+
+
+def test_etag_vigente_responde_304(cliente):
+    etag = cliente.get('/api/partidos/').headers['ETag']
+
+    respuesta = cliente.get('/api/partidos/', headers={'If-None-Match': etag})
+
+    assert respuesta.status_code == 304
+    assert respuesta.get_data() == b''
+
+
+def test_alta_invalida_el_listado(cliente):
+    cliente.get('/api/partidos/')
+
+    assert cliente.post('/api/partidos/', json={'nombre_partido': 'Partido de Prueba'}).status_code == 201
+
+    respuesta = cliente.get('/api/partidos/')
+    assert respuesta.headers['X-Cache'] == 'MISS'
+    assert 'Partido de Prueba' in [partido['nombre_partido'] for partido in respuesta.json]
+
+
+def test_alta_en_otro_worker_invalida_el_listado(cliente, otro_worker):
+    etag = cliente.get('/api/partidos/').headers['ETag']
+
+    respuesta = otro_worker.test_client().post('/api/partidos/', json={'nombre_partido': 'Partido de Prueba'})
+    assert respuesta.status_code == 201
+
+    respuesta = cliente.get('/api/partidos/', headers={'If-None-Match': etag})
+    assert respuesta.status_code == 200
+    assert respuesta.headers['X-Cache'] == 'MISS'
+    assert 'Partido de Prueba' in [partido['nombre_partido'] for partido in respuesta.json]
+
+
+def test_cache_distingue_la_query_string(cliente):
+    completo = cliente.get('/api/candidatos/?limit=5')
+    parcial = cliente.get('/api/candidatos/?limit=5&campos=nombre_candidato')
+
+    assert parcial.headers['X-Cache'] == 'MISS'
+    assert parcial.json != completo.json
@@ -0,0 +1,41 @@
+"""Modo estricto de carga (ORM_CARGA_ESTRICTA, activo en las pruebas): las relaciones se cargan de forma explícita"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from conftest import votar
+
+
+def test_carga_perezosa_de_voto_categorias_falla(app, cliente):
+    from app.models import db, Voto
+
+    id_voto = votar(cliente, '12345678', (1, 1))['voto']['id_voto']
+
+    with app.app_context():
+        voto = db.session.get(Voto, id_voto)
+        with pytest.raises(InvalidRequestError):
+            voto.voto_categorias
+
+
+def test_carga_perezosa_de_opciones_falla(app):
+    from app.models import db, Pregunta
+
+    with app.app_context():
+        pregunta = db.session.execute(select(Pregunta).limit(1)).scalar_one()
+        with pytest.raises(InvalidRequestError):
+            pregunta.opciones
+
+
+def test_lecturas_con_carga_explicita(cliente):
+    id_voto = votar(cliente, '12345678', (1, 1), (2, None))['voto']['id_voto']
+
+    voto = cliente.get(f'/api/votos/{id_voto}')
+    assert voto.status_code == 200
+    assert len(voto.json['votos_categoria']) == 2
+
+    preguntas = cliente.get('/api/preguntas/')
+    assert preguntas.status_code == 200
+    assert preguntas.json and all('opciones' in pregunta for pregunta in preguntas.json)
+    pregunta = cliente.get(f'/api/preguntas/{preguntas.json[0]["id_pregunta"]}')
+    assert pregunta.status_code == 200
+    assert pregunta.json['opciones']
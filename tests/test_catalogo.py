@@ -0,0 +1,73 @@
+"""Catálogo de referencia en memoria: resolución de IDs, recargas y aviso entre workers"""
+
+
+def _candidato(id_partido, id_categoria=1):
+    return {'nombre_candidato': 'Candidato de Prueba', 'id_partido': id_partido, 'id_categoria': id_categoria}
+
+
+def _version(app):
+    from app.services.catalogo_service import catalogo_service
+
+    with app.app_context():
+        return catalogo_service.actual().version
+
+
+def test_ids_en_texto_se_resuelven(cliente):
+    respuesta = cliente.post('/api/candidatos/', json=_candidato('1', '1'))
+
+    assert respuesta.status_code == 201
+    assert respuesta.json['id_partido'] == 1
+
+
+def test_id_que_no_es_entero_responde_400_sin_recargar(app, cliente):
+    version = _version(app)
+
+    for id_partido in ('abc', [1], 1.5, True):
+        respuesta = cliente.post('/api/candidatos/', json=_candidato(id_partido))
+        assert respuesta.status_code == 400
+        assert 'id_partido' in respuesta.json['error']
+
+    assert _version(app) == version
+
+
+def test_id_inexistente_anterior_al_catalogo_no_recarga(app, cliente):
+    version = _version(app)
+
+    respuesta = cliente.post('/api/candidatos/', json=_candidato(-5))
+
+    assert respuesta.status_code == 404
+    assert _version(app) == version
+
+
+def test_ids_nuevos_recargan_a_lo_sumo_una_vez(app, cliente):
+    version = _version(app)
+
+    for id_partido in range(1000, 1010):
+        assert cliente.post('/api/candidatos/', json=_candidato(id_partido)).status_code == 404
+
+    assert _version(app) == version + 1
+
+
+def test_registro_de_otro_worker_sin_aviso_se_encuentra_recargando(app, cliente, otro_worker):
+    from app.models import db, PartidoPolitico
+
+    # Creado sin invalidar(): como si la notificación aún no hubiera llegado
+    with otro_worker.app_context():
+        partido = PartidoPolitico(nombre_partido='Partido Recién Creado')
+        db.session.add(partido)
+        db.session.commit()
+        id_partido = partido.id_partido
+
+    respuesta = cliente.post('/api/candidatos/', json=_candidato(id_partido))
+
+    assert respuesta.status_code == 201
+
+
+def test_alta_en_otro_worker_llega_por_el_notificador(app, otro_worker):
+    from app.services.catalogo_service import catalogo_service
+
+    respuesta = otro_worker.test_client().post('/api/partidos/', json={'nombre_partido': 'Partido de Prueba'})
+    assert respuesta.status_code == 201
+
+    with app.app_context():
+        assert respuesta.json['id_partido'] in catalogo_service.actual().partidos
@@ -0,0 +1,55 @@
+"""Cédula pre-serializada: GET /api/cedula/bundle, caché HTTP por versión y gzip"""
+import gzip
+
+
+def _etag(respuesta):
+    return respuesta.headers['ETag'].strip('"')
+
+
+def test_cedula_completa(cliente):
+    cedula = cliente.get('/api/cedula/bundle').json
+
+    categorias = cliente.get('/api/categorias/').json
+    assert [c['categoria']['id_categoria'] for c in cedula['categorias']] == [c['id_categoria'] for c in categorias]
+    assert len(cedula['partidos']) == len(cliente.get('/api/partidos/').json)
+    candidatos = sum(len(p['candidatos']) for c in cedula['categorias'] for p in c['partidos'])
+    assert candidatos == len(cliente.get('/api/candidatos/?limit=1000').json)
+
+
+def test_revalidacion_y_version_inmutable(cliente):
+    respuesta = cliente.get('/api/cedula/bundle')
+    etag = _etag(respuesta)
+
+    assert respuesta.headers['Cache-Control'] == 'no-cache'
+    assert cliente.get('/api/cedula/bundle', headers={'If-None-Match': f'"{etag}"'}).status_code == 304
+    versionada = cliente.get(f'/api/cedula/bundle?v={etag}')
+    assert 'immutable' in versionada.headers['Cache-Control']
+    # Una versión que ya no es la vigente no se guarda como inmutable
+    assert cliente.get('/api/cedula/bundle?v=vieja').headers['Cache-Control'] == 'no-cache'
+
+
+def test_gzip(cliente):
+    plano = cliente.get('/api/cedula/bundle')
+    comprimido = cliente.get('/api/cedula/bundle', headers={'Accept-Encoding': 'gzip'})
+
+    assert comprimido.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(comprimido.get_data()) == plano.get_data()
+    assert 'Accept-Encoding' in comprimido.vary
+
+
+def test_nueva_version_al_cambiar_el_catalogo(cliente, otro_worker):
+    etag = _etag(cliente.get('/api/cedula/bundle'))
+
+    respuesta = otro_worker.test_client().post('/api/partidos/', json={'nombre_partido': 'Partido de Prueba'})
+    assert respuesta.status_code == 201
+
+    nueva = cliente.get('/api/cedula/bundle', headers={'If-None-Match': f'"{etag}"'})
+    assert nueva.status_code == 200
+    assert _etag(nueva) != etag
+    assert 'Partido de Prueba' in [p['nombre_partido'] for p in nueva.json['partidos']]
+
+
+def test_etag_expuesto_por_cors(cliente):
+    respuesta = cliente.get('/api/cedula/bundle', headers={'Origin': 'http://kiosco.local'})
+
+    assert 'ETag' in respuesta.headers.get('Access-Control-Expose-Headers', '')
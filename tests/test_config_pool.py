@@ -0,0 +1,72 @@
+"""Tamaño del pool de conexiones: reparto por worker y advertencia de sobresuscripción"""
+import importlib
+
+import pytest
+
+from config import config as modulo_config
+from config.config import conexiones_por_worker, verificar_conexiones, opciones_motor
+
+POSTGRES = 'postgresql+psycopg2://usuario@localhost/votacion'
+
+
+def _config(**valores):
+    config = {
+        'SQLALCHEMY_DATABASE_URI': POSTGRES, 'DB_PGBOUNCER': False, 'NOTIFICADOR_BACKEND': 'postgres',
+        'DB_POOL_SIZE': 14, 'DB_MAX_OVERFLOW': 7, 'DB_POOL_TIMEOUT': 10, 'DB_POOL_RECYCLE': 1800,
+        'DB_POOL_PRE_PING': True, 'DB_CONEXIONES_MAXIMO': 90,
+    }
+    config.update(valores)
+    return config
+
+
+@pytest.fixture
+def produccion(monkeypatch):
+    """Recarga config.config con el entorno de la prueba y la restaura al terminar"""
+    def cargar(**entorno):
+        for nombre in ('DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'DB_CONEXIONES_MAXIMO', 'GUNICORN_WORKERS'):
+            monkeypatch.delenv(nombre, raising=False)
+        for nombre, valor in entorno.items():
+            monkeypatch.setenv(nombre, str(valor))
+        return importlib.reload(modulo_config).ProductionConfig
+
+    yield cargar
+    monkeypatch.undo()
+    importlib.reload(modulo_config)
+
+
+def test_conexiones_por_worker():
+    assert conexiones_por_worker(_config()) == 14 + 7 + 1
+    assert conexiones_por_worker(_config(NOTIFICADOR_BACKEND='local')) == 21
+    assert conexiones_por_worker(_config(DB_PGBOUNCER=True)) == 0
+    assert conexiones_por_worker(_config(SQLALCHEMY_DATABASE_URI='sqlite:///votacion.db')) == 0
+
+
+def test_advertencia_solo_si_se_supera_el_maximo():
+    assert verificar_conexiones(_config(), 4) is None
+    advertencia = verificar_conexiones(_config(DB_POOL_SIZE=20), 6)
+    assert advertencia is not None and '6 workers x 28' in advertencia
+
+
+@pytest.mark.parametrize('workers', [1, 4, 12, 44])
+def test_pool_de_produccion_entra_en_el_maximo(produccion, workers):
+    configuracion = produccion(GUNICORN_WORKERS=workers)
+    config = _config(DB_POOL_SIZE=configuracion.DB_POOL_SIZE, DB_MAX_OVERFLOW=configuracion.DB_MAX_OVERFLOW)
+
+    assert configuracion.DB_POOL_SIZE >= configuracion.DB_MAX_OVERFLOW >= 0
+    if workers * 3 <= 90:
+        assert verificar_conexiones(config, workers) is None
+    else:
+        # Con demasiados workers el pool no baja de 2 conexiones y se advierte
+        assert verificar_conexiones(config, workers) is not None
+
+
+def test_pool_explicito_tiene_prioridad(produccion):
+    configuracion = produccion(GUNICORN_WORKERS=4, DB_POOL_SIZE=3, DB_MAX_OVERFLOW=0)
+
+    assert (configuracion.DB_POOL_SIZE, configuracion.DB_MAX_OVERFLOW) == (3, 0)
+
+
+def test_opciones_del_motor():
+    assert opciones_motor(_config())['pool_size'] == 14
+    assert 'pool_size' not in opciones_motor(_config(SQLALCHEMY_DATABASE_URI='sqlite://'))
+    assert opciones_motor(_config(DB_PGBOUNCER=True))['poolclass'].__name__ == 'NullPool'
@@ -0,0 +1,75 @@
+"""Cubo de resultados en memoria: cortes, claves normalizadas y reconstrucción entre workers"""
+from sqlalchemy import update
+
+from conftest import votar
+
+
+def test_cubo_coincide_con_los_conteos(cliente):
+    votar(cliente, '12345678', (1, 1), (2, 1), (3, None))
+    votar(cliente, '87654321', (1, 2), (2, None))
+    votar(cliente, '33333333')
+
+    cubo = cliente.get('/api/resultados/cubo?por=categoria,partido').json['valores']
+
+    for categoria in cliente.get('/api/resultados/').json['categorias']:
+        # El partido 0 del cubo es el voto en blanco; las celdas en cero no figuran en los conteos
+        esperado = {str(p['id_partido']): p['votos'] for p in categoria['partidos']}
+        if categoria['en_blanco']:
+            esperado['0'] = categoria['en_blanco']
+        celdas = cubo.get(str(categoria['id_categoria']), {})
+        assert {partido: votos for partido, votos in celdas.items() if votos} == esperado
+
+
+def test_cortes_por_region_y_partido(cliente):
+    votar(cliente, '12345678', (1, 1))
+    votar(cliente, '87654321', (1, 2))
+
+    region = cliente.get('/api/electores/verificar/12345678').json['elector']['region']
+    assert cliente.get(f'/api/resultados/cubo?region={region}&categoria=1&partido=1').json['valores'] == 1
+    assert cliente.get('/api/resultados/cubo?categoria=1&partido=1&partido=2&por=partido').json['valores'] == \
+        {'1': 1, '2': 1}
+    assert cliente.get('/api/resultados/cubo?por=provincia').status_code == 400
+
+
+def test_ids_en_texto_ocupan_la_misma_celda(cliente):
+    respuesta = cliente.post('/api/votos/', json={'dni': '12345678', 'votos_categoria': [
+        {'id_categoria': '1', 'id_partido': '1'}
+    ]})
+    assert respuesta.status_code == 201
+    votar(cliente, '87654321', (1, 1))
+
+    respuesta = cliente.get('/api/resultados/cubo?por=categoria&partido=1')
+
+    assert respuesta.get_data(as_text=True).count('"1"') == 1
+    assert respuesta.json['valores'] == {'1': 2}
+
+
+def test_consulta_no_ve_claves_agregadas_despues(app):
+    from app.services.cubo_service import cubo_service
+
+    with app.app_context():
+        indices, datos = cubo_service._vigente()
+        cubo_service.registrar([(('Región Nueva', 99, 99), 1)])
+
+        # Lo retornado conserva su forma aunque el cubo haya crecido
+        assert tuple(len(indices[eje]) for eje in ('region', 'categoria', 'partido')) == datos.shape
+        assert 'Región Nueva' not in indices['region']
+        assert cubo_service.consultar(regiones=['Región Nueva'])['valores'] == 1
+
+
+def test_otro_worker_reconstruye_su_cubo_tras_el_aviso(app, cliente, otro_worker):
+    from app.models import db, ConteoRegion
+    from app.services.cubo_service import cubo_service
+
+    votar(cliente, '12345678', (1, 1))
+    # Conteos desviados con el mismo total: el otro worker no lo detecta comparando totales
+    with app.app_context():
+        db.session.execute(update(ConteoRegion).where(ConteoRegion.id_partido == 1).values(id_partido=2))
+        db.session.commit()
+    with otro_worker.app_context():
+        cubo_service.reconstruir()
+    assert otro_worker.test_client().get('/api/resultados/cubo?por=partido').json['valores'] == {'2': 1}
+
+    assert cliente.post('/api/resultados/reconstruir').status_code == 200
+
+    assert otro_worker.test_client().get('/api/resultados/cubo?por=partido').json['valores'] == {'1': 1}
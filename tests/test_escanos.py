@@ -0,0 +1,89 @@
+"""Asignación de escaños: cifra repartidora, reparto entre distritos y GET /api/resultados/escanos/<id>"""
+import pytest
+
+from conftest import votar
+from app.services.escanos_service import (
+    escanos_service, cifra_repartidora, repartir_escanos_distritos, calcular_asignacion
+)
+
+DIPUTADO = 3
+PRESIDENTE = 1
+
+
+@pytest.fixture(autouse=True)
+def sin_asignaciones_previas():
+    # El servicio es del proceso y guarda por versión (total de votos): cada prueba parte de otra base
+    escanos_service._cache.clear()
+    escanos_service._pendientes.clear()
+    escanos_service._padron = (0.0, {})
+
+
+def test_cifra_repartidora():
+    votos = {1: 100000, 2: 80000, 3: 30000, 4: 20000}
+
+    assert cifra_repartidora(votos, 8) == {1: 4, 2: 3, 3: 1}
+    assert cifra_repartidora(votos, 0) == {}
+    assert cifra_repartidora({1: 0, 2: 0}, 3) == {}
+
+
+def test_cifra_repartidora_desempata_por_id():
+    assert cifra_repartidora({2: 100, 1: 100}, 1) == {1: 1}
+    assert cifra_repartidora({2: 100, 1: 100}, 3) == {1: 2, 2: 1}
+
+
+def test_reparto_entre_distritos():
+    escanos = repartir_escanos_distritos({'Lima': 700, 'Cusco': 200, 'Tacna': 100}, 20)
+
+    assert sum(escanos.values()) == 20
+    assert escanos == {'Cusco': 4, 'Lima': 13, 'Tacna': 3}
+    assert repartir_escanos_distritos({'Lima': 10, 'Cusco': 0}, 1) == {'Cusco': 1, 'Lima': 1}
+    assert repartir_escanos_distritos({}, 10) == {}
+
+
+def test_umbral_y_electos():
+    asignacion = calcular_asignacion({
+        'escanos_por_distrito': {'Lima': 3, 'Cusco': 2},
+        'votos': {'Lima': {1: 60, 2: 35, 3: 3}, 'Cusco': {1: 10, 2: 20}},
+        'umbral': 0.05,
+        'candidatos': {1: ['a1', 'a2', 'a3', 'a4'], 2: ['b1', 'b2', 'b3']}
+    })
+
+    partidos = {p['id_partido']: p for p in asignacion['partidos']}
+    assert asignacion['total_validos'] == 128
+    assert partidos[3]['supera_umbral'] is False and partidos[3]['escanos'] == 0
+    assert {id_partido: p['escanos'] for id_partido, p in partidos.items()} == {1: 2, 2: 3, 3: 0}
+    assert partidos[1]['electos'] == ['a1', 'a2']
+    assert partidos[2]['electos'] == ['b1', 'b2', 'b3']
+    assert sum(d['escanos'] for d in asignacion['distritos']) == 5
+
+
+def test_escanos_de_una_categoria(cliente):
+    votar(cliente, '12345678', (DIPUTADO, 1))
+    votar(cliente, '87654321', (DIPUTADO, 1))
+    votar(cliente, '11111111', (DIPUTADO, 2))
+
+    respuesta = cliente.get(f'/api/resultados/escanos/{DIPUTADO}')
+
+    assert respuesta.status_code == 200
+    asignacion = respuesta.json
+    assert asignacion['id_categoria'] == DIPUTADO
+    assert asignacion['total_validos'] == 3
+    assert sum(d['escanos'] for d in asignacion['distritos']) == 130
+    assert sum(p['escanos'] for p in asignacion['partidos']) == sum(
+        sum(a['escanos'] for a in d['asignacion']) for d in asignacion['distritos']
+    )
+
+
+def test_categoria_sin_escanos_o_inexistente(cliente):
+    assert cliente.get(f'/api/resultados/escanos/{PRESIDENTE}').status_code == 400
+    assert cliente.get('/api/resultados/escanos/999').status_code == 404
+
+
+def test_calculo_fallido_responde_503(cliente, monkeypatch):
+    # Entrada incompleta: el cálculo falla en el proceso del pool
+    monkeypatch.setattr(escanos_service, '_entrada', lambda id_categoria: {'umbral': 0.05})
+    votar(cliente, '12345678', (DIPUTADO, 1))
+
+    respuesta = cliente.get(f'/api/resultados/escanos/{DIPUTADO}')
+
+    assert respuesta.status_code == 503
@@ -0,0 +1,37 @@
+"""Exportación en flujo (NDJSON y CSV) de votos y votos por categoría"""
+import csv
+import io
+import json
+
+from conftest import votar
+
+
+def test_ndjson_con_el_formato_de_jsonify(cliente):
+    votos = [votar(cliente, dni, (1, 1))['voto'] for dni in ('12345678', '87654321')]
+
+    respuesta = cliente.get('/api/votos/exportar')
+
+    assert respuesta.status_code == 200
+    assert respuesta.mimetype == 'application/x-ndjson'
+    lineas = respuesta.get_data(as_text=True).splitlines()
+    exportados = [json.loads(linea) for linea in lineas]
+    # Mismas claves y mismo formato de fecha que el resto de la API
+    for exportado, voto in zip(exportados, votos):
+        publicado = cliente.get(f'/api/votos/{voto["id_voto"]}').json
+        assert exportado == {clave: publicado[clave] for clave in exportado}
+
+
+def test_csv_con_encabezado(cliente):
+    votar(cliente, '12345678', (1, 1), (2, None))
+
+    respuesta = cliente.get('/api/votos-categoria/exportar?formato=csv')
+
+    assert respuesta.status_code == 200
+    filas = list(csv.reader(io.StringIO(respuesta.get_data(as_text=True))))
+    assert 'id_categoria' in filas[0] and len(filas) == 3
+    # id_partido NULL queda vacío
+    assert filas[2][filas[0].index('id_partido')] == ''
+
+
+def test_formato_no_soportado(cliente):
+    assert cliente.get('/api/votos/exportar?formato=xml').status_code == 400
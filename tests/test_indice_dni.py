@@ -0,0 +1,68 @@
+"""Índice de DNI en memoria: existe / ya votó, altas y relectura tras el aviso de otro worker"""
+import time
+
+from conftest import votar
+
+
+def _esperar(condicion, segundos: float = 5.0) -> bool:
+    limite = time.monotonic() + segundos
+    while time.monotonic() < limite:
+        if condicion():
+            return True
+        time.sleep(0.05)
+    return condicion()
+
+
+def test_estados_de_verificacion(cliente):
+    no_registrado = cliente.get('/api/electores/verificar/00000001').json
+    assert no_registrado['exists'] is False and no_registrado['has_voted'] is False
+
+    assert cliente.get('/api/electores/verificar/12345678').json['has_voted'] is False
+    assert cliente.get('/api/votos/verificar-dni/12345678').json == \
+        {'dni': '12345678', 'ya_voto': False, 'puede_votar': True}
+
+    votar(cliente, '12345678', (1, 1))
+
+    assert cliente.get('/api/electores/verificar/12345678').json['has_voted'] is True
+    assert cliente.get('/api/votos/verificar-dni/12345678').json['ya_voto'] is True
+
+
+def test_el_indice_se_construye_con_el_padron(cliente):
+    indice = cliente.get('/api/electores/indice').json
+
+    assert indice['electores_completos'] is True
+    assert indice['electores'] == len(cliente.get('/api/electores/?limit=1000').json)
+
+
+def test_alta_de_elector_visible_en_el_mismo_worker(cliente):
+    respuesta = cliente.post('/api/electores/', json={
+        'dni': '01234567', 'nombres': 'Ana', 'apellidos': 'Prueba', 'distrito': 'Lima', 'region': 'Lima'
+    })
+    assert respuesta.status_code == 201
+
+    assert cliente.get('/api/electores/verificar/01234567').json['exists'] is True
+    votar(cliente, '01234567', (1, 1))
+    assert cliente.get('/api/votos/verificar-dni/01234567').json['ya_voto'] is True
+
+
+def test_alta_en_otro_worker_se_relee_en_segundo_plano(cliente, otro_worker):
+    electores = cliente.get('/api/electores/indice').json['electores']
+
+    respuesta = otro_worker.test_client().post('/api/electores/', json={
+        'dni': '01234567', 'nombres': 'Ana', 'apellidos': 'Prueba', 'distrito': 'Lima', 'region': 'Lima'
+    })
+    assert respuesta.status_code == 201
+
+    # Mientras relee, los "no registrado" se confirman contra la base
+    assert cliente.get('/api/electores/verificar/01234567').json['exists'] is True
+    assert _esperar(lambda: cliente.get('/api/electores/indice').json == {
+        **cliente.get('/api/electores/indice').json, 'electores': electores + 1, 'electores_completos': True
+    })
+
+
+def test_voto_en_otro_worker_se_ve_en_este(cliente, otro_worker):
+    assert cliente.get('/api/votos/verificar-dni/12345678').json['ya_voto'] is False
+
+    votar(otro_worker.test_client(), '12345678', (1, 1))
+
+    assert _esperar(lambda: cliente.get('/api/votos/verificar-dni/12345678').json['ya_voto'] is True)
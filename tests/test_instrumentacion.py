@@ -0,0 +1,53 @@
+"""Instrumentación por solicitud: Server-Timing, consultas lentas y aviso de N+1"""
+import logging
+import re
+
+from app.instrumentacion import forma_parametros
+
+
+def test_server_timing_cuenta_las_consultas(cliente):
+    respuesta = cliente.get('/api/electores/12345678')
+
+    coincidencia = re.fullmatch(
+        r'db;dur=[\d.]+;desc="consultas: (\d+)", serialize;dur=[\d.]+, total;dur=[\d.]+',
+        respuesta.headers['Server-Timing']
+    )
+    assert coincidencia and int(coincidencia.group(1)) >= 1
+    assert respuesta.headers['Timing-Allow-Origin'] == '*'
+
+
+def test_forma_de_los_parametros_sin_valores():
+    assert forma_parametros({'dni': '12345678', 'limite': 5}) == {'dni': 'str', 'limite': 'int'}
+    assert forma_parametros([{'dni': '1'}, {'dni': '2'}]) == {'filas': 2, 'fila': {'dni': 'str'}}
+    assert forma_parametros(['12345678'] * 20) == {'str': 20}
+
+
+def test_consulta_lenta_se_registra_sin_valores(app, cliente, caplog):
+    app.config['SQL_LENTA_MS'] = 1e-9
+
+    with caplog.at_level(logging.WARNING, logger='app.sql'):
+        cliente.get('/api/electores/87654321')
+
+    lentas = [r.getMessage() for r in caplog.records if r.getMessage().startswith('Consulta lenta')]
+    assert lentas and 'elector.get_elector_by_dni' in lentas[0]
+    assert not any('87654321' in mensaje for mensaje in lentas)
+
+
+def test_aviso_de_n_mas_1(app, cliente, caplog):
+    from app.models import db, Elector
+
+    def en_bucle():
+        # Una consulta por DNI dentro de un bucle
+        for dni in ('12345678', '87654321', '11111111'):
+            db.session.get(Elector, dni)
+        return 'ok'
+
+    app.add_url_rule('/prueba/n-mas-1', 'prueba_n_mas_1', en_bucle)
+    app.config['N_MAS_1_UMBRAL'] = 2
+
+    with caplog.at_level(logging.WARNING, logger='app.sql'):
+        cliente.get('/prueba/n-mas-1')
+        cliente.get('/api/electores/12345678')
+
+    avisos = [r.getMessage() for r in caplog.records if r.getMessage().startswith('Posible N+1')]
+    assert len(avisos) == 1 and 'prueba_n_mas_1' in avisos[0] and '3 ejecuciones' in avisos[0]
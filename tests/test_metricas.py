@@ -0,0 +1,49 @@
+"""Métricas Prometheus en /metrics"""
+from prometheus_client.parser import text_string_to_metric_families
+
+from conftest import votar
+
+
+def _muestras(cliente, nombre):
+    respuesta = cliente.get('/metrics')
+    assert respuesta.status_code == 200
+    return [
+        muestra for familia in text_string_to_metric_families(respuesta.get_data(as_text=True))
+        for muestra in familia.samples if muestra.name == nombre
+    ]
+
+
+def _valor(cliente, nombre, **etiquetas):
+    return sum(
+        muestra.value for muestra in _muestras(cliente, nombre)
+        if all(muestra.labels.get(clave) == valor for clave, valor in etiquetas.items())
+    )
+
+
+def test_solicitudes_por_plantilla_de_ruta(cliente):
+    antes = _valor(cliente, 'votacion_solicitudes_total', ruta='/api/electores/<string:dni>', estado='200')
+
+    cliente.get('/api/electores/12345678')
+    cliente.get('/api/electores/87654321')
+
+    assert _valor(cliente, 'votacion_solicitudes_total', ruta='/api/electores/<string:dni>', estado='200') == \
+        antes + 2
+    # Las etiquetas no crecen con los DNIs
+    assert not [m for m in _muestras(cliente, 'votacion_solicitudes_total') if '12345678' in m.labels['ruta']]
+
+
+def test_votos_y_duplicados(cliente):
+    validos = _valor(cliente, 'votacion_votos_total', tipo_voto='Válido')
+    duplicados = _valor(cliente, 'votacion_dni_duplicado_total', origen='voto')
+
+    votar(cliente, '12345678', (1, 1))
+    assert cliente.post('/api/votos/', json={'dni': '12345678', 'votos_categoria': []}).status_code == 409
+
+    assert _valor(cliente, 'votacion_votos_total', tipo_voto='Válido') == validos + 1
+    assert _valor(cliente, 'votacion_dni_duplicado_total', origen='voto') == duplicados + 1
+
+
+def test_espera_del_pool(cliente):
+    cliente.get('/api/electores/12345678')
+
+    assert _muestras(cliente, 'votacion_pool_espera_segundos_count')
@@ -0,0 +1,58 @@
+"""Negociación de MessagePack: respuestas según Accept y cuerpos según Content-Type"""
+import msgpack
+
+MSGPACK = {'Accept': 'application/msgpack'}
+
+
+def test_jsonify_responde_msgpack_si_el_cliente_lo_prefiere(cliente):
+    cliente.post('/api/votos/', json={'dni': '12345678', 'votos_categoria': [{'id_categoria': 1, 'id_partido': 1}]})
+
+    respuesta = cliente.get('/api/resultados/cubo?por=categoria,partido', headers=MSGPACK)
+
+    assert respuesta.mimetype == 'application/msgpack'
+    assert 'Accept' in respuesta.vary
+    # Claves de mapas siempre str, como en JSON
+    assert msgpack.unpackb(respuesta.get_data()) == cliente.get('/api/resultados/cubo?por=categoria,partido').json
+
+
+def test_json_por_defecto_y_con_preferencia_por_json(cliente):
+    assert cliente.get('/api/resultados/').mimetype == 'application/json'
+    assert cliente.get('/api/resultados/', headers={
+        'Accept': 'application/json, application/msgpack;q=0.5'
+    }).mimetype == 'application/json'
+    assert cliente.get('/api/resultados/', headers={'Accept': 'application/x-msgpack'}).mimetype == \
+        'application/msgpack'
+
+
+def test_cuerpos_en_cache_con_su_propio_etag(cliente):
+    json_ = cliente.get('/api/categorias/')
+    empaquetado = cliente.get('/api/categorias/', headers=MSGPACK)
+
+    assert msgpack.unpackb(empaquetado.get_data()) == json_.json
+    assert empaquetado.headers['ETag'] != json_.headers['ETag']
+    assert cliente.get('/api/categorias/', headers={**MSGPACK, 'If-None-Match': empaquetado.headers['ETag']}) \
+        .status_code == 304
+    assert cliente.get('/api/categorias/', headers={'If-None-Match': empaquetado.headers['ETag']}) \
+        .status_code == 200
+
+
+def test_cedula_en_msgpack(cliente):
+    respuesta = cliente.get('/api/cedula/bundle', headers=MSGPACK)
+
+    assert respuesta.mimetype == 'application/msgpack'
+    assert msgpack.unpackb(respuesta.get_data()) == cliente.get('/api/cedula/bundle').json
+
+
+def test_voto_enviado_en_msgpack(cliente):
+    cuerpo = msgpack.packb({'dni': '12345678', 'votos_categoria': [{'id_categoria': 1, 'id_partido': 1}]})
+
+    respuesta = cliente.post('/api/votos/', data=cuerpo, content_type='application/msgpack', headers=MSGPACK)
+
+    assert respuesta.status_code == 201
+    assert msgpack.unpackb(respuesta.get_data())['voto']['dni'] == '12345678'
+
+
+def test_msgpack_invalido_responde_400(cliente):
+    respuesta = cliente.post('/api/votos/', data=b'\xc1', content_type='application/msgpack')
+
+    assert respuesta.status_code == 400
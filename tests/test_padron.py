@@ -0,0 +1,129 @@
+"""Importación del padrón: validación, fusión por bloques, carga en segundo plano y reanudación"""
+import io
+import time
+from datetime import datetime, timedelta
+
+ENCABEZADO = 'dni,nombres,apellidos,distrito,region\n'
+
+
+def _csv(*filas, separador=','):
+    return (ENCABEZADO.replace(',', separador) + ''.join(separador.join(fila) + '\n' for fila in filas)).encode()
+
+
+def _nuevos(cantidad, inicio=90000000):
+    return [(str(inicio + i), 'Nombre', 'Apellido', 'Miraflores', 'Lima') for i in range(cantidad)]
+
+
+def _esperar(cliente, respuesta, segundos: float = 10.0) -> dict:
+    limite = time.monotonic() + segundos
+    while True:
+        importacion = cliente.get(respuesta.headers['Location']).json
+        if importacion['estado'] != 'en_curso' or time.monotonic() > limite:
+            return importacion
+        time.sleep(0.05)
+
+
+def _importar(cliente, cuerpo: bytes, consulta: str = '') -> dict:
+    respuesta = cliente.post(f'/api/electores/importar{consulta}', data=cuerpo, content_type='text/csv')
+    assert respuesta.status_code == 202, respuesta.json
+    assert respuesta.json['estado'] == 'en_curso'
+    return _esperar(cliente, respuesta)
+
+
+def test_importa_valida_y_cuenta_errores(app, cliente):
+    app.config['PADRON_BLOQUE'] = 2
+    cuerpo = _csv(
+        *_nuevos(5),
+        ('9000000', 'Corto', 'Dni', 'Lima', 'Lima'),
+        ('90000001', 'Repetido', 'En el archivo', 'Lima', 'Lima'),
+        ('90000010', '', 'Sin nombre', 'Lima', 'Lima'),
+        ('90000011', 'Sin columnas'),
+    )
+
+    importacion = _importar(cliente, cuerpo)
+
+    assert importacion['estado'] == 'completada'
+    assert (importacion['filas_leidas'], importacion['filas_validas']) == (9, 5)
+    assert (importacion['filas_invalidas'], importacion['duplicados']) == (3, 1)
+    assert cliente.get('/api/electores/90000004').status_code == 200
+    assert cliente.get('/api/electores/90000010').status_code == 404
+    # El índice de DNI se reconstruye al terminar
+    assert cliente.get('/api/electores/verificar/90000004').json['exists'] is True
+
+
+def test_upsert_actualiza_electores_existentes(cliente):
+    _importar(cliente, _csv(('12345678', 'Nombre Nuevo', 'Apellido Nuevo', 'Cusco', 'Cusco')))
+
+    elector = cliente.get('/api/electores/12345678').json
+    assert (elector['nombres'], elector['region']) == ('Nombre Nuevo', 'Cusco')
+
+
+def test_punto_y_coma_y_columnas_en_otro_orden(cliente):
+    cuerpo = b'region;dni;distrito;apellidos;nombres\nLima;90000000;Miraflores;Apellido;Nombre\n'
+
+    importacion = _importar(cliente, cuerpo)
+
+    assert importacion['filas_validas'] == 1
+    assert cliente.get('/api/electores/90000000').json['distrito'] == 'Miraflores'
+
+
+def test_ancho_fijo(app):
+    from app.services.padron_service import padron_service, ANCHOS
+
+    linea = ''.join(valor.ljust(ancho) for valor, ancho in zip(_nuevos(1)[0], ANCHOS))
+    with app.app_context():
+        importacion = padron_service.importar(io.StringIO(linea + '\n'), 'fijo', 'prueba')
+
+    assert importacion['estado'] == 'completada'
+    assert importacion['filas_validas'] == 1
+
+
+def test_encabezado_o_formato_invalido_responde_400(cliente):
+    assert cliente.post('/api/electores/importar', data=b'dni,nombres\n1,2\n',
+                        content_type='text/csv').status_code == 400
+    assert cliente.post('/api/electores/importar?formato=xml', data=_csv(*_nuevos(1)),
+                        content_type='text/csv').status_code == 400
+    assert cliente.post('/api/electores/importar?reanudar=999', data=_csv(*_nuevos(1)),
+                        content_type='text/csv').status_code == 400
+    assert cliente.get('/api/electores/importaciones/999').status_code == 404
+
+
+def test_reanuda_una_importacion_fallida_desde_lo_confirmado(app, cliente):
+    from app.models import db, ImportacionPadron
+
+    with app.app_context():
+        fallida = ImportacionPadron(origen='prueba', formato='csv', estado='fallida', filas_leidas=3, error='corte')
+        db.session.add(fallida)
+        db.session.commit()
+        id_importacion = fallida.id_importacion
+
+    importacion = _importar(cliente, _csv(*_nuevos(5)), f'?reanudar={id_importacion}')
+
+    assert importacion['id_importacion'] == id_importacion
+    assert importacion['estado'] == 'completada'
+    assert importacion['filas_leidas'] == 5
+    # Las tres primeras filas se dieron por fusionadas en la ejecución anterior
+    assert cliente.get('/api/electores/90000000').status_code == 404
+    assert cliente.get('/api/electores/90000004').status_code == 200
+
+
+def test_solo_se_reanuda_una_importacion_abandonada(app, cliente):
+    from app.models import db, ImportacionPadron
+
+    with app.app_context():
+        en_curso = ImportacionPadron(origen='prueba', formato='csv', estado='en_curso',
+                                     fecha_actualizacion=datetime.utcnow())
+        db.session.add(en_curso)
+        db.session.commit()
+        id_importacion = en_curso.id_importacion
+
+    respuesta = cliente.post(f'/api/electores/importar?reanudar={id_importacion}', data=_csv(*_nuevos(1)),
+                             content_type='text/csv')
+    assert respuesta.status_code == 400
+
+    with app.app_context():
+        en_curso = db.session.get(ImportacionPadron, id_importacion)
+        en_curso.fecha_actualizacion = datetime.utcnow() - timedelta(seconds=app.config['PADRON_ABANDONO'] + 60)
+        db.session.commit()
+
+    assert _importar(cliente, _csv(*_nuevos(1)), f'?reanudar={id_importacion}')['estado'] == 'completada'
@@ -0,0 +1,76 @@
+"""Listados paginados por clave (?after=&limit=), campos, filtros y ?forma=filas"""
+from urllib.parse import parse_qs, urlparse
+
+from sqlalchemy import select
+
+
+def _todos_los_dni(app):
+    from app.models import db, Elector
+
+    with app.app_context():
+        return list(db.session.execute(select(Elector.dni).order_by(Elector.dni)).scalars())
+
+
+def test_recorre_todas_las_paginas_con_el_cursor(app, cliente):
+    vistos = []
+    url = '/api/electores/?limit=7'
+    paginas = 0
+    while True:
+        respuesta = cliente.get(url)
+        assert respuesta.status_code == 200
+        assert len(respuesta.json) <= 7
+        vistos.extend(elector['dni'] for elector in respuesta.json)
+        paginas += 1
+        siguiente = respuesta.headers.get('X-Siguiente')
+        if siguiente is None:
+            break
+        assert siguiente == respuesta.json[-1]['dni']
+        url = f'/api/electores/?limit=7&after={siguiente}'
+
+    dnis = _todos_los_dni(app)
+    assert vistos == dnis
+    assert paginas == -(-len(dnis) // 7)
+
+
+def test_link_siguiente_conserva_los_parametros(cliente):
+    respuesta = cliente.get('/api/electores/?limit=2&region=Lima')
+
+    enlace = respuesta.headers['Link']
+    assert enlace.endswith('; rel="next"')
+    argumentos = parse_qs(urlparse(enlace[1:enlace.index('>')]).query)
+    assert argumentos == {'limit': ['2'], 'region': ['Lima'], 'after': [respuesta.headers['X-Siguiente']]}
+
+
+def test_filtro_por_columna_indexada(cliente):
+    electores = cliente.get('/api/electores/?region=Lima&limit=100').json
+
+    assert electores
+    assert {elector['region'] for elector in electores} == {'Lima'}
+
+
+def test_campos_y_forma_filas(cliente):
+    objetos = cliente.get('/api/electores/?campos=region&limit=5').json
+    filas = cliente.get('/api/electores/?campos=region&limit=5&forma=filas').json
+
+    assert set(objetos[0]) == {'dni', 'region'}
+    assert filas['columnas'] == ['dni', 'region']
+    assert [dict(zip(filas['columnas'], fila)) for fila in filas['filas']] == objetos
+
+
+def test_parametros_invalidos_responden_400(cliente):
+    assert cliente.get('/api/electores/?limit=abc').status_code == 400
+    assert cliente.get('/api/electores/?forma=tabla').status_code == 400
+    assert cliente.get('/api/electores/?campos=clave').status_code == 400
+    assert cliente.get('/api/electores/?nombres=Juan').status_code == 400
+
+
+def test_distrito_solo_junto_con_la_region(cliente):
+    elector = cliente.get('/api/electores/?limit=1').json[0]
+
+    sin_region = cliente.get(f'/api/electores/?distrito={elector["distrito"]}')
+    assert sin_region.status_code == 400
+    assert 'region' in sin_region.json['error']
+
+    electores = cliente.get(f'/api/electores/?region={elector["region"]}&distrito={elector["distrito"]}').json
+    assert elector in electores
+    assert {(e['region'], e['distrito']) for e in electores} == {(elector['region'], elector['distrito'])}
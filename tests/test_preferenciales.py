@@ -0,0 +1,75 @@
+"""Conteo del voto preferencial con NumPy y GET /api/resultados/preferenciales/<id>"""
+import numpy as np
+import pytest
+
+from app.services.preferencial_service import preferencial_service, contar_bloque
+
+DIPUTADO = 3
+
+
+@pytest.fixture(autouse=True)
+def sin_conteos_previos():
+    # El servicio es del proceso y guarda por versión (total de votos): cada prueba parte de otra base
+    preferencial_service._cache.clear()
+
+
+def test_contar_bloque():
+    conteo = np.zeros(3 * 10, dtype=np.int64)
+
+    contar_bloque(
+        partidos=np.array([1, 1, 2, 2]),
+        pref_1=np.array([3, 3, 5, -1]),
+        # El segundo igual al primero no cuenta; fuera de rango (>= base) se descarta
+        pref_2=np.array([4, 3, 12, 7]),
+        base=10, conteo=conteo
+    )
+
+    assert {int(clave): int(votos) for clave, votos in enumerate(conteo) if votos} == {13: 2, 14: 1, 25: 1, 27: 1}
+
+
+def _candidatos(cliente, id_partido):
+    ranking = cliente.get(f'/api/resultados/preferenciales/{DIPUTADO}').json
+    return next(p for p in ranking['partidos'] if p['id_partido'] == id_partido)['candidatos']
+
+
+def test_ranking_por_partido(app, cliente):
+    # Sin el intervalo mínimo entre recálculos: cada consulta ve los votos nuevos
+    app.config['PREFERENCIAL_INTERVALO'] = 0
+    numeros = sorted(c['numero_candidato'] for c in _candidatos(cliente, 1))
+    for dni, (pref_1, pref_2) in zip(('12345678', '87654321', '11111111'),
+                                      ((numeros[1], numeros[2]), (numeros[1], None), (numeros[2], numeros[2]))):
+        respuesta = cliente.post('/api/votos/', json={'dni': dni, 'votos_categoria': [{
+            'id_categoria': DIPUTADO, 'id_partido': 1,
+            'numero_preferencial_1': pref_1, 'numero_preferencial_2': pref_2
+        }]})
+        assert respuesta.status_code == 201
+
+    candidatos = _candidatos(cliente, 1)
+
+    assert [(c['numero_candidato'], c['votos_preferenciales']) for c in candidatos[:3]] == \
+        [(numeros[1], 2), (numeros[2], 2), (numeros[0], 0)]
+    assert [c['posicion'] for c in candidatos] == list(range(1, len(candidatos) + 1))
+    top = cliente.get(f'/api/resultados/preferenciales/{DIPUTADO}?top=1').json
+    assert all(len(p['candidatos']) <= 1 for p in top['partidos'])
+
+
+def test_candidato_nuevo_se_cuenta_sin_esperar_el_intervalo(cliente):
+    assert cliente.get(f'/api/resultados/preferenciales/{DIPUTADO}').status_code == 200
+    numero = max(c['numero_candidato'] for c in _candidatos(cliente, 1)) + 100
+
+    respuesta = cliente.post('/api/candidatos/', json={
+        'nombre_candidato': 'Candidato Nuevo', 'id_partido': 1, 'id_categoria': DIPUTADO, 'numero_candidato': numero
+    })
+    assert respuesta.status_code == 201
+    assert cliente.post('/api/votos/', json={'dni': '12345678', 'votos_categoria': [{
+        'id_categoria': DIPUTADO, 'id_partido': 1, 'numero_preferencial_1': numero
+    }]}).status_code == 201
+
+    # El catálogo cambió: el conteo guardado (otra base) no sirve aunque no haya pasado el intervalo
+    nuevo = next(c for c in _candidatos(cliente, 1) if c['numero_candidato'] == numero)
+    assert nuevo['votos_preferenciales'] == 1
+
+
+def test_categoria_sin_preferencial(cliente):
+    assert cliente.get('/api/resultados/preferenciales/1').status_code == 400
+    assert cliente.get('/api/resultados/preferenciales/999').status_code == 404
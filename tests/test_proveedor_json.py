@@ -0,0 +1,38 @@
+"""Proveedor JSON con orjson: jsonify, request.get_json y tipos que no son de JSON"""
+import datetime
+
+import numpy as np
+
+from app.proveedor_json import codificar
+
+
+def test_codifica_fechas_numpy_y_claves_enteras():
+    assert codificar({
+        1: np.int64(3),
+        'fecha': datetime.datetime(2026, 4, 12, 8, 30),
+        'dia': datetime.date(2026, 4, 12),
+        'conteos': np.array([1, 2], dtype=np.int64)
+    }) == b'{"1":3,"fecha":"2026-04-12T08:30:00","dia":"2026-04-12","conteos":[1,2]}'
+
+
+def test_jsonify_en_bytes_compactos_y_en_orden_de_insercion(app):
+    with app.test_request_context():
+        respuesta = app.json.response({'z': 1, 'a': [1, 2]})
+
+    assert respuesta.mimetype == 'application/json'
+    assert respuesta.get_data() == b'{"z":1,"a":[1,2]}'
+    assert app.json.loads(b'{"a": 1}') == {'a': 1}
+
+
+def test_fecha_del_listado_en_iso_8601(cliente):
+    cliente.post('/api/votos/', json={'dni': '12345678', 'votos_categoria': [{'id_categoria': 1, 'id_partido': 1}]})
+
+    voto = cliente.get('/api/votos/?limit=1').json[0]
+
+    assert datetime.datetime.fromisoformat(voto['fecha'])
+
+
+def test_cuerpo_json_invalido_responde_400(cliente):
+    respuesta = cliente.post('/api/votos/lote', data=b'{"votos": [', content_type='application/json')
+
+    assert respuesta.status_code == 400
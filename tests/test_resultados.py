@@ -0,0 +1,70 @@
+"""Conteos incrementales de resultados frente a la reconstrucción"""
+from conftest import votar
+
+
+def _resultados(cliente):
+    return {
+        'nacional': cliente.get('/api/resultados/').json,
+        'regiones': cliente.get('/api/resultados/regiones').json,
+        'lima': cliente.get('/api/resultados/region/Lima').json,
+        'cubo': cliente.get('/api/resultados/cubo?por=region,categoria,partido').json,
+    }
+
+
+def _registrar_votos(cliente):
+    votar(cliente, '12345678', (1, 1), (2, 1), (3, None))
+    votar(cliente, '87654321', (1, 2), (2, None))
+    votar(cliente, '33333333')
+    respuesta = cliente.post('/api/votos/lote', json={'votos': [
+        {'dni': '11111111', 'votos_categoria': [{'id_categoria': 1, 'id_partido': 1}]},
+        {'dni': '44444444', 'votos_categoria': [{'id_categoria': 1, 'id_partido': 2},
+                                                {'id_categoria': 4, 'id_partido': 3}]},
+    ]})
+    assert respuesta.json['resumen'] == {'registrado': 2}
+
+
+def test_reconstruir_coincide_con_los_conteos_incrementales(cliente):
+    _registrar_votos(cliente)
+    incrementales = _resultados(cliente)
+    assert incrementales['nacional']['total_votos'] == 5
+
+    respuesta = cliente.post('/api/resultados/reconstruir')
+
+    assert respuesta.status_code == 200
+    assert _resultados(cliente) == incrementales
+
+
+def test_ids_en_texto_se_cuentan_como_enteros(cliente):
+    respuesta = cliente.post('/api/votos/', json={'dni': '12345678', 'votos_categoria': [
+        {'id_categoria': '1', 'id_partido': '1'}, {'id_categoria': '2', 'id_partido': None}
+    ]})
+    assert respuesta.status_code == 201
+    assert [vc['id_categoria'] for vc in respuesta.json['voto']['votos_categoria']] == [1, 2]
+    votar(cliente, '87654321', (1, 1))
+
+    presidente = cliente.get('/api/resultados/').json['categorias'][0]
+    assert {p['id_partido']: p['votos'] for p in presidente['partidos']} == {1: 2}
+
+
+def test_papeleta_con_ids_mezclados(cliente):
+    respuesta = cliente.post('/api/votos/', json={'dni': '12345678', 'votos_categoria': [
+        {'id_categoria': '1', 'id_partido': 2}, {'id_categoria': 2, 'id_partido': 1}
+    ]})
+
+    assert respuesta.status_code == 201
+    resultados = cliente.get('/api/resultados/').json
+    assert resultados['total_votos'] == 1
+    assert {c['id_categoria']: [p['id_partido'] for p in c['partidos']] for c in resultados['categorias']
+            if c['partidos']} == {1: [2], 2: [1]}
+
+
+def test_id_que_no_es_entero_responde_400(cliente):
+    for id_partido in ('abc', [1], True, '1.5'):
+        respuesta = cliente.post('/api/votos/', json={'dni': '12345678', 'votos_categoria': [
+            {'id_categoria': 1, 'id_partido': id_partido}, {'id_categoria': 2, 'id_partido': 1}
+        ]})
+        assert respuesta.status_code == 400
+        assert 'id_partido' in respuesta.json['error']
+
+    assert cliente.get('/api/resultados/').json['total_votos'] == 0
+    assert cliente.get('/api/votos/verificar-dni/12345678').json['ya_voto'] is False
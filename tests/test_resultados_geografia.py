@@ -0,0 +1,58 @@
+"""Conteos por región y distrito: coinciden con el total nacional y entre sí"""
+from conftest import votar
+
+
+def _votos(resultado):
+    votos = {(c['id_categoria'], None): c['en_blanco'] for c in resultado['categorias'] if c['en_blanco']}
+    votos.update(
+        ((c['id_categoria'], p['id_partido']), p['votos']) for c in resultado['categorias'] for p in c['partidos']
+    )
+    return votos
+
+
+def _sumar(*conteos):
+    total = {}
+    for conteo in conteos:
+        for clave, votos in conteo.items():
+            total[clave] = total.get(clave, 0) + votos
+    return total
+
+
+def test_regiones_suman_el_total_nacional(cliente):
+    electores = cliente.get('/api/electores/?limit=6').json
+    assert len({e['region'] for e in electores}) > 1
+    for indice, elector in enumerate(electores):
+        votar(cliente, elector['dni'], (1, 1 + indice % 2), (2, None))
+
+    regiones = cliente.get('/api/resultados/regiones').json
+
+    assert {r['region'] for r in regiones} == {e['region'] for e in electores}
+    assert _sumar(*map(_votos, regiones)) == _votos(cliente.get('/api/resultados/').json)
+    for region in regiones:
+        assert _votos(cliente.get(f'/api/resultados/region/{region["region"]}').json) == _votos(region)
+
+
+def test_distritos_suman_su_region(cliente):
+    electores = cliente.get('/api/electores/?limit=100').json
+    region = electores[0]['region']
+    de_la_region = [e for e in electores if e['region'] == region]
+    for elector in de_la_region:
+        votar(cliente, elector['dni'], (1, 1))
+
+    distritos = cliente.get(f'/api/resultados/region/{region}/distritos').json
+
+    assert sum(d['votos_por_categoria']['1'] for d in distritos) == len(de_la_region)
+    assert _sumar(*(
+        _votos(cliente.get(f'/api/resultados/region/{region}/distrito/{d["distrito"]}').json) for d in distritos
+    )) == _votos(cliente.get(f'/api/resultados/region/{region}').json)
+
+
+def test_filtro_de_regiones(cliente):
+    electores = cliente.get('/api/electores/?limit=6').json
+    for elector in electores:
+        votar(cliente, elector['dni'], (1, 1))
+    region = electores[0]['region']
+
+    regiones = cliente.get(f'/api/resultados/regiones?region={region}').json
+
+    assert [r['region'] for r in regiones] == [region]
@@ -0,0 +1,26 @@
+"""Verificación de DNIs por lote: POST /api/electores/verificar-lote"""
+from conftest import votar
+
+
+def test_verificacion_por_lote(cliente):
+    votar(cliente, '12345678', (1, 1))
+
+    respuesta = cliente.post('/api/electores/verificar-lote', json={
+        'dnis': ['12345678', '87654321', '00000001', 87654321]
+    })
+
+    assert respuesta.status_code == 200
+    assert respuesta.json['resumen'] == {'ya_voto': 1, 'puede_votar': 2, 'no_registrado': 1}
+    resultados = respuesta.json['resultados']
+    # Mismo orden que el pedido; los DNIs numéricos se tratan como texto
+    assert [r['dni'] for r in resultados] == ['12345678', '87654321', '00000001', '87654321']
+    assert resultados[0]['id_voto'] is not None and resultados[0]['fecha']
+    assert resultados[1] == {'dni': '87654321', 'exists': True, 'has_voted': False, 'id_voto': None, 'fecha': None}
+
+
+def test_verificacion_por_lote_invalida(app, cliente):
+    app.config['VERIFICAR_LOTE_MAXIMO'] = 2
+
+    assert cliente.post('/api/electores/verificar-lote', json={'dnis': []}).status_code == 400
+    assert cliente.post('/api/electores/verificar-lote', json={'dnis': [['1']]}).status_code == 400
+    assert cliente.post('/api/electores/verificar-lote', json={'dnis': ['1', '2', '3']}).status_code == 400
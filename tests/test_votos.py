@@ -0,0 +1,47 @@
+"""Registro de votos: POST /api/votos/ (VotoService.create)"""
+from conftest import votar
+
+
+def _categoria(resultados, id_categoria):
+    return next(c for c in resultados['categorias'] if c['id_categoria'] == id_categoria)
+
+
+def test_voto_incrementa_conteos(cliente):
+    voto = votar(cliente, '12345678', (1, 1), (2, None))['voto']
+
+    assert voto['dni'] == '12345678'
+    assert [vc['id_categoria'] for vc in voto['votos_categoria']] == [1, 2]
+
+    resultados = cliente.get('/api/resultados/').json
+    assert resultados['total_votos'] == 1
+    presidente = _categoria(resultados, 1)
+    assert {p['id_partido']: p['votos'] for p in presidente['partidos']} == {1: 1}
+    assert presidente['total'] == 1
+    vicepresidente = _categoria(resultados, 2)
+    assert vicepresidente['en_blanco'] == 1 and vicepresidente['partidos'] == []
+
+    estado = cliente.get('/api/electores/verificar/12345678').json
+    assert estado['has_voted'] is True
+    assert estado['voto']['id_voto'] == voto['id_voto']
+
+
+def test_voto_duplicado_responde_409_con_el_voto_existente(cliente):
+    voto = votar(cliente, '12345678', (1, 1))['voto']
+
+    respuesta = cliente.post('/api/votos/', json={'dni': '12345678', 'votos_categoria': [{'id_categoria': 1, 'id_partido': 2}]})
+
+    assert respuesta.status_code == 409
+    assert respuesta.json['voto_existente']['id_voto'] == voto['id_voto']
+    # El segundo intento no suma
+    assert cliente.get('/api/resultados/').json['total_votos'] == 1
+
+
+def test_elector_inexistente_responde_404(cliente):
+    respuesta = cliente.post('/api/votos/', json={'dni': '00000001', 'votos_categoria': []})
+
+    assert respuesta.status_code == 404
+    assert cliente.get('/api/resultados/').json['total_votos'] == 0
+
+
+def test_sin_dni_responde_400(cliente):
+    assert cliente.post('/api/votos/', json={'votos_categoria': []}).status_code == 400
@@ -0,0 +1,101 @@
+"""Ingesta de lotes: POST /api/votos/lote (VotoService.create_many)"""
+from conftest import votar
+
+
+def _categoria(resultados, id_categoria):
+    return next(c for c in resultados['categorias'] if c['id_categoria'] == id_categoria)
+
+
+def test_lote_informa_el_estado_de_cada_papeleta(cliente):
+    votar(cliente, '11111111', (1, 1))
+
+    respuesta = cliente.post('/api/votos/lote', json={'votos': [
+        {'dni': '87654321', 'votos_categoria': [{'id_categoria': 1, 'id_partido': 2}]},
+        {'dni': '87654321', 'votos_categoria': []},
+        {'dni': '11111111', 'votos_categoria': []},
+        {'dni': '00000001', 'votos_categoria': []},
+        {'dni': '22222222', 'votos_categoria': [{'id_categoria': 1, 'id_partido': None}]},
+    ]})
+
+    assert respuesta.status_code == 200
+    estados = [resultado['estado'] for resultado in respuesta.json['resultados']]
+    assert estados == ['registrado', 'duplicado', 'duplicado', 'elector_no_encontrado', 'registrado']
+    assert respuesta.json['resumen'] == {'registrado': 2, 'duplicado': 2, 'elector_no_encontrado': 1}
+
+    presidente = _categoria(cliente.get('/api/resultados/').json, 1)
+    assert {p['id_partido']: p['votos'] for p in presidente['partidos']} == {1: 1, 2: 1}
+    assert presidente['en_blanco'] == 1
+
+
+def test_lote_con_ids_no_enteros_solo_invalida_esa_papeleta(cliente):
+    respuesta = cliente.post('/api/votos/lote', json={'votos': [
+        {'dni': '12345678', 'votos_categoria': [{'id_categoria': 1, 'id_partido': [1]}]},
+        {'dni': '87654321', 'votos_categoria': {'id_categoria': 1}},
+        {'dni': '11111111', 'votos_categoria': [{'id_categoria': 1, 'id_partido': 1}]},
+    ]})
+
+    assert respuesta.status_code == 200
+    resultados = respuesta.json['resultados']
+    assert [resultado['estado'] for resultado in resultados] == ['invalido', 'invalido', 'registrado']
+    assert 'id_partido' in resultados[0]['error']
+    assert cliente.get('/api/resultados/').json['total_votos'] == 1
+
+
+def test_lote_vacio_responde_400(cliente):
+    assert cliente.post('/api/votos/lote', json={'votos': []}).status_code == 400
+
+
+def test_lote_demasiado_grande_responde_400(app, cliente):
+    app.config['VOTOS_LOTE_MAXIMO'] = 2
+
+    respuesta = cliente.post('/api/votos/lote', json={'votos': [
+        {'dni': dni, 'votos_categoria': []} for dni in ('12345678', '87654321', '11111111')
+    ]})
+
+    assert respuesta.status_code == 400
+    assert cliente.get('/api/resultados/').json['total_votos'] == 0
+
+
+def test_lote_acepta_ids_en_texto(cliente):
+    respuesta = cliente.post('/api/votos/lote', json={'votos': [
+        {'dni': '12345678', 'votos_categoria': [{'id_categoria': '1', 'id_partido': '2'}]},
+        {'dni': '87654321', 'votos_categoria': [{'id_categoria': 1, 'id_partido': 2}]},
+    ]})
+
+    assert respuesta.json['resumen'] == {'registrado': 2}
+    presidente = _categoria(cliente.get('/api/resultados/').json, 1)
+    assert {p['id_partido']: p['votos'] for p in presidente['partidos']} == {2: 2}
+    assert cliente.get('/api/resultados/cubo?categoria=1&por=partido').json['valores']['2'] == 2
+
+
+def test_lote_marca_votos_en_el_indice_y_el_cubo(cliente):
+    respuesta = cliente.post('/api/votos/lote', json={'votos': [
+        {'dni': '12345678', 'votos_categoria': [{'id_categoria': 1, 'id_partido': 1}]},
+        {'dni': '87654321', 'votos_categoria': []},
+    ]})
+    assert respuesta.json['resumen'] == {'registrado': 2}
+
+    assert cliente.get('/api/votos/verificar-dni/12345678').json['ya_voto'] is True
+    assert cliente.get('/api/votos/verificar-dni/87654321').json['ya_voto'] is True
+    # La papeleta vacía cuenta en blanco en todas las categorías
+    cubo = cliente.get('/api/resultados/cubo?por=categoria').json['valores']
+    assert cubo.pop('1') == 2
+    assert set(cubo.values()) == {1}
+
+
+def test_lote_con_partido_creado_en_otro_worker_sin_aviso(cliente, otro_worker):
+    from app.models import db, PartidoPolitico
+
+    with otro_worker.app_context():
+        partido = PartidoPolitico(nombre_partido='Partido Recién Creado')
+        db.session.add(partido)
+        db.session.commit()
+        id_partido = partido.id_partido
+
+    respuesta = cliente.post('/api/votos/lote', json={'votos': [
+        {'dni': '12345678', 'votos_categoria': [{'id_categoria': 1, 'id_partido': id_partido}]},
+        {'dni': '87654321', 'votos_categoria': [{'id_categoria': 1, 'id_partido': -1}]},
+    ]})
+
+    assert [r['estado'] for r in respuesta.json['resultados']] == ['registrado', 'invalido']
+    assert 'partido' in respuesta.json['resultados'][1]['error']
@@ -0,0 +1,18 @@
+"""
+Punto de entrada WSGI de producción:
+
+    gunicorn -c gunicorn.conf.py          (usa wsgi:app)
+
+A diferencia de app.py (servidor de desarrollo con debug y db.create_all),
+crea la aplicación con la configuración de producción y la precalienta al
+importarse: mapeadores del ORM, cachés de referencia y pool de conexiones.
+Con preload_app esto ocurre una sola vez en el maestro de gunicorn y los
+workers heredan la memoria copy-on-write (ver app/arranque.py).
+"""
+import os
+
+from app import create_app
+from app.arranque import precalentar
+
+app = create_app(os.getenv('FLASK_ENV', 'production'))
+precalentar(app)